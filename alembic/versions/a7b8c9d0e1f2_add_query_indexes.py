@@ -0,0 +1,68 @@
+"""add_query_indexes
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-07-20 10:00:00.000000
+
+Background
+----------
+``tickets`` only had the primary-key index, yet every list endpoint
+filters by ``status``, ``user_id`` or ``assigned_agent_id`` and orders by
+``created_at DESC``, and the similarity corpus query filters on
+``status = 'auto_resolved' AND response IS NOT NULL``. Each of those was a
+full table scan followed by a sort.
+
+The indexes below match those query shapes (equality columns first, then
+the ordering column) and are declared on the models in ``__table_args__``
+so fresh databases created by init_db() get them too.
+
+``ix_tickets_resolved_corpus`` is a partial index on SQLite and
+PostgreSQL: it only holds the rows the corpus query can return.
+
+Reversibility:
+  downgrade() drops the indexes; no data is touched.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, Sequence[str], None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_RESOLVED_CORPUS = sa.text("status = 'auto_resolved' AND response IS NOT NULL")
+
+_TICKET_INDEXES = (
+    ("ix_tickets_created_at", ["created_at"]),
+    ("ix_tickets_status_created_at", ["status", "created_at"]),
+    ("ix_tickets_user_id_created_at", ["user_id", "created_at"]),
+    ("ix_tickets_assigned_agent_status", ["assigned_agent_id", "status", "created_at"]),
+    ("ix_tickets_quality_score", ["quality_score"]),
+)
+
+
+def upgrade() -> None:
+    """Create the ticket and feedback query indexes."""
+    for name, columns in _TICKET_INDEXES:
+        op.create_index(name, "tickets", columns)
+    op.create_index(
+        "ix_tickets_resolved_corpus",
+        "tickets",
+        ["created_at"],
+        sqlite_where=_RESOLVED_CORPUS,
+        postgresql_where=_RESOLVED_CORPUS,
+    )
+    op.create_index("ix_feedback_resolved", "feedback", ["resolved"])
+
+
+def downgrade() -> None:
+    """Drop the indexes created in upgrade()."""
+    op.drop_index("ix_feedback_resolved", table_name="feedback")
+    op.drop_index("ix_tickets_resolved_corpus", table_name="tickets")
+    for name, _columns in reversed(_TICKET_INDEXES):
+        op.drop_index(name, table_name="tickets")
@@ -0,0 +1,67 @@
+"""add_ticket_rollups_hourly
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-07-24 10:00:00.000000
+
+Background
+----------
+/admin/metrics and workers/metrics_collector.py rescanned the whole
+tickets and feedback tables on every run. ticket_rollups_hourly holds
+pre-aggregated counters per (ticket creation hour, intent, status,
+response_source). They are kept current by the Session events in
+app/db/rollups.py, so dashboards and the time-series endpoint read
+O(buckets) rows.
+
+The table is created empty. Backfill existing history with
+``python workers/rollup_reconciler.py`` before setting
+METRICS_ROLLUPS_ENABLED=true.
+
+Reversibility:
+  downgrade() drops the table; it is derived data and can be rebuilt
+  from tickets/feedback at any time.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, Sequence[str], None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the ticket_rollups_hourly table."""
+    op.create_table(
+        "ticket_rollups_hourly",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("intent", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("response_source", sa.String(), nullable=False),
+        sa.Column("ticket_count", sa.Integer(), nullable=False),
+        sa.Column("unassigned_count", sa.Integer(), nullable=False),
+        sa.Column("confidence_sum", sa.Float(), nullable=False),
+        sa.Column("confidence_count", sa.Integer(), nullable=False),
+        sa.Column("quality_sum", sa.Float(), nullable=False),
+        sa.Column("quality_count", sa.Integer(), nullable=False),
+        sa.Column("low_quality_count", sa.Integer(), nullable=False),
+        sa.Column("feedback_count", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Integer(), nullable=False),
+        sa.Column("resolved_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "bucket_start", "intent", "status", "response_source",
+            name="uq_ticket_rollups_hourly_key",
+        ),
+    )
+    op.create_index("ix_ticket_rollups_hourly_bucket_start", "ticket_rollups_hourly", ["bucket_start"])
+
+
+def downgrade() -> None:
+    """Drop the ticket_rollups_hourly table."""
+    op.drop_index("ix_ticket_rollups_hourly_bucket_start", table_name="ticket_rollups_hourly")
+    op.drop_table("ticket_rollups_hourly")
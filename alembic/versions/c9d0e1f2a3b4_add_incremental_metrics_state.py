@@ -0,0 +1,83 @@
+"""add_incremental_metrics_state
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-07-27 10:00:00.000000
+
+Background
+----------
+workers/metrics_collector.py --incremental only reads rows that changed
+since its last run, which needs:
+
+- ``tickets.updated_at``: set on insert and on every UPDATE (including the
+  bulk status UPDATEs in app/api/agent.py), indexed for the watermark
+  range scan. Existing rows are backfilled with ``created_at``.
+- ``ix_feedback_created_at``: the same range scan over feedback.
+- ``worker_checkpoints``: per-worker watermark + JSON state.
+- ``metrics_ticket_state``: what the collector last counted per ticket, so
+  a changed ticket's old contribution can be subtracted.
+
+Reversibility:
+  downgrade() drops the new tables, indexes and column; the collector
+  state is derived and is rebuilt on the next incremental run.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = (
+    ("ix_tickets_updated_at", "tickets", ["updated_at"]),
+    ("ix_feedback_created_at", "feedback", ["created_at"]),
+)
+
+
+def upgrade() -> None:
+    """Add tickets.updated_at, the watermark indexes and the collector state tables."""
+    with op.batch_alter_table("tickets", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(),
+                server_default=sa.text("CURRENT_TIMESTAMP"),
+                nullable=False,
+            )
+        )
+    op.execute("UPDATE tickets SET updated_at = created_at")
+
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+    op.create_table(
+        "worker_checkpoints",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("watermark", sa.DateTime(), nullable=True),
+        sa.Column("state", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "metrics_ticket_state",
+        sa.Column("ticket_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("intent", sa.String(), nullable=True),
+        sa.Column("rating", sa.Integer(), nullable=True),
+        sa.Column("resolved", sa.Boolean(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop the collector state tables, the watermark indexes and tickets.updated_at."""
+    op.drop_table("metrics_ticket_state")
+    op.drop_table("worker_checkpoints")
+    for name, table, _columns in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("tickets", schema=None) as batch_op:
+        batch_op.drop_column("updated_at")
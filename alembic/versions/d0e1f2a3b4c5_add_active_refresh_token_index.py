@@ -0,0 +1,45 @@
+"""add_active_refresh_token_index
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-07-29 10:00:00.000000
+
+Background
+----------
+refresh_tokens gains a row on every login and every /auth/refresh
+rotation, and revocation only flags the old row. workers/cleanup.py now
+deletes revoked and expired tokens in batches. Revoked ones go in
+primary-key order. Unrevoked tokens past ``expires_at`` are found
+through this partial index, which only holds live tokens, so it stays
+small however many revoked rows pile up between runs.
+
+Reversibility:
+  downgrade() drops the index; no data is touched.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the partial index on unrevoked refresh tokens."""
+    op.create_index(
+        "ix_refresh_tokens_active_expires_at",
+        "refresh_tokens",
+        ["expires_at"],
+        sqlite_where=sa.text("revoked = 0"),
+        postgresql_where=sa.text("revoked = false"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the index created in upgrade()."""
+    op.drop_index("ix_refresh_tokens_active_expires_at", table_name="refresh_tokens")
@@ -17,26 +17,35 @@ DO NOT:
 - Allow non-admin access
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, Integer, update
-from typing import Annotated, Any
+from sqlalchemy import Integer, update
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Literal
+import json
 import logging
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.ticket import Ticket
-from app.models.feedback import Feedback
 from app.models.user import User
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, set_password
 from app.constants import UserRole, TicketStatus
-from app.schemas.admin import MetricsResponse, AdminTicketListResponse, AdminTicketItem, AgentListItem, AdminAssignRequest, AdminUserItem, AdminUserListResponse, AdminResetPasswordRequest, FiltersMeta, PaginationMeta
+from app.schemas.admin import MetricsResponse, TimeSeriesResponse, AdminTicketListResponse, AdminTicketItem, AgentListItem, AdminAssignRequest, AdminUserItem, AdminUserListResponse, AdminResetPasswordRequest, FiltersMeta, PaginationMeta
 from app.schemas.ticket import TicketResponse
-from app.core.security import hash_password
+from app.core.password_hasher import hash_password_async
 from app.api.dependencies import require_agent_or_admin
+from app.services.admin_metrics import get_admin_metrics, ticket_timeseries
+from app.utils.pagination import decode_cursor, keyset_page, wants_total
+from app.core.http_cache import cache_headers, etag_matches, list_version, make_etag, not_modified
+from app.core.json_response import FastJSONResponse, list_columns, rows_as_dicts
+from app.core.config import settings
 from app.core.exceptions import (
     AuthorizationError,
     ValidationError,
-    InternalError
+    InternalError,
+    NotFoundError,
+    ServiceUnavailableError,
 )
 
 # Configure logger
@@ -51,6 +60,10 @@ ALLOWED_TICKET_STATUSES = {
     TicketStatus.CLOSED.value,
 }
 
+# GET /admin/tickets selects only the columns it returns
+ADMIN_TICKET_COLUMNS = list_columns(Ticket, AdminTicketItem)
+ADMIN_TICKET_FIELDS = list(AdminTicketItem.model_fields)
+
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
@@ -75,17 +88,31 @@ def require_admin(current_user: Annotated[User, Depends(get_current_user)]) -> U
 @router.get("/metrics", response_model=MetricsResponse)
 def get_metrics(
     current_user: Annotated[User, Depends(require_admin)],
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    max_staleness: float | None = Query(
+        None,
+        ge=0,
+        description="Oldest acceptable cached snapshot in seconds (default: ADMIN_METRICS_CACHE_TTL_S; 0 = fresh)",
+    ),
 ):
     """
     Retrieve high-level system metrics.
     
     This endpoint provides aggregated statistics about the system performance
-    and is restricted to admin users only.
+    and is restricted to admin users only. Numbers come from a short-TTL
+    snapshot (see app/services/admin_metrics.py); the ``Age`` response
+    header reports how old it is. The ETag covers the snapshot's numbers,
+    and Cache-Control lets the client reuse it until the snapshot would be
+    recomputed.
     
     Args:
         current_user: Admin user (from require_admin dependency)
+        request: Incoming request (If-None-Match)
+        response: Used to set the Age / ETag / Cache-Control headers
         db: Database session dependency
+        max_staleness: Upper bound on snapshot age; 0 forces fresh numbers
         
     Returns:
         Dictionary containing system metrics:
@@ -101,83 +128,18 @@ def get_metrics(
         AuthorizationError: 403 if not admin, 500 for database errors
     """
     try:
-        # Ticket statistics
-        total_tickets = db.query(Ticket).count()
-        
-        tickets_by_status = (
-            db.query(Ticket.status, func.count(Ticket.id))
-            .group_by(Ticket.status)
-            .all()
-        )
-        
-        status_counts = {status: count for status, count in tickets_by_status}
-        
-        auto_resolved = status_counts.get(TicketStatus.AUTO_RESOLVED.value, 0)
-        escalated = status_counts.get(TicketStatus.ESCALATED.value, 0)
-        open_tickets = status_counts.get(TicketStatus.OPEN.value, 0)
-        
-        # Calculate rates (avoid division by zero)
-        auto_resolve_rate = (auto_resolved / total_tickets * 100) if total_tickets > 0 else 0
-        escalation_rate = (escalated / total_tickets * 100) if total_tickets > 0 else 0
-        
-        # Count unassigned escalated tickets
-        unassigned_escalated = db.query(Ticket).filter(
-            Ticket.status == TicketStatus.ESCALATED.value,
-            Ticket.assigned_agent_id.is_(None)
-        ).count()
-        
-        # Feedback statistics
-        total_feedback = db.query(Feedback).count()
-        
-        # Use a simpler approach for counting resolved feedback
-        resolved_feedback_count = db.query(Feedback).filter(Feedback.resolved.is_(True)).count()
-        avg_rating_result = db.query(func.avg(Feedback.rating)).scalar()
-        average_rating = float(avg_rating_result) if avg_rating_result else 0.0
-        
-        feedback_resolution_rate = (resolved_feedback_count / total_feedback * 100) if total_feedback > 0 else 0
-        
-        # Quality metrics
-        low_quality_tickets = db.query(Ticket).filter(
-            Ticket.quality_score.isnot(None),
-            Ticket.quality_score < 0.5
-        ).count()
-        
-        quality_by_intent = (
-            db.query(Ticket.intent, func.avg(Ticket.quality_score))
-            .filter(Ticket.quality_score.isnot(None))
-            .group_by(Ticket.intent)
-            .all()
+        metrics, age = get_admin_metrics(db, max_staleness=max_staleness)
+        fresh_for = max(0, int(settings.ADMIN_METRICS_CACHE_TTL_S - age))
+        headers = cache_headers(
+            make_etag("metrics", json.dumps(metrics, sort_keys=True, default=str)),
+            f"private, max-age={fresh_for}",
         )
+        headers["Age"] = str(int(age))
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
         
-        metrics = {
-            "tickets": {
-                "total": total_tickets,
-                "by_status": status_counts,
-                "auto_resolve_rate": round(auto_resolve_rate, 2),
-                "escalation_rate": round(escalation_rate, 2),
-                "open": open_tickets,
-                "auto_resolved": auto_resolved,
-                "escalated": escalated,
-                "unassigned_escalated": unassigned_escalated
-            },
-            "feedback": {
-                "total": total_feedback,
-                "average_rating": round(average_rating, 2),
-                "resolution_rate": round(feedback_resolution_rate, 2),
-                "resolved_count": resolved_feedback_count
-            },
-            "quality": {
-                "low_quality_count": low_quality_tickets,
-                "by_intent": {intent: round(float(score), 2) for intent, score in quality_by_intent if intent}
-            },
-            "system_health": {
-                "auto_resolve_rate_status": "good" if auto_resolve_rate >= 70 else "needs_improvement",
-                "escalation_rate_status": "good" if escalation_rate <= 30 else "needs_improvement",
-                "feedback_coverage": round((total_feedback / total_tickets * 100), 2) if total_tickets > 0 else 0
-            }
-        }
-        
-        logger.info(f"Admin metrics retrieved by user {current_user.id}")
+        logger.info(f"Admin metrics retrieved by user {current_user.id} (age={age:.1f}s)")
         return metrics
         
     except Exception as e:
@@ -185,13 +147,56 @@ def get_metrics(
         raise InternalError("Failed to retrieve metrics") from e
 
 
+@router.get("/metrics/timeseries", response_model=TimeSeriesResponse)
+def get_metrics_timeseries(
+    current_user: Annotated[User, Depends(require_admin)],
+    db: Session = Depends(get_read_db),
+    hours: int = Query(24, ge=1, le=24 * 90, description="How far back to go, in hours"),
+    interval: Literal["hour", "day"] = Query("hour", description="Bucket size"),
+):
+    """
+    Ticket volume, status mix, confidence and feedback over time.
+
+    Served from the hourly rollup table (O(buckets) rows), so it is only
+    available when METRICS_ROLLUPS_ENABLED is set. Buckets are by ticket
+    creation time (UTC).
+    
+    Args:
+        current_user: Admin user (from require_admin dependency)
+        db: Database session dependency
+        hours: Window size in hours (1–2160)
+        interval: ``hour`` or ``day`` buckets
+        
+    Raises:
+        AuthorizationError: 403 if not admin
+        NotFoundError: 404 when rollups are disabled
+        InternalError: 500 for database errors
+    """
+    if not settings.METRICS_ROLLUPS_ENABLED:
+        raise NotFoundError("Time-series metrics are not enabled")
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    try:
+        points = ticket_timeseries(db, since, interval)
+    except Exception as e:
+        logger.exception("Failed to build metrics time series")
+        raise InternalError("Failed to retrieve metrics time series") from e
+
+    logger.info(f"Admin metrics time series retrieved by user {current_user.id}: hours={hours}, interval={interval}")
+    return {"interval": interval, "since": since.isoformat(), "points": points}
+
+
 @router.get("/tickets", response_model=AdminTicketListResponse)
 def list_all_tickets(
     current_user: Annotated[User, Depends(require_admin)],
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     status_filter: str | None = Query(None, alias="status", description="Filter by ticket status"),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(50, ge=1, le=100, description="Items per page")
+    limit: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page (keyset mode; page is ignored)"),
+    include_total: bool | None = Query(None, description="Run COUNT(*) for total (default: true without cursor, false with one)"),
 ):
     """
     List all tickets with optional filtering and pagination.
@@ -201,16 +206,22 @@ def list_all_tickets(
     
     Args:
         current_user: Admin user (from require_admin dependency)
+        request: Incoming request (If-None-Match)
+        response: Used to set the ETag / Cache-Control headers
         db: Database session dependency
         status_filter: Optional filter for ticket status (from query parameter "status")
         page: Page number for pagination
         limit: Number of items per page
+        cursor: Keyset cursor (see app/utils/pagination.py)
+        include_total: Whether to count all matching tickets
         
     Returns:
         Dictionary containing:
         - tickets: List of tickets
         - pagination: Pagination metadata
         - filters: Applied filters
+        A 304 without body when If-None-Match holds the current ETag (pages
+        that report a total only; see app/core/http_cache.py).
         
     Raises:
         AuthorizationError: 403 if not admin, ValidationError for invalid status, 500 for database errors
@@ -220,61 +231,85 @@ def list_all_tickets(
         raise ValidationError(
             f"Invalid status '{status_filter}'. Allowed statuses: {', '.join(sorted(ALLOWED_TICKET_STATUSES))}"
         )
+    if cursor is not None:
+        decode_cursor(cursor)  # ValidationError (400) for a malformed cursor
     
     try:
-        # Build base query
-        query = db.query(Ticket)
+        # Column-only select: just the AdminTicketItem fields, no ORM objects
+        query = db.query(*ADMIN_TICKET_COLUMNS)
         
         # Apply status filter if provided
         if status_filter:
             query = query.filter(Ticket.status == status_filter)
         
-        # Get total count for pagination
-        total_count = query.count()
+        # Total count is optional in cursor mode (see wants_total); the
+        # same aggregate versions the list for the ETag
+        total_count, headers = None, {}
+        if wants_total(cursor, include_total):
+            version = list_version(query)
+            total_count = version[0]
+            headers = cache_headers(make_etag("admin_tickets", str(request.query_params), version))
+            if etag_matches(request, headers["ETag"]):
+                return not_modified(headers)
+            response.headers.update(headers)
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        tickets = query.order_by(Ticket.created_at.desc()).offset(offset).limit(limit).all()
+        # Apply pagination (keyset when a cursor is given, else offset)
+        tickets, next_cursor = keyset_page(
+            query,
+            created_at=Ticket.created_at,
+            row_id=Ticket.id,
+            limit=limit,
+            cursor=cursor,
+            offset=(page - 1) * limit,
+        )
         
         # Convert to response format.
-        # Serialize via AdminTicketItem so that all fields declared in the
-        # schema are always populated — prevents silent None/undefined
-        # mismatches on the frontend (e.g. assigned_agent_id was previously
-        # missing, causing the Escalations page filter to always return empty).
-        ticket_list = [
-            AdminTicketItem(
-                id=ticket.id,
-                message=ticket.message,
-                status=ticket.status,
-                intent=ticket.intent,
-                sub_intent=ticket.sub_intent,
-                confidence=ticket.confidence,
-                sentiment=ticket.sentiment,
-                sentiment_confidence=ticket.sentiment_confidence,
-                response=ticket.response,
-                response_source=ticket.response_source,
-                quality_score=ticket.quality_score,
-                user_id=ticket.user_id,
-                assigned_agent_id=ticket.assigned_agent_id,
-                created_at=ticket.created_at.isoformat() if ticket.created_at else None,
-            ).model_dump()
-            for ticket in tickets
-        ]
+        # Every field declared in AdminTicketItem is always populated (the
+        # fast path selects exactly those columns) — prevents silent
+        # None/undefined mismatches on the frontend (e.g. assigned_agent_id
+        # was previously missing, causing the Escalations page filter to
+        # always return empty).
+        if settings.FAST_JSON_RESPONSES:
+            ticket_list = rows_as_dicts(tickets, ADMIN_TICKET_FIELDS)
+            for item in ticket_list:
+                if item["created_at"] is not None:
+                    item["created_at"] = item["created_at"].isoformat()
+        else:
+            ticket_list = [
+                AdminTicketItem(
+                    id=ticket.id,
+                    message=ticket.message,
+                    status=ticket.status,
+                    intent=ticket.intent,
+                    sub_intent=ticket.sub_intent,
+                    confidence=ticket.confidence,
+                    sentiment=ticket.sentiment,
+                    sentiment_confidence=ticket.sentiment_confidence,
+                    response=ticket.response,
+                    response_source=ticket.response_source,
+                    quality_score=ticket.quality_score,
+                    user_id=ticket.user_id,
+                    assigned_agent_id=ticket.assigned_agent_id,
+                    created_at=ticket.created_at.isoformat() if ticket.created_at else None,
+                ).model_dump()
+                for ticket in tickets
+            ]
         
         # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_prev = page > 1
+        total_pages = (total_count + limit - 1) // limit if total_count is not None else None
+        has_next = next_cursor is not None
+        has_prev = cursor is not None or page > 1
         
-        response = {
+        body = {
             "tickets": ticket_list,
             "pagination": {
-                "page": page,
+                "page": None if cursor is not None else page,
                 "limit": limit,
                 "total": total_count,
                 "total_pages": total_pages,
                 "has_next": has_next,
-                "has_prev": has_prev
+                "has_prev": has_prev,
+                "next_cursor": next_cursor,
             },
             "filters": {
                 "status": status_filter
@@ -282,7 +317,9 @@ def list_all_tickets(
         }
         
         logger.info(f"Admin tickets list retrieved by user {current_user.id}: page={page}, filter={status_filter}")
-        return response
+        if settings.FAST_JSON_RESPONSES:
+            return FastJSONResponse(body, headers=headers)
+        return body
         
     except Exception as e:
         logger.exception("Failed to retrieve admin tickets list")
@@ -293,7 +330,7 @@ def list_all_tickets(
 @router.get("/agents", response_model=list[AgentListItem])
 def list_agents(
     current_user: Annotated[User, Depends(require_admin)],
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[AgentListItem]:
     """
     List all users with the 'agent' role.
@@ -422,7 +459,7 @@ def list_users(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: Annotated[User, Depends(require_admin)] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> AdminUserListResponse:
     """
     List all users in the system.
@@ -483,7 +520,7 @@ def list_users(
 
 
 @router.post("/users/{user_id}/reset-password", response_model=dict)
-def admin_reset_password(
+async def admin_reset_password(
     user_id: int,
     body: AdminResetPasswordRequest,
     current_user: Annotated[User, Depends(require_admin)] = None,
@@ -498,7 +535,8 @@ def admin_reset_password(
     password; the user should change it on next login.
 
     The new password is validated against the same complexity rules as
-    self-service registration, then hashed with bcrypt before storage.
+    self-service registration, then hashed with bcrypt (on the password
+    hasher pool, app/core/password_hasher.py) before storage.
     The previous password hash is overwritten; no plaintext is ever
     stored or logged.
 
@@ -516,6 +554,7 @@ def admin_reset_password(
     Raises:
         HTTPException 400 – admin attempting to reset their own password
         HTTPException 404 – user not found
+        ServiceUnavailableError 503 – password hasher saturated
     """
     try:
         if user_id == current_user.id:
@@ -524,7 +563,7 @@ def admin_reset_password(
                 detail="Use the standard change-password flow to update your own password",
             )
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await run_in_threadpool(db.get, User, user_id)
 
         if not user:
             raise HTTPException(
@@ -532,23 +571,19 @@ def admin_reset_password(
                 detail=f"User {user_id} not found",
             )
 
-        user.hashed_password = hash_password(body.new_password)
-        # Clear any pending OTP so stale reset tokens can't be replayed
-        user.reset_otp = None
-        user.reset_otp_expires_at = None
-        user.reset_otp_attempts = 0
-
-        db.commit()
+        user_email = user.email
+        hashed_password = await hash_password_async(body.new_password)
+        await run_in_threadpool(set_password, db, user, hashed_password)
 
         logger.info(
-            f"Admin {current_user.id} reset password for user {user_id} ({user.email})"
+            f"Admin {current_user.id} reset password for user {user_id} ({user_email})"
         )
 
         return {"message": "Password reset successfully"}
 
-    except HTTPException:
+    except (HTTPException, ServiceUnavailableError):
         raise
     except Exception:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         logger.exception(f"Failed to reset password for user {user_id}")
         raise InternalError("Failed to reset password")
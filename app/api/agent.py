@@ -22,15 +22,18 @@ DO NOT:
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import update
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import require_agent_or_admin
+from app.api.dependencies import require_agent_or_admin, require_agent_or_admin_async
 from app.constants import TicketStatus
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.ticket import Ticket
 from app.models.user import User
 from app.schemas.ticket import TicketList, TicketResponse
+from app.services.principal_cache import Principal
+from app.utils.pagination import decode_cursor, keyset_page, wants_total
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/agent", tags=["Agent"])
@@ -45,6 +48,8 @@ def get_my_assignments(
     ),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page (keyset mode; offset is ignored)"),
+    include_total: bool | None = Query(None, description="Run COUNT(*) for total (default: true without cursor, false with one)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_agent_or_admin),
 ) -> TicketList:
@@ -66,11 +71,16 @@ def get_my_assignments(
         ticket_status: Optional status filter
         limit: Page size (1–100)
         offset: Pagination offset
+        cursor: Keyset cursor (see app/utils/pagination.py)
+        include_total: Whether to count all matching tickets
         current_user: Authenticated agent/admin user
 
     Returns:
         TicketList: Tickets assigned to the current user
     """
+    if cursor is not None:
+        decode_cursor(cursor)  # reject a malformed cursor with 400, not 500
+
     try:
         allowed = {
             TicketStatus.ESCALATED.value,
@@ -91,15 +101,22 @@ def get_my_assignments(
         if ticket_status:
             query = query.filter(Ticket.status == ticket_status)
 
-        total = query.count()
-        tickets = query.order_by(Ticket.created_at.desc()).limit(limit).offset(offset).all()
+        total = query.count() if wants_total(cursor, include_total) else None
+        tickets, next_cursor = keyset_page(
+            query,
+            created_at=Ticket.created_at,
+            row_id=Ticket.id,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+        )
         ticket_responses = [TicketResponse.model_validate(t) for t in tickets]
 
         logger.info(
             f"Agent {current_user.id} fetched my-assignments: "
             f"count={len(ticket_responses)}, filter={ticket_status}"
         )
-        return TicketList(tickets=ticket_responses, total=total)
+        return TicketList(tickets=ticket_responses, total=total, next_cursor=next_cursor)
 
     except HTTPException:
         raise
@@ -112,10 +129,10 @@ def get_my_assignments(
 
 
 @router.post("/tickets/{ticket_id}/assign", response_model=TicketResponse)
-def assign_ticket(
+async def assign_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_agent_or_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_agent_or_admin_async)
 ) -> TicketResponse:
     """
     Assign an escalated ticket to the current agent/admin.
@@ -137,7 +154,7 @@ def assign_ticket(
     try:
         # Single atomic UPDATE: only succeeds when the ticket exists, is escalated,
         # and has no assigned agent yet.  No pre-fetch → no TOCTOU window.
-        result = db.execute(
+        result = await db.execute(
             update(Ticket)
             .where(
                 Ticket.id == ticket_id,
@@ -151,7 +168,7 @@ def assign_ticket(
             # WHERE clause matched nothing — nothing was written, so no commit
             # is needed.  Read current DB state within this open transaction
             # to diagnose why and return the appropriate error.
-            ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+            ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
 
             if not ticket:
                 raise HTTPException(
@@ -183,8 +200,8 @@ def assign_ticket(
             )
 
         # rowcount == 1: UPDATE succeeded.  Commit, then fetch for the response.
-        db.commit()
-        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        await db.commit()
+        ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
 
         if not ticket:
             raise HTTPException(
@@ -198,7 +215,7 @@ def assign_ticket(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception(f"Failed to assign ticket {ticket_id}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -207,10 +224,10 @@ def assign_ticket(
 
 
 @router.post("/tickets/{ticket_id}/accept", response_model=TicketResponse)
-def accept_ticket(
+async def accept_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_agent_or_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_agent_or_admin_async)
 ) -> TicketResponse:
     """
     Accept an escalated ticket that has been assigned to the current agent.
@@ -235,7 +252,7 @@ def accept_ticket(
         HTTPException 409 – ticket not in an acceptable state
     """
     try:
-        result = db.execute(
+        result = await db.execute(
             update(Ticket)
             .where(
                 Ticket.id == ticket_id,
@@ -246,7 +263,7 @@ def accept_ticket(
         )
 
         if result.rowcount == 0:
-            ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+            ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
 
             if not ticket:
                 raise HTTPException(
@@ -270,15 +287,15 @@ def accept_ticket(
                 detail=f"Ticket status is '{ticket.status}', cannot accept",
             )
 
-        db.commit()
-        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        await db.commit()
+        ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
         logger.info(f"Ticket {ticket_id} accepted (in_progress) by user {current_user.id}")
         return TicketResponse.model_validate(ticket)
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception(f"Failed to accept ticket {ticket_id}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -287,10 +304,10 @@ def accept_ticket(
 
 
 @router.post("/tickets/{ticket_id}/close", response_model=TicketResponse)
-def close_ticket(
+async def close_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_agent_or_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_agent_or_admin_async)
 ) -> TicketResponse:
     """
     Close an escalated or auto_resolved ticket.
@@ -315,7 +332,7 @@ def close_ticket(
     try:
         # Single atomic UPDATE: only succeeds when the ticket exists and is in
         # a closeable state.  No pre-fetch → no TOCTOU window.
-        result = db.execute(
+        result = await db.execute(
             update(Ticket)
             .where(
                 Ticket.id == ticket_id,
@@ -327,7 +344,7 @@ def close_ticket(
         if result.rowcount == 0:
             # WHERE clause matched nothing — nothing was written, no commit needed.
             # Read current state to diagnose why.
-            ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+            ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
 
             if not ticket:
                 raise HTTPException(
@@ -346,8 +363,8 @@ def close_ticket(
             )
 
         # rowcount == 1: UPDATE succeeded.  Commit, then fetch for the response.
-        db.commit()
-        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        await db.commit()
+        ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
 
         if not ticket:
             raise HTTPException(
@@ -361,7 +378,7 @@ def close_ticket(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception(f"Failed to close ticket {ticket_id}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -24,13 +24,15 @@ References:
 import logging
 import secrets
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
-from jose import JWTError
 
 from app.constants import (
     UserRole,
@@ -49,16 +51,29 @@ from app.constants import (
     INVALID_REFRESH_TOKEN,
 )
 
+from app.core.password_hasher import hash_password_async, verify_password_async
 from app.core.security import (
-    verify_password, create_access_token, hash_password, decode_token, check_password_truncation,
+    create_access_token, check_password_truncation,
     create_refresh_token, hash_refresh_token, verify_refresh_token_hash, get_refresh_token_expiration_time,
 )
 from app.core.config import settings, ALLOWED_ROLES
+from app.core.exceptions import ServiceUnavailableError
 from app.core.limiter import limiter
-from app.core.otp import generate_otp, hash_otp, verify_otp_hash, send_otp_email, log_otp_for_dev, is_otp_expired, get_otp_expiration_time
-from app.db.session import get_db
+from app.core.token_claims import get_token_claims
+from app.core.otp import generate_otp, hash_otp, verify_otp_hash, is_otp_expired, get_otp_expiration_time
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
+from app.services.email_outbox import enqueue_otp_email
+from app.services.principal_cache import (
+    Principal,
+    get_principal,
+    get_principal_async,
+    principal_fields,
+    principal_user,
+    store_principal,
+    store_principal_async,
+)
 from app.schemas.user import (
     UserLogin, UserCreate, UserResponse, Token,
     ForgotPasswordRequest, ForgotPasswordResponse,
@@ -99,9 +114,35 @@ def normalize_email(email: str) -> str:
     return normalized
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+def _find_active_user(db: Session, email: str) -> User | None:
+    """
+    Look up an active user by (normalized) email for login.
+
+    Raises:
+        HTTPException: If database error occurs (500 Internal Server Error)
+    """
+    try:
+        # Normalize email to lowercase for consistent storage and lookup
+        normalized_email = normalize_email(email)
+
+        user = db.query(User).filter(User.email == normalized_email).first()
+        if not user or not user.is_active:
+            return None
+        return user
+    except SQLAlchemyError as e:
+        logger.exception("Database error during authentication")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=AUTH_SERVICE_UNAVAILABLE
+        )
+
+
+async def authenticate_user(db: Session, email: str, password: str) -> User | None:
     """
     Authenticate a user by email and password.
+
+    The lookup runs in the threadpool and the bcrypt check on the password
+    hasher pool (app/core/password_hasher.py).
     
     Args:
         db: Database session
@@ -113,34 +154,26 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
         
     Raises:
         HTTPException: If database error occurs (500 Internal Server Error)
+        ServiceUnavailableError: If the password hasher is saturated (503)
     """
     # Validate inputs
     if not email or not password:
         return None
-        
-    try:
-        # Normalize email to lowercase for consistent storage and lookup
-        normalized_email = normalize_email(email)
-            
-        user = db.query(User).filter(User.email == normalized_email).first()
-        if not user:
-            return None
-        if not user.is_active:
-            return None
-        if not verify_password(password, user.hashed_password):
-            return None
-        return user
-    except SQLAlchemyError as e:
-        logger.exception("Database error during authentication")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=AUTH_SERVICE_UNAVAILABLE
-        )
 
+    user = await run_in_threadpool(_find_active_user, db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
 
-def create_user(db: Session, user_create: UserCreate) -> UserResponse:
+
+async def create_user(db: Session, user_create: UserCreate) -> UserResponse:
     """
     Create a new user with hashed password.
+
+    The password is hashed on the password hasher pool
+    (app/core/password_hasher.py); the insert runs in the threadpool.
     
     Args:
         db: Database session
@@ -151,6 +184,7 @@ def create_user(db: Session, user_create: UserCreate) -> UserResponse:
         
     Raises:
         HTTPException: If email already exists (400 Bad Request) or database error occurs
+        ServiceUnavailableError: If the password hasher is saturated (503)
     """
     # Validate inputs
     if not user_create.email or not user_create.password:
@@ -159,14 +193,18 @@ def create_user(db: Session, user_create: UserCreate) -> UserResponse:
             detail=EMAIL_PASSWORD_REQUIRED
         )
         
+    # Check if password would be truncated and warn user
+    truncation_info = check_password_truncation(user_create.password)
+    if truncation_info["would_be_truncated"]:
+        logger.info("Password will be truncated to fit bcrypt limit")
+
+    hashed_password = await hash_password_async(user_create.password)
+    return await run_in_threadpool(_insert_user, db, user_create, hashed_password)
+
+
+def _insert_user(db: Session, user_create: UserCreate, hashed_password: str) -> UserResponse:
+    """Persist a new user whose password :func:`create_user` already hashed."""
     try:
-        # Check if password would be truncated and warn user
-        truncation_info = check_password_truncation(user_create.password)
-        if truncation_info["would_be_truncated"]:
-            logger.info("Password will be truncated to fit bcrypt limit")
-        
-        hashed_password = hash_password(user_create.password)
-        
         # Use role from user_create, fallback to default if not provided
         user_role = getattr(user_create, 'role', None) or getattr(settings, 'DEFAULT_USER_ROLE', UserRole.USER.value)
         
@@ -264,7 +302,7 @@ def _issue_refresh_token(db: Session, user_id: int) -> str:
 
 @router.post("/login", response_model=Token)
 @limiter.limit(settings.AUTH_RATE_LIMIT_LOGIN)
-def login(
+async def login(
     request: Request,
     user_credentials: UserLogin,
     db: Annotated[Session, Depends(get_db)]
@@ -281,8 +319,9 @@ def login(
         
     Raises:
         HTTPException: If authentication fails (401 Unauthorized)
+        ServiceUnavailableError: If the password hasher is saturated (503)
     """
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -297,7 +336,7 @@ def login(
         expires_delta=access_token_expires
     )
 
-    refresh_token = _issue_refresh_token(db, user.id)
+    refresh_token = await run_in_threadpool(_issue_refresh_token, db, user.id)
 
     return Token(
         access_token=access_token,
@@ -307,7 +346,7 @@ def login(
 
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user_create: UserCreate,
     db: Annotated[Session, Depends(get_db)]
 ):
@@ -328,11 +367,41 @@ def register(
         HTTPException: If registration fails (400 Bad Request or 500 Internal Server Error)
     """
     # Create new user - database constraints will handle duplicates
-    return create_user(db, user_create)
+    return await create_user(db, user_create)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=COULD_NOT_VALIDATE_CREDENTIALS,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _user_id_from_claims(claims: dict | None) -> int:
+    """
+    Return the integer ``sub`` claim of a verified access token.
+
+    Raises:
+        HTTPException: 401 if the token was invalid (*claims* is None) or
+            carries no usable subject.
+    """
+    if claims is None:
+        raise _credentials_exception()
+    user_id_str = claims.get("sub")
+    if user_id_str is None:
+        raise _credentials_exception()
+
+    # Validate and convert user_id to int
+    try:
+        return int(user_id_str)
+    except (ValueError, TypeError):
+        raise _credentials_exception()
 
 
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
+    claims: Annotated[dict | None, Depends(get_token_claims)],
     db: Annotated[Session, Depends(get_db)]
 ) -> User:
     """
@@ -340,9 +409,15 @@ def get_current_user(
     
     This function decodes the JWT token and retrieves the corresponding user
     from the database. It's used as a dependency for protected routes.
+
+    The user's id/email/role/is_active come from the principal cache
+    (app/services/principal_cache.py) when it holds a current entry; the
+    returned User is then merged into *db* without a SELECT.
     
     Args:
-        token: JWT token from Authorization header
+        token: JWT token from Authorization header (401 when missing)
+        claims: The token's verified claims, decoded once per request
+            (app/core/token_claims.py)
         db: Database session dependency
         
     Returns:
@@ -351,31 +426,16 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found (401 Unauthorized)
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail=COULD_NOT_VALIDATE_CREDENTIALS,
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = decode_token(token)
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-        
-        # Validate and convert user_id to int
-        try:
-            user_id = int(user_id_str)
-        except (ValueError, TypeError):
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-    
+    user_id = _user_id_from_claims(claims)
+    cached, version = get_principal(user_id)
+
     try:
+        if cached is not None:
+            return db.merge(principal_user(cached), load=False)
         user = db.query(User).filter(User.id == user_id).first()
         if user is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        store_principal(user_id, version, principal_fields(user))
         return user
     except SQLAlchemyError as e:
         logger.exception("Database error retrieving user")
@@ -385,6 +445,40 @@ def get_current_user(
         )
 
 
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    claims: Annotated[dict | None, Depends(get_token_claims)],
+    db: Annotated[AsyncSession, Depends(get_async_db)]
+) -> Principal:
+    """
+    Async variant of :func:`get_current_user` for ``async def`` routes.
+
+    Same checks, errors and principal cache; the user lookup goes through
+    the AsyncSession so the dependency never occupies a threadpool thread
+    (only the Redis tier of the cache, when configured, does).
+
+    Returns a :class:`~app.services.principal_cache.Principal` (id, email,
+    role, is_active), not a User: an AsyncSession cannot lazy-load the
+    columns a cache hit leaves unset.
+    """
+    user_id = _user_id_from_claims(claims)
+    cached, version = await get_principal_async(user_id)
+
+    try:
+        if cached is not None:
+            return Principal(**cached)
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            raise _credentials_exception()
+        fields = principal_fields(user)
+        await store_principal_async(user_id, version, fields)
+        return Principal(**fields)
+    except SQLAlchemyError:
+        logger.exception("Database error retrieving user")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=AUTH_SERVICE_UNAVAILABLE
+        )
 
 
 @router.get("/me", response_model=UserResponse)
@@ -582,7 +676,6 @@ def logout(
 def forgot_password(
     request: Request,
     request_body: ForgotPasswordRequest,
-    background_tasks: BackgroundTasks,
     db: Annotated[Session, Depends(get_db)],
 ):
     """
@@ -593,15 +686,15 @@ def forgot_password(
     1. User enumeration (CWE-204): always returns HTTP 200 with an identical
        body whether or not the email is registered.
 
-    2. Timing oracle: the slow Resend API call is dispatched as a FastAPI
-       BackgroundTask so both the "user not found" and "user found" paths
-       return at the same wall-clock time from the caller's perspective.
-       DB writes are synchronous (fast); only network I/O is deferred.
+    2. Timing oracle: the email is not sent here. It is queued in the
+       email_outbox table, in the same transaction as the OTP hash, and
+       workers/email_outbox.py delivers it (batched, with retries). Both the
+       "user not found" and "user found" paths only do fast DB work, and
+       the response time no longer depends on the email provider.
 
     Args:
         request: FastAPI Request (required by SlowAPI rate-limiter)
         request_body: ForgotPasswordRequest with user email
-        background_tasks: FastAPI BackgroundTasks for async OTP delivery
         db: Database session dependency
 
     Returns:
@@ -616,18 +709,6 @@ def forgot_password(
         otp_expires_in=10,
     )
 
-    def _deliver_otp(email: str, otp: str) -> None:
-        """Background task: deliver OTP without blocking the HTTP response."""
-        if not send_otp_email(email, otp):
-            # Only log the raw OTP in development; in other envs log a generic
-            # delivery-failure message so reset codes never appear in prod logs.
-            if settings.ENV == "development":
-                log_otp_for_dev(email, otp)
-            else:
-                logger.warning(
-                    "OTP email delivery failed for user (email suppressed)"
-                )
-
     try:
         normalized_email = normalize_email(request_body.email)
 
@@ -647,10 +728,10 @@ def forgot_password(
         user.reset_otp_expires_at = otp_expires_at
         user.reset_otp_attempts = 0
 
-        db.commit()
+        # Queued with the OTP hash: both commit, or neither does.
+        enqueue_otp_email(db, user.email, otp, otp_expires_at)
 
-        # Dispatch delivery off the hot path to avoid a timing side-channel.
-        background_tasks.add_task(_deliver_otp, user.email, otp)
+        db.commit()
 
         return _safe_response
 
@@ -773,8 +854,18 @@ def verify_otp(
         )
 
 
+def set_password(db: Session, user: User, hashed_password: str) -> None:
+    """Store a new password hash, clear any pending reset OTP, and commit."""
+    user.hashed_password = hashed_password
+    # Clear any pending OTP so stale reset tokens can't be replayed
+    user.reset_otp = None
+    user.reset_otp_expires_at = None
+    user.reset_otp_attempts = 0
+    db.commit()
+
+
 @router.post("/reset-password", response_model=ResetPasswordResponse)
-def reset_password(
+async def reset_password(
     request: ResetPasswordRequest,
     db: Annotated[Session, Depends(get_db)]
 ):
@@ -790,9 +881,10 @@ def reset_password(
         
     Raises:
         HTTPException: If OTP is invalid/expired (400) or max attempts exceeded (429)
+        ServiceUnavailableError: If the password hasher is saturated (503)
     """
     try:
-        user = _verify_user_otp(db, request.email, request.otp)
+        user = await run_in_threadpool(_verify_user_otp, db, request.email, request.otp)
         
         # Check password truncation
         truncation_info = check_password_truncation(request.new_password)
@@ -800,15 +892,10 @@ def reset_password(
             logger.info("New password will be truncated to fit bcrypt limit")
         
         # Hash new password
-        new_hashed_password = hash_password(request.new_password)
+        new_hashed_password = await hash_password_async(request.new_password)
         
         # Update password and clear OTP
-        user.hashed_password = new_hashed_password
-        user.reset_otp = None
-        user.reset_otp_expires_at = None
-        user.reset_otp_attempts = 0
-        
-        db.commit()
+        await run_in_threadpool(set_password, db, user, new_hashed_password)
         
         return ResetPasswordResponse(
             message="Password reset successfully"
@@ -816,16 +903,16 @@ def reset_password(
         
     except SQLAlchemyError as e:
         logger.exception("Database error in reset_password")
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=AUTH_SERVICE_UNAVAILABLE
         )
-    except HTTPException:
+    except (HTTPException, ServiceUnavailableError):
         raise
     except Exception as e:
         logger.exception("Unexpected error in reset_password")
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=AUTH_SERVICE_UNAVAILABLE
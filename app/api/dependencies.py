@@ -11,9 +11,10 @@ issuance/validation, not downstream permission checks.
 
 from fastapi import Depends, HTTPException, status
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_async
 from app.constants import UserRole
 from app.models.user import User
+from app.services.principal_cache import Principal
 
 
 def require_agent_or_admin(
@@ -38,3 +39,14 @@ def require_agent_or_admin(
         )
     return current_user
 
+
+async def require_agent_or_admin_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    """
+    Same check as :func:`require_agent_or_admin`, for ``async def`` routes.
+
+    Declared ``async`` so FastAPI calls it on the event loop rather than
+    dispatching it to the threadpool; the role check itself does no I/O.
+    """
+    return require_agent_or_admin(current_user)
@@ -21,13 +21,13 @@ DO NOT:
 import logging
 
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.limiter import limiter
-from app.db.session import get_db
+from app.db.session import get_async_read_db
 from app.schemas.public import ResolveRequest, ResolveResponse
-from app.services.ticket_service import resolve_message
+from app.services.ticket_service import resolve_message_async
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Public API"])
@@ -39,10 +39,10 @@ router = APIRouter(tags=["Public API"])
     summary="Classify + answer a message — no login required",
 )
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
-def resolve(
+async def resolve(
     request: Request,
     payload: ResolveRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> ResolveResponse:
     """
     The one endpoint you need.
@@ -57,5 +57,5 @@ def resolve(
           -H "Content-Type: application/json" \\
           -d '{"message": "How do I reset my password?"}'
     """
-    result = resolve_message(payload.message, db, log_ref="public-resolve")
+    result = await resolve_message_async(payload.message, db, log_ref="public-resolve")
     return ResolveResponse(**result)
@@ -20,9 +20,11 @@ DO NOT:
 """
 
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import logging
 
 from app.schemas.ticket import (
@@ -32,27 +34,34 @@ from app.schemas.ticket import (
 )
 from app.schemas.feedback import FeedbackResponse, FeedbackCreateNested
 from app.models.ticket import Ticket
+from app.services.cold_storage import find_offloaded_ticket
 from app.services.feedback_service import create_feedback_record
+from app.services import ticket_cache
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db, get_read_db, reads_replica
 from app.core.limiter import limiter
 from app.constants import TicketStatus, UserRole
-from app.services.ticket_service import run_ticket_automation, extract_user_id_from_token, extract_user_id_and_role_from_token
+from app.utils.pagination import decode_cursor, keyset_page, wants_total
+from app.core.http_cache import cache_headers, etag_matches, list_version, make_etag, not_modified
+from app.core.json_response import FastJSONResponse, list_columns, rows_as_dicts
+from app.core.token_claims import get_token_claims
+from app.services.ticket_service import run_ticket_automation_async, user_id_and_role_from_claims
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
-# Optional OAuth2 scheme for user identification (token is optional)
-oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+# GET /tickets/ selects only the columns it returns
+TICKET_LIST_COLUMNS = list_columns(Ticket, TicketResponse)
+TICKET_LIST_FIELDS = list(TicketResponse.model_fields)
 
 
 @router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
-def create_ticket(
+async def create_ticket(
     request: Request,
     ticket_data: TicketCreate,
-    db: Session = Depends(get_db),
-    token: str | None = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db),
+    claims: dict | None = Depends(get_token_claims),
 ) -> TicketResponse:
     """
     Create a new support ticket with AI automation.
@@ -81,7 +90,7 @@ def create_ticket(
     """
     try:
         # Extract user_id from optional token
-        user_id = extract_user_id_from_token(token)
+        user_id, _role = user_id_and_role_from_claims(claims)
 
         # Step 1: Create ticket with initial status
         ticket = Ticket(
@@ -92,19 +101,20 @@ def create_ticket(
         
         # Save to database to get ID
         db.add(ticket)
-        db.commit()
-        db.refresh(ticket)
+        await db.commit()
+        await db.refresh(ticket)
+        ticket_id = ticket.id
         
         # Step 2: Run AI pipeline
         try:
-            ticket = run_ticket_automation(ticket=ticket, db=db)
+            ticket = await run_ticket_automation_async(ticket=ticket, db=db)
             
         except Exception as ai_error:
             # AI failure: escalate for safety (never block user)
-            logger.exception(f"AI pipeline failed for ticket {ticket.id}")
+            logger.exception(f"AI pipeline failed for ticket {ticket_id}")
             
             # Rollback any partial AI processing, then escalate
-            db.rollback()
+            await db.rollback()
             
             ticket.status = TicketStatus.ESCALATED.value
             ticket.intent = None
@@ -112,8 +122,8 @@ def create_ticket(
             ticket.sub_intent = None 
             ticket.response = None
             
-            db.commit()
-            db.refresh(ticket)
+            await db.commit()
+            await db.refresh(ticket)
         
         return TicketResponse.model_validate(ticket)
         
@@ -121,7 +131,7 @@ def create_ticket(
         # Re-raise HTTP exceptions (including 401 from token validation)
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Failed to create ticket")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -131,6 +141,8 @@ def create_ticket(
 
 @router.get("/", response_model=TicketList)
 def list_tickets(
+    request: Request,
+    response: Response,
     ticket_status: str | None = Query(
         None,
         description=f"Filter tickets by status ({TicketStatus.OPEN.value}, {TicketStatus.AUTO_RESOLVED.value}, {TicketStatus.ESCALATED.value}, {TicketStatus.CLOSED.value})",
@@ -138,8 +150,10 @@ def list_tickets(
     ),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    token: str | None = Depends(oauth2_scheme_optional),
+    cursor: str | None = Query(None, description="Opaque next_cursor from the previous page (keyset mode; offset is ignored)"),
+    include_total: bool | None = Query(None, description="Run COUNT(*) for total (default: true without cursor, false with one)"),
+    db: Session = Depends(get_read_db),
+    claims: dict | None = Depends(get_token_claims),
 ) -> TicketList:
     """
     List tickets visible to the authenticated caller.
@@ -159,20 +173,32 @@ def list_tickets(
     with no owner (CWE-284 / improper access control).
 
     Args:
+        request: Incoming request (If-None-Match)
+        response: Used to set the ETag / Cache-Control headers
         ticket_status: Optional status filter
         limit: Page size (1–100)
         offset: Pagination offset
-        db: Database session dependency
-        token: Optional Bearer token
+        cursor: Keyset cursor (see app/utils/pagination.py)
+        include_total: Whether to count all matching tickets
+        db: Read-only session (replica when configured)
+        claims: Verified Bearer token claims (None when anonymous)
 
     Returns:
-        TicketList: Tickets scoped to the caller's access level
+        TicketList: Tickets scoped to the caller's access level; a 304
+        without body when If-None-Match holds the current ETag. Pages
+        that report ``total`` carry an ETag (see app/core/http_cache.py);
+        cursor pages without it do not, as the ETag costs the same
+        aggregate as the count.
 
     Raises:
+        AppValidationError 400 – malformed cursor
         HTTPException 500 – database error
     """
+    if cursor is not None:
+        decode_cursor(cursor)  # reject a malformed cursor with 400, not 500
+
     try:
-        user_id, user_role = extract_user_id_and_role_from_token(token)
+        user_id, user_role = user_id_and_role_from_claims(claims)
 
         is_privileged = user_role in (UserRole.ADMIN.value, UserRole.AGENT.value)
 
@@ -182,7 +208,8 @@ def list_tickets(
         if user_id is None and not is_privileged:
             return TicketList(tickets=[], total=0)
 
-        query = db.query(Ticket)
+        # Column-only select: just the TicketResponse fields, no ORM objects
+        query = db.query(*TICKET_LIST_COLUMNS)
 
         # Apply status filter if provided
         if ticket_status:
@@ -192,11 +219,54 @@ def list_tickets(
         if not is_privileged:
             query = query.filter(Ticket.user_id == user_id)
 
-        total = query.count()
-        tickets = query.order_by(Ticket.created_at.desc()).limit(limit).offset(offset).all()
+        with_total = wants_total(cursor, include_total)
+
+        # A user's own first page is served from ticket_cache; ticket writes
+        # bump the owner's stamp. Only pages read from the primary are
+        # stored: a lagging replica's page would predate the bump.
+        cache_key = cache_version = None
+        if not is_privileged and cursor is None and offset == 0:
+            cache_key = ticket_cache.user_list_key(user_id, ticket_status, limit, with_total)
+            cached, cache_version = ticket_cache.get_cached(cache_key, ticket_cache.user_stamp(user_id))
+            if cached is not None:
+                return _list_response(request, response, cached["body"], cached["version"], user_id, user_role)
+
+        version = list_version(query) if with_total else None
+        total = version[0] if version else None
+
+        headers = _list_headers(request, version, user_id, user_role)
+        if headers and etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+
+        tickets, next_cursor = keyset_page(
+            query,
+            created_at=Ticket.created_at,
+            row_id=Ticket.id,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+        )
+
+        if cache_key is not None and not reads_replica(db):
+            body = {
+                "tickets": [TicketResponse.model_validate(t).model_dump(mode="json") for t in tickets],
+                "total": total,
+                "next_cursor": next_cursor,
+            }
+            ticket_cache.store_cached(
+                cache_key, ticket_cache.user_stamp(user_id), cache_version, {"body": body, "version": version}
+            )
+
+        if settings.FAST_JSON_RESPONSES:
+            return FastJSONResponse({
+                "tickets": rows_as_dicts(tickets, TICKET_LIST_FIELDS),
+                "total": total,
+                "next_cursor": next_cursor,
+            }, headers=headers)
 
         ticket_responses = [TicketResponse.model_validate(ticket) for ticket in tickets]
-        return TicketList(tickets=ticket_responses, total=total)
+        return TicketList(tickets=ticket_responses, total=total, next_cursor=next_cursor)
 
     except HTTPException:
         raise
@@ -208,6 +278,24 @@ def list_tickets(
         )
 
 
+def _list_headers(request: Request, version, user_id: int | None, user_role: str | None) -> dict[str, str]:
+    # Pages without a total (list_version) carry no ETag
+    if version is None:
+        return {}
+    return cache_headers(make_etag("tickets", str(request.query_params), user_id, user_role, tuple(version)))
+
+
+def _list_response(request: Request, response: Response, body: dict, version, user_id: int, user_role: str | None):
+    """A GET /tickets/ page from its cached JSON body."""
+    headers = _list_headers(request, version, user_id, user_role)
+    if headers and etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(body, headers=headers)
+    response.headers.update(headers)
+    return TicketList.model_validate(body)
+
+
 @router.get("/health", response_model=dict)
 def tickets_health():
     """
@@ -229,10 +317,12 @@ def tickets_health():
 
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
-def get_ticket(
+async def get_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    token: str | None = Depends(oauth2_scheme_optional),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    claims: dict | None = Depends(get_token_claims),
 ) -> TicketResponse:
     """
     Retrieve a single ticket by ID.
@@ -244,13 +334,20 @@ def get_ticket(
       confirming ticket existence to unauthorised callers).
     - Agents and admins may fetch any ticket.
 
+    Tickets offloaded to cold storage by the cleanup worker are served from
+    COLD_STORAGE_DIR (same access rules) when they are not in the database.
+
     Args:
         ticket_id: ID of the ticket to retrieve
+        request: Incoming request (If-None-Match)
+        response: Used to set the ETag / Cache-Control headers
         db: Database session dependency
-        token: Optional Bearer token (unauthenticated → 401)
+        claims: Verified Bearer token claims (unauthenticated → 401)
 
     Returns:
-        TicketResponse: The requested ticket
+        TicketResponse: The requested ticket (from app/services/ticket_cache.py
+        when cached), with an ETag over its id and updated_at; a 304
+        without body when If-None-Match still matches
 
     Raises:
         HTTPException 401 - no valid token supplied
@@ -261,7 +358,7 @@ def get_ticket(
         # --- Auth gate -------------------------------------------------------
         # Resolve caller identity; unauthenticated requests are rejected so
         # users cannot probe arbitrary ticket IDs without a valid session.
-        user_id, user_role = extract_user_id_and_role_from_token(token)
+        user_id, user_role = user_id_and_role_from_claims(claims)
 
         if user_id is None:
             raise HTTPException(
@@ -271,7 +368,30 @@ def get_ticket(
             )
 
         # --- Fetch -----------------------------------------------------------
-        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        # Read-through ticket_cache; the ownership check below runs on hits too
+        cache_key = ticket_cache.ticket_key(ticket_id)
+        cache_stamp = ticket_cache.ticket_stamp(ticket_id)
+        cached, cache_version = await ticket_cache.get_cached_async(cache_key, cache_stamp)
+        if cached is not None:
+            ticket = TicketResponse.model_validate(cached["ticket"])
+            version = cached["updated_at"]
+        else:
+            ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
+            version = None
+            if ticket:
+                version = ticket.updated_at.isoformat() if ticket.updated_at else None
+                ticket = TicketResponse.model_validate(ticket)
+                await ticket_cache.store_cached_async(
+                    cache_key, cache_stamp, cache_version,
+                    {"ticket": ticket.model_dump(mode="json"), "updated_at": version},
+                )
+
+        if not ticket and settings.COLD_STORAGE_DIR:
+            # Read-through: archived tickets may have been offloaded
+            record = await run_in_threadpool(find_offloaded_ticket, ticket_id)
+            if record is not None:
+                ticket = TicketResponse.model_validate(record)
+                version = ("cold", record)  # immutable once offloaded
 
         if not ticket:
             raise HTTPException(
@@ -291,7 +411,14 @@ def get_ticket(
                 detail=f"Ticket with ID {ticket_id} not found",
             )
 
-        return TicketResponse.model_validate(ticket)
+        # --- Conditional GET -------------------------------------------------
+        # After the access check, so a 304 never confirms a ticket exists.
+        headers = cache_headers(make_etag("ticket", ticket_id, version))
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+
+        return ticket
 
     except HTTPException:
         raise
@@ -34,6 +34,7 @@ from app.core.exceptions import (
     AIServiceError,
     DatabaseError,
     RateLimitError,
+    ServiceUnavailableError,
     create_error_response
 )
 
@@ -133,6 +134,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         405: InternalError,
         429: RateLimitError,
         500: InternalError,
+        503: ServiceUnavailableError,
     }
 
     error_class = error_mapping.get(exc.status_code, InternalError)
@@ -227,9 +229,14 @@ async def api_exception_handler(request: Request, exc: BaseAPIException) -> JSON
             headers=headers
         )
     
+    headers = {}
+    if isinstance(exc, ServiceUnavailableError) and "retry_after" in exc.details:
+        headers["Retry-After"] = str(exc.details["retry_after"])
+
     return JSONResponse(
         status_code=exc.status_code,
-        content=create_error_response(exc, include_details=False)
+        content=create_error_response(exc, include_details=False),
+        headers=headers
     )
 
 
@@ -0,0 +1,85 @@
+"""
+app/core/http_cache.py
+
+Purpose:
+Conditional GET support for the endpoints dashboards poll
+(GET /tickets/{id}, GET /tickets/, GET /admin/tickets, GET /admin/metrics).
+
+Each of them derives an ETag from what its response is built from, not
+from the response body, so an unchanged poll is answered with a bodiless
+304 before the page is fetched or serialized:
+
+- a ticket: its id and ``updated_at`` (bumped by every ORM and Core UPDATE),
+  as an ISO string
+- a list: the request's query string, the caller's scope, and the row
+  count, newest ``updated_at`` and highest id of the rows matching the
+  filters (list_version()); inserts, deletes and updates all move one of
+  the three
+- the metrics snapshot: its contents
+
+ETags are weak (``W/"..."``): the same data may be sent gzip-compressed or
+not (GZipMiddleware, see app/main.py). Responses carry ``Cache-Control:
+private`` (they depend on the caller's token) and ``Vary: Authorization``.
+
+Responsibilities:
+- Build ETags, match If-None-Match, produce the cache headers and 304s
+
+DO NOT:
+- Cache responses server-side here (see app/services/admin_metrics.py for
+  the metrics snapshot)
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.models.ticket import Ticket
+
+# Clients may keep the response but must revalidate it on every use.
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """A weak ETag over ``parts`` (and the app version, so deploys change it)."""
+    digest = hashlib.sha256(repr((settings.APP_VERSION, *parts)).encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match names ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def cache_headers(etag: str, cache_control: str = REVALIDATE) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """A 304 carrying the validator headers of the full response."""
+    return Response(status_code=304, headers=headers)
+
+
+def list_version(query: Query) -> tuple[int, Any, Any]:
+    """
+    ``(count, max(updated_at), max(id))`` of the tickets matching ``query``.
+
+    One aggregate over the filtered rows, i.e. the cost of the COUNT(*)
+    offset pages already run for ``total``; the count is returned so
+    callers can reuse it. ``updated_at`` comes back as an ISO string, so
+    the tuple can be cached as JSON (app/services/ticket_cache.py) and
+    still give the same ETag.
+    """
+    count, newest, highest_id = query.with_entities(
+        func.count(Ticket.id), func.max(Ticket.updated_at), func.max(Ticket.id)
+    ).one()
+    return count, newest.isoformat() if newest is not None else None, highest_id
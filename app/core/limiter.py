@@ -1,5 +1,13 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address, headers_enabled=False, storage_uri="memory://")
+# Registers the "srs-redis" storage scheme: limits are shared through Redis
+# when REDIS_URL is set and kept per process otherwise (see the module).
+from app.core import rate_limit_storage  # noqa: F401
 
+limiter = Limiter(
+    key_func=get_remote_address,
+    headers_enabled=False,
+    strategy="moving-window",
+    storage_uri="srs-redis://",
+)
@@ -0,0 +1,51 @@
+"""
+app/core/optional_imports.py
+
+Purpose:
+Deferred imports for SDKs that are slow to import and only needed on some
+code paths. ``openai`` alone takes ~0.25 s to import (most of app startup)
+yet is only used when AI_PROVIDER=openai is configured; replicas started
+on demand should not pay for it before serving their first request.
+
+Modules that call the OpenAI SDK keep a module-level ``OpenAI`` name (tests
+patch it) set to :data:`DEFERRED`, and resolve it at call time:
+
+    OpenAI = DEFERRED
+
+    def _call():
+        client_class = resolve_openai(OpenAI)
+        if client_class is None:
+            return None  # SDK not installed (or patched out)
+
+``benchmarks/import_time.py`` checks that ``import app.main`` does not load
+these modules.
+
+Responsibilities:
+- Import openai on first use
+
+DO NOT:
+- Defer imports every request needs (fastapi, sqlalchemy, jose, ...): that
+  only moves the cost into the first request
+"""
+
+from typing import Any
+
+# Placeholder for "not imported yet"
+DEFERRED: Any = object()
+
+
+def resolve_openai(current: Any) -> Any:
+    """
+    The ``openai.OpenAI`` class, unless ``current`` already holds a value.
+
+    ``current`` is the caller's module-level ``OpenAI``: :data:`DEFERRED`
+    in normal use, or whatever a test patched in (None = SDK unavailable).
+    The import runs once; later calls hit ``sys.modules``.
+    """
+    if current is not DEFERRED:
+        return current
+    try:
+        from openai import OpenAI
+    except ImportError:  # pragma: no cover - openai is a hard requirement in requirements.txt
+        return None
+    return OpenAI
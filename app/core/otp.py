@@ -2,16 +2,16 @@
 app/core/otp.py
 
 Purpose:
-OTP generation and email sending utilities for password reset.
+OTP generation and verification utilities for password reset.
 
 Responsibilities:
 - Generate secure 6-digit OTPs
-- Send OTP emails using Resend API
 - Validate OTP format and expiration
 - Handle OTP-related security measures
 
 DO NOT:
 - Store OTPs in plain text for extended periods
+- Send email here (OTP emails go through app/services/email_outbox.py)
 - Send sensitive information via email
 - Allow unlimited OTP attempts
 
@@ -26,8 +26,6 @@ import string
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import resend
-
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -85,37 +83,6 @@ def verify_otp_hash(candidate_otp: str, stored_hash: str) -> bool:
     return hmac.compare_digest(hash_otp(candidate_otp), stored_hash)
 
 
-def send_otp_email(email: str, otp: str) -> bool:
-    """
-    Send OTP to user's email address using Resend API.
-    
-    Args:
-        email: Recipient email address
-        otp: 6-digit OTP code
-        
-    Returns:
-        True if email sent successfully, False otherwise
-    """
-    try:
-        resend.api_key = settings.RESEND_API_KEY
-
-        if not resend.api_key:
-            logger.warning("RESEND_API_KEY not configured — using development fallback")
-            return False  # This will trigger log_otp_for_dev fallback
-
-        resend.Emails.send({
-            "from": "onboarding@resend.dev",
-            "to": email,
-            "subject": "Your SRS OTP Code",
-            "html": f"<p>Your OTP is: <strong>{otp}</strong>. It expires in 10 minutes.</p>"
-        })
-        return True
-
-    except Exception as e:
-        logger.error("Error sending OTP email: %s", e)
-        return False
-
-
 def is_otp_expired(expires_at: datetime) -> bool:
     """
     Check if OTP has expired.
@@ -126,6 +93,9 @@ def is_otp_expired(expires_at: datetime) -> bool:
     Returns:
         True if expired, False otherwise
     """
+    if expires_at.tzinfo is None:
+        # SQLite returns naive datetimes; the column is stored in UTC.
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
     now = datetime.now(timezone.utc)
     return now > expires_at
 
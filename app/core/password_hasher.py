@@ -0,0 +1,170 @@
+"""
+app/core/password_hasher.py
+
+Purpose:
+Run bcrypt (app/core/security.py:hash_password / verify_password) off the
+request path.
+
+A bcrypt hash takes tens of milliseconds of CPU. Done inline, a burst of
+logins or registrations fills the request threadpool and every other sync
+endpoint queues behind it. Instead the work is submitted to a bounded
+executor:
+
+- a process pool of PASSWORD_HASH_WORKERS processes (0 = one per CPU
+  core), or threads when PASSWORD_HASH_EXECUTOR is "thread"
+- at most PASSWORD_HASH_QUEUE_SIZE jobs may wait for a free worker; one
+  more raises ServiceUnavailableError (503 with Retry-After) immediately,
+  rather than letting the backlog grow until clients time out
+
+hash_password_async() / verify_password_async() await the result without
+holding a thread, so the endpoints calling them are ``async def`` and only
+their database work goes to the threadpool.
+
+Responsibilities:
+- Own the executor (created on first use, shut down by the app lifespan)
+- Bound the number of queued hash/verify jobs
+
+DO NOT:
+- Implement hashing here (app/core/security.py does; the worker processes
+  import it)
+- Call the sync functions in app/core/security.py from request handlers
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+from app.core import security
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Seconds a client is asked to wait after a 503.
+RETRY_AFTER_S = 1
+
+PASSWORD_HASHER_BUSY = "Too many password operations in progress, please retry shortly"
+
+
+class PasswordHasher:
+    """A worker pool that rejects work once ``workers + queue_size`` jobs are pending."""
+
+    def __init__(self, kind: str, workers: int, queue_size: int) -> None:
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers + queue_size
+        self._pending = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn, not fork: the serving process has threads (threadpool,
+                # database pools) that a forked child would inherit mid-state.
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _release(self, _future: Future | None = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Queue ``fn(*args)`` on the pool.
+
+        Raises:
+            ServiceUnavailableError: ``max_pending`` jobs are already queued or
+                running, or the process pool died (it is rebuilt on the next call).
+        """
+        return self._submit(fn, *args)[1]
+
+    async def run(self, fn: Callable, *args):
+        """Await ``fn(*args)`` on the pool (see :meth:`submit`)."""
+        executor, future = self._submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenExecutor:
+            self._discard_broken(executor)
+            raise ServiceUnavailableError(PASSWORD_HASHER_BUSY, retry_after=RETRY_AFTER_S)
+
+    def _submit(self, fn: Callable, *args) -> tuple[Executor, Future]:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning("Password hasher saturated (%d jobs pending); rejecting request", self._pending)
+                raise ServiceUnavailableError(PASSWORD_HASHER_BUSY, retry_after=RETRY_AFTER_S)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenExecutor:
+                broken = True
+            else:
+                broken = False
+                self._pending += 1
+        if broken:
+            self._discard_broken(executor)
+            raise ServiceUnavailableError(PASSWORD_HASHER_BUSY, retry_after=RETRY_AFTER_S)
+        future.add_done_callback(self._release)
+        return executor, future
+
+    def _discard_broken(self, executor: Executor) -> None:
+        # A worker process died (OOM kill, ...): every job in the pool fails
+        # with BrokenProcessPool, and the next submit starts a fresh pool.
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.error("Password hasher pool is broken; starting a new one")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_hasher: PasswordHasher | None = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """The process-wide hasher, configured from settings on first use."""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher(
+                settings.PASSWORD_HASH_EXECUTOR,
+                settings.PASSWORD_HASH_WORKERS,
+                settings.PASSWORD_HASH_QUEUE_SIZE,
+            )
+        return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the worker pool (app shutdown; tests, to pick up new settings)."""
+    global _hasher
+    with _hasher_lock:
+        hasher, _hasher = _hasher, None
+    if hasher is not None:
+        hasher.shutdown()
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """:func:`app.core.security.hash_password` on the pool."""
+    return await get_password_hasher().run(security.hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """:func:`app.core.security.verify_password` on the pool."""
+    return await get_password_hasher().run(security.verify_password, plain_password, hashed_password)
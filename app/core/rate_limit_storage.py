@@ -0,0 +1,264 @@
+"""
+app/core/rate_limit_storage.py
+
+Purpose:
+Rate-limit storage for slowapi/limits (``storage_uri="srs-redis://"``,
+moving-window strategy) that enforces each limit across every worker
+process and replica when REDIS_URL is set.
+
+- Sliding window: every hit is a member of a Redis sorted set scored by
+  the Redis server's clock; one Lua script trims entries older than the
+  window, counts, and adds the hit only if it fits -- atomic, one round
+  trip, no clock skew between replicas.
+- Local lease: while a key is clearly under its limit (the window is at
+  most LEASE_HEADROOM full), the script reserves up to lease_size() extra
+  entries and this process spends them without asking Redis again, for at
+  most LEASE_TTL_S. Unspent entries simply age out of the window, so the
+  limit can only err on the strict side. Limits smaller than
+  1 / LEASE_FRACTION (e.g. 10/minute on login) never lease: every hit
+  goes to Redis.
+- Fallback: when Redis is not configured, or a call fails, hits are
+  counted in an in-process MemoryStorage, i.e. the limit is enforced per
+  process. After a failure Redis is retried every REDIS_RETRY_S seconds.
+
+Responsibilities:
+- Count rate-limit hits (acquire_entry / get_moving_window)
+
+DO NOT:
+- Decide limits or keys here (app/core/limiter.py and the route
+  decorators do)
+- Let a Redis outage fail requests; degrade to per-process limits
+"""
+
+import logging
+import math
+import threading
+import time
+
+from limits.storage import MemoryStorage, MovingWindowSupport, Storage
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "srs:ratelimit:"
+
+# A key may lease extra entries only while its window is at most this full...
+LEASE_HEADROOM = 0.5
+# ...and then at most this fraction of its limit at a time...
+LEASE_FRACTION = 0.05
+# ...to spend locally for at most this long.
+LEASE_TTL_S = 1.0
+
+# Seconds between Redis attempts after a failure.
+REDIS_RETRY_S = 5.0
+
+# KEYS[1] window zset, KEYS[2] member sequence
+# ARGV limit, window_ms, amount, extra (lease), lease_ceiling
+# Returns {granted, count_after, window_start_ms}; granted = 0 when the hit
+# does not fit.
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local extra = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count + amount > limit then
+  local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+  return {0, count, tonumber(oldest[2] or now)}
+end
+if count + amount + extra > tonumber(ARGV[5]) then
+  extra = 0
+end
+local grant = amount + extra
+local last = redis.call('INCRBY', KEYS[2], grant)
+for i = last - grant + 1, last do
+  redis.call('ZADD', KEYS[1], now, i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+redis.call('PEXPIRE', KEYS[2], window)
+return {grant, count + grant, now}
+"""
+
+# KEYS[1] window zset; ARGV window_ms. Returns {count, window_start_ms}.
+WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[1]))
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {redis.call('ZCARD', KEYS[1]), tonumber(oldest[2] or now)}
+"""
+
+
+def _redis():
+    # Imported lazily: app.services.similarity_search pulls in the models.
+    from app.services.similarity_search import _get_cache_client
+
+    return _get_cache_client()
+
+
+def _reset_redis() -> None:
+    from app.services.similarity_search import _redis_manager
+
+    _redis_manager.reset()
+
+
+def lease_size(limit: int) -> int:
+    """Extra entries a process may reserve per Redis round trip for *limit*."""
+    return int(limit * LEASE_FRACTION)
+
+
+class RedisSlidingWindowStorage(Storage, MovingWindowSupport):
+    """Moving-window storage: Redis sliding log + local leases, memory fallback."""
+
+    STORAGE_SCHEME = ["srs-redis"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.local = MemoryStorage()
+        # key -> (entries left, expires at); spent and expired leases are
+        # dropped, and a sweep every LEASE_TTL_S drops keys not seen again
+        self._leases: dict[str, tuple[int, float]] = {}
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        self._scripts = None
+        self._redis_down_until = 0.0
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return Exception
+
+    # -------------------------------------------------
+    # Redis access
+    # -------------------------------------------------
+
+    def _client(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        return _redis()
+
+    def _script(self, client, name: str):
+        # register_script only hashes the source; the script is sent with
+        # EVALSHA, falling back to EVAL once per connection (NOSCRIPT).
+        if self._scripts is None or self._scripts[0] is not client:
+            self._scripts = (
+                client,
+                {"acquire": client.register_script(ACQUIRE_SCRIPT), "window": client.register_script(WINDOW_SCRIPT)},
+            )
+        return self._scripts[1][name]
+
+    def _redis_failed(self, operation: str) -> None:
+        logger.warning(
+            "Rate limit %s failed; enforcing limits per process for %.0fs", operation, REDIS_RETRY_S, exc_info=True
+        )
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_S
+        self._scripts = None
+        _reset_redis()
+
+    @staticmethod
+    def _keys(key: str) -> list[str]:
+        # Hash tag: both keys land on the same Redis Cluster slot.
+        base = f"{REDIS_KEY_PREFIX}{{{key}}}"
+        return [base, base + ":seq"]
+
+    # -------------------------------------------------
+    # MovingWindowSupport
+    # -------------------------------------------------
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        with self._lock:
+            left, expires_at = self._leases.pop(key, (0, 0.0))
+            if left >= amount and time.monotonic() < expires_at:
+                if left > amount:
+                    self._leases[key] = (left - amount, expires_at)
+                return True
+
+        client = self._client()
+        if client is None:
+            return self.local.acquire_entry(key, limit, expiry, amount)
+
+        extra = lease_size(limit)
+        try:
+            granted, _count, _start = self._script(client, "acquire")(
+                keys=self._keys(key),
+                args=[limit, int(expiry * 1000), amount, extra, math.floor(limit * LEASE_HEADROOM)],
+            )
+        except Exception:
+            self._redis_failed("acquire")
+            return self.local.acquire_entry(key, limit, expiry, amount)
+
+        granted = int(granted)
+        if granted < amount:
+            return False
+        if granted > amount:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._next_sweep:
+                    self._leases = {k: lease for k, lease in self._leases.items() if lease[1] > now}
+                    self._next_sweep = now + LEASE_TTL_S
+                self._leases[key] = (granted - amount, now + min(LEASE_TTL_S, expiry))
+        return True
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple[float, int]:
+        client = self._client()
+        if client is None:
+            return self.local.get_moving_window(key, limit, expiry)
+        try:
+            count, start_ms = self._script(client, "window")(keys=self._keys(key)[:1], args=[int(expiry * 1000)])
+        except Exception:
+            self._redis_failed("window read")
+            return self.local.get_moving_window(key, limit, expiry)
+        return int(start_ms) / 1000, int(count)
+
+    # -------------------------------------------------
+    # Storage (fixed-window API; unused with the moving-window strategy)
+    # -------------------------------------------------
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.local.incr(key, expiry, amount)
+
+    def get(self, key: str) -> int:
+        return self.local.get(key)
+
+    def get_expiry(self, key: str) -> float:
+        return self.local.get_expiry(key)
+
+    def check(self) -> bool:
+        client = _redis()
+        if client is None:
+            return True
+        try:
+            return bool(client.ping())
+        except Exception:
+            return False
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._leases.pop(key, None)
+        self.local.clear(key)
+        client = self._client()
+        if client is not None:
+            try:
+                client.delete(*self._keys(key))
+            except Exception:
+                self._redis_failed("clear")
+
+    def reset(self) -> int | None:
+        """Forget every limit: local state, and the shared keys in Redis."""
+        with self._lock:
+            self._leases.clear()
+        self._redis_down_until = 0.0
+        cleared = self.local.reset() or 0
+        client = _redis()
+        if client is not None:
+            try:
+                keys = list(client.scan_iter(match=REDIS_KEY_PREFIX + "*"))
+                if keys:
+                    cleared += client.delete(*keys)
+            except Exception:
+                self._redis_failed("reset")
+        return cleared
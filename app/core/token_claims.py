@@ -0,0 +1,129 @@
+"""
+app/core/token_claims.py
+
+Purpose:
+Verify an access token once and reuse the result.
+
+- verified_claims(): decode_token() behind a bounded in-process cache of
+  verified claims. Entries are keyed by an HMAC-SHA256 of the token under
+  SECRET_KEY (the token itself is never stored, and rotating the key
+  orphans every entry) and are only served until the token's ``exp``.
+  Tokens that fail verification are not cached.
+- get_token_claims(): FastAPI dependency returning the claims of the
+  request's Bearer token (None when absent or invalid). FastAPI resolves
+  it once per request however many dependencies ask for it, and it is
+  also kept on ``request.state.token_claims`` for code that only has the
+  request.
+
+Responsibilities:
+- Cache verified JWT claims until they expire
+- Decode the request's token at most once
+
+DO NOT:
+- Verify tokens here (app/core/security.py:decode_token does)
+- Decide what a missing/invalid token means (401, anonymous, ...); that
+  is up to each route
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, Any
+
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+
+from app.core.config import settings
+from app.core.security import decode_token
+
+# Distinct tokens kept; an access token is cached for at most its lifetime.
+MAX_ENTRIES = 10_000
+
+# The Bearer token when present; never raises (routes decide about 401).
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+
+class _ClaimsCache:
+    """LRU of ``token digest -> (exp, claims)``."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: bytes, exp: float, claims: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (exp, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = _ClaimsCache(MAX_ENTRIES)
+
+
+def _cache_key(token: str) -> bytes:
+    secret = f"{settings.ALGORITHM}:{settings.SECRET_KEY}".encode()
+    return hmac.new(secret, token.encode(), hashlib.sha256).digest()
+
+
+def verified_claims(token: str) -> dict[str, Any]:
+    """
+    Same contract as :func:`app.core.security.decode_token`, cached.
+
+    Returns a fresh dict each call, so callers may modify it.
+
+    Raises:
+        jose.JWTError: The token is expired, forged or malformed.
+    """
+    key = _cache_key(token)
+    claims = _cache.get(key)
+    if claims is None:
+        claims = decode_token(token)
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            _cache.put(key, float(exp), claims)
+    return dict(claims)
+
+
+def clear_token_claims_cache() -> None:
+    """Forget every cached verification (tests)."""
+    _cache.clear()
+
+
+def get_token_claims(
+    request: Request,
+    token: Annotated[str | None, Depends(oauth2_scheme_optional)],
+) -> dict[str, Any] | None:
+    """Verified claims of the request's Bearer token, or None if absent/invalid."""
+    if hasattr(request.state, "token_claims"):
+        return request.state.token_claims
+    claims = None
+    if token:
+        try:
+            claims = verified_claims(token)
+        except JWTError:
+            claims = None
+    request.state.token_claims = claims
+    return claims
@@ -0,0 +1,117 @@
+"""
+app/db/replica.py
+
+Purpose:
+Read-your-writes bookkeeping for read-replica routing.
+
+When DATABASE_READ_URL is set, read-only endpoints are served from the
+replica (see get_read_db in app/db/session.py). Replicas lag the primary,
+so a client that has just written — created a ticket, closed one, left
+feedback — could read a state that no longer includes its own write. To
+avoid that, every successful write marks the calling client, and for
+DATABASE_READ_STALENESS_S seconds afterwards that client's reads are
+routed to the primary.
+
+Responsibilities:
+- Identify the calling client (bearer token, else client address)
+- Remember recent writers for the staleness window (bounded, thread-safe)
+- ASGI middleware that records successful non-GET requests
+
+DO NOT:
+- Create engines or sessions here (see app/db/engine.py, app/db/session.py)
+
+Limitations:
+The window is tracked per process. With several workers behind a load
+balancer a client's next read may land on a worker that did not see the
+write; raise DATABASE_READ_STALENESS_S only together with sticky routing,
+or leave the endpoint on the primary.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def client_key(conn: HTTPConnection) -> str:
+    """
+    Stable, non-reversible identifier for the caller of a request.
+
+    Authenticated callers are keyed by their Authorization header (the same
+    token is sent on the write and the follow-up read); anonymous callers by
+    client address. Only a digest is kept, never the token itself.
+    """
+    raw = conn.headers.get("authorization") or (conn.client.host if conn.client else "")
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+class ReadYourWritesTracker:
+    """Clients that wrote within the last ``window_s`` seconds."""
+
+    def __init__(self, window_s: float, max_entries: int = 10_000):
+        self.window_s = window_s
+        self.max_entries = max_entries
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark_write(self, key: str) -> None:
+        """Pin ``key``'s reads to the primary for the next ``window_s`` seconds."""
+        if self.window_s <= 0:
+            return
+        with self._lock:
+            self._expires[key] = time.monotonic() + self.window_s
+            self._expires.move_to_end(key)
+            while len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+
+    def requires_primary(self, key: str) -> bool:
+        """True if ``key`` wrote recently enough that the replica may not have caught up."""
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expires[key]
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Mark the caller in ``tracker`` after every successful non-GET request.
+
+    ``exempt_paths`` lists POST endpoints that write nothing (e.g. the
+    stateless /resolve), so calling them does not pin the caller to the
+    primary. Plain ASGI (no BaseHTTPMiddleware) so the response body is
+    streamed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: ReadYourWritesTracker, exempt_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.tracker = tracker
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in _SAFE_METHODS
+            or scope["path"] in self.exempt_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.tracker.mark_write(client_key(HTTPConnection(scope)))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
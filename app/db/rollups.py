@@ -0,0 +1,382 @@
+"""
+app/db/rollups.py
+
+Purpose:
+Keep ticket_rollups_hourly (app/models/ticket_rollup.py) in step with the
+tickets and feedback tables.
+
+Maintenance is incremental and transactional. Session events snapshot the
+rollup contribution of every ticket a flush or bulk UPDATE/DELETE touches,
+before and after the write, and accumulate the difference per rollup key
+in ``session.info``. Right before the transaction commits the accumulated
+deltas are upserted (``counter = counter + delta``), so the rollups commit
+or roll back together with the change that caused them. This covers:
+
+- ORM flushes: ticket inserts/updates/deletes, feedback inserts/updates
+- ORM-enabled bulk statements: ``update(Ticket)`` / ``delete(Ticket)`` and
+  the same for Feedback executed through a Session (the agent
+  assign/accept/close endpoints use these)
+
+Writes that bypass the Session (Core ``engine.begin()`` inserts, raw SQL,
+bulk seeding scripts) are not seen; reconcile_rollups() recomputes buckets
+from the base tables and fixes any drift (workers/rollup_reconciler.py).
+
+Responsibilities:
+- Compute a ticket's contribution (key + counter vector)
+- Accumulate and apply rollup deltas from Session events
+- Recompute / reconcile rollups from the base tables
+
+DO NOT:
+- Serve dashboards from here (see app/services/admin_metrics.py)
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import and_, delete, event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import ORMExecuteState, Session
+
+logger = logging.getLogger(__name__)
+
+LOW_QUALITY_THRESHOLD = 0.5
+
+_DELTAS_KEY = "ticket_rollup_deltas"
+_PENDING_KEY = "ticket_rollup_pending"
+_SNAPSHOT_CHUNK = 500
+
+RollupKey = tuple[datetime, str, str, str]
+
+
+# -------------------------------------------------
+# Contributions
+# -------------------------------------------------
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def bucket_start(created_at: datetime) -> datetime:
+    """Hour bucket (naive UTC, like the stored column) for a ticket's ``created_at``."""
+    return _naive_utc(created_at).replace(minute=0, second=0, microsecond=0)
+
+
+def _contribution_query():
+    from app.models.feedback import Feedback
+    from app.models.ticket import Ticket
+
+    return select(
+        Ticket.id,
+        Ticket.created_at,
+        Ticket.intent,
+        Ticket.status,
+        Ticket.response_source,
+        Ticket.assigned_agent_id,
+        Ticket.confidence,
+        Ticket.quality_score,
+        Feedback.rating,
+        Feedback.resolved,
+    ).outerjoin(Feedback, Feedback.ticket_id == Ticket.id)
+
+
+def contribution(row) -> tuple[RollupKey, list]:
+    """Rollup key and counter vector (COUNTER_COLUMNS order) for one ticket row."""
+    from app.models.ticket_rollup import NONE_KEY
+
+    key = (
+        bucket_start(row.created_at),
+        row.intent or NONE_KEY,
+        row.status,
+        row.response_source or NONE_KEY,
+    )
+    has_feedback = row.rating is not None
+    quality = row.quality_score
+    return key, [
+        1,
+        1 if row.assigned_agent_id is None else 0,
+        row.confidence or 0.0,
+        1 if row.confidence is not None else 0,
+        quality or 0.0,
+        1 if quality is not None else 0,
+        1 if quality is not None and quality < LOW_QUALITY_THRESHOLD else 0,
+        1 if has_feedback else 0,
+        row.rating or 0,
+        1 if has_feedback and row.resolved else 0,
+    ]
+
+
+def _snapshot(conn: Connection, ticket_ids: Iterable[int]) -> dict[int, tuple[RollupKey, list]]:
+    from app.models.ticket import Ticket
+
+    ids = sorted(i for i in ticket_ids if i is not None)
+    snapshot = {}
+    for start in range(0, len(ids), _SNAPSHOT_CHUNK):
+        chunk = ids[start:start + _SNAPSHOT_CHUNK]
+        for row in conn.execute(_contribution_query().where(Ticket.id.in_(chunk))):
+            snapshot[row.id] = contribution(row)
+    return snapshot
+
+
+def _add(deltas: dict[RollupKey, list], key: RollupKey, vector: list, sign: int) -> None:
+    acc = deltas.get(key)
+    if acc is None:
+        deltas[key] = [sign * v for v in vector]
+    else:
+        for i, v in enumerate(vector):
+            acc[i] += sign * v
+
+
+def _accumulate(session: Session, before: dict, after: dict) -> None:
+    deltas = session.info.setdefault(_DELTAS_KEY, {})
+    for ticket_id in before.keys() | after.keys():
+        old, new = before.get(ticket_id), after.get(ticket_id)
+        if old == new:
+            continue
+        if old is not None:
+            _add(deltas, old[0], old[1], -1)
+        if new is not None:
+            _add(deltas, new[0], new[1], +1)
+
+
+# -------------------------------------------------
+# Applying deltas
+# -------------------------------------------------
+
+
+def _upsert(conn: Connection, key: RollupKey, counters: dict[str, Any]) -> None:
+    from app.models.ticket_rollup import TicketRollupHourly
+
+    table = TicketRollupHourly.__table__
+    key_values = dict(zip(("bucket_start", "intent", "status", "response_source"), key))
+    dialect = conn.dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**key_values, **counters)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_values),
+            set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+        )
+        conn.execute(stmt)
+        return
+
+    # Generic fallback: UPDATE, then INSERT if the row does not exist yet.
+    match = and_(*(table.c[k] == v for k, v in key_values.items()))
+    result = conn.execute(update(table).where(match).values({c: table.c[c] + v for c, v in counters.items()}))
+    if result.rowcount == 0:
+        conn.execute(insert(table).values(**key_values, **counters))
+
+
+def apply_deltas(conn: Connection, deltas: dict[RollupKey, list]) -> int:
+    """Add ``deltas`` to the rollup rows; returns the number of rows touched."""
+    from app.models.ticket_rollup import COUNTER_COLUMNS
+
+    touched = 0
+    # Sorted so concurrent transactions lock rollup rows in the same order.
+    for key in sorted(deltas):
+        vector = deltas[key]
+        if not any(vector):
+            continue
+        _upsert(conn, key, dict(zip(COUNTER_COLUMNS, vector)))
+        touched += 1
+    return touched
+
+
+# -------------------------------------------------
+# Session events
+# -------------------------------------------------
+
+
+def _tracked_classes():
+    from app.models.feedback import Feedback
+    from app.models.ticket import Ticket
+
+    return Ticket, Feedback
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, _flush_context, _instances) -> None:
+    Ticket, Feedback = _tracked_classes()
+    existing: set[int] = set()
+    new_objects = []
+    for obj in session.new:
+        if isinstance(obj, (Ticket, Feedback)):
+            new_objects.append(obj)
+            if isinstance(obj, Feedback) and obj.ticket_id is not None:
+                existing.add(obj.ticket_id)
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Ticket) and obj.id is not None:
+            existing.add(obj.id)
+        elif isinstance(obj, Feedback) and obj.ticket_id is not None:
+            existing.add(obj.ticket_id)
+    if not existing and not new_objects:
+        return
+    before = _snapshot(session.connection(), existing) if existing else {}
+    session.info[_PENDING_KEY] = (existing, before, new_objects)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, _flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    Ticket, _Feedback = _tracked_classes()
+    existing, before, new_objects = pending
+    ids = set(existing)
+    for obj in new_objects:
+        ids.add(obj.id if isinstance(obj, Ticket) else obj.ticket_id)
+    _accumulate(session, before, _snapshot(session.connection(), ids))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_statement(state: ORMExecuteState):
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return None
+    Ticket, Feedback = _tracked_classes()
+    cls = state.bind_mapper.class_
+    if cls not in (Ticket, Feedback):
+        return None
+
+    conn = state.session.connection()
+    params = state.parameters
+    if isinstance(params, (list, tuple)):
+        # ORM "bulk UPDATE by primary key": one parameter dict per row.
+        pks = [p["id"] for p in params if "id" in p]
+        if cls is Ticket:
+            ids = set(pks)
+        else:
+            ids = set(conn.execute(select(Feedback.ticket_id).where(Feedback.id.in_(pks))).scalars())
+    else:
+        target = Ticket.id if cls is Ticket else Feedback.ticket_id
+        id_query = select(target)
+        if state.statement.whereclause is not None:
+            id_query = id_query.where(state.statement.whereclause)
+        ids = set(conn.execute(id_query, params or {}).scalars())
+    if not ids:
+        return None
+
+    before = _snapshot(conn, ids)
+    result = state.invoke_statement()
+    _accumulate(state.session, before, _snapshot(conn, ids))
+    return result
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    # Flush first so after_flush has recorded every pending change.
+    session.flush()
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_DELTAS_KEY, None)
+        session.info.pop(_PENDING_KEY, None)
+
+
+# -------------------------------------------------
+# Recompute / reconcile
+# -------------------------------------------------
+
+
+def compute_rollups(
+    conn: Connection,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict[RollupKey, list]:
+    """Aggregate rollup vectors straight from tickets/feedback (streamed)."""
+    from app.models.ticket import Ticket
+
+    query = _contribution_query()
+    if since is not None:
+        query = query.where(Ticket.created_at >= since)
+    if until is not None:
+        query = query.where(Ticket.created_at < until)
+
+    totals: dict[RollupKey, list] = {}
+    result = conn.execution_options(yield_per=1000).execute(query)
+    for row in result:
+        key, vector = contribution(row)
+        _add(totals, key, vector, +1)
+    return totals
+
+
+def _differs(a: list, b: list) -> bool:
+    return any(abs(x - y) > 1e-6 for x, y in zip(a, b))
+
+
+def reconcile_rollups(
+    session: Session,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Recompute the rollups for ``[since, until)`` from the base tables and
+    rewrite rows that drifted.
+
+    ``since`` / ``until`` are widened to whole hours. The caller commits
+    (nothing is written when ``dry_run``). A ticket write that commits
+    while this runs can be overwritten by the recomputed row; the next
+    run corrects it.
+
+    Returns:
+        Counts of ``checked`` / ``updated`` / ``inserted`` / ``deleted`` rows.
+    """
+    from app.models.ticket_rollup import COUNTER_COLUMNS, TicketRollupHourly
+
+    if since is not None:
+        since = bucket_start(since)
+    if until is not None and _naive_utc(until) != bucket_start(until):
+        until = bucket_start(until) + timedelta(hours=1)
+    elif until is not None:
+        until = _naive_utc(until)
+
+    conn = session.connection()
+    expected = compute_rollups(conn, since, until)
+
+    table = TicketRollupHourly.__table__
+    query = select(table)
+    if since is not None:
+        query = query.where(table.c.bucket_start >= since)
+    if until is not None:
+        query = query.where(table.c.bucket_start < until)
+    actual = {
+        (row.bucket_start, row.intent, row.status, row.response_source): (row.id, [getattr(row, c) for c in COUNTER_COLUMNS])
+        for row in conn.execute(query)
+    }
+
+    stats = defaultdict(int)
+    stats["checked"] = len(expected.keys() | actual.keys())
+    for key, vector in expected.items():
+        if key not in actual:
+            stats["inserted"] += 1
+            if not dry_run:
+                conn.execute(insert(table).values(
+                    **dict(zip(("bucket_start", "intent", "status", "response_source"), key)),
+                    **dict(zip(COUNTER_COLUMNS, vector)),
+                ))
+        elif _differs(actual[key][1], vector):
+            stats["updated"] += 1
+            if not dry_run:
+                conn.execute(update(table).where(table.c.id == actual[key][0]).values(dict(zip(COUNTER_COLUMNS, vector))))
+    stale = [row_id for key, (row_id, _) in actual.items() if key not in expected]
+    stats["deleted"] = len(stale)
+    if stale and not dry_run:
+        conn.execute(delete(table).where(table.c.id.in_(stale)))
+
+    for name in ("inserted", "updated", "deleted"):
+        stats.setdefault(name, 0)
+    return dict(stats)
@@ -9,7 +9,11 @@ Responsibilities:
 - Provide session factory (SessionLocal)
 - Expose Base class for ORM models (User, Ticket, Feedback)
 - Provide FastAPI dependency (get_db) for per-request DB sessions
+- Provide the async engine/session (get_async_db) used by the hot endpoints
+- Route read-only sessions to the optional read replica (get_read_db)
 - Provide init_db() to create tables on startup
+- Register the ticket rollup maintenance events (app/db/rollups.py)
+- Register the principal cache invalidation events (app/services/principal_cache.py)
 
 Reference: docs/specification/TECHNICAL_SPEC.md § 5.3 Data Layer
 
@@ -19,12 +23,16 @@ DO NOT:
 - Commit transactions in this file
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.db.engine import create_async_db_engine, create_db_engine
+from app.db.replica import ReadYourWritesTracker, client_key
 
 # -------------------------------------------------
 # Database Engine
@@ -35,20 +43,10 @@ Engine is the core interface to the database.
 - Manages connection pooling
 - Executes SQL via sessions
 
-SQLite: check_same_thread=False required (SQLite default forbids shared connections)
-PostgreSQL: Do NOT pass check_same_thread (not supported)
+Pool sizing, pre-ping/recycle and the SQLite pragmas (WAL, busy_timeout, ...)
+come from the backend profiles in app/db/engine.py.
 """
-_connect_args = (
-    {"check_same_thread": False}
-    if "sqlite" in settings.DATABASE_URL.lower()
-    else {}
-)
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=_connect_args,
-    echo=settings.DEBUG,  # Log SQL in development only
-)
+engine = create_db_engine(settings.DATABASE_URL)
 
 # -------------------------------------------------
 # Session Factory
@@ -67,6 +65,143 @@ SessionLocal = sessionmaker(
     class_=Session,
 )
 
+# -------------------------------------------------
+# Read Replica
+# -------------------------------------------------
+
+"""
+Optional read replica (DATABASE_READ_URL). Read-only endpoints and worker
+scans use ReadSessionLocal / get_read_db; without a replica both simply
+fall back to the primary, so callers never need to check.
+
+recent_writes pins a client's reads to the primary for
+DATABASE_READ_STALENESS_S seconds after it writes (see app/db/replica.py).
+"""
+read_engine = (
+    create_db_engine(settings.DATABASE_READ_URL)
+    if settings.DATABASE_READ_URL
+    else engine
+)
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=Session,
+)
+
+recent_writes = ReadYourWritesTracker(settings.DATABASE_READ_STALENESS_S)
+
+
+def replica_configured() -> bool:
+    """True when a separate read replica is configured."""
+    return bool(settings.DATABASE_READ_URL)
+
+
+_REPLICA_KEY = "reads_replica"
+
+
+def reads_replica(db: Session | AsyncSession) -> bool:
+    """
+    True when *db* came from get_read_db / get_async_read_db and reads the
+    replica, so its results may predate writes committed on the primary.
+    """
+    return db.info.get(_REPLICA_KEY, False)
+
+# -------------------------------------------------
+# Async Engine & Session Factory
+# -------------------------------------------------
+
+"""
+The hot request paths (/resolve, POST /tickets/, GET /tickets/{id}, agent
+assign/accept/close) are ``async def`` and use an AsyncSession, so a request
+waiting on the database no longer pins one of the threadpool's worker
+threads. Everything else keeps using the sync SessionLocal above.
+
+The async engine points at the same database as ``engine``; only the driver
+differs (aiosqlite for SQLite, asyncpg for PostgreSQL). It is created lazily
+so importing this module never requires the async drivers.
+
+- expire_on_commit=False: attribute access after commit would otherwise
+  trigger an implicit (sync) refresh, which AsyncSession cannot do.
+"""
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+_async_read_engine: AsyncEngine | None = None
+_async_read_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync database URL onto its async-driver equivalent.
+
+    ``sqlite:///app.db`` -> ``sqlite+aiosqlite:///app.db``;
+    ``postgresql[+psycopg2]://...`` -> ``postgresql+asyncpg://...``.
+    URLs that already name an async driver are returned unchanged.
+
+    Raises:
+        ValueError: If the backend has no supported async driver.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    if parsed.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(to_async_url(settings.DATABASE_URL))
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the AsyncSession factory bound to :func:`get_async_engine`."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+def get_async_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """AsyncSession factory for the read replica (the primary's if none is configured)."""
+    global _async_read_engine, _async_read_session_factory
+    if not replica_configured():
+        return get_async_session_factory()
+    if _async_read_session_factory is None:
+        _async_read_engine = create_async_db_engine(to_async_url(settings.DATABASE_READ_URL))
+        _async_read_session_factory = async_sessionmaker(
+            bind=_async_read_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_read_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (called from the app lifespan on shutdown)."""
+    global _async_engine, _async_session_factory, _async_read_engine, _async_read_session_factory
+    for async_engine in (_async_engine, _async_read_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+    _async_read_engine = None
+    _async_read_session_factory = None
+
 # -------------------------------------------------
 # Declarative Base
 # -------------------------------------------------
@@ -112,6 +247,67 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of :func:`get_db` for ``async def`` route handlers.
+
+    Usage in route handlers:
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        @router.get("/tickets/{ticket_id}")
+        async def get_ticket(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+            return await db.get(Ticket, ticket_id)
+
+    Tests that override ``get_db`` with their own database must override
+    this dependency as well.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+def _use_replica(request: Request) -> bool:
+    return replica_configured() and not recent_writes.requires_primary(client_key(request))
+
+
+def get_read_db(
+    request: Request,
+    primary: Session = Depends(get_db),
+) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: the replica, unless the caller wrote
+    within DATABASE_READ_STALENESS_S (then the primary, so it sees its own
+    write).
+
+    The primary session comes from get_db so dependency overrides of get_db
+    (tests) apply here too; a Session opens no connection until first use,
+    so requests served by the replica never touch the primary.
+
+    Never write through this session.
+    """
+    if not _use_replica(request):
+        yield primary
+        return
+    db = ReadSessionLocal()
+    db.info[_REPLICA_KEY] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: Request,
+    primary: AsyncSession = Depends(get_async_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of :func:`get_read_db`."""
+    if not _use_replica(request):
+        yield primary
+        return
+    async with get_async_read_session_factory()() as db:
+        db.info[_REPLICA_KEY] = True
+        yield db
+
+
 # -------------------------------------------------
 # Table Initialization
 # -------------------------------------------------
@@ -125,7 +321,22 @@ def init_db() -> None:
     Safe to call multiple times: creates only missing tables.
     """
     # Import models so they register with Base.metadata (side-effect imports)
-    from app.models import feedback, refresh_token, ticket, user
+    from app.models import (
+        email_outbox, feedback, metrics_ticket_state, refresh_token, ticket, ticket_rollup, user,
+        worker_checkpoint,
+    )
 
     Base.metadata.create_all(bind=engine)
 
+
+# Session events that keep ticket_rollups_hourly in step with every ticket /
+# feedback write made through any Session (see app/db/rollups.py).
+from app.db import rollups  # noqa: E402,F401
+
+# Session events that invalidate cached principals when a users row changes
+# (see app/services/principal_cache.py).
+from app.services import principal_cache  # noqa: E402,F401
+
+# Session events that invalidate cached tickets and ticket lists when a
+# tickets row changes (see app/services/ticket_cache.py).
+from app.services import ticket_cache  # noqa: E402,F401
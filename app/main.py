@@ -20,6 +20,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.limiter import limiter
@@ -27,7 +28,9 @@ from app.core.limiter import limiter
 from app.api import auth, demo, tickets, feedback, admin, agent, public
 from app.core.config import settings
 from app.core.error_handlers import setup_exception_handlers
-from app.db.session import engine, init_db
+from app.core.password_hasher import shutdown_password_hasher
+from app.db.replica import ReadYourWritesMiddleware
+from app.db.session import dispose_async_engine, engine, init_db, recent_writes, replica_configured
 
 
 # --------------------------------------------------
@@ -47,7 +50,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     - Initialize database connections / create tables
 
     Shutdown tasks:
-    - Dispose of SQLAlchemy engine connection pool
+    - Dispose of SQLAlchemy engine connection pools (sync and async)
+    - Stop the password hasher's worker pool
     """
     # --- Startup ---
     init_db()
@@ -56,6 +60,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # --- Shutdown ---
     engine.dispose()
+    await dispose_async_engine()
+    shutdown_password_hasher()
 
 
 # --------------------------------------------------
@@ -143,6 +149,22 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compression: large JSON pages (ticket lists, metrics) shrink several
+    # times on the wire. Small responses and 304s are sent as-is.
+    if settings.GZIP_MINIMUM_SIZE > 0:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=settings.GZIP_MINIMUM_SIZE,
+            compresslevel=settings.GZIP_COMPRESS_LEVEL,
+        )
+
+    # Read-your-writes for replica routing: after a successful write, the
+    # caller's reads stay on the primary for DATABASE_READ_STALENESS_S
+    # (see app/db/replica.py). Not needed without a replica. /resolve is a
+    # POST but stores nothing, so it does not count as a write.
+    if replica_configured():
+        app.add_middleware(ReadYourWritesMiddleware, tracker=recent_writes, exempt_paths=("/resolve",))
+
     # Rate Limit Setup (decorator-only mode)
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -0,0 +1,123 @@
+"""
+app/models/email_outbox.py
+
+Purpose:
+Defines the EmailOutbox database model.
+
+Responsibilities:
+- Hold outgoing emails between the request that queues them and the
+  worker that sends them (workers/email_outbox.py), together with their
+  delivery state: attempts, next retry time, last error
+
+A request writes its email row in the same transaction as the state it
+refers to (e.g. the user's OTP hash), so an email is queued if and only
+if that change commits.
+
+DO NOT:
+- Store the payload in plain text (it holds the raw OTP; see
+  app/services/email_outbox.py for the encryption)
+- Send email or write delivery queries here
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.db.session import Base
+
+# status values
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+EXPIRED = "expired"
+
+
+class EmailOutbox(Base):
+    """
+    EmailOutbox ORM model.
+
+    One row per email. Rows start ``pending`` and end ``sent``, ``failed``
+    (out of attempts, or rejected for good) or ``expired`` (e.g. an OTP
+    that could no longer be used by the time it would be sent). The
+    payload is cleared once a row leaves ``pending``.
+    """
+
+    __tablename__ = "email_outbox"
+
+    __table_args__ = (
+        # Worker: pending rows whose next attempt is due, oldest first.
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(
+        Integer,
+        primary_key=True,
+        doc="Primary key identifier for the queued email",
+    )
+
+    kind = Column(
+        String(32),
+        nullable=False,
+        doc="Email template (e.g. 'otp')",
+    )
+
+    recipient = Column(
+        String(255),
+        nullable=False,
+        doc="Recipient email address",
+    )
+
+    payload = Column(
+        Text,
+        nullable=True,
+        doc="Fernet-encrypted JSON template context; NULL once delivered or given up",
+    )
+
+    status = Column(
+        String(16),
+        default=PENDING,
+        nullable=False,
+        doc="pending | sent | failed | expired",
+    )
+
+    attempts = Column(
+        Integer,
+        default=0,
+        nullable=False,
+        doc="Number of failed delivery attempts so far",
+    )
+
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        doc="Earliest time the worker may (re)try the email",
+    )
+
+    expires_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Do not send after this time (NULL = never expires)",
+    )
+
+    last_error = Column(
+        String(255),
+        nullable=True,
+        doc="Error from the last failed attempt",
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        doc="Timestamp when the email was queued",
+    )
+
+    sent_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Timestamp when the provider accepted the email",
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, kind={self.kind!r}, status={self.status!r}, attempts={self.attempts})>"
@@ -16,7 +16,7 @@ DO NOT:
 """
 
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -41,6 +41,10 @@ class Feedback(Base):
     # database schema to ensure this uniqueness is enforced at the DB level.
     __table_args__ = (
         UniqueConstraint('ticket_id', name='uq_feedback_ticket_id'),
+        # Resolved-feedback counts in /admin/metrics and the metrics worker
+        Index('ix_feedback_resolved', 'resolved'),
+        # Incremental metrics collector: feedback since its watermark
+        Index('ix_feedback_created_at', 'created_at'),
     )
 
     def __repr__(self):
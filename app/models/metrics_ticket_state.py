@@ -0,0 +1,46 @@
+"""
+app/models/metrics_ticket_state.py
+
+Purpose:
+Defines the MetricsTicketState database model.
+
+Responsibilities:
+- Remember, per ticket, the values the incremental metrics collector last
+  counted (status, intent, feedback rating / resolved), so when a ticket
+  changes the collector can subtract the old contribution and add the new
+  one without rescanning the table
+
+Owned by workers/metrics_collector.py (--incremental); nothing else
+writes to it. Dropping its rows together with the "metrics_collector"
+worker checkpoint forces a full rebuild on the next run.
+
+DO NOT:
+- Read this table for dashboards (use the collector's snapshot output)
+- Write database queries here
+"""
+
+from sqlalchemy import Boolean, Column, Integer, String
+
+from app.db.session import Base
+
+
+class MetricsTicketState(Base):
+    """
+    MetricsTicketState ORM model.
+
+    One row per ticket the collector has counted.
+    """
+
+    __tablename__ = "metrics_ticket_state"
+
+    # No foreign key: rows must survive a ticket delete so the collector
+    # can still subtract what it counted.
+    ticket_id = Column(Integer, primary_key=True, autoincrement=False)
+
+    status = Column(String, nullable=False)
+    intent = Column(String, nullable=True)
+    rating = Column(Integer, nullable=True, doc="Feedback rating; NULL when the ticket has no feedback")
+    resolved = Column(Boolean, nullable=True, doc="Feedback resolved flag; NULL when the ticket has no feedback")
+
+    def __repr__(self):
+        return f"<MetricsTicketState(ticket_id={self.ticket_id}, status={self.status!r}, intent={self.intent!r})>"
@@ -10,6 +10,8 @@ Responsibilities:
 - Support revocation (logout, rotation-on-refresh) — something a
   stateless JWT access token cannot do before it naturally expires.
 
+Revoked and expired rows are deleted by workers/cleanup.py.
+
 DO NOT:
 - Store the raw refresh token (only its HMAC-SHA256 hash — see
   app/core/security.py: hash_refresh_token / verify_refresh_token_hash)
@@ -18,7 +20,7 @@ DO NOT:
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -36,6 +38,18 @@ class RefreshToken(Base):
 
     __tablename__ = "refresh_tokens"
 
+    __table_args__ = (
+        # Cleanup worker: unrevoked tokens past expires_at, oldest first.
+        # Partial, so it only holds live tokens however many revoked rows
+        # accumulate between purges (alembic revision d0e1f2a3b4c5).
+        Index(
+            "ix_refresh_tokens_active_expires_at",
+            "expires_at",
+            sqlite_where=text("revoked = 0"),
+            postgresql_where=text("revoked = false"),
+        ),
+    )
+
     id = Column(
         Integer,
         primary_key=True,
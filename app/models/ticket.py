@@ -16,7 +16,7 @@ DO NOT:
 """
 
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from app.constants import TicketStatus
@@ -33,6 +33,35 @@ class Ticket(Base):
 
     __tablename__ = "tickets"
 
+    # Indexes follow the hot query shapes (filter columns first, then the
+    # created_at ordering) so list endpoints read one index range instead
+    # of scanning and sorting the table. Mirrored by alembic revision
+    # a7b8c9d0e1f2; tests/models/test_query_plans.py fails if any of those
+    # queries falls back to a full scan.
+    __table_args__ = (
+        # GET /tickets/, GET /admin/tickets (no filter): newest first
+        Index("ix_tickets_created_at", "created_at"),
+        # GET /tickets/?status=, GET /admin/tickets?status=, cleanup worker
+        Index("ix_tickets_status_created_at", "status", "created_at"),
+        # GET /tickets/ for a customer (own tickets only)
+        Index("ix_tickets_user_id_created_at", "user_id", "created_at"),
+        # GET /agent/my-assignments, unassigned-escalated count in metrics
+        Index("ix_tickets_assigned_agent_status", "assigned_agent_id", "status", "created_at"),
+        # Low-quality count and quality-by-intent in /admin/metrics
+        Index("ix_tickets_quality_score", "quality_score"),
+        # Incremental metrics collector: tickets changed since its watermark
+        # (alembic revision c9d0e1f2a3b4)
+        Index("ix_tickets_updated_at", "updated_at"),
+        # Similarity corpus (get_resolved_tickets): partial, so it only
+        # holds the rows that query can ever return
+        Index(
+            "ix_tickets_resolved_corpus",
+            "created_at",
+            sqlite_where=text("status = 'auto_resolved' AND response IS NOT NULL"),
+            postgresql_where=text("status = 'auto_resolved' AND response IS NOT NULL"),
+        ),
+    )
+
     def __init__(self, **kwargs):
         """Initialize Ticket with default status if not provided."""
         if 'status' not in kwargs:
@@ -145,6 +174,14 @@ class Ticket(Base):
         doc="Timestamp when the ticket was created",
     )
 
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        doc="Timestamp of the last write to the ticket (bulk UPDATEs included)",
+    )
+
     # -------------------------------------------------
     # Relationships
     # -------------------------------------------------
@@ -159,3 +196,7 @@ class Ticket(Base):
     user = relationship("User", foreign_keys=[user_id])
     assigned_agent = relationship("User", foreign_keys=[assigned_agent_id])
 
+
+# The rollup table is maintained on every ticket write (app/db/rollups.py),
+# so it must be registered whenever tickets are.
+from app.models import ticket_rollup  # noqa: E402,F401
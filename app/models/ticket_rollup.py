@@ -0,0 +1,99 @@
+"""
+app/models/ticket_rollup.py
+
+Purpose:
+Defines the TicketRollupHourly database model.
+
+Responsibilities:
+- Store pre-aggregated ticket and feedback counters per hour bucket
+  (ticket creation hour) x intent x status x response_source, so dashboards
+  and time-series endpoints read O(buckets) rows instead of O(tickets)
+
+Each ticket contributes to exactly one row: the bucket of its creation hour
+and its *current* intent / status / response_source. When a ticket changes
+state its contribution moves from the old row to the new one; its feedback
+(one-to-one) is counted on the same row.
+
+DO NOT:
+- Maintain the counters here (see app/db/rollups.py)
+- Write database queries here
+"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint
+
+from app.db.session import Base
+
+# Stored in place of NULL intent / response_source so the unique key works
+# on every backend (NULLs never compare equal in a UNIQUE constraint).
+NONE_KEY = ""
+
+
+class TicketRollupHourly(Base):
+    """
+    TicketRollupHourly ORM model.
+
+    One row per (bucket_start, intent, status, response_source).
+    """
+
+    __tablename__ = "ticket_rollups_hourly"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_start", "intent", "status", "response_source",
+            name="uq_ticket_rollups_hourly_key",
+        ),
+    )
+
+    # -------------------------------------------------
+    # Key
+    # -------------------------------------------------
+
+    id = Column(Integer, primary_key=True)
+
+    bucket_start = Column(
+        DateTime,
+        nullable=False,
+        index=True,
+        doc="Ticket creation time truncated to the hour (UTC)",
+    )
+
+    intent = Column(String, nullable=False, default=NONE_KEY, doc="Ticket intent ('' when unclassified)")
+    status = Column(String, nullable=False, doc="Current ticket status")
+    response_source = Column(String, nullable=False, default=NONE_KEY, doc="Response source ('' when none)")
+
+    # -------------------------------------------------
+    # Counters
+    # -------------------------------------------------
+
+    ticket_count = Column(Integer, nullable=False, default=0)
+    unassigned_count = Column(Integer, nullable=False, default=0, doc="Tickets with no assigned agent")
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    confidence_count = Column(Integer, nullable=False, default=0)
+    quality_sum = Column(Float, nullable=False, default=0.0)
+    quality_count = Column(Integer, nullable=False, default=0)
+    low_quality_count = Column(Integer, nullable=False, default=0, doc="Tickets with quality_score < 0.5")
+    feedback_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    resolved_count = Column(Integer, nullable=False, default=0, doc="Feedback entries with resolved=True")
+
+    def __repr__(self):
+        return (
+            f"<TicketRollupHourly({self.bucket_start:%Y-%m-%d %H}:00, intent={self.intent!r}, "
+            f"status={self.status!r}, tickets={self.ticket_count})>"
+        )
+
+
+# Counter columns in a fixed order; app/db/rollups.py builds its delta
+# vectors in this order.
+COUNTER_COLUMNS = (
+    "ticket_count",
+    "unassigned_count",
+    "confidence_sum",
+    "confidence_count",
+    "quality_sum",
+    "quality_count",
+    "low_quality_count",
+    "feedback_count",
+    "rating_sum",
+    "resolved_count",
+)
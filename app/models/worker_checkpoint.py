@@ -0,0 +1,63 @@
+"""
+app/models/worker_checkpoint.py
+
+Purpose:
+Defines the WorkerCheckpoint database model.
+
+Responsibilities:
+- Persist a background worker's progress between runs (a watermark plus
+  a small JSON state blob), so scheduled workers resume where they left
+  off instead of rescanning from the beginning
+
+The checkpoint lives in the application database so a worker can update
+it in the same transaction as the rows it writes.
+
+DO NOT:
+- Interpret the state blob here (each worker owns its format)
+- Write database queries here
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from app.db.session import Base
+
+
+class WorkerCheckpoint(Base):
+    """
+    WorkerCheckpoint ORM model.
+
+    One row per worker, keyed by ``name`` (e.g. ``"metrics_collector"``).
+    """
+
+    __tablename__ = "worker_checkpoints"
+
+    name = Column(
+        String(64),
+        primary_key=True,
+        doc="Worker identifier",
+    )
+
+    watermark = Column(
+        DateTime,
+        nullable=True,
+        doc="Timestamp up to which the worker has processed rows (UTC)",
+    )
+
+    state = Column(
+        Text,
+        nullable=True,
+        doc="Worker-specific JSON state",
+    )
+
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        doc="Timestamp of the last checkpoint write",
+    )
+
+    def __repr__(self):
+        return f"<WorkerCheckpoint(name={self.name!r}, watermark={self.watermark})>"
@@ -6,6 +6,7 @@ Pydantic response models for admin-level API endpoints.
 
 Responsibilities:
 - Validate and document the shape of admin metrics responses
+- Validate and document the shape of the metrics time series
 - Validate and document the shape of admin ticket list responses
 """
 
@@ -51,6 +52,25 @@ class MetricsResponse(BaseModel):
     system_health: SystemHealthSchema
 
 
+class TimeSeriesPoint(BaseModel):
+    bucket_start: str
+    tickets: int
+    by_status: dict[str, int]
+    feedback: int
+    resolved_feedback: int
+    average_confidence: float | None = None
+    average_rating: float | None = None
+
+
+class TimeSeriesResponse(BaseModel):
+    """
+    Response schema for GET /admin/metrics/timeseries.
+    """
+    interval: str
+    since: str
+    points: list[TimeSeriesPoint]
+
+
 class AdminTicketItem(BaseModel):
     """
     Single ticket entry in the admin ticket list.
@@ -79,12 +99,17 @@ class AdminTicketItem(BaseModel):
 
 
 class PaginationMeta(BaseModel):
-    page: int
+    """
+    Offset pages fill every field. Cursor pages (?cursor=) have no page
+    number, and total/total_pages are None unless include_total=true.
+    """
+    page: int | None = None
     limit: int
-    total: int
-    total_pages: int
+    total: int | None = None
+    total_pages: int | None = None
     has_next: bool
     has_prev: bool
+    next_cursor: str | None = None
 
 
 class AdminAssignRequest(BaseModel):
@@ -92,8 +92,12 @@ class TicketList(BaseModel):
 
     Fields:
     - tickets: List of TicketResponse objects
+    - total: Number of matching tickets; None for cursor pages unless
+      include_total=true was requested
+    - next_cursor: Pass as ?cursor= to fetch the next page; None on the last page
     """
 
     tickets: list[TicketResponse]
-    total: int = 0
+    total: int | None = 0
+    next_cursor: str | None = None
 
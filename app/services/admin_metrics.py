@@ -0,0 +1,340 @@
+"""
+app/services/admin_metrics.py
+
+Purpose:
+Aggregate and cache the admin dashboard metrics (GET /admin/metrics).
+
+The dashboard polls this endpoint, and it used to run about nine queries
+per refresh: several full-table COUNT(*)s, a GROUP BY on status, rating
+averages and quality-by-intent. compute_admin_metrics() now gets the same
+numbers from two conditional-aggregation queries (one over tickets, one
+over feedback). With METRICS_ROLLUPS_ENABLED the numbers come from the
+hourly rollup table instead (compute_admin_metrics_from_rollups, one query
+over O(buckets) rows), which also backs the time series. The result is
+cached for ADMIN_METRICS_CACHE_TTL_S seconds:
+
+- in-process, so repeated refreshes on one worker touch no database
+- in Redis when REDIS_URL is set, so all workers share one snapshot and
+  workers/metrics_collector.py can pre-populate it
+
+Callers pass ``max_staleness`` (seconds) to bound the age of a cached
+snapshot; 0 always recomputes.
+
+Responsibilities:
+- Compute the metrics dict returned by /admin/metrics
+- Build the /admin/metrics/timeseries series from the rollups
+- Read/write the cached snapshot (local, then Redis)
+
+DO NOT:
+- Handle HTTP request/response here
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.constants import TicketStatus
+from app.core.config import settings
+from app.db.rollups import LOW_QUALITY_THRESHOLD, bucket_start
+from app.models.feedback import Feedback
+from app.models.ticket import Ticket
+from app.models.ticket_rollup import TicketRollupHourly
+from app.services.similarity_search import _get_cache_client, _redis_manager
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "srs:admin_metrics"
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_admin_metrics(db: Session) -> dict[str, Any]:
+    """
+    Compute the /admin/metrics payload with two aggregate queries.
+
+    Tickets are grouped by (status, intent); each group row carries its
+    count, unassigned count, low-quality count and quality-score sum/count,
+    which is enough to derive every ticket and quality figure in Python
+    without another round trip.
+    """
+    ticket_rows = db.execute(
+        select(
+            Ticket.status,
+            Ticket.intent,
+            func.count(),
+            _count_if(Ticket.assigned_agent_id.is_(None)),
+            _count_if(Ticket.quality_score < LOW_QUALITY_THRESHOLD),
+            func.sum(Ticket.quality_score),
+            func.count(Ticket.quality_score),
+        ).group_by(Ticket.status, Ticket.intent)
+    ).all()
+
+    feedback_total, resolved_feedback_count, avg_rating_result = db.execute(
+        select(
+            func.count(),
+            _count_if(Feedback.resolved.is_(True)),
+            func.avg(Feedback.rating),
+        )
+    ).one()
+
+    average_rating = float(avg_rating_result) if avg_rating_result else 0.0
+    return _assemble(ticket_rows, feedback_total or 0, resolved_feedback_count, average_rating)
+
+
+def compute_admin_metrics_from_rollups(db: Session) -> dict[str, Any]:
+    """
+    Same payload as :func:`compute_admin_metrics`, read from
+    ticket_rollups_hourly in one query over O(buckets) rows.
+    """
+    r = TicketRollupHourly
+    rows = db.execute(
+        select(
+            r.status,
+            r.intent,
+            func.sum(r.ticket_count),
+            func.sum(r.unassigned_count),
+            func.sum(r.low_quality_count),
+            func.sum(r.quality_sum),
+            func.sum(r.quality_count),
+            func.sum(r.feedback_count),
+            func.sum(r.resolved_count),
+            func.sum(r.rating_sum),
+        )
+        .group_by(r.status, r.intent)
+        .having(func.sum(r.ticket_count) > 0)
+    ).all()
+
+    feedback_total = sum(row[7] for row in rows)
+    resolved_feedback_count = sum(row[8] for row in rows)
+    rating_sum = sum(row[9] for row in rows)
+    average_rating = rating_sum / feedback_total if feedback_total else 0.0
+    return _assemble([row[:7] for row in rows], feedback_total, resolved_feedback_count, average_rating)
+
+
+def _assemble(ticket_rows, total_feedback: int, resolved_feedback_count: int, average_rating: float) -> dict[str, Any]:
+    """Build the metrics dict from (status, intent, ...) group rows and feedback totals."""
+    status_counts: dict[str, int] = {}
+    quality_sums: dict[str, list[float]] = {}
+    unassigned_escalated = 0
+    low_quality_tickets = 0
+    for status, intent, count, unassigned, low_quality, quality_sum, quality_count in ticket_rows:
+        status_counts[status] = status_counts.get(status, 0) + count
+        if status == TicketStatus.ESCALATED.value:
+            unassigned_escalated += unassigned
+        low_quality_tickets += low_quality
+        if intent and quality_count:
+            acc = quality_sums.setdefault(intent, [0.0, 0])
+            acc[0] += float(quality_sum)
+            acc[1] += quality_count
+
+    total_tickets = sum(status_counts.values())
+    auto_resolved = status_counts.get(TicketStatus.AUTO_RESOLVED.value, 0)
+    escalated = status_counts.get(TicketStatus.ESCALATED.value, 0)
+    open_tickets = status_counts.get(TicketStatus.OPEN.value, 0)
+
+    # Calculate rates (avoid division by zero)
+    auto_resolve_rate = (auto_resolved / total_tickets * 100) if total_tickets > 0 else 0
+    escalation_rate = (escalated / total_tickets * 100) if total_tickets > 0 else 0
+    feedback_resolution_rate = (resolved_feedback_count / total_feedback * 100) if total_feedback > 0 else 0
+
+    return {
+        "tickets": {
+            "total": total_tickets,
+            "by_status": status_counts,
+            "auto_resolve_rate": round(auto_resolve_rate, 2),
+            "escalation_rate": round(escalation_rate, 2),
+            "open": open_tickets,
+            "auto_resolved": auto_resolved,
+            "escalated": escalated,
+            "unassigned_escalated": unassigned_escalated,
+        },
+        "feedback": {
+            "total": total_feedback,
+            "average_rating": round(average_rating, 2),
+            "resolution_rate": round(feedback_resolution_rate, 2),
+            "resolved_count": resolved_feedback_count,
+        },
+        "quality": {
+            "low_quality_count": low_quality_tickets,
+            "by_intent": {intent: round(s / n, 2) for intent, (s, n) in quality_sums.items()},
+        },
+        "system_health": {
+            "auto_resolve_rate_status": "good" if auto_resolve_rate >= 70 else "needs_improvement",
+            "escalation_rate_status": "good" if escalation_rate <= 30 else "needs_improvement",
+            "feedback_coverage": round((total_feedback / total_tickets * 100), 2) if total_tickets > 0 else 0,
+        },
+    }
+
+
+def _compute(db: Session) -> dict[str, Any]:
+    if settings.METRICS_ROLLUPS_ENABLED:
+        return compute_admin_metrics_from_rollups(db)
+    return compute_admin_metrics(db)
+
+
+def ticket_timeseries(db: Session, since: datetime, interval: str = "hour") -> list[dict[str, Any]]:
+    """
+    Per-bucket ticket and feedback figures from the hourly rollups.
+
+    Buckets are ticket *creation* time; status counts are the current
+    status of the tickets created in that bucket. ``interval="day"`` merges
+    hourly rows into UTC days. Empty buckets are omitted.
+    """
+    r = TicketRollupHourly
+    rows = db.execute(
+        select(
+            r.bucket_start,
+            r.status,
+            func.sum(r.ticket_count),
+            func.sum(r.confidence_sum),
+            func.sum(r.confidence_count),
+            func.sum(r.feedback_count),
+            func.sum(r.rating_sum),
+            func.sum(r.resolved_count),
+        )
+        .where(r.bucket_start >= bucket_start(since))
+        .group_by(r.bucket_start, r.status)
+        .having(func.sum(r.ticket_count) > 0)
+        .order_by(r.bucket_start)
+    ).all()
+
+    points: dict[datetime, dict[str, Any]] = {}
+    for start, status, tickets, conf_sum, conf_count, feedback, rating_sum, resolved in rows:
+        if interval == "day":
+            start = start.replace(hour=0)
+        point = points.setdefault(start, {
+            "tickets": 0, "by_status": {}, "_conf": [0.0, 0],
+            "feedback": 0, "_rating_sum": 0, "resolved_feedback": 0,
+        })
+        point["tickets"] += tickets
+        point["by_status"][status] = point["by_status"].get(status, 0) + tickets
+        point["_conf"][0] += conf_sum or 0.0
+        point["_conf"][1] += conf_count or 0
+        point["feedback"] += feedback
+        point["_rating_sum"] += rating_sum
+        point["resolved_feedback"] += resolved
+
+    series = []
+    for start, point in points.items():
+        conf_sum, conf_count = point.pop("_conf")
+        rating_sum = point.pop("_rating_sum")
+        series.append({
+            "bucket_start": start.isoformat(),
+            **point,
+            "average_confidence": round(conf_sum / conf_count, 3) if conf_count else None,
+            "average_rating": round(rating_sum / point["feedback"], 2) if point["feedback"] else None,
+        })
+    return series
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class _MetricsCache:
+    """Latest snapshot as ``(computed_at, metrics)``; wall-clock time so it compares with Redis entries."""
+
+    def __init__(self) -> None:
+        self._entry: tuple[float, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> tuple[float, dict[str, Any]] | None:
+        with self._lock:
+            return self._entry
+
+    def set(self, computed_at: float, metrics: dict[str, Any]) -> None:
+        with self._lock:
+            if self._entry is None or computed_at >= self._entry[0]:
+                self._entry = (computed_at, metrics)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = None
+
+
+_local_cache = _MetricsCache()
+
+
+def _read_redis() -> tuple[float, dict[str, Any]] | None:
+    cache = _get_cache_client()
+    if cache is None:
+        return None
+    try:
+        raw = cache.get(REDIS_KEY)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return float(entry["computed_at"]), entry["metrics"]
+    except Exception:
+        logger.warning("Admin metrics cache read failed; recomputing", exc_info=True)
+        _redis_manager.reset()
+        return None
+
+
+def _write_redis(computed_at: float, metrics: dict[str, Any]) -> None:
+    cache = _get_cache_client()
+    if cache is None:
+        return
+    try:
+        payload = json.dumps({"computed_at": computed_at, "metrics": metrics})
+        # Keep the key a little longer than the TTL so a max_staleness
+        # larger than the TTL can still be served from it.
+        cache.set(REDIS_KEY, payload, ex=max(1, int(settings.ADMIN_METRICS_CACHE_TTL_S * 10)))
+    except Exception:
+        logger.warning("Admin metrics cache write failed", exc_info=True)
+        _redis_manager.reset()
+
+
+def publish_admin_metrics(metrics: dict[str, Any], computed_at: float | None = None) -> None:
+    """Store a freshly computed snapshot in the local and Redis caches."""
+    computed_at = time.time() if computed_at is None else computed_at
+    _local_cache.set(computed_at, metrics)
+    _write_redis(computed_at, metrics)
+
+
+def refresh_admin_metrics(db: Session) -> dict[str, Any]:
+    """Recompute the metrics and publish them (used by workers/metrics_collector.py)."""
+    metrics = _compute(db)
+    publish_admin_metrics(metrics)
+    return metrics
+
+
+def get_admin_metrics(db: Session, max_staleness: float | None = None) -> tuple[dict[str, Any], float]:
+    """
+    Return ``(metrics, age_seconds)``, recomputing only if no cached
+    snapshot is young enough.
+
+    Args:
+        db: Session used when the metrics have to be recomputed.
+        max_staleness: Oldest acceptable snapshot in seconds. Defaults to
+            ADMIN_METRICS_CACHE_TTL_S; 0 forces a fresh computation.
+    """
+    limit = settings.ADMIN_METRICS_CACHE_TTL_S if max_staleness is None else max_staleness
+    if limit > 0:
+        now = time.time()
+        for read in (_local_cache.get, _read_redis):
+            entry = read()
+            if entry is not None and now - entry[0] <= limit:
+                _local_cache.set(*entry)
+                return entry[1], max(0.0, now - entry[0])
+
+    metrics = _compute(db)
+    publish_admin_metrics(metrics)
+    return metrics, 0.0
+
+
+def clear_admin_metrics_cache() -> None:
+    """Drop the in-process snapshot (tests; Redis entries simply expire)."""
+    _local_cache.clear()
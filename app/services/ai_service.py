@@ -27,12 +27,11 @@ from abc import ABC, abstractmethod
 from app.core.config import settings
 from app.core.exceptions import AIServiceError
 from app.core.error_handlers import handle_ai_service_failure
+from app.core.optional_imports import DEFERRED, resolve_openai
 from app.services.classifier import classify_intent_ai
 
-try:
-    from openai import OpenAI
-except ImportError:  # pragma: no cover - openai is a hard requirement in requirements.txt
-    OpenAI = None
+# Imported on first use (see app/core/optional_imports.py)
+OpenAI = DEFERRED
 
 logger = logging.getLogger(__name__)
 
@@ -53,14 +52,19 @@ def _call_openai_sentiment(text: str) -> Optional[Dict[str, Any]]:
         {"sentiment": "negative"|"neutral"|"positive", "confidence": float,
          "escalate": bool} on success, else None.
     """
-    if OpenAI is None:
+    if not (settings.AI_PROVIDER == "openai" and settings.OPENAI_API_KEY):
         return None
 
-    if not (settings.AI_PROVIDER == "openai" and settings.OPENAI_API_KEY):
+    client_class = resolve_openai(OpenAI)
+    if client_class is None:
         return None
 
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY, timeout=settings.OPENAI_TIMEOUT)
+        client = client_class(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT,
+        )
 
         system_prompt = (
             "Classify the sentiment of a customer support message as "
@@ -4,13 +4,12 @@ import re
 from typing import Optional
 
 from app.core.config import settings
+from app.core.optional_imports import DEFERRED, resolve_openai
 
 logger = logging.getLogger(__name__)
 
-try:
-    from openai import OpenAI
-except ImportError:  # pragma: no cover - openai is a hard requirement in requirements.txt
-    OpenAI = None
+# Imported on first use (see app/core/optional_imports.py)
+OpenAI = DEFERRED
 
 
 # Intents the model is allowed to return. Kept in sync with the rule-based
@@ -353,14 +352,19 @@ def _call_openai_classifier(message: str) -> Optional[dict[str, str | float]]:
     Returns:
         {"intent": str, "confidence": float} on success, else None.
     """
-    if OpenAI is None:
+    if not (settings.AI_PROVIDER == "openai" and settings.OPENAI_API_KEY):
         return None
 
-    if not (settings.AI_PROVIDER == "openai" and settings.OPENAI_API_KEY):
+    client_class = resolve_openai(OpenAI)
+    if client_class is None:
         return None
 
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY, timeout=settings.OPENAI_TIMEOUT)
+        client = client_class(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT,
+        )
 
         system_prompt = (
             "You classify customer support tickets into exactly one of these "
@@ -0,0 +1,208 @@
+"""
+app/services/cold_storage.py
+
+Purpose:
+Write archived tickets to cold storage and read them back.
+
+Archived tickets are moved out of the hot ``tickets`` / ``feedback`` tables
+by workers/cleanup.py (--offload) into COLD_STORAGE_DIR:
+
+- ``tickets-<first id>-<last id>-<stamp>.jsonl.gz``: one segment per batch;
+  one JSON object per line: the ticket's columns plus its ``feedback``
+  (or null)
+- ``manifest.json``: ``{"segments": [...]}``, one entry per segment with
+  its id range, row counts and sha256
+
+Segments and the manifest are written to a temporary name and renamed
+into place, so readers never see a partial file. A segment is listed in
+the manifest before its rows are deleted from the database; a crash in
+between only leaves a duplicate copy that the next offload supersedes.
+
+Responsibilities:
+- Serialize ticket + feedback rows into segments and record them in the manifest
+- Find an offloaded ticket by id (read-through for GET /tickets/{id})
+
+DO NOT:
+- Delete database rows here (the cleanup worker owns that)
+- Handle HTTP request/response here
+
+A single offload writer per directory is assumed.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def make_record(ticket_row: dict, feedback_row: dict | None) -> dict:
+    """One segment line: ticket columns plus its feedback (JSON-safe)."""
+    record = {key: _json_value(value) for key, value in ticket_row.items()}
+    record["feedback"] = (
+        {key: _json_value(value) for key, value in feedback_row.items()} if feedback_row else None
+    )
+    return record
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def read_manifest(directory: Path) -> list[dict]:
+    """Manifest segment entries, oldest first ([] when nothing was offloaded)."""
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["segments"]
+    except FileNotFoundError:
+        return []
+
+
+def write_segment(directory: Path, records: Iterable[dict]) -> dict:
+    """
+    Write *records* (from :func:`make_record`, ascending id) as a new
+    segment and append it to the manifest.
+
+    Returns:
+        The manifest entry for the segment.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    records = list(records)
+    if not records:
+        raise ValueError("write_segment needs at least one record")
+
+    payload = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+    data = gzip.compress(payload, mtime=0)
+    min_id, max_id = records[0]["id"], records[-1]["id"]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    name = f"tickets-{min_id:012d}-{max_id:012d}-{stamp}.jsonl.gz"
+    _atomic_write(directory / name, data)
+
+    entry = {
+        "file": name,
+        "min_id": min_id,
+        "max_id": max_id,
+        "tickets": len(records),
+        "feedback": sum(1 for r in records if r["feedback"] is not None),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "written_at": datetime.now(timezone.utc).isoformat(),
+    }
+    segments = read_manifest(directory) + [entry]
+    _atomic_write(
+        directory / MANIFEST_NAME,
+        json.dumps({"segments": segments}, indent=1).encode("utf-8"),
+    )
+    return entry
+
+
+# -------------------------------------------------
+# Read-through
+# -------------------------------------------------
+
+
+class _ManifestIndex:
+    """Manifest entries sorted by min_id, reloaded when manifest.json changes."""
+
+    def __init__(self) -> None:
+        self._key: tuple | None = None
+        self._entries: list[dict] = []
+        self._starts: list[int] = []
+        self._lock = threading.Lock()
+
+    def covering(self, directory: Path, ticket_id: int) -> list[dict]:
+        """Entries whose id range contains *ticket_id*, newest first."""
+        path = directory / MANIFEST_NAME
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return []
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key != self._key:
+                self._entries = sorted(read_manifest(directory), key=lambda e: e["min_id"])
+                self._starts = [e["min_id"] for e in self._entries]
+                self._key = key
+            entries, starts = self._entries, self._starts
+        candidates = entries[:bisect_right(starts, ticket_id)]
+        hits = [e for e in candidates if e["max_id"] >= ticket_id]
+        return sorted(hits, key=lambda e: e["written_at"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._entries = []
+            self._starts = []
+
+
+_manifest_index = _ManifestIndex()
+
+
+@lru_cache(maxsize=8)
+def _load_segment(path: str, _mtime_ns: int) -> dict[int, dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        return {record["id"]: record for record in map(json.loads, fh)}
+
+
+def find_offloaded_ticket(ticket_id: int, directory: str | Path | None = None) -> dict | None:
+    """
+    Return the offloaded record for *ticket_id*, or None.
+
+    Blocking file I/O: call through run_in_threadpool from async code.
+    Uses COLD_STORAGE_DIR when *directory* is not given.
+    """
+    directory = directory or settings.COLD_STORAGE_DIR
+    if not directory:
+        return None
+    directory = Path(directory)
+    for entry in _manifest_index.covering(directory, ticket_id):
+        path = directory / entry["file"]
+        try:
+            record = _load_segment(str(path), path.stat().st_mtime_ns).get(ticket_id)
+        except FileNotFoundError:
+            logger.warning("Cold-storage segment %s listed in the manifest is missing", path)
+            continue
+        if record is not None:
+            return record
+    return None
+
+
+def clear_cold_storage_cache() -> None:
+    """Forget cached manifest/segment contents (tests)."""
+    _manifest_index.clear()
+    _load_segment.cache_clear()
@@ -0,0 +1,268 @@
+"""
+app/services/email_outbox.py
+
+Purpose:
+Queue transactional email in the email_outbox table and deliver it from a
+worker (workers/email_outbox.py), so a request never waits on the email
+provider.
+
+- enqueue_otp_email() adds the email to the caller's session; it is queued
+  when, and only when, the caller commits (together with the OTP hash).
+- deliver_due() claims up to a batch of due rows (``FOR UPDATE SKIP
+  LOCKED`` on PostgreSQL, so several workers never send the same row),
+  sends them in one provider call and records the outcome. A failed call
+  is retried with exponential backoff (EMAIL_OUTBOX_RETRY_BASE_S doubling
+  up to EMAIL_OUTBOX_RETRY_MAX_S) until EMAIL_OUTBOX_MAX_ATTEMPTS; an
+  email past its expires_at is dropped instead of sent.
+- Payloads are encrypted with Fernet (EMAIL_OUTBOX_KEY, or a key derived
+  from SECRET_KEY) and cleared once the row leaves ``pending``, so the
+  raw OTP is only ever at rest while it waits to be sent.
+
+Senders take a list of EmailMessage and either return (all accepted) or
+raise; EmailDeliveryError(permanent=True) skips the remaining retries.
+
+Responsibilities:
+- Queue emails; render, send and retry them
+
+DO NOT:
+- Commit in enqueue_*(): the caller's transaction decides
+- Send email from request handlers
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.otp import log_otp_for_dev
+from app.models.email_outbox import EXPIRED, FAILED, PENDING, SENT, EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+EMAIL_FROM = "onboarding@resend.dev"
+
+OTP_EMAIL = "otp"
+
+
+@dataclass
+class EmailMessage:
+    """A rendered email, plus the template context it was rendered from."""
+
+    to: str
+    subject: str
+    html: str
+    kind: str
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+class EmailDeliveryError(Exception):
+    """A send failed; ``permanent`` means retrying cannot help."""
+
+    def __init__(self, message: str, permanent: bool = False) -> None:
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class EmailSender(Protocol):
+    def send(self, messages: list[EmailMessage]) -> None: ...
+
+
+# -------------------------------------------------
+# Payload encryption
+# -------------------------------------------------
+
+def _fernet() -> Fernet:
+    key = settings.EMAIL_OUTBOX_KEY
+    if not key:
+        digest = hashlib.sha256(b"srs-email-outbox:" + settings.SECRET_KEY.encode("utf-8")).digest()
+        key = base64.urlsafe_b64encode(digest).decode("ascii")
+    return Fernet(key)
+
+
+def _encrypt(context: dict[str, Any]) -> str:
+    return _fernet().encrypt(json.dumps(context).encode("utf-8")).decode("ascii")
+
+
+def _decrypt(payload: str) -> dict[str, Any]:
+    return json.loads(_fernet().decrypt(payload.encode("ascii")))
+
+
+# -------------------------------------------------
+# Queueing
+# -------------------------------------------------
+
+def enqueue_otp_email(db: Session, recipient: str, otp: str, expires_at: datetime) -> EmailOutbox:
+    """
+    Queue the password-reset OTP email in *db*'s transaction (not committed).
+
+    The email is dropped rather than sent once the OTP expires.
+    """
+    row = EmailOutbox(
+        kind=OTP_EMAIL,
+        recipient=recipient,
+        payload=_encrypt({"otp": otp}),
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+        expires_at=expires_at,
+    )
+    db.add(row)
+    return row
+
+
+def render(kind: str, recipient: str, context: dict[str, Any]) -> EmailMessage:
+    """Build the email for a queued row."""
+    if kind == OTP_EMAIL:
+        return EmailMessage(
+            to=recipient,
+            subject="Your SRS OTP Code",
+            html=f"<p>Your OTP is: <strong>{context['otp']}</strong>. It expires in 10 minutes.</p>",
+            kind=kind,
+            context=context,
+        )
+    raise ValueError(f"Unknown email kind: {kind!r}")
+
+
+# -------------------------------------------------
+# Senders
+# -------------------------------------------------
+
+class ResendSender:
+    """Send through the Resend batch API: one HTTP call per batch."""
+
+    def send(self, messages: list[EmailMessage]) -> None:
+        import resend  # only the worker sends; keeps it out of API startup
+
+        resend.api_key = settings.RESEND_API_KEY
+        resend.Batch.send([
+            {"from": EMAIL_FROM, "to": m.to, "subject": m.subject, "html": m.html}
+            for m in messages
+        ])
+
+
+class DevLogSender:
+    """
+    Stand-in when RESEND_API_KEY is not set: in development the OTP is
+    logged (app/core/otp.py:log_otp_for_dev); elsewhere the email fails for
+    good, so reset codes never appear in production logs.
+    """
+
+    def send(self, messages: list[EmailMessage]) -> None:
+        if settings.ENV != "development":
+            raise EmailDeliveryError("RESEND_API_KEY not configured", permanent=True)
+        for message in messages:
+            if message.kind == OTP_EMAIL:
+                log_otp_for_dev(message.to, message.context["otp"])
+            else:
+                logger.debug("DEV LOG — email to %s: %s", message.to, message.subject)
+
+
+def get_email_sender() -> EmailSender:
+    """The sender for the configured provider."""
+    if settings.RESEND_API_KEY:
+        return ResendSender()
+    logger.warning("RESEND_API_KEY not configured — using development fallback")
+    return DevLogSender()
+
+
+# -------------------------------------------------
+# Delivery
+# -------------------------------------------------
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; every value here is UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next try, after *attempts* failed ones (>= 1)."""
+    seconds = settings.EMAIL_OUTBOX_RETRY_BASE_S * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_RETRY_MAX_S))
+
+
+def _finish(row: EmailOutbox, status: str, error: str | None = None) -> None:
+    row.status = status
+    row.payload = None
+    if error is not None:
+        row.last_error = error[:255]
+
+
+def deliver_due(
+    db: Session,
+    sender: EmailSender,
+    batch_size: int | None = None,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """
+    Send one batch of due emails and commit the outcome.
+
+    Args:
+        db: Session on the primary database.
+        sender: Where the emails go (see get_email_sender()).
+        batch_size: Rows per batch; EMAIL_OUTBOX_BATCH_SIZE by default.
+        now: Current time (tests).
+
+    Returns:
+        Counts: ``claimed`` rows, and how many were ``sent`` / ``retried``
+        / ``failed`` / ``expired``. ``claimed == 0`` means nothing was due.
+    """
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    summary = {"claimed": 0, "sent": 0, "retried": 0, "failed": 0, "expired": 0}
+
+    rows = db.execute(
+        select(EmailOutbox)
+        .where(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    summary["claimed"] = len(rows)
+
+    batch: list[tuple[EmailOutbox, EmailMessage]] = []
+    for row in rows:
+        if row.expires_at is not None and _as_utc(row.expires_at) <= now:
+            _finish(row, EXPIRED)
+            summary["expired"] += 1
+            continue
+        try:
+            batch.append((row, render(row.kind, row.recipient, _decrypt(row.payload))))
+        except (InvalidToken, ValueError, KeyError, TypeError) as exc:
+            # Key rotated, or a template that no longer exists.
+            logger.error("Email outbox row %s cannot be rendered: %r", row.id, exc)
+            _finish(row, FAILED, f"render: {exc!r}")
+            summary["failed"] += 1
+
+    if batch:
+        try:
+            sender.send([message for _row, message in batch])
+        except Exception as exc:
+            permanent = isinstance(exc, EmailDeliveryError) and exc.permanent
+            logger.warning("Sending %d email(s) failed: %s", len(batch), exc)
+            for row, _message in batch:
+                row.attempts += 1
+                if permanent or row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    _finish(row, FAILED, str(exc) or type(exc).__name__)
+                    summary["failed"] += 1
+                else:
+                    row.last_error = (str(exc) or type(exc).__name__)[:255]
+                    row.next_attempt_at = now + retry_delay(row.attempts)
+                    summary["retried"] += 1
+        else:
+            for row, _message in batch:
+                _finish(row, SENT)
+                row.sent_at = now
+            summary["sent"] += len(batch)
+
+    db.commit()
+    return summary
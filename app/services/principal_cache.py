@@ -0,0 +1,357 @@
+"""
+app/services/principal_cache.py
+
+Purpose:
+Cache the authenticated principal (the ``users`` row behind an access
+token) so get_current_user / get_current_user_async don't run
+``SELECT ... FROM users WHERE id = ?`` on every authenticated request.
+
+Two tiers, both keyed by user id:
+
+- an in-process LRU of :data:`MAX_ENTRIES` users
+- Redis, when REDIS_URL is set, shared by every worker process
+
+Entries expire after PRINCIPAL_CACHE_TTL_S and carry the user's version
+stamp. Every committed change to a users row made through a Session (ORM
+flush or bulk UPDATE/DELETE: password resets, OTP state, role or
+is_active changes) bumps the stamp and drops the entry. A loader reads the
+stamp before it queries the database and its result is only used while
+the stamp is unchanged, so a concurrent invalidation is never papered over
+with pre-change data.
+
+With Redis the stamp lives there (one MGET per request), so an
+invalidation is seen by every process immediately. Without Redis it only
+reaches the process that made the change; other processes pick it up when
+their entry expires. Writes that bypass the Session (raw SQL, Core
+statements on an engine) are likewise only seen after the TTL.
+
+Responsibilities:
+- Look up / store the authorization fields of a user
+- Invalidate users changed by a committed transaction (Session events)
+
+DO NOT:
+- Cache credentials (hashed_password, reset OTP); only the fields
+  authorization reads
+- Cache misses: an unknown user id always goes to the database
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Columns served from the cache. Anything else is lazy-loaded from the
+# database on first access, as for any expired attribute.
+PRINCIPAL_FIELDS = ("id", "email", "role", "is_active")
+
+MAX_ENTRIES = 4096
+
+REDIS_ENTRY_PREFIX = "srs:principal:"
+REDIS_VERSION_PREFIX = "srs:principal_version:"
+
+_CHANGED_KEY = "principal_cache_changed"
+
+
+def _redis():
+    # Imported lazily: app.services.similarity_search pulls in the models,
+    # and this module is loaded by app/db/session.py.
+    from app.services.similarity_search import _get_cache_client
+
+    return _get_cache_client()
+
+
+def _reset_redis() -> None:
+    from app.services.similarity_search import _redis_manager
+
+    _redis_manager.reset()
+
+
+# -------------------------------------------------
+# In-process tier
+# -------------------------------------------------
+
+
+class _LocalCache:
+    """LRU of ``user_id -> (version, cached_at, fields)`` plus local version stamps."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[int, float, dict[str, Any]]] = OrderedDict()
+        # Stamps of users invalidated in this process (used without Redis).
+        # Versions come from one increasing counter; users not in the dict
+        # are at _floor, which pruning raises past every version handed out.
+        self._versions: dict[int, int] = {}
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        with self._lock:
+            return self._versions.get(user_id, self._floor)
+
+    def get(self, user_id: int, version: int, ttl: float) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] != version or time.time() - entry[1] > ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[2]
+
+    def put(
+        self,
+        user_id: int,
+        version: int,
+        fields: dict[str, Any],
+        cached_at: float,
+        check_version: bool,
+    ) -> None:
+        with self._lock:
+            if check_version and self._versions.get(user_id, self._floor) != version:
+                return
+            self._entries[user_id] = (version, cached_at, fields)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._counter += 1
+                self._versions[user_id] = self._counter
+                self._entries.pop(user_id, None)
+            if len(self._versions) > 2 * self._max_entries:
+                # Keep the stamps of cached users; the rest move to the new
+                # floor. Runs at most once per max_entries invalidations.
+                self._versions = {
+                    user_id: self._versions.get(user_id, self._floor) for user_id in self._entries
+                }
+                self._floor = self._counter
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._floor = self._counter
+
+
+_local_cache = _LocalCache(MAX_ENTRIES)
+
+
+# -------------------------------------------------
+# Lookup / store
+# -------------------------------------------------
+
+
+def principal_fields(user) -> dict[str, Any]:
+    """The cached subset of a User's columns."""
+    return {name: getattr(user, name) for name in PRINCIPAL_FIELDS}
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller as seen by ``async def`` routes.
+
+    Plain data rather than an ORM instance: attributes outside
+    :data:`PRINCIPAL_FIELDS` would have to lazy-load, which an AsyncSession
+    cannot do. A route that needs more of the user loads it explicitly.
+    """
+
+    id: int
+    email: str
+    role: str
+    is_active: bool
+
+
+def principal_user(fields: dict[str, Any]):
+    """
+    A detached User carrying only the cached fields.
+
+    Merge it into the request's session with ``load=False`` (no SELECT);
+    other attributes then load on first access like expired ones.
+    """
+    from app.models.user import User
+
+    user = User(**fields)
+    make_transient_to_detached(user)
+    return user
+
+
+def get_principal(user_id: int) -> tuple[dict[str, Any] | None, int | None]:
+    """
+    Return ``(fields, version)`` for *user_id*.
+
+    *fields* is None on a miss; pass *version* to :func:`store_principal`
+    after loading the user. A None *version* means "do not store" (cache
+    disabled or Redis unavailable).
+    """
+    ttl = settings.PRINCIPAL_CACHE_TTL_S
+    if ttl <= 0:
+        return None, None
+
+    cache = _redis()
+    if cache is None:
+        version = _local_cache.version(user_id)
+        return _local_cache.get(user_id, version, ttl), version
+
+    try:
+        raw_version, raw_entry = cache.mget(
+            REDIS_VERSION_PREFIX + str(user_id), REDIS_ENTRY_PREFIX + str(user_id)
+        )
+    except Exception:
+        logger.warning("Principal cache read failed; loading user %s from the database", user_id, exc_info=True)
+        _reset_redis()
+        return None, None
+
+    version = int(raw_version or 0)
+    fields = _local_cache.get(user_id, version, ttl)
+    if fields is None and raw_entry is not None:
+        entry = json.loads(raw_entry)
+        if entry["version"] == version and time.time() - entry["cached_at"] <= ttl:
+            fields = entry["fields"]
+            _local_cache.put(user_id, version, fields, entry["cached_at"], check_version=False)
+    return fields, version
+
+
+def store_principal(user_id: int, version: int | None, fields: dict[str, Any]) -> None:
+    """Cache *fields* under the *version* returned by :func:`get_principal`."""
+    ttl = settings.PRINCIPAL_CACHE_TTL_S
+    if version is None or ttl <= 0:
+        return
+
+    now = time.time()
+    cache = _redis()
+    if cache is None:
+        _local_cache.put(user_id, version, fields, now, check_version=True)
+        return
+
+    _local_cache.put(user_id, version, fields, now, check_version=False)
+    try:
+        payload = json.dumps({"version": version, "cached_at": now, "fields": fields})
+        cache.set(REDIS_ENTRY_PREFIX + str(user_id), payload, ex=max(1, int(ttl)))
+    except Exception:
+        logger.warning("Principal cache write failed", exc_info=True)
+        _reset_redis()
+
+
+async def get_principal_async(user_id: int) -> tuple[dict[str, Any] | None, int | None]:
+    """:func:`get_principal` for async code (Redis calls go to the threadpool)."""
+    if _redis() is None:
+        return get_principal(user_id)
+    return await run_in_threadpool(get_principal, user_id)
+
+
+async def store_principal_async(user_id: int, version: int | None, fields: dict[str, Any]) -> None:
+    """:func:`store_principal` for async code (Redis calls go to the threadpool)."""
+    if _redis() is None:
+        store_principal(user_id, version, fields)
+    else:
+        await run_in_threadpool(store_principal, user_id, version, fields)
+
+
+def invalidate_principals(user_ids: Iterable[int]) -> None:
+    """Bump the version stamp of *user_ids* and drop their cached entries."""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    _local_cache.invalidate(user_ids)
+
+    cache = _redis()
+    if cache is None:
+        return
+    # An expired stamp reads as version 0 again; entries stored before the
+    # bump are gone by then (they live PRINCIPAL_CACHE_TTL_S), and the
+    # margin covers a loader still holding the old version.
+    version_ttl = max(1, int(2 * settings.PRINCIPAL_CACHE_TTL_S))
+    try:
+        pipe = cache.pipeline()
+        for user_id in user_ids:
+            pipe.incr(REDIS_VERSION_PREFIX + str(user_id))
+            pipe.expire(REDIS_VERSION_PREFIX + str(user_id), version_ttl)
+            pipe.delete(REDIS_ENTRY_PREFIX + str(user_id))
+        pipe.execute()
+    except Exception:
+        # Other processes keep their entries until the TTL runs out.
+        logger.warning("Principal cache invalidation failed for users %s", user_ids, exc_info=True)
+        _reset_redis()
+
+
+def clear_principal_cache() -> None:
+    """Drop the in-process tier (tests, or after writes that bypassed the Session)."""
+    _local_cache.clear()
+
+
+# -------------------------------------------------
+# Session events
+# -------------------------------------------------
+
+
+def _user_class():
+    from app.models.user import User
+
+    return User
+
+
+def _record(session: Session, user_ids: Iterable[int]) -> None:
+    session.info.setdefault(_CHANGED_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, _flush_context, _instances) -> None:
+    User = _user_class()
+    changed = [
+        obj.id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+        and (obj in session.deleted or session.is_modified(obj))
+    ]
+    if changed:
+        _record(session, changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_statement(state: ORMExecuteState) -> None:
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    User = _user_class()
+    if state.bind_mapper.class_ is not User:
+        return
+
+    params = state.parameters
+    if isinstance(params, (list, tuple)):
+        # ORM "bulk UPDATE by primary key": one parameter dict per row.
+        ids = [p["id"] for p in params if "id" in p]
+    else:
+        id_query = select(User.id)
+        if state.statement.whereclause is not None:
+            id_query = id_query.where(state.statement.whereclause)
+        ids = list(state.session.connection().execute(id_query, params or {}).scalars())
+    _record(state.session, ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        invalidate_principals(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_KEY, None)
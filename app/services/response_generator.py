@@ -19,12 +19,10 @@ DO NOT:
 from typing import Optional, Tuple
 import re
 from app.core.config import settings
+from app.core.optional_imports import DEFERRED, resolve_openai
 
-# Attempt global import for OpenAI (Issue #12)
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None
+# Imported on first use (see app/core/optional_imports.py)
+OpenAI = DEFERRED
 
 
 def _call_openai(intent: str, sub_intent: Optional[str], message: str) -> Optional[str]:
@@ -40,14 +38,16 @@ def _call_openai(intent: str, sub_intent: Optional[str], message: str) -> Option
         str: Generated response or None if API call fails
     """
     # Check if OpenAI is effectively installed
-    if OpenAI is None:
+    client_class = resolve_openai(OpenAI)
+    if client_class is None:
         # OpenAI not available
         return None
     
     # Make OpenAI API call
     try:
-        client = OpenAI(
+        client = client_class(
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
             timeout=settings.OPENAI_TIMEOUT
         )
         
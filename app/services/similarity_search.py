@@ -6,6 +6,8 @@ from app.core.config import settings
 from app.models.ticket import Ticket
 from app.utils.service_helpers import CacheHelper, ErrorHelper, MetricsHelper
 from app.constants import TicketStatus
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -117,20 +119,29 @@ def _cosine_similarity(tfidf1: dict[str, float], tfidf2: dict[str, float]) -> fl
     return dot_product / (magnitude1 * magnitude2)
 
 
-def get_resolved_tickets(db: Session) -> list[Ticket]:
-    """Fetch recent successfully resolved tickets for similarity search."""
+def _resolved_tickets_query():
+    """Most recent auto-resolved tickets with a response (the similarity corpus)."""
     return (
-        db.query(Ticket)
-        .filter(
+        select(Ticket)
+        .where(
             Ticket.status == TicketStatus.AUTO_RESOLVED.value,
             Ticket.response.isnot(None),
         )
         .order_by(Ticket.created_at.desc())
         .limit(50)
-        .all()
     )
 
 
+def get_resolved_tickets(db: Session) -> list[Ticket]:
+    """Fetch recent successfully resolved tickets for similarity search."""
+    return list(db.scalars(_resolved_tickets_query()))
+
+
+async def get_resolved_tickets_async(db: AsyncSession) -> list[Ticket]:
+    """Async variant of :func:`get_resolved_tickets` for AsyncSession callers."""
+    return list(await db.scalars(_resolved_tickets_query()))
+
+
 def find_similar_ticket(new_message: str, resolved_tickets: list[dict], similarity_threshold: float = None) -> dict | None:
     """
     Find the most similar resolved ticket to a new ticket message.
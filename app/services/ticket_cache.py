@@ -0,0 +1,347 @@
+"""
+app/services/ticket_cache.py
+
+Purpose:
+Read-through cache for ticket reads: GET /tickets/{id}, and the first page
+of a regular user's GET /tickets/ (their own tickets, no cursor). Tickets
+change on a handful of transitions (automation, assign, accept, close,
+feedback) but dashboards and users poll them constantly.
+
+Same two-tier scheme as app/services/principal_cache.py:
+
+- an in-process LRU of :data:`MAX_ENTRIES` entries
+- Redis, when REDIS_URL is set, shared by every worker process
+
+Every entry carries a version stamp: the ticket's for a single ticket, the
+owning user's for a list page. Committed writes made through any Session
+bump the stamps of the tickets they touch and of their owners (Session
+events below: ORM inserts, updates and deletes, and bulk UPDATE/DELETE
+statements), so every write path -- ticket_service automation, the agent
+and admin endpoints, feedback_service -- invalidates without having to
+remember to. A loader reads the stamp before it queries the database and
+its result is only stored while the stamp is unchanged. Writes that bypass
+the Session (raw SQL, Core statements on an engine) are only seen after
+TICKET_CACHE_TTL_S.
+
+Entries hold the response data only. Callers still run their ownership
+checks on every hit.
+
+Responsibilities:
+- Look up / store cached ticket responses and user list pages
+- Invalidate them when tickets are written (Session events)
+
+DO NOT:
+- Cache what agents and admins list (every ticket write would invalidate it)
+- Decide who may see a ticket here (the endpoints do)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 8192
+
+REDIS_ENTRY_PREFIX = "srs:ticket_cache:"
+REDIS_VERSION_PREFIX = "srs:ticket_cache_version:"
+
+_CHANGED_KEY = "ticket_cache_changed"
+
+
+def _redis():
+    # Imported lazily: app.services.similarity_search pulls in the models,
+    # and this module is loaded by app/db/session.py.
+    from app.services.similarity_search import _get_cache_client
+
+    return _get_cache_client()
+
+
+def _reset_redis() -> None:
+    from app.services.similarity_search import _redis_manager
+
+    _redis_manager.reset()
+
+
+def ticket_stamp(ticket_id: int) -> str:
+    return f"ticket:{ticket_id}"
+
+
+def user_stamp(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def ticket_key(ticket_id: int) -> str:
+    return ticket_stamp(ticket_id)
+
+
+def user_list_key(user_id: int, status: str | None, limit: int, with_total: bool) -> str:
+    return f"{user_stamp(user_id)}:list:{status or ''}:{limit}:{int(with_total)}"
+
+
+# -------------------------------------------------
+# In-process tier
+# -------------------------------------------------
+
+
+class _LocalCache:
+    """LRU of ``key -> (stamp, version, cached_at, value)`` plus local version stamps."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, int, float, Any]] = OrderedDict()
+        # Stamps invalidated in this process (used without Redis). Versions
+        # come from one increasing counter; stamps not in the dict are at
+        # _floor. Pruning stamps without entries raises _floor past every
+        # version handed out, so a loader that read a pruned stamp can't
+        # store under it.
+        self._versions: dict[str, int] = {}
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def version(self, stamp: str) -> int:
+        with self._lock:
+            return self._versions.get(stamp, self._floor)
+
+    def get(self, key: str, version: int, ttl: float) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] != version or time.time() - entry[2] > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[3]
+
+    def put(self, key: str, stamp: str, version: int, value: Any, cached_at: float, check_version: bool) -> None:
+        with self._lock:
+            if check_version and self._versions.get(stamp, self._floor) != version:
+                return
+            self._entries[key] = (stamp, version, cached_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, stamps: Iterable[str]) -> None:
+        # List entries under a user stamp are dropped lazily (version mismatch).
+        with self._lock:
+            for stamp in stamps:
+                self._counter += 1
+                self._versions[stamp] = self._counter
+                self._entries.pop(stamp, None)
+            if len(self._versions) > 2 * self._max_entries:
+                self._prune()
+
+    def _prune(self) -> None:
+        # Keep the stamps of live entries at their current version; the rest
+        # move to the new floor. Leaves at most max_entries stamps, so this
+        # runs at most once per max_entries invalidations.
+        live = {entry[0]: self._versions.get(entry[0], self._floor) for entry in self._entries.values()}
+        self._versions = live
+        self._floor = self._counter
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._floor = self._counter
+
+
+_local_cache = _LocalCache(MAX_ENTRIES)
+
+
+# -------------------------------------------------
+# Lookup / store
+# -------------------------------------------------
+
+
+def get_cached(key: str, stamp: str) -> tuple[Any, int | None]:
+    """
+    Return ``(value, version)`` for *key*, whose entries are invalidated
+    through *stamp*.
+
+    *value* is None on a miss; pass *version* to :func:`store_cached`
+    after loading. A None *version* means "do not store" (cache disabled or
+    Redis unavailable).
+    """
+    ttl = settings.TICKET_CACHE_TTL_S
+    if ttl <= 0:
+        return None, None
+
+    cache = _redis()
+    if cache is None:
+        version = _local_cache.version(stamp)
+        return _local_cache.get(key, version, ttl), version
+
+    try:
+        raw_version, raw_entry = cache.mget(REDIS_VERSION_PREFIX + stamp, REDIS_ENTRY_PREFIX + key)
+    except Exception:
+        logger.warning("Ticket cache read failed; loading %s from the database", key, exc_info=True)
+        _reset_redis()
+        return None, None
+
+    version = int(raw_version or 0)
+    value = _local_cache.get(key, version, ttl)
+    if value is None and raw_entry is not None:
+        entry = json.loads(raw_entry)
+        if entry["version"] == version and time.time() - entry["cached_at"] <= ttl:
+            value = entry["value"]
+            _local_cache.put(key, stamp, version, value, entry["cached_at"], check_version=False)
+    return value, version
+
+
+def store_cached(key: str, stamp: str, version: int | None, value: Any) -> None:
+    """Cache JSON-serializable *value* under the *version* from :func:`get_cached`."""
+    ttl = settings.TICKET_CACHE_TTL_S
+    if version is None or ttl <= 0:
+        return
+
+    now = time.time()
+    cache = _redis()
+    if cache is None:
+        _local_cache.put(key, stamp, version, value, now, check_version=True)
+        return
+
+    _local_cache.put(key, stamp, version, value, now, check_version=False)
+    try:
+        payload = json.dumps({"version": version, "cached_at": now, "value": value})
+        cache.set(REDIS_ENTRY_PREFIX + key, payload, ex=max(1, int(ttl)))
+    except Exception:
+        logger.warning("Ticket cache write failed", exc_info=True)
+        _reset_redis()
+
+
+async def get_cached_async(key: str, stamp: str) -> tuple[Any, int | None]:
+    """:func:`get_cached` for async code (Redis calls go to the threadpool)."""
+    if _redis() is None:
+        return get_cached(key, stamp)
+    return await run_in_threadpool(get_cached, key, stamp)
+
+
+async def store_cached_async(key: str, stamp: str, version: int | None, value: Any) -> None:
+    """:func:`store_cached` for async code (Redis calls go to the threadpool)."""
+    if _redis() is None:
+        store_cached(key, stamp, version, value)
+    else:
+        await run_in_threadpool(store_cached, key, stamp, version, value)
+
+
+def invalidate(stamps: Iterable[str]) -> None:
+    """Bump *stamps* and drop the entries cached under them."""
+    stamps = sorted(set(stamps))
+    if not stamps:
+        return
+    _local_cache.invalidate(stamps)
+
+    cache = _redis()
+    if cache is None:
+        return
+    # Stamps expire so bulk writes don't leave a key per row behind. An
+    # expired stamp reads as version 0 again; entries stored before the bump
+    # are gone by then (they live TICKET_CACHE_TTL_S), and the margin covers
+    # a loader still holding the old version.
+    version_ttl = max(1, int(2 * settings.TICKET_CACHE_TTL_S))
+    try:
+        pipe = cache.pipeline()
+        for stamp in stamps:
+            pipe.incr(REDIS_VERSION_PREFIX + stamp)
+            pipe.expire(REDIS_VERSION_PREFIX + stamp, version_ttl)
+            pipe.delete(REDIS_ENTRY_PREFIX + stamp)
+        pipe.execute()
+    except Exception:
+        # Other processes keep their entries until the TTL runs out.
+        logger.warning("Ticket cache invalidation failed for %s", stamps, exc_info=True)
+        _reset_redis()
+
+
+def clear_ticket_cache() -> None:
+    """Drop the in-process tier (tests, or after writes that bypassed the Session)."""
+    _local_cache.clear()
+
+
+# -------------------------------------------------
+# Session events
+# -------------------------------------------------
+
+
+def _ticket_class():
+    from app.models.ticket import Ticket
+
+    return Ticket
+
+
+def _record(session: Session, stamps: Iterable[str]) -> None:
+    session.info.setdefault(_CHANGED_KEY, set()).update(stamps)
+
+
+def _owner_stamps(ticket) -> list[str]:
+    # Current owner, plus the previous one if user_id itself changed.
+    history = inspect(ticket).attrs.user_id.history
+    owners = {ticket.user_id, *history.deleted}
+    return [user_stamp(user_id) for user_id in owners if user_id is not None]
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, _flush_context, _instances) -> None:
+    Ticket = _ticket_class()
+    stamps = []
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            stamps.extend(_owner_stamps(obj))
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Ticket) and obj.id is not None and (obj in session.deleted or session.is_modified(obj)):
+            stamps.append(ticket_stamp(obj.id))
+            stamps.extend(_owner_stamps(obj))
+    if stamps:
+        _record(session, stamps)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_statement(state: ORMExecuteState) -> None:
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    Ticket = _ticket_class()
+    if state.bind_mapper.class_ is not Ticket:
+        return
+
+    params = state.parameters
+    if isinstance(params, (list, tuple)):
+        # ORM "bulk UPDATE by primary key": one parameter dict per row.
+        ids = [p["id"] for p in params if "id" in p]
+        rows = state.session.connection().execute(select(Ticket.id, Ticket.user_id).where(Ticket.id.in_(ids)))
+    else:
+        query = select(Ticket.id, Ticket.user_id)
+        if state.statement.whereclause is not None:
+            query = query.where(state.statement.whereclause)
+        rows = state.session.connection().execute(query, params or {})
+    stamps = []
+    for ticket_id, user_id in rows:
+        stamps.append(ticket_stamp(ticket_id))
+        if user_id is not None:
+            stamps.append(user_stamp(user_id))
+    _record(state.session, stamps)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        invalidate(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_KEY, None)
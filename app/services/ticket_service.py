@@ -17,8 +17,11 @@ DO NOT:
 
 import json
 import logging
+from functools import partial
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.constants import TicketStatus
 from app.core.config import settings
@@ -30,6 +33,7 @@ from app.services.response_generator import generate_response
 from app.services.similarity_search import (
     find_similar_ticket,
     get_resolved_tickets,
+    get_resolved_tickets_async,
     _get_cache_client,
     _cache_key,
 )
@@ -41,32 +45,58 @@ logger = logging.getLogger(__name__)
 _sentiment_service = SentimentAnalysisService()
 
 
-def extract_user_id_from_token(token: str | None) -> int | None:
+def user_id_and_role_from_claims(claims: dict | None) -> tuple[int | None, str | None]:
     """
-    Safely decode an optional Bearer token and return the user_id (sub claim).
+    Return (user_id, role) from verified token claims.
 
     Args:
-        token: Raw JWT string, or None if the request is unauthenticated.
+        claims: Claims from app/core/token_claims.py (None for a missing or
+            invalid token).
 
     Returns:
-        Integer user ID extracted from the "sub" claim, or None if the token
-        is absent, invalid, or does not carry a parseable subject.
+        Tuple of (user_id, role), both None if there are no claims or the
+        subject is not a parseable integer.
     """
+    if not claims:
+        return None, None
+    try:
+        sub = claims.get("sub")
+        return (int(sub) if sub else None), claims.get("role")
+    except (TypeError, ValueError):
+        logger.debug("Token subject is not a user id — treating as unauthenticated")
+    return None, None
+
+
+def _claims_or_none(token: str | None) -> dict | None:
     if not token:
         return None
     try:
         # Import here to avoid circular imports — auth depends on models,
         # ticket_service must not depend on api.auth at module level.
-        from app.core.security import decode_token  # local import avoids circular dep
-        payload = decode_token(token)
-        sub = payload.get("sub")
-        if sub:
-            return int(sub)
+        from app.core.token_claims import verified_claims  # local import avoids circular dep
+        return verified_claims(token)
     except Exception:
         logger.debug("Token decode failed — treating as unauthenticated", exc_info=True)
     return None
 
 
+def extract_user_id_from_token(token: str | None) -> int | None:
+    """
+    Safely decode an optional Bearer token and return the user_id (sub claim).
+
+    Routes should depend on app.core.token_claims.get_token_claims instead,
+    which decodes once per request; this is for callers with a bare token.
+
+    Args:
+        token: Raw JWT string, or None if the request is unauthenticated.
+
+    Returns:
+        Integer user ID extracted from the "sub" claim, or None if the token
+        is absent, invalid, or does not carry a parseable subject.
+    """
+    return user_id_and_role_from_claims(_claims_or_none(token))[0]
+
+
 def extract_user_id_and_role_from_token(token: str | None) -> tuple[int | None, str | None]:
     """
     Safely decode an optional Bearer token and return (user_id, role).
@@ -77,21 +107,16 @@ def extract_user_id_and_role_from_token(token: str | None) -> tuple[int | None,
     Returns:
         Tuple of (user_id, role), both None if token is absent or invalid.
     """
-    if not token:
-        return None, None
-    try:
-        from app.core.security import decode_token
-        payload = decode_token(token)
-        sub = payload.get("sub")
-        role = payload.get("role")
-        user_id = int(sub) if sub else None
-        return user_id, role
-    except Exception:
-        logger.debug("Token decode failed — treating as unauthenticated", exc_info=True)
-    return None, None
+    return user_id_and_role_from_claims(_claims_or_none(token))
 
 
-def resolve_message(message: str, db: Session, *, log_ref: str = "message") -> dict:
+def resolve_message(
+    message: str,
+    db: Session | None,
+    *,
+    log_ref: str = "message",
+    resolved_tickets: list[Ticket] | None = None,
+) -> dict:
     """
     Run the full AI resolution pipeline for a raw message and return the
     result as a plain dict — no Ticket row is created or modified.
@@ -111,9 +136,13 @@ def resolve_message(message: str, db: Session, *, log_ref: str = "message") -> d
     Args:
         message: Raw customer message to classify and (maybe) answer.
         db: Active SQLAlchemy session (used read-only, for the similarity
-            corpus of previously-resolved tickets).
+            corpus of previously-resolved tickets). May be None when
+            ``resolved_tickets`` is supplied.
         log_ref: Short label used in log lines to identify the caller
             (e.g. a ticket ID, or "public-resolve") — purely cosmetic.
+        resolved_tickets: Pre-fetched similarity corpus. When given, it is
+            used on a cache miss instead of querying ``db`` — this is how
+            the async callers below keep all DB I/O on the event loop.
 
     Returns:
         dict with keys: intent, sub_intent, confidence, sentiment,
@@ -166,7 +195,8 @@ def resolve_message(message: str, db: Session, *, log_ref: str = "message") -> d
             pass  # Cache failure is non-fatal; fall through to DB
 
     if similar_result is None:
-        resolved_tickets = get_resolved_tickets(db)
+        if resolved_tickets is None:
+            resolved_tickets = get_resolved_tickets(db)
         resolved_tickets_data = [
             {"message": t.message, "response": t.response, "quality_score": t.quality_score}
             for t in resolved_tickets
@@ -225,22 +255,27 @@ def resolve_message(message: str, db: Session, *, log_ref: str = "message") -> d
     }
 
 
-def run_ticket_automation(ticket: Ticket, db: Session) -> Ticket:
+async def resolve_message_async(message: str, db: AsyncSession, *, log_ref: str = "message") -> dict:
     """
-    Run the AI automation pipeline for a given ticket and persist the result.
+    Async entry point for :func:`resolve_message`, used by ``async def`` routes.
 
-    Thin wrapper around :func:`resolve_message` that maps the pipeline
-    result onto a Ticket row, sets its status, and commits.
-
-    Args:
-        ticket: Ticket ORM instance (already persisted with an ID).
-        db: Active SQLAlchemy session.
+    The similarity corpus is loaded through the AsyncSession on the event
+    loop; the rest of the pipeline (rule-based classifier, TF-IDF search and
+    the sync OpenAI client calls) still runs in the threadpool, but without
+    a database connection or session attached to that thread.
 
-    Returns:
-        Updated Ticket instance with intent, confidence, status, and response set.
+    The corpus (at most 50 rows) is fetched up front even though a
+    similarity-cache hit will not use it — cheaper than a second threadpool
+    round-trip just to peek at the cache.
     """
-    result = resolve_message(ticket.message, db, log_ref=f"Ticket {ticket.id}")
+    resolved_tickets = await get_resolved_tickets_async(db)
+    return await run_in_threadpool(
+        partial(resolve_message, message, None, log_ref=log_ref, resolved_tickets=resolved_tickets)
+    )
 
+
+def _apply_resolution(ticket: Ticket, result: dict) -> None:
+    """Copy a :func:`resolve_message` result onto a Ticket and set its status."""
     ticket.intent = result["intent"]
     ticket.sub_intent = result["sub_intent"]
     ticket.confidence = result["confidence"]
@@ -255,9 +290,47 @@ def run_ticket_automation(ticket: Ticket, db: Session) -> Ticket:
         ticket.status = TicketStatus.ESCALATED.value
         ticket.response = None
 
+
+def run_ticket_automation(ticket: Ticket, db: Session) -> Ticket:
+    """
+    Run the AI automation pipeline for a given ticket and persist the result.
+
+    Thin wrapper around :func:`resolve_message` that maps the pipeline
+    result onto a Ticket row, sets its status, and commits.
+
+    Args:
+        ticket: Ticket ORM instance (already persisted with an ID).
+        db: Active SQLAlchemy session.
+
+    Returns:
+        Updated Ticket instance with intent, confidence, status, and response set.
+    """
+    result = resolve_message(ticket.message, db, log_ref=f"Ticket {ticket.id}")
+    _apply_resolution(ticket, result)
+
     # --- Persist ---
     db.add(ticket)
     db.commit()
     db.refresh(ticket)
     return ticket
 
+
+async def run_ticket_automation_async(ticket: Ticket, db: AsyncSession) -> Ticket:
+    """
+    Async variant of :func:`run_ticket_automation` (see :func:`resolve_message_async`).
+
+    Args:
+        ticket: Ticket ORM instance (already persisted with an ID).
+        db: Active AsyncSession.
+
+    Returns:
+        Updated Ticket instance with intent, confidence, status, and response set.
+    """
+    result = await resolve_message_async(ticket.message, db, log_ref=f"Ticket {ticket.id}")
+    _apply_resolution(ticket, result)
+
+    # --- Persist ---
+    db.add(ticket)
+    await db.commit()
+    await db.refresh(ticket)
+    return ticket
@@ -0,0 +1,111 @@
+"""
+app/utils/pagination.py
+
+Purpose:
+Keyset (cursor) pagination for the newest-first ticket lists
+(GET /tickets/, GET /admin/tickets, GET /agent/my-assignments).
+
+OFFSET pagination makes the database walk and discard every row before
+the requested page, and each page also ran a separate COUNT(*), so deep
+pages got linearly slower. A keyset page instead continues from the last
+row seen:
+
+    WHERE (created_at, id) < (:last_created_at, :last_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+
+which is a single index range read at any depth (see the
+``*_created_at`` indexes on Ticket).
+
+The cursor is opaque to clients: URL-safe base64 of the last row's
+``created_at`` and ``id``. Every list response carries ``next_cursor``
+(offset pages too), so clients can switch to cursor mode from any page.
+
+DO NOT:
+- Put endpoint-specific filters here; callers pass an already-filtered query
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+from app.core.exceptions import AppValidationError
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row ``(created_at, row_id)``."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Inverse of :func:`encode_cursor`.
+
+    Raises:
+        AppValidationError: If the cursor was not produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(row_id, int):
+            raise TypeError("cursor id must be an integer")
+        return datetime.fromisoformat(created_at), row_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise AppValidationError("Invalid pagination cursor") from exc
+
+
+def wants_total(cursor: str | None, include_total: bool | None) -> bool:
+    """
+    Whether a list request should run COUNT(*) for its ``total``.
+
+    Offset pages keep returning the total (backward compatible); cursor
+    pages skip it unless the client asks, since the count is the one part
+    of the request that still reads every matching row.
+    """
+    if include_total is not None:
+        return include_total
+    return cursor is None
+
+
+def newest_first(query: Query, created_at: InstrumentedAttribute, row_id: InstrumentedAttribute) -> Query:
+    """Order ``query`` newest first, with ``id`` as tie-breaker so pages are stable."""
+    return query.order_by(created_at.desc(), row_id.desc())
+
+
+def keyset_page(
+    query: Query,
+    *,
+    created_at: InstrumentedAttribute,
+    row_id: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    offset: int = 0,
+) -> tuple[list[Any], str | None]:
+    """
+    Fetch one newest-first page and the cursor for the page after it.
+
+    With ``cursor`` the page starts just after the row it points at and
+    ``offset`` is ignored; without it, ``offset`` is applied as before.
+    One extra row is fetched to know whether another page exists, so no
+    COUNT(*) is needed for that.
+
+    Returns:
+        (rows, next_cursor) -- next_cursor is None on the last page.
+    """
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_at, row_id) < (after_created_at, after_id))
+        offset = 0
+
+    rows = newest_first(query, created_at, row_id).offset(offset).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_at.key), getattr(last, row_id.key))
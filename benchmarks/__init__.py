@@ -0,0 +1,9 @@
+"""
+benchmarks/
+
+Micro- and macro-benchmarks for the request hot paths and workers.
+
+Not part of the pytest suite -- run manually (or from CI) to produce
+comparable timing numbers and to gate regressions against a stored
+baseline. See benchmarks/README.md.
+"""
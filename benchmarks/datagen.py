@@ -0,0 +1,556 @@
+"""
+benchmarks/datagen.py
+
+Purpose:
+--------
+Bulk synthetic data generator for scale-testing the database layer.
+
+``demo/demo_db.py`` inserts a handful of rows; this fills a database with
+up to millions of users, tickets, feedback rows and refresh tokens so
+``/admin/metrics``, the list endpoints, the workers and similarity search
+can be exercised at realistic volume.
+
+Responsibilities:
+-----------------
+- Generate rows with realistic distributions: intent mix, status that
+  depends on ticket age, growth over time with weekday/office-hours
+  seasonality, skewed per-user ticket counts, sentiment, confidence,
+  feedback ratings that depend on how the ticket was resolved
+- Draw message text from the classifier's own vocabulary
+  (``SUB_INTENT_PATTERNS`` plus natural seed phrases) so tickets classify
+  the way real ones would
+- Write in large batches: ``COPY ... FROM STDIN`` on PostgreSQL,
+  Core ``executemany`` inside one transaction per batch elsewhere (SQLite)
+- Append to existing data: ids continue after the current maximum
+
+DO NOT:
+-------
+- Run against production -- rows are fake and passwords are shared
+
+Usage:
+------
+    python -m benchmarks.datagen --tickets 1000000 --users 20000
+    python -m benchmarks.datagen --database-url postgresql://u:p@localhost/srs_scale \\
+        --tickets 5000000 --users 100000 --batch-size 50000
+    python -m benchmarks.datagen --tickets 0 --users 0 --loadtest-accounts
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import logging
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add project root to path so the generator can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import Table, create_engine, func, insert, select, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from benchmarks.synthetic import FILLER_WORDS, RESPONSES, SEED_PHRASES  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PASSWORD = "Password123!"
+LOADTEST_PASSWORD = "LoadTest123!"
+LOADTEST_ACCOUNTS = (
+    ("loadtest-user@example.com", "user"),
+    ("loadtest-agent@example.com", "agent"),
+    ("loadtest-admin@example.com", "admin"),
+)
+
+INTENT_WEIGHTS = {
+    "login_issue": 22,
+    "payment_issue": 20,
+    "technical_issue": 24,
+    "account_issue": 12,
+    "feature_request": 8,
+    "general_query": 14,
+}
+
+# Status mix for tickets younger than RECENT_DAYS vs. older ones: recent
+# tickets are still being worked, old ones have almost all been resolved.
+RECENT_DAYS = 2
+RECENT_STATUS_WEIGHTS = {"open": 25, "escalated": 30, "in_progress": 15, "auto_resolved": 28, "closed": 2}
+OLD_STATUS_WEIGHTS = {"open": 2, "escalated": 8, "in_progress": 2, "auto_resolved": 58, "closed": 30}
+
+SENTIMENT_WEIGHTS = {"negative": 18, "neutral": 67, "positive": 15}
+RESPONSE_SOURCE_WEIGHTS = {"similarity": 30, "template": 45, "openai": 25}
+# Mean feedback rating per response source (human-closed tickets use "agent").
+RATING_MEANS = {"similarity": 4.1, "template": 3.6, "openai": 3.9, "agent": 4.3}
+
+# Relative ticket volume by hour of day (UTC) -- business-hours peak.
+HOUR_WEIGHTS = [2, 1, 1, 1, 1, 2, 4, 7, 10, 12, 12, 11, 10, 11, 12, 11, 10, 8, 6, 5, 4, 3, 3, 2]
+WEEKEND_FACTOR = 0.45
+ARCHIVE_AFTER_DAYS = 90
+
+OPENERS = ["Hi,", "Hello,", "Hey team,", "Urgent:", "Quick question:", "", "", ""]
+KEYWORD_FRAMES = ["related to {kw}", "({kw})", "- {kw}", "it says {kw}", "re: {kw}"]
+CLOSERS = ["Thanks.", "Please help.", "Any update?", "This is blocking me.", "", "", ""]
+
+
+@dataclass
+class DataGenConfig:
+    """Volumes and distribution knobs for one generator run."""
+
+    users: int = 10_000
+    agents: Optional[int] = None  # default: ~1 per 200 users (min 1)
+    admins: int = 3
+    tickets: int = 100_000
+    feedback_ratio: float = 0.35
+    refresh_tokens_per_user: float = 1.5
+    days: int = 365
+    batch_size: int = 10_000
+    seed: int = 42
+    password: str = DEFAULT_PASSWORD
+    loadtest_accounts: bool = False
+
+    @property
+    def agent_count(self) -> int:
+        if self.agents is not None:
+            return self.agents
+        return max(1, self.users // 200) if self.users else 0
+
+
+# ---------------------------------------------------------------------------
+# Value generators
+# ---------------------------------------------------------------------------
+
+class _Vocabulary:
+    """Per-intent seed phrases and sub-intent keywords from the classifier."""
+
+    def __init__(self):
+        from app.services.classifier import SUB_INTENT_PATTERNS
+
+        self.phrases: Dict[str, List[str]] = {}
+        for intent, phrase in SEED_PHRASES:
+            self.phrases.setdefault(intent, []).append(phrase)
+        self.sub_intents: Dict[str, List[Tuple[str, List[str]]]] = SUB_INTENT_PATTERNS
+
+    def message(self, intent: str, rng: random.Random) -> Tuple[str, Optional[str]]:
+        """Return ``(message, sub_intent)`` for an intent."""
+        parts = [rng.choice(OPENERS), rng.choice(self.phrases[intent])]
+        sub_intent = None
+        patterns = self.sub_intents.get(intent)
+        if patterns and rng.random() < 0.7:
+            sub_intent, keywords = rng.choice(patterns)
+            parts.append(rng.choice(KEYWORD_FRAMES).format(kw=rng.choice(keywords)))
+        parts.append(" ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(0, 4))))
+        parts.append(rng.choice(CLOSERS))
+        return " ".join(p for p in parts if p), sub_intent
+
+
+def _weighted(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _created_at(rng: random.Random, now: datetime, days: int) -> datetime:
+    """
+    Sample a creation time within the last ``days`` days.
+
+    Volume grows linearly over the window (density proportional to t),
+    dips on weekends and peaks during office hours.
+    """
+    while True:
+        age_days = days * (1.0 - math.sqrt(rng.random()))
+        day = now - timedelta(days=age_days)
+        if day.weekday() >= 5 and rng.random() > WEEKEND_FACTOR:
+            continue
+        hour = rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        ts = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+        if ts <= now:
+            return ts
+
+
+def _rating(rng: random.Random, source: str) -> int:
+    return int(min(5, max(1, round(rng.gauss(RATING_MEANS.get(source, 3.8), 1.1)))))
+
+
+def _zipf_user(rng: random.Random, user_ids: range) -> Optional[int]:
+    """Pick a ticket owner; a few heavy users file most tickets, ~8% are anonymous."""
+    if not user_ids or rng.random() < 0.08:
+        return None
+    # Power-law rank: low ranks (heavy submitters) are drawn far more often.
+    rank = int(len(user_ids) * rng.random() ** 3)
+    # Spread heavy users across the id range instead of always the lowest ids.
+    return user_ids[(rank * 7919) % len(user_ids)]
+
+
+# ---------------------------------------------------------------------------
+# Row generators
+# ---------------------------------------------------------------------------
+
+def generate_users(cfg: DataGenConfig, start_id: int, password_hash: str,
+                   now: datetime) -> Iterator[Dict]:
+    """Yield user rows: agents and admins first, then regular users."""
+    roles = ["admin"] * cfg.admins + ["agent"] * cfg.agent_count + ["user"] * cfg.users
+    rng = random.Random(cfg.seed)
+    for offset, role in enumerate(roles):
+        uid = start_id + offset
+        created = now - timedelta(days=rng.uniform(0, cfg.days + 30))
+        yield {
+            "id": uid,
+            "email": f"{role}{uid}@scale.example.com",
+            "hashed_password": password_hash,
+            "role": role,
+            "is_active": rng.random() > 0.02,
+            "reset_otp_attempts": 0,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def generate_tickets(cfg: DataGenConfig, start_id: int, user_ids: range, agent_ids: range,
+                     now: datetime) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+    """Yield ``(ticket_row, feedback_row_or_None)`` pairs."""
+    rng = random.Random(cfg.seed + 1)
+    vocab = _Vocabulary()
+    naive_now = now.replace(tzinfo=None)
+
+    for offset in range(cfg.tickets):
+        tid = start_id + offset
+        intent = _weighted(rng, INTENT_WEIGHTS)
+        message, sub_intent = vocab.message(intent, rng)
+        created = _created_at(rng, naive_now, cfg.days)
+        age_days = (naive_now - created).total_seconds() / 86400
+        status = _weighted(rng, RECENT_STATUS_WEIGHTS if age_days < RECENT_DAYS else OLD_STATUS_WEIGHTS)
+
+        sentiment = _weighted(rng, SENTIMENT_WEIGHTS)
+        if status in ("escalated", "in_progress") and rng.random() < 0.3:
+            sentiment = "negative"
+        if status == "auto_resolved":
+            confidence = rng.uniform(0.75, 0.99)
+        else:
+            confidence = min(0.99, max(0.05, rng.betavariate(4, 3)))
+
+        response = response_source = None
+        if status == "auto_resolved":
+            response_source = _weighted(rng, RESPONSE_SOURCE_WEIGHTS)
+            response = RESPONSES[intent]
+        elif status == "closed":
+            response_source = "agent"
+            response = f"Resolved by support: {RESPONSES[intent]}"
+
+        assigned = None
+        if status in ("in_progress", "closed") or (status == "escalated" and rng.random() < 0.6):
+            assigned = agent_ids[rng.randrange(len(agent_ids))] if agent_ids else None
+
+        feedback = None
+        quality_score = None
+        if status in ("auto_resolved", "closed") and rng.random() < cfg.feedback_ratio:
+            rating = _rating(rng, response_source or "agent")
+            resolved = rating >= 3 if rng.random() > 0.1 else rating < 3
+            quality_score = max(0.0, min(1.0, rating / 5.0 + (0.1 if resolved else -0.1)))
+            feedback = {
+                "ticket_id": tid,
+                "rating": rating,
+                "resolved": resolved,
+                "created_at": min(naive_now, created + timedelta(hours=rng.expovariate(1 / 18))),
+            }
+
+        ticket = {
+            "id": tid,
+            "message": message,
+            "intent": intent,
+            "sub_intent": sub_intent,
+            "sentiment": sentiment,
+            "sentiment_confidence": round(rng.uniform(0.6, 0.98), 3),
+            "confidence": round(confidence, 3),
+            "status": status,
+            "is_archived": (
+                status in ("auto_resolved", "closed")
+                and age_days > ARCHIVE_AFTER_DAYS
+                and rng.random() < 0.4
+            ),
+            "response": response,
+            "response_source": response_source,
+            "quality_score": quality_score,
+            "user_id": _zipf_user(rng, user_ids),
+            "assigned_agent_id": assigned,
+            "created_at": created,
+            "updated_at": feedback["created_at"] if feedback else created,
+        }
+        yield ticket, feedback
+
+
+def generate_refresh_tokens(cfg: DataGenConfig, start_id: int, user_ids: range,
+                            now: datetime) -> Iterator[Dict]:
+    """Yield refresh-token rows: a mix of live, expired and revoked tokens."""
+    rng = random.Random(cfg.seed + 2)
+    total = int(len(user_ids) * cfg.refresh_tokens_per_user)
+    for offset in range(total):
+        rid = start_id + offset
+        created = now - timedelta(days=rng.uniform(0, 60))
+        roll = rng.random()
+        yield {
+            "id": rid,
+            "user_id": user_ids[rng.randrange(len(user_ids))],
+            # Not a real token -- just unique, correctly-sized hash values.
+            "token_hash": hashlib.sha256(f"{cfg.seed}:{rid}".encode()).hexdigest(),
+            "expires_at": created + timedelta(days=30),
+            "revoked": roll < 0.25,
+            "created_at": created,
+        }
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class BulkWriter:
+    """
+    Batched inserts tuned per backend.
+
+    PostgreSQL uses ``COPY ... FROM STDIN (FORMAT csv)`` through the raw
+    psycopg2 connection; everything else uses a Core ``insert()``
+    executemany with one transaction per batch.
+    """
+
+    def __init__(self, engine: Engine, batch_size: int):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+
+    def write(self, table: Table, rows: Iterable[Dict]) -> int:
+        count = 0
+        for batch in _batched(rows, self.batch_size):
+            if self.use_copy:
+                self._copy(table, batch)
+            else:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(table), batch)
+            count += len(batch)
+        return count
+
+    def _copy(self, table: Table, batch: List[Dict]) -> None:
+        columns = list(batch[0].keys())
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in batch:
+            writer.writerow(_csv_value(row[c]) for c in columns)
+        buf.seek(0)
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cur:
+                cur.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+                )
+            raw.commit()
+        finally:
+            raw.close()
+
+    def finish(self, tables: Iterable[Table]) -> None:
+        """Advance PostgreSQL id sequences past the explicitly inserted ids."""
+        if self.engine.dialect.name != "postgresql":
+            return
+        with self.engine.begin() as conn:
+            for table in tables:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+                ))
+
+
+def _csv_value(value):
+    if value is None:
+        return ""  # unquoted empty field == NULL in CSV COPY
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _next_id(engine: Engine, table: Table) -> int:
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _tune_sqlite(engine: Engine) -> None:
+    """Trade durability for load speed on the generator's own connections."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA synchronous=OFF")
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA cache_size=-65536")
+        cur.close()
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def run_datagen(cfg: DataGenConfig, database_url: Optional[str] = None) -> Dict:
+    """
+    Generate and insert data; returns a summary of row counts and timings.
+
+    Args:
+        cfg: Volumes and distribution knobs.
+        database_url: Target database; defaults to ``settings.DATABASE_URL``.
+    """
+    from app.core.config import settings
+    from app.core.security import hash_password
+    from app.db.session import Base
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401
+
+    url = database_url or settings.DATABASE_URL
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    if engine.dialect.name == "sqlite":
+        _tune_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+
+    tables = Base.metadata.tables
+    users_t, tickets_t = tables["users"], tables["tickets"]
+    feedback_t, tokens_t = tables["feedback"], tables["refresh_tokens"]
+    writer = BulkWriter(engine, cfg.batch_size)
+    now = datetime.now(timezone.utc)
+    summary: Dict = {"database": engine.url.render_as_string(hide_password=True), "rows": {}, "seconds": {}}
+
+    # bcrypt is deliberately slow (~0.25s); hash once and share it.
+    password_hash = hash_password(cfg.password)
+
+    started = time.perf_counter()
+    first_user = _next_id(engine, users_t)
+    summary["rows"]["users"] = writer.write(users_t, generate_users(cfg, first_user, password_hash, now))
+    summary["seconds"]["users"] = round(time.perf_counter() - started, 2)
+
+    admin_end = first_user + cfg.admins
+    agent_ids = range(admin_end, admin_end + cfg.agent_count)
+    user_ids = range(agent_ids.stop, agent_ids.stop + cfg.users)
+
+    if cfg.loadtest_accounts:
+        summary["rows"]["loadtest_accounts"] = _ensure_loadtest_accounts(engine, users_t, hash_password, now)
+
+    started = time.perf_counter()
+    feedback_rows: List[Dict] = []
+
+    def tickets_with_feedback():
+        for ticket_row, feedback_row in generate_tickets(
+            cfg, _next_id(engine, tickets_t), user_ids, agent_ids, now
+        ):
+            if feedback_row is not None:
+                feedback_rows.append(feedback_row)
+            yield ticket_row
+
+    # Feedback rows reference tickets, so flush them after each ticket batch.
+    ticket_count = 0
+    feedback_count = 0
+    next_feedback_id = _next_id(engine, feedback_t)
+    for batch in _batched(tickets_with_feedback(), cfg.batch_size):
+        ticket_count += writer.write(tickets_t, batch)
+        for row in feedback_rows:
+            row["id"] = next_feedback_id
+            next_feedback_id += 1
+        feedback_count += writer.write(feedback_t, feedback_rows)
+        feedback_rows.clear()
+        logger.info("Inserted %d/%d tickets", ticket_count, cfg.tickets)
+    summary["rows"]["tickets"] = ticket_count
+    summary["rows"]["feedback"] = feedback_count
+    summary["seconds"]["tickets_and_feedback"] = round(time.perf_counter() - started, 2)
+
+    started = time.perf_counter()
+    summary["rows"]["refresh_tokens"] = writer.write(
+        tokens_t, generate_refresh_tokens(cfg, _next_id(engine, tokens_t), user_ids, now)
+    ) if user_ids else 0
+    summary["seconds"]["refresh_tokens"] = round(time.perf_counter() - started, 2)
+
+    writer.finish([users_t, tickets_t, feedback_t, tokens_t])
+    engine.dispose()
+    return summary
+
+
+def _ensure_loadtest_accounts(engine: Engine, users_t: Table, hash_password, now: datetime) -> int:
+    """Create the accounts used by benchmarks/scenarios/mixed.json if missing."""
+    created = 0
+    password_hash = hash_password(LOADTEST_PASSWORD)
+    with engine.begin() as conn:
+        for email, role in LOADTEST_ACCOUNTS:
+            exists = conn.execute(select(users_t.c.id).where(users_t.c.email == email)).first()
+            if exists:
+                continue
+            conn.execute(insert(users_t).values(
+                email=email, hashed_password=password_hash, role=role,
+                is_active=True, reset_otp_attempts=0, created_at=now, updated_at=now,
+            ))
+            created += 1
+    return created
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-generate synthetic SRS data for scale testing.")
+    parser.add_argument("--database-url", default=None, help="Target DB (default: settings.DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=10_000, help="Regular users (default: 10000)")
+    parser.add_argument("--agents", type=int, default=None, help="Agents (default: users/200, min 1)")
+    parser.add_argument("--admins", type=int, default=3, help="Admins (default: 3)")
+    parser.add_argument("--tickets", type=int, default=100_000, help="Tickets (default: 100000)")
+    parser.add_argument("--feedback-ratio", type=float, default=0.35,
+                        help="Share of resolved tickets that get feedback (default: 0.35)")
+    parser.add_argument("--refresh-tokens-per-user", type=float, default=1.5,
+                        help="Average refresh tokens per regular user (default: 1.5)")
+    parser.add_argument("--days", type=int, default=365, help="History window in days (default: 365)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per insert batch")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password shared by generated users")
+    parser.add_argument("--loadtest-accounts", action="store_true",
+                        help="Also create the loadtest-{user,agent,admin}@example.com accounts")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    if args.database_url:
+        # app.core.config requires DATABASE_URL at import time.
+        os.environ.setdefault("DATABASE_URL", args.database_url)
+    cfg = DataGenConfig(
+        users=args.users,
+        agents=args.agents,
+        admins=args.admins,
+        tickets=args.tickets,
+        feedback_ratio=args.feedback_ratio,
+        refresh_tokens_per_user=args.refresh_tokens_per_user,
+        days=args.days,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        password=args.password,
+        loadtest_accounts=args.loadtest_accounts,
+    )
+    summary = run_datagen(cfg, args.database_url)
+    logger.info("Data generation complete: %s", summary)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+benchmarks/db_concurrency.py
+
+Purpose:
+--------
+Concurrent read/write benchmark for the database engine profiles in
+app/db/engine.py.
+
+Reader threads repeatedly run the similarity-corpus query (the read done by
+every /resolve and POST /tickets/ request) while writer threads insert
+tickets and commit, each through its own Session from a shared engine --
+the same shape as the threadpool serving requests. The run is repeated per
+profile on a fresh database file:
+
+- ``baseline``: ``create_engine(url, connect_args={"check_same_thread": False})``,
+  i.e. the engine configuration before the profiles existed (rollback
+  journal, default synchronous=FULL, no pragmas)
+- ``tuned``: :func:`app.db.engine.create_db_engine` (WAL, synchronous=NORMAL,
+  busy_timeout, mmap and cache pragmas)
+
+For each profile the report has per-operation throughput, error counts
+(e.g. "database is locked") and latency percentiles.
+
+Usage:
+------
+    python -m benchmarks.db_concurrency
+    python -m benchmarks.db_concurrency --readers 16 --writers 4 --duration 10
+    python -m benchmarks.db_concurrency --output benchmarks/results/db_concurrency.json
+
+DO NOT:
+-------
+- Point this at a database you care about: each profile run creates and
+  deletes its own SQLite file
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path so the benchmark can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.histogram import LatencyHistogram  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("baseline", "tuned")
+DEFAULT_SEED_ROWS = 5000
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+
+def build_engine(profile: str, url: str):
+    """Create the engine for ``profile`` (see module docstring)."""
+    from sqlalchemy import create_engine
+
+    from app.db.engine import create_db_engine
+
+    if profile == "baseline":
+        return create_engine(url, connect_args={"check_same_thread": False})
+    if profile == "tuned":
+        return create_db_engine(url, echo=False)
+    raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+
+
+def _seed(engine, rows: int, seed: int) -> None:
+    """Create the schema and insert ``rows`` tickets (about half resolved)."""
+    from sqlalchemy import insert
+
+    from app.db.session import Base
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401 -- register tables
+    from app.models.ticket import Ticket
+    from benchmarks.synthetic import RESPONSES, synthetic_messages
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    batch = []
+    for m in synthetic_messages(rows, seed=seed):
+        resolved = rng.random() < 0.5
+        batch.append({
+            "message": m["message"],
+            "intent": m["intent"],
+            "confidence": 0.9,
+            "status": "auto_resolved" if resolved else "escalated",
+            "is_archived": False,
+            "response": RESPONSES[m["intent"]] if resolved else None,
+            "created_at": now - timedelta(seconds=m["id"]),
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(Ticket), batch)
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+class _OpStats:
+    """Per-operation latency histogram plus success/error counters."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.ok = 0
+        self.errors: Dict[str, int] = {}
+
+    def merge(self, other: "_OpStats") -> None:
+        self.latency.merge(other.latency)
+        self.ok += other.ok
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+
+    def summary(self, elapsed_s: float) -> Dict:
+        return {
+            "ok": self.ok,
+            "errors": dict(sorted(self.errors.items())),
+            "ops_per_sec": round(self.ok / elapsed_s, 1) if elapsed_s else 0.0,
+            "latency_us": self.latency.summary(),
+        }
+
+
+def _read_op(session_factory) -> Callable[[], None]:
+    from app.services.similarity_search import get_resolved_tickets
+
+    def op():
+        db = session_factory()
+        try:
+            get_resolved_tickets(db)
+        finally:
+            db.close()
+
+    return op
+
+
+def _write_op(session_factory, rng: random.Random) -> Callable[[], None]:
+    from app.models.ticket import Ticket
+
+    def op():
+        db = session_factory()
+        try:
+            db.add(Ticket(message=f"concurrency benchmark {rng.random()}", status="open"))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    return op
+
+
+def _worker(op: Callable[[], None], stats: _OpStats, stop: threading.Event, start: threading.Barrier) -> None:
+    start.wait()
+    while not stop.is_set():
+        t0 = time.perf_counter_ns()
+        try:
+            op()
+        except Exception as exc:
+            key = type(exc).__name__
+            if "locked" in str(exc):
+                key = "database is locked"
+            stats.errors[key] = stats.errors.get(key, 0) + 1
+            continue
+        stats.latency.record((time.perf_counter_ns() - t0) // 1000)
+        stats.ok += 1
+
+
+def run_profile(
+    profile: str,
+    *,
+    readers: int,
+    writers: int,
+    duration: float,
+    rows: int = DEFAULT_SEED_ROWS,
+    seed: int = 42,
+    workdir: Optional[str] = None,
+) -> Dict:
+    """
+    Run the mixed workload for one profile on a fresh SQLite file.
+
+    Returns:
+        Dict with ``read`` / ``write`` summaries, ``elapsed_s`` and the
+        effective ``journal_mode``.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker
+
+    fd, path = tempfile.mkstemp(prefix=f"srs-dbconc-{profile}-", suffix=".db", dir=workdir)
+    os.close(fd)
+    engine = build_engine(profile, f"sqlite:///{path}")
+    try:
+        _seed(engine, rows, seed)
+        with engine.connect() as conn:
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        stop = threading.Event()
+        start = threading.Barrier(readers + writers + 1)
+        read_stats = [_OpStats() for _ in range(readers)]
+        write_stats = [_OpStats() for _ in range(writers)]
+        threads = [
+            threading.Thread(target=_worker, args=(_read_op(session_factory), s, stop, start), daemon=True)
+            for s in read_stats
+        ] + [
+            threading.Thread(
+                target=_worker,
+                args=(_write_op(session_factory, random.Random(seed + i)), s, stop, start),
+                daemon=True,
+            )
+            for i, s in enumerate(write_stats)
+        ]
+        for t in threads:
+            t.start()
+        start.wait()
+        t0 = time.perf_counter()
+        time.sleep(duration)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    reads, writes = _OpStats(), _OpStats()
+    for s in read_stats:
+        reads.merge(s)
+    for s in write_stats:
+        writes.merge(s)
+    return {
+        "journal_mode": journal_mode,
+        "elapsed_s": round(elapsed, 3),
+        "read": reads.summary(elapsed),
+        "write": writes.summary(elapsed),
+    }
+
+
+def run(profiles: List[str], **kwargs) -> Dict:
+    """Run each profile and add tuned/baseline throughput ratios when both ran."""
+    results = {p: run_profile(p, **kwargs) for p in profiles}
+    report = {"config": kwargs, "profiles": results}
+    if "baseline" in results and "tuned" in results:
+        report["speedup"] = {
+            op: round(results["tuned"][op]["ops_per_sec"] / results["baseline"][op]["ops_per_sec"], 2)
+            if results["baseline"][op]["ops_per_sec"] else None
+            for op in ("read", "write")
+        }
+    return report
+
+
+def _format(report: Dict) -> str:
+    lines = [f"{'profile':<10} {'op':<6} {'ops/s':>10} {'p50_us':>10} {'p99_us':>10} {'errors':>8}  journal"]
+    for name, result in report["profiles"].items():
+        for op in ("read", "write"):
+            r = result[op]
+            pct = r["latency_us"]["percentiles"]
+            lines.append(
+                f"{name:<10} {op:<6} {r['ops_per_sec']:>10.1f} {pct['p50']:>10} {pct['p99']:>10} "
+                f"{sum(r['errors'].values()):>8}  {result['journal_mode']}"
+            )
+    if "speedup" in report:
+        lines.append(f"tuned/baseline throughput: {report['speedup']}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # app.core.config requires these; the benchmark never touches this URL.
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["DEBUG"] = "false"
+
+    report = run(
+        args.profiles,
+        readers=args.readers,
+        writers=args.writers,
+        duration=args.duration,
+        rows=args.rows,
+        seed=args.seed,
+    )
+    print(_format(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        logger.info("Wrote report to %s", args.output)
+    return 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent read/write benchmark for the DB engine profiles.")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES),
+                        help="Profiles to run (default: baseline tuned)")
+    parser.add_argument("--readers", type=int, default=8, help="Reader threads (default: 8)")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads (default: 2)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile (default: 5)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_SEED_ROWS,
+                        help=f"Tickets seeded before the run (default: {DEFAULT_SEED_ROWS})")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--output", type=Path, default=None, help="Optional path for the JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    sys.exit(main())
@@ -0,0 +1,443 @@
+"""
+benchmarks/fake_openai.py
+
+Purpose:
+--------
+Local stand-in for the OpenAI chat-completions API, for load tests and
+benchmarks that need the LLM code paths (``classify_intent_ai``,
+sentiment analysis, response generation) without network access or
+API spend.
+
+Responsibilities:
+-----------------
+- Serve ``POST /v1/chat/completions`` (plain, JSON mode and SSE
+  streaming) and ``GET /v1/models`` in the wire format the ``openai``
+  SDK expects
+- Inject latency from a configurable distribution, random 5xx errors,
+  and 429 rate-limit responses (random, or from a requests/second cap)
+  with ``Retry-After`` headers
+- Return deterministic answers: the app's own rule-based classifier for
+  intent prompts, a keyword heuristic for sentiment prompts, and the
+  response templates (or ``--responses`` overrides) for generation
+
+DO NOT:
+-------
+- Use in production -- answers are canned, not generated
+
+Usage:
+------
+    python -m benchmarks.fake_openai --port 8100 --latency lognormal:0.25:0.5 \\
+        --error-rate 0.01 --rate-limit-rate 0.02
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8100/v1 \\
+        uvicorn app.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Add project root to path so the server can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+NEGATIVE_WORDS = ("angry", "frustrated", "terrible", "awful", "hate", "worst", "unacceptable")
+POSITIVE_WORDS = ("happy", "great", "excellent", "love", "wonderful", "thanks", "thank you")
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LatencySpec:
+    """
+    Per-request latency distribution, in seconds.
+
+    ``kind`` is one of ``fixed`` (a), ``uniform`` (a..b), ``normal``
+    (mean a, stdev b) or ``lognormal`` (median a, sigma b). Samples are
+    clamped at zero.
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencySpec":
+        """
+        Parse ``kind:a[:b]``, e.g. ``fixed:0.2`` or ``lognormal:0.25:0.5``.
+
+        Raises:
+            ValueError: On an unknown kind or malformed numbers.
+        """
+        parts = spec.split(":")
+        kind = parts[0]
+        if kind not in cls.KINDS:
+            raise ValueError(f"unknown latency kind {kind!r} (expected one of {cls.KINDS})")
+        nums = [float(p) for p in parts[1:]]
+        if kind == "fixed":
+            nums = nums[:1] or [0.0]
+            nums.append(0.0)
+        if len(nums) != 2:
+            raise ValueError(f"latency spec {spec!r} needs two parameters")
+        return cls(kind, nums[0], nums[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value = self.a
+        elif self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        else:
+            value = self.a * rng.lognormvariate(0.0, self.b) if self.a > 0 else 0.0
+        return max(0.0, value)
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Behaviour knobs for the fake server."""
+
+    latency: LatencySpec = field(default_factory=LatencySpec)
+    # Delay between streamed chunks (seconds); time-to-first-chunk uses ``latency``.
+    stream_chunk_delay: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # Hard cap in requests/second (token bucket); 0 disables it.
+    max_rps: float = 0.0
+    retry_after_s: float = 1.0
+    seed: int = 1234
+    responses: Dict[str, str] = field(default_factory=dict)
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def incr(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(sorted(self.counts.items()))
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+# ---------------------------------------------------------------------------
+# Canned answers
+# ---------------------------------------------------------------------------
+
+def _customer_message(user_prompt: str) -> str:
+    """Pull the customer text out of the prompts the app sends."""
+    for marker in ("Customer message:\n", "Customer message: "):
+        if marker in user_prompt:
+            text = user_prompt.split(marker, 1)[1]
+            return text.split("\n\nRemember:", 1)[0].strip()
+    return user_prompt.strip()
+
+
+def _answer_intent(message: str) -> str:
+    from app.services.classifier import classify_intent
+
+    result = classify_intent(message)
+    return json.dumps({"intent": result["intent"], "confidence": result["confidence"]})
+
+
+def _answer_sentiment(message: str) -> str:
+    lowered = message.lower()
+    if any(w in lowered for w in NEGATIVE_WORDS):
+        sentiment, confidence = "negative", 0.92
+    elif any(w in lowered for w in POSITIVE_WORDS):
+        sentiment, confidence = "positive", 0.88
+    else:
+        sentiment, confidence = "neutral", 0.81
+    return json.dumps({"sentiment": sentiment, "confidence": confidence})
+
+
+def _answer_response(user_prompt: str, overrides: Dict[str, str]) -> str:
+    from app.services.response_generator import _select_template_with_sub_intent
+
+    intent_match = re.search(r"^Intent: (\S+)", user_prompt, re.MULTILINE)
+    sub_match = re.search(r"^Sub-intent: (\S+)", user_prompt, re.MULTILINE)
+    intent = intent_match.group(1) if intent_match else "general_query"
+    if intent in overrides:
+        return overrides[intent]
+    message = _customer_message(user_prompt)
+    template = _select_template_with_sub_intent(intent, message, sub_match.group(1) if sub_match else None)
+    return template or "Thanks for reaching out. A support specialist will follow up shortly."
+
+
+def canned_completion(messages: List[Dict], overrides: Optional[Dict[str, str]] = None) -> str:
+    """
+    Deterministic assistant reply for a chat request.
+
+    The prompt is recognised from the system message the app sends
+    (intent classification, sentiment, or response generation).
+    """
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    system_lower = system.lower()
+    if "intents:" in system_lower:
+        return _answer_intent(_customer_message(user))
+    if "sentiment" in system_lower:
+        return _answer_sentiment(_customer_message(user))
+    return _answer_response(user, overrides or {})
+
+
+# ---------------------------------------------------------------------------
+# App
+# ---------------------------------------------------------------------------
+
+def _error(status: int, message: str, type_: str, code: str, headers: Optional[Dict] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": type_, "param": None, "code": code}},
+        headers=headers,
+    )
+
+
+def _usage(messages: List[Dict], content: str) -> Dict[str, int]:
+    prompt = sum(len(str(m.get("content", "")).split()) for m in messages)
+    completion = len(content.split())
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    """Build the fake API app; ``app.state.stats`` holds request counters."""
+    config = config or FakeOpenAIConfig()
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    bucket = _TokenBucket(config.max_rps) if config.max_rps > 0 else None
+    stats = _Stats()
+
+    app = FastAPI(title="Fake OpenAI", docs_url=None, redoc_url=None)
+    app.state.config = config
+    app.state.stats = stats
+
+    def draw():
+        with rng_lock:
+            return rng.random(), rng.random(), config.latency.sample(rng)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    def get_stats():
+        return stats.snapshot()
+
+    @app.get("/v1/models")
+    def list_models():
+        return {"object": "list", "data": [{"id": DEFAULT_MODEL, "object": "model", "owned_by": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stats.incr("requests")
+        try:
+            body = await request.json()
+            messages = body["messages"]
+        except (ValueError, KeyError, TypeError):
+            stats.incr("invalid")
+            return _error(400, "messages is required", "invalid_request_error", "invalid_request")
+
+        error_roll, limit_roll, delay = draw()
+        retry_headers = {
+            "retry-after": f"{config.retry_after_s:g}",
+            "retry-after-ms": str(int(config.retry_after_s * 1000)),
+            "x-ratelimit-remaining-requests": "0",
+        }
+        if (bucket and not bucket.take()) or limit_roll < config.rate_limit_rate:
+            stats.incr("rate_limited")
+            return _error(429, "Rate limit reached", "rate_limit_error", "rate_limit_exceeded", retry_headers)
+        if error_roll < config.error_rate:
+            await asyncio.sleep(delay)
+            stats.incr("errors")
+            return _error(500, "The server had an error processing your request", "server_error", "server_error")
+
+        content = canned_completion(messages, config.responses)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", DEFAULT_MODEL)
+
+        if body.get("stream"):
+            stats.incr("streamed")
+            return StreamingResponse(
+                _stream(completion_id, created, model, content, delay, config.stream_chunk_delay),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(delay)
+        stats.incr("completed")
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": _usage(messages, content),
+        }
+
+    return app
+
+
+async def _stream(completion_id, created, model, content, first_delay, chunk_delay):
+    """Yield SSE chunks in the ``chat.completion.chunk`` format."""
+
+    def chunk(delta, finish=None):
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    await asyncio.sleep(first_delay)
+    yield chunk({"role": "assistant", "content": ""})
+    for piece in re.findall(r"\S+\s*", content):
+        if chunk_delay:
+            await asyncio.sleep(chunk_delay)
+        yield chunk({"content": piece})
+    yield chunk({}, finish="stop")
+    yield "data: [DONE]\n\n"
+
+
+# ---------------------------------------------------------------------------
+# In-process server (benchmarks / tests)
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def serve_in_thread(config: Optional[FakeOpenAIConfig] = None, host: str = "127.0.0.1",
+                    port: int = 0) -> Iterator[str]:
+    """
+    Run the fake server on a background thread; yields its ``/v1`` base URL.
+
+    ``port=0`` picks a free ephemeral port.
+    """
+    import socket
+
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    bound_port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if time.monotonic() > deadline or not thread.is_alive():
+                raise RuntimeError("fake OpenAI server failed to start")
+            time.sleep(0.01)
+        yield f"http://{host}:{bound_port}/v1"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        sock.close()
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake OpenAI chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--latency",
+        type=LatencySpec.parse,
+        default=LatencySpec(),
+        help="Latency distribution: fixed:S | uniform:A:B | normal:MEAN:SD | lognormal:MEDIAN:SIGMA",
+    )
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="429 above this many requests/second (0 = off)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--responses",
+        type=Path,
+        default=None,
+        help="JSON {intent: reply} overriding generated response text",
+    )
+    return parser.parse_args(argv)
+
+
+def _config_from_args(args) -> FakeOpenAIConfig:
+    responses = {}
+    if args.responses:
+        responses = json.loads(args.responses.read_text(encoding="utf-8"))
+    return FakeOpenAIConfig(
+        latency=args.latency,
+        stream_chunk_delay=args.stream_chunk_delay,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_rps=args.max_rps,
+        retry_after_s=args.retry_after,
+        seed=args.seed,
+        responses=responses,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    # The canned answers reuse app modules, which need a SECRET_KEY to import.
+    os.environ.setdefault("SECRET_KEY", "fake-openai-server")
+    cli_args = _parse_args()
+    uvicorn.run(create_app(_config_from_args(cli_args)), host=cli_args.host, port=cli_args.port)
@@ -0,0 +1,250 @@
+"""
+benchmarks/harness.py
+
+Purpose:
+--------
+Small, dependency-free timing harness used by the benchmark suite.
+
+Responsibilities:
+-----------------
+- Time a zero-argument callable with warmup, auto-calibrated inner loop
+  and several repeats, and summarise the per-call latency distribution
+- Serialise results to stable (sorted, versioned) JSON
+- Compare a run against a stored baseline and flag regressions that
+  exceed a configurable relative threshold
+
+DO NOT:
+-------
+- Import application code (cases own their setup; see benchmarks/suite.py)
+- Print or exit -- that is the CLI's job (benchmarks/run.py)
+"""
+
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCHEMA_VERSION = 1
+
+# Comparison statuses
+STATUS_OK = "ok"
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_NEW = "new"
+STATUS_MISSING = "missing"
+
+DEFAULT_THRESHOLD = 0.15
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def _calibrate(func: Callable[[], object], min_time_s: float) -> int:
+    """
+    Pick an inner-loop count so one sample takes at least ``min_time_s``.
+
+    Very fast functions (sub-microsecond) would otherwise be dominated by
+    timer resolution and loop overhead.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        elapsed_s = (time.perf_counter_ns() - start) / 1e9
+        if elapsed_s >= min_time_s or number >= 1_000_000:
+            return number
+        # Grow geometrically, but jump straight to the estimate when we can.
+        if elapsed_s > 0:
+            number = max(number * 2, int(number * min_time_s / elapsed_s) + 1)
+        else:
+            number *= 10
+
+
+def measure(
+    func: Callable[[], object],
+    *,
+    repeat: int = 7,
+    warmup: int = 1,
+    min_time_s: float = 0.05,
+    number: Optional[int] = None,
+    items: int = 1,
+) -> Dict:
+    """
+    Time ``func`` and return summary statistics for a single call.
+
+    Args:
+        func: Zero-argument callable to benchmark.
+        repeat: Number of timed samples.
+        warmup: Untimed calls made before calibration (caches, imports).
+        min_time_s: Target duration of one sample when auto-calibrating.
+        number: Fixed inner-loop count; auto-calibrated when None.
+        items: Units of work performed by one call (e.g. tickets processed),
+            used to report ``items_per_sec`` for throughput cases.
+
+    Returns:
+        Dict with ``median_us``, ``p95_us``, ``min_us``, ``mean_us``,
+        ``stdev_us``, ``ops_per_sec``, ``items_per_sec``, ``number``,
+        ``repeat`` and ``items``.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+
+    for _ in range(max(0, warmup)):
+        func()
+
+    if number is None:
+        number = _calibrate(func, min_time_s)
+
+    samples_us: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        elapsed_ns = time.perf_counter_ns() - start
+        samples_us.append(elapsed_ns / number / 1000.0)
+
+    samples_us.sort()
+    median = statistics.median(samples_us)
+    return {
+        "median_us": round(median, 3),
+        "p95_us": round(_percentile(samples_us, 95), 3),
+        "min_us": round(samples_us[0], 3),
+        "mean_us": round(statistics.fmean(samples_us), 3),
+        "stdev_us": round(statistics.stdev(samples_us), 3) if len(samples_us) > 1 else 0.0,
+        "ops_per_sec": round(1e6 / median, 2) if median > 0 else 0.0,
+        "items_per_sec": round(items * 1e6 / median, 2) if median > 0 else 0.0,
+        "number": number,
+        "repeat": repeat,
+        "items": items,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Serialisation
+# ---------------------------------------------------------------------------
+
+def environment_info() -> Dict:
+    """Describe the machine/interpreter a run was produced on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "executable": sys.executable,
+    }
+
+
+def build_report(results: Dict[str, Dict]) -> Dict:
+    """Wrap per-case results in the versioned report envelope."""
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment_info(),
+        "results": results,
+    }
+
+
+def save_report(report: Dict, path: Path) -> None:
+    """Write a report as stable JSON (sorted keys) so diffs stay readable."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_report(path: Path) -> Dict:
+    """
+    Load a report written by :func:`save_report`.
+
+    Raises:
+        ValueError: If the file's schema version is not supported.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = data.get("schema_version")
+    if version != SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark schema_version {version!r} in {path} "
+            f"(expected {SCHEMA_VERSION})"
+        )
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare_to_baseline(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "median_us",
+) -> List[Dict]:
+    """
+    Compare current results with a baseline, case by case.
+
+    A case regresses when ``current > baseline * (1 + threshold)`` and
+    improves when ``current < baseline * (1 - threshold)``. Cases present
+    on only one side are reported as ``new`` / ``missing`` and never fail
+    the gate on their own.
+
+    Args:
+        results: ``{case_name: stats}`` from the current run.
+        baseline: ``{case_name: stats}`` from the stored baseline.
+        threshold: Allowed relative slowdown, e.g. 0.15 for 15%.
+        metric: Stats key to compare (lower is better).
+
+    Returns:
+        List of dicts sorted by case name with ``name``, ``status``,
+        ``baseline``, ``current`` and ``ratio`` keys.
+
+    Raises:
+        ValueError: If ``threshold`` is negative.
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0")
+
+    rows: List[Dict] = []
+    for name in sorted(set(results) | set(baseline)):
+        current = results.get(name, {}).get(metric)
+        previous = baseline.get(name, {}).get(metric)
+
+        if current is None:
+            status, ratio = STATUS_MISSING, None
+        elif previous is None:
+            status, ratio = STATUS_NEW, None
+        else:
+            ratio = round(current / previous, 4) if previous > 0 else None
+            if previous > 0 and current > previous * (1 + threshold):
+                status = STATUS_REGRESSION
+            elif previous > 0 and current < previous * (1 - threshold):
+                status = STATUS_IMPROVEMENT
+            else:
+                status = STATUS_OK
+
+        rows.append({
+            "name": name,
+            "status": status,
+            "baseline": previous,
+            "current": current,
+            "ratio": ratio,
+        })
+    return rows
+
+
+def has_regressions(comparison: List[Dict]) -> bool:
+    """True when any row of :func:`compare_to_baseline` regressed."""
+    return any(row["status"] == STATUS_REGRESSION for row in comparison)
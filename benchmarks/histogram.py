@@ -0,0 +1,159 @@
+"""
+benchmarks/histogram.py
+
+Purpose:
+--------
+Pure-Python latency histogram with HdrHistogram-style log-linear buckets.
+
+Values are bucketed by power-of-two magnitude and then split linearly into
+``2 ** significant_bits`` sub-buckets, so the relative error of every
+recorded value is bounded (about 0.1% with the default 10 bits) no matter
+whether the latency is 50 microseconds or 50 seconds. Buckets are stored
+sparsely, which keeps memory proportional to the number of distinct
+magnitudes actually seen.
+
+Responsibilities:
+-----------------
+- Record integer latencies (microseconds by convention)
+- Answer percentile / min / max / mean queries
+- Merge histograms and serialise them to JSON-friendly dicts
+
+DO NOT:
+-------
+- Measure time itself (callers pass already-measured values)
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_SIGNIFICANT_BITS = 10
+REPORT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 99.99)
+
+
+class LatencyHistogram:
+    """Sparse log-linear histogram of non-negative integer values."""
+
+    def __init__(self, significant_bits: int = DEFAULT_SIGNIFICANT_BITS):
+        if not 1 <= significant_bits <= 16:
+            raise ValueError("significant_bits must be between 1 and 16")
+        self.significant_bits = significant_bits
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.total_count = 0
+        self._sum = 0
+        self.min = None
+        self.max = None
+
+    # ------------------------------------------------------------------
+    # Bucketing
+    # ------------------------------------------------------------------
+
+    def _bucket(self, value: int) -> Tuple[int, int]:
+        shift = max(0, value.bit_length() - self.significant_bits)
+        return shift, value >> shift
+
+    @staticmethod
+    def _bucket_range(shift: int, sub: int) -> Tuple[int, int]:
+        """Inclusive [low, high] of values that map to a bucket."""
+        low = sub << shift
+        return low, low + (1 << shift) - 1
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, value: int, count: int = 1) -> None:
+        """
+        Record ``value`` ``count`` times.
+
+        Raises:
+            ValueError: If ``value`` is negative or ``count`` is not positive.
+        """
+        value = int(value)
+        if value < 0:
+            raise ValueError("histogram values must be non-negative")
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        key = self._bucket(value)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.total_count += count
+        self._sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add every value recorded in ``other`` to this histogram."""
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("cannot merge histograms with different precision")
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    def _sorted_buckets(self) -> List[Tuple[Tuple[int, int], int]]:
+        return sorted(self._counts.items(), key=lambda kv: self._bucket_range(*kv[0])[0])
+
+    def percentile(self, pct: float) -> int:
+        """
+        Value at percentile ``pct`` (0-100).
+
+        Returns the upper edge of the bucket holding the target rank,
+        clamped to the observed maximum -- the same convention
+        HdrHistogram uses, so reported tails are never optimistic.
+        """
+        if not 0.0 <= pct <= 100.0:
+            raise ValueError("percentile must be between 0 and 100")
+        if not self.total_count:
+            return 0
+        target = max(1, int(-(-pct * self.total_count // 100)))  # ceil
+        running = 0
+        for (shift, sub), count in self._sorted_buckets():
+            running += count
+            if running >= target:
+                return min(self._bucket_range(shift, sub)[1], self.max)
+        return self.max
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+
+    def summary(self, percentiles: Iterable[float] = REPORT_PERCENTILES) -> Dict:
+        """Compact summary: count, min/max/mean and selected percentiles."""
+        return {
+            "count": self.total_count,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "mean": round(self.mean, 2),
+            "percentiles": {f"p{p:g}": self.percentile(p) for p in percentiles},
+        }
+
+    def to_dict(self) -> Dict:
+        """Full, mergeable representation (summary plus raw buckets)."""
+        data = self.summary()
+        data["significant_bits"] = self.significant_bits
+        data["buckets"] = [
+            [self._bucket_range(shift, sub)[0], count]
+            for (shift, sub), count in self._sorted_buckets()
+        ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        """Rebuild a histogram from :meth:`to_dict` output."""
+        hist = cls(data.get("significant_bits", DEFAULT_SIGNIFICANT_BITS))
+        for low, count in data.get("buckets", []):
+            hist.record(low, count)
+        # Bucket lower bounds lose the exact extremes; restore them.
+        if hist.total_count:
+            hist.min, hist.max = data.get("min", hist.min), data.get("max", hist.max)
+            hist._sum = int(round(data.get("mean", hist.mean) * hist.total_count))
+        return hist
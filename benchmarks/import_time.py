@@ -0,0 +1,228 @@
+"""
+benchmarks/import_time.py
+
+Purpose:
+--------
+Cold-start cost of ``import app.main`` (what every new API replica pays
+before it can serve), with a budget check for CI.
+
+Each run imports the module in a fresh interpreter with ``-X importtime``
+and reads its report (one line per module: self and cumulative
+microseconds). The report gives:
+
+- ``import_ms``: median / min / max of the total over ``--runs`` runs
+- ``packages_ms``: self time summed per top-level package (median run),
+  i.e. which dependencies the startup is spent in
+- ``slowest_modules``: the modules with the most self time
+- ``forbidden_loaded``: which ``--forbid`` packages were imported at all.
+  The defaults (openai, resend) are only needed on some code paths and are
+  imported on first use (app/core/optional_imports.py,
+  app/services/email_outbox.py); this catches a module-level import
+  creeping back in
+
+``-X importtime`` itself adds some overhead, so compare numbers from this
+tool with each other, not with wall-clock startup.
+
+Usage:
+------
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --budget-ms 800
+    python -m benchmarks.import_time --module workers.email_outbox --forbid openai \\
+        --output benchmarks/results/import_time.json
+
+Exits with status 1 when the median exceeds ``--budget-ms`` or a forbidden
+package was imported.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Add project root to path so the benchmark can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODULE = "app.main"
+DEFAULT_FORBID = ("openai", "resend")
+# Wall-clock budget for the median cold import of app.main. It is host
+# dependent, so it is enforced by this script, not by the unit tests.
+DEFAULT_BUDGET_MS = 1500.0
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """The module lines of an ``-X importtime`` report, in report order."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def total_us(records: Sequence[ImportRecord], module: str) -> int:
+    """Cumulative time of ``module``; every module it imported is included."""
+    for record in records:
+        if record.name == module:
+            return record.cumulative_us
+    raise ValueError(f"{module} not found in the -X importtime report")
+
+
+def package_self_us(records: Iterable[ImportRecord]) -> Dict[str, int]:
+    """Self time summed per top-level package, largest first."""
+    totals: Dict[str, int] = {}
+    for record in records:
+        package = record.name.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + record.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def loaded(records: Iterable[ImportRecord], packages: Iterable[str]) -> List[str]:
+    """The ``packages`` (or any of their submodules) that were imported."""
+    names = {record.name.split(".", 1)[0] for record in records}
+    return [package for package in packages if package in names]
+
+
+def _import_env() -> Dict[str, str]:
+    # app.core.config requires these; nothing connects at import time.
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "benchmark-secret-key")
+    env["DEBUG"] = "false"
+    return env
+
+
+def run_once(module: str, cwd: Optional[str] = None) -> List[ImportRecord]:
+    """Import ``module`` in a fresh interpreter and parse its report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd or str(project_root),
+        env=_import_env(),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def run(
+    module: str = DEFAULT_MODULE,
+    *,
+    runs: int = 5,
+    forbid: Sequence[str] = DEFAULT_FORBID,
+    budget_ms: Optional[float] = DEFAULT_BUDGET_MS,
+    top: int = 15,
+    cwd: Optional[str] = None,
+) -> Dict:
+    """Measure ``runs`` cold imports of ``module`` and check them against the budget."""
+    samples = [run_once(module, cwd) for _ in range(runs)]
+    totals = [total_us(records, module) for records in samples]
+    median_run = samples[totals.index(sorted(totals)[(len(totals) - 1) // 2])]
+
+    median_ms = statistics.median(totals) / 1000
+    forbidden = sorted({p for records in samples for p in loaded(records, forbid)})
+    report = {
+        "module": module,
+        "runs": runs,
+        "import_ms": {
+            "median": round(median_ms, 1),
+            "min": round(min(totals) / 1000, 1),
+            "max": round(max(totals) / 1000, 1),
+        },
+        "packages_ms": {
+            package: round(us / 1000, 1) for package, us in list(package_self_us(median_run).items())[:top]
+        },
+        "slowest_modules": [
+            {"name": r.name, "self_ms": round(r.self_us / 1000, 1), "cumulative_ms": round(r.cumulative_us / 1000, 1)}
+            for r in sorted(median_run, key=lambda r: r.self_us, reverse=True)[:top]
+        ],
+        "forbidden_loaded": forbidden,
+        "budget_ms": budget_ms,
+    }
+    report["ok"] = not forbidden and (budget_ms is None or median_ms <= budget_ms)
+    return report
+
+
+def _format(report: Dict) -> str:
+    t = report["import_ms"]
+    lines = [
+        f"import {report['module']}: median {t['median']} ms (min {t['min']}, max {t['max']}, "
+        f"{report['runs']} runs; budget {report['budget_ms']} ms)",
+        "",
+        f"{'package':<24} {'self_ms':>8}",
+    ]
+    lines += [f"{package:<24} {ms:>8}" for package, ms in report["packages_ms"].items()]
+    lines += ["", f"{'module':<48} {'self_ms':>8} {'cum_ms':>8}"]
+    lines += [f"{m['name']:<48} {m['self_ms']:>8} {m['cumulative_ms']:>8}" for m in report["slowest_modules"]]
+    lines.append("")
+    if report["forbidden_loaded"]:
+        lines.append(f"FAIL: imported at startup: {', '.join(report['forbidden_loaded'])}")
+    if report["budget_ms"] is not None and t["median"] > report["budget_ms"]:
+        lines.append("FAIL: median over budget")
+    if report["ok"]:
+        lines.append("OK")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    report = run(
+        args.module,
+        runs=args.runs,
+        forbid=args.forbid,
+        budget_ms=args.budget_ms if args.budget_ms > 0 else None,
+        top=args.top,
+    )
+    print(_format(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        logger.info("Wrote report to %s", args.output)
+    return 0 if report["ok"] else 1
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import time of the app, with a budget check.")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help=f"Module to import (default: {DEFAULT_MODULE})")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time (default: 5)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Fail when the median exceeds this (default: {DEFAULT_BUDGET_MS:g}; 0 = no budget)")
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBID),
+                        help=f"Packages that must not be imported (default: {' '.join(DEFAULT_FORBID)})")
+    parser.add_argument("--top", type=int, default=15, help="Rows in the package / module tables (default: 15)")
+    parser.add_argument("--output", type=Path, default=None, help="Optional path for the JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+benchmarks/list_serialization.py
+
+Purpose:
+--------
+Latency of 100-item list pages (GET /admin/tickets, GET /tickets/) with and
+without FAST_JSON_RESPONSES (app/core/json_response.py).
+
+For each profile a uvicorn server is started in a subprocess on a fresh
+SQLite file seeded with ``--tickets`` fully populated tickets. Client
+threads then fetch 100-item pages back to back (closed loop), cycling
+through the offset pages of both endpoints as an admin:
+
+- ``pydantic``: FAST_JSON_RESPONSES=false -- item models, response_model
+  validation, standard library JSON encoder
+- ``orjson``: FAST_JSON_RESPONSES=true -- rows to dicts to orjson, no
+  response_model validation
+
+Both profiles select the same columns, so the difference is serialization
+alone. Before timing, the first page of each endpoint is fetched from both
+servers and compared: the report's ``identical`` says whether the JSON
+bodies decode to the same data.
+
+Usage:
+------
+    python -m benchmarks.list_serialization
+    python -m benchmarks.list_serialization --concurrency 4 --duration 10 --tickets 5000 \\
+        --output benchmarks/results/list_serialization.json
+
+DO NOT:
+-------
+- Point this at a database you care about: each profile run creates and
+  deletes its own SQLite file
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+# Add project root to path so the benchmark can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.db_concurrency import _OpStats  # noqa: E402
+from benchmarks.login_throughput import _start_server, _stop_server  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("pydantic", "orjson")
+ENDPOINTS = ("/admin/tickets", "/tickets/")
+PAGE_SIZE = 100
+ADMIN_EMAIL = "list-bench-admin@example.com"
+PASSWORD = "Benchmark-Passw0rd!"
+# Fixed, so both profiles' databases hold the same rows.
+SEED_TIME = datetime(2026, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def profile_env(profile: str) -> Dict[str, str]:
+    """Settings overrides for ``profile`` (see module docstring)."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+    return {"FAST_JSON_RESPONSES": "true" if profile == "orjson" else "false"}
+
+
+def _seed(url: str, tickets: int) -> None:
+    """Create the schema, one admin and ``tickets`` tickets with every listed field set."""
+    from sqlalchemy import create_engine, insert
+
+    from app.core.security import hash_password
+    from app.db.session import Base
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401 -- register tables
+    from app.models.ticket import Ticket
+    from app.models.user import User
+
+    engine = create_engine(url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(User), [{"email": ADMIN_EMAIL, "hashed_password": hash_password(PASSWORD),
+                                         "role": "admin"}])
+            conn.execute(insert(Ticket), [
+                {
+                    "message": f"I was charged twice for order #{i}, please refund the duplicate payment.",
+                    "intent": ("payment", "refund", "login_issue")[i % 3],
+                    "sub_intent": "duplicate_charge",
+                    "confidence": 0.5 + (i % 50) / 100,
+                    "sentiment": ("negative", "neutral", "positive")[i % 3],
+                    "sentiment_confidence": 0.8125,
+                    "status": ("auto_resolved", "escalated", "open")[i % 3],
+                    "is_archived": False,
+                    "response": "We have refunded the duplicate charge; it will show up within 5 business days.",
+                    "response_source": "ai",
+                    "quality_score": (i % 10) / 10,
+                    "user_id": 1,
+                    "assigned_agent_id": 1 if i % 4 == 0 else None,
+                    "created_at": SEED_TIME - timedelta(seconds=i),
+                    "updated_at": SEED_TIME - timedelta(seconds=i),
+                }
+                for i in range(tickets)
+            ])
+    finally:
+        engine.dispose()
+
+
+def _login(base_url: str) -> Dict[str, str]:
+    response = httpx.post(f"{base_url}/auth/login", json={"email": ADMIN_EMAIL, "password": PASSWORD}, timeout=60)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _page_worker(base_url: str, headers: Dict[str, str], pages: int, offset: int, stats: Dict[str, _OpStats],
+                 stop: threading.Event, start: threading.Barrier) -> None:
+    with httpx.Client(base_url=base_url, headers=headers, timeout=60) as http:
+        start.wait()
+        i = offset
+        while not stop.is_set():
+            endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+            page = (i // len(ENDPOINTS)) % pages
+            params = {"limit": PAGE_SIZE}
+            if endpoint == "/admin/tickets":
+                params["page"] = page + 1
+            else:
+                params["offset"] = page * PAGE_SIZE
+            i += 1
+            t0 = time.perf_counter_ns()
+            try:
+                response = http.get(endpoint, params=params)
+            except httpx.HTTPError as exc:
+                stats[endpoint].errors[type(exc).__name__] = stats[endpoint].errors.get(type(exc).__name__, 0) + 1
+                continue
+            if response.status_code != 200:
+                key = f"HTTP {response.status_code}"
+                stats[endpoint].errors[key] = stats[endpoint].errors.get(key, 0) + 1
+                continue
+            stats[endpoint].latency.record((time.perf_counter_ns() - t0) // 1000)
+            stats[endpoint].ok += 1
+
+
+def _first_pages(base_url: str, headers: Dict[str, str]) -> Dict[str, object]:
+    return {
+        endpoint: httpx.get(f"{base_url}{endpoint}", params={"limit": PAGE_SIZE}, headers=headers, timeout=60).json()
+        for endpoint in ENDPOINTS
+    }
+
+
+def run_profile(
+    profile: str,
+    *,
+    concurrency: int,
+    duration: float,
+    tickets: int = 1000,
+    workdir: Optional[str] = None,
+) -> Dict:
+    """
+    Run the list workload against a fresh server for one profile.
+
+    Returns:
+        Dict with a summary per endpoint, the ``first_pages`` bodies (used
+        for the identical check, dropped from the report), ``elapsed_s``
+        and the server ``env`` used.
+    """
+    env_overrides = profile_env(profile)
+    fd, path = tempfile.mkstemp(prefix=f"srs-lists-{profile}-", suffix=".db", dir=workdir)
+    os.close(fd)
+    database_url = f"sqlite:///{path}"
+    pages = max(1, tickets // PAGE_SIZE)
+    try:
+        _seed(database_url, tickets)
+        proc, base_url = _start_server(database_url, env_overrides)
+        try:
+            headers = _login(base_url)
+            first_pages = _first_pages(base_url, headers)
+            stop = threading.Event()
+            start = threading.Barrier(concurrency + 1)
+            stats = [{endpoint: _OpStats() for endpoint in ENDPOINTS} for _ in range(concurrency)]
+            threads = [
+                threading.Thread(
+                    target=_page_worker,
+                    args=(base_url, headers, pages, i, stats[i], stop, start),
+                    daemon=True,
+                )
+                for i in range(concurrency)
+            ]
+            for t in threads:
+                t.start()
+            start.wait()
+            t0 = time.perf_counter()
+            time.sleep(duration)
+            stop.set()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - t0
+        finally:
+            _stop_server(proc)
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    result = {"env": env_overrides, "elapsed_s": round(elapsed, 3), "first_pages": first_pages}
+    for endpoint in ENDPOINTS:
+        merged = _OpStats()
+        for s in stats:
+            merged.merge(s[endpoint])
+        result[endpoint] = merged.summary(elapsed)
+    return result
+
+
+def run(profiles: List[str], **kwargs) -> Dict:
+    """Run each profile; with both, compare their bodies and p50 latencies."""
+    results = {p: run_profile(p, **kwargs) for p in profiles}
+    first_pages = {p: r.pop("first_pages") for p, r in results.items()}
+    report = {"config": kwargs, "profiles": results}
+    if "pydantic" in results and "orjson" in results:
+        report["identical"] = first_pages["pydantic"] == first_pages["orjson"]
+        report["p50_speedup"] = {}
+        for endpoint in ENDPOINTS:
+            base = results["pydantic"][endpoint]["latency_us"]["percentiles"]["p50"]
+            fast = results["orjson"][endpoint]["latency_us"]["percentiles"]["p50"]
+            report["p50_speedup"][endpoint] = round(base / fast, 2) if base and fast else None
+    return report
+
+
+def _format(report: Dict) -> str:
+    lines = [f"{'profile':<9} {'endpoint':<15} {'pages/s':>8} {'p50_us':>9} {'p99_us':>10} {'errors':>7}"]
+    for name, result in report["profiles"].items():
+        for endpoint in ENDPOINTS:
+            summary = result[endpoint]
+            p = summary["latency_us"]["percentiles"]
+            lines.append(
+                f"{name:<9} {endpoint:<15} {summary['ops_per_sec']:>8.1f} {p['p50']:>9} {p['p99']:>10}"
+                f" {sum(summary['errors'].values()):>7}"
+            )
+    if "p50_speedup" in report:
+        for endpoint, speedup in report["p50_speedup"].items():
+            lines.append(f"pydantic/orjson p50 {endpoint}: {speedup}")
+        lines.append(f"identical JSON: {report['identical']}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # app.core.config requires these to seed the database; each server gets
+    # its own DATABASE_URL.
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["DEBUG"] = "false"
+
+    report = run(args.profiles, concurrency=args.concurrency, duration=args.duration, tickets=args.tickets)
+    print(_format(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        logger.info("Wrote report to %s", args.output)
+    return 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="100-item list page latency with and without FAST_JSON_RESPONSES.")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES),
+                        help="Profiles to run (default: pydantic orjson)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients (default: 4)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile (default: 5)")
+    parser.add_argument("--tickets", type=int, default=1000, help="Tickets seeded (default: 1000)")
+    parser.add_argument("--output", type=Path, default=None, help="Optional path for the JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,641 @@
+"""
+benchmarks/loadgen.py
+
+Purpose:
+--------
+Open-loop asyncio load generator for the HTTP API.
+
+Unlike a closed-loop client (N workers each waiting for their previous
+response), requests here are *scheduled* at a fixed arrival rate and fired
+at their scheduled time whether or not earlier requests have finished.
+Latency is measured from the **intended** start time, so a server stall
+shows up in the percentiles instead of silently lowering the offered load
+(the "coordinated omission" problem).
+
+Responsibilities:
+-----------------
+- Load weighted scenario files (benchmarks/scenarios/*.json) or replay a
+  JSONL request log
+- Pace requests at a constant or Poisson arrival rate
+- Keep per-role auth sessions (login once up front, optional login and
+  refresh steps during the run)
+- Record latency and service time per step in HDR-style histograms and
+  write machine-readable JSON results (optionally a per-request JSONL log
+  that can itself be replayed)
+
+DO NOT:
+-------
+- Import application code -- this talks to a server over HTTP only
+
+Usage:
+------
+    uvicorn app.main:app --host 127.0.0.1 --port 8000   # in one terminal
+    python -m benchmarks.loadgen --scenario benchmarks/scenarios/mixed.json \\
+        --url http://127.0.0.1:8000 --rate 50 --duration 30 --output loadgen.json
+    python -m benchmarks.loadgen --replay traffic.jsonl --url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+import httpx
+
+# Add project root to path so the generator can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.histogram import LatencyHistogram  # noqa: E402
+from benchmarks.synthetic import synthetic_messages  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+STEP_HTTP = "http"
+STEP_LOGIN = "login"
+STEP_REFRESH = "refresh"
+STEP_KINDS = (STEP_HTTP, STEP_LOGIN, STEP_REFRESH)
+
+ARRIVAL_CONSTANT = "constant"
+ARRIVAL_POISSON = "poisson"
+
+DEFAULT_EXPECT = (200, 201)
+TICKET_POOL_SIZE = 1000
+
+
+# ---------------------------------------------------------------------------
+# Scenario model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Step:
+    """One weighted request type in a scenario."""
+
+    name: str
+    method: str = "GET"
+    path: str = "/"
+    weight: float = 1.0
+    kind: str = STEP_HTTP
+    auth: Optional[str] = None
+    json: Optional[object] = None
+    expect: tuple = DEFAULT_EXPECT
+
+
+@dataclass
+class Scenario:
+    """A weighted traffic mix plus the credentials it needs."""
+
+    name: str
+    steps: List[Step]
+    rate: float = 10.0
+    duration: float = 10.0
+    credentials: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+
+@dataclass
+class PlannedRequest:
+    """A request scheduled ``offset_s`` seconds after the run starts."""
+
+    offset_s: float
+    step: Step
+
+
+def _step_from_dict(data: Dict, index: int) -> Step:
+    kind = data.get("kind", STEP_HTTP)
+    if kind not in STEP_KINDS:
+        raise ValueError(f"step {index}: unknown kind {kind!r} (expected one of {STEP_KINDS})")
+    if kind in (STEP_LOGIN, STEP_REFRESH) and not data.get("auth"):
+        raise ValueError(f"step {index}: {kind} steps need an 'auth' role")
+    weight = float(data.get("weight", 1.0))
+    if weight < 0:
+        raise ValueError(f"step {index}: weight must be >= 0")
+    defaults = {
+        STEP_LOGIN: ("POST", "/auth/login"),
+        STEP_REFRESH: ("POST", "/auth/refresh"),
+    }.get(kind, ("GET", "/"))
+    return Step(
+        name=data.get("name") or f"step{index}",
+        method=str(data.get("method", defaults[0])).upper(),
+        path=data.get("path", defaults[1]),
+        weight=weight,
+        kind=kind,
+        auth=data.get("auth"),
+        json=data.get("json"),
+        expect=tuple(data.get("expect", DEFAULT_EXPECT)),
+    )
+
+
+def load_scenario(path: Path) -> Scenario:
+    """
+    Load a scenario JSON file.
+
+    Raises:
+        ValueError: If the file has no steps, only zero weights, or a step
+            references a role that has no credentials.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    steps = [_step_from_dict(s, i) for i, s in enumerate(data.get("steps", []))]
+    if not steps or not any(s.weight > 0 for s in steps):
+        raise ValueError(f"scenario {path} needs at least one step with weight > 0")
+    credentials = data.get("credentials", {})
+    for step in steps:
+        if step.auth and step.auth not in credentials:
+            raise ValueError(f"step {step.name!r} uses role {step.auth!r} with no credentials")
+    return Scenario(
+        name=data.get("name", Path(path).stem),
+        steps=steps,
+        rate=float(data.get("rate", 10.0)),
+        duration=float(data.get("duration", 10.0)),
+        credentials=credentials,
+    )
+
+
+def load_replay(path: Path, rate: Optional[float] = None, speed: float = 1.0) -> List[PlannedRequest]:
+    """
+    Load a JSONL request log for replay.
+
+    Each line is an object with ``method``, ``path`` and optionally
+    ``name``, ``json``, ``auth``, ``kind``, ``expect`` and ``offset_s``.
+    When every line carries ``offset_s`` the original timing is replayed
+    (divided by ``speed``); otherwise lines are paced at ``rate`` req/s.
+    Blank lines and lines without a ``path`` are ignored, so the log
+    written by ``--events`` can be fed straight back in.
+    """
+    records = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if "path" in data:
+                records.append(data)
+
+    timed = records and all("offset_s" in r for r in records)
+    if not timed and not rate:
+        raise ValueError("replay file has no offset_s timing; pass a --rate")
+    if speed <= 0:
+        raise ValueError("speed must be > 0")
+
+    planned = []
+    for i, rec in enumerate(records):
+        offset = float(rec["offset_s"]) / speed if timed else i / rate
+        planned.append(PlannedRequest(offset_s=offset, step=_step_from_dict(rec, i)))
+    planned.sort(key=lambda p: p.offset_s)
+    return planned
+
+
+def plan_requests(
+    scenario: Scenario,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    arrival: str = ARRIVAL_CONSTANT,
+    seed: int = 1234,
+) -> List[PlannedRequest]:
+    """
+    Build the open-loop schedule for a scenario.
+
+    Args:
+        scenario: Weighted step mix.
+        rate: Target requests/second (scenario default when None).
+        duration: Run length in seconds (scenario default when None).
+        arrival: ``constant`` spacing or ``poisson`` (exponential gaps).
+        seed: Seed for step selection and Poisson gaps.
+
+    Raises:
+        ValueError: On a non-positive rate/duration or unknown arrival mode.
+    """
+    rate = scenario.rate if rate is None else rate
+    duration = scenario.duration if duration is None else duration
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be > 0")
+    if arrival not in (ARRIVAL_CONSTANT, ARRIVAL_POISSON):
+        raise ValueError(f"unknown arrival mode {arrival!r}")
+
+    rng = random.Random(seed)
+    weights = [s.weight for s in scenario.steps]
+    planned = []
+    t = 0.0
+    i = 0
+    while True:
+        t = rng.expovariate(rate) + t if arrival == ARRIVAL_POISSON else i / rate
+        if t >= duration:
+            break
+        step = rng.choices(scenario.steps, weights=weights)[0]
+        planned.append(PlannedRequest(offset_s=t, step=step))
+        i += 1
+    return planned
+
+
+# ---------------------------------------------------------------------------
+# Run-time state
+# ---------------------------------------------------------------------------
+
+class _Sessions:
+    """Access/refresh tokens per role, shared by all in-flight requests."""
+
+    def __init__(self, credentials: Dict[str, Dict[str, str]]):
+        self.credentials = credentials
+        self.access: Dict[str, str] = {}
+        self.refresh: Dict[str, str] = {}
+        # Refresh tokens rotate on every use, so concurrent refreshes for
+        # the same role would race; serialise them per role.
+        self.refresh_locks: Dict[str, asyncio.Lock] = {}
+
+    def headers(self, role: Optional[str]) -> Dict[str, str]:
+        token = self.access.get(role) if role else None
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+    def store(self, role: str, body: Dict) -> None:
+        if body.get("access_token"):
+            self.access[role] = body["access_token"]
+        if body.get("refresh_token"):
+            self.refresh[role] = body["refresh_token"]
+
+    def lock(self, role: str) -> asyncio.Lock:
+        if role not in self.refresh_locks:
+            self.refresh_locks[role] = asyncio.Lock()
+        return self.refresh_locks[role]
+
+
+class _StepStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.count = 0
+        self.ok = 0
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+        self.exceptions: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "ok": self.ok,
+            "errors": self.errors,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "exceptions": dict(sorted(self.exceptions.items())),
+            "latency_us": self.latency.summary(),
+            "service_time_us": self.service.summary(),
+        }
+
+
+def _render(value, context: Dict):
+    """
+    Substitute ``{placeholder}`` fields in strings nested inside ``value``.
+
+    Raises:
+        KeyError: If a placeholder has no value yet (e.g. ``{ticket_id}``
+            before any ticket was created in this run).
+    """
+    if isinstance(value, str):
+        return value.format_map(context)
+    if isinstance(value, dict):
+        return {k: _render(v, context) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, context) for v in value]
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class LoadRunner:
+    """
+    Execute a list of :class:`PlannedRequest` against ``base_url``.
+
+    Args:
+        base_url: Server root, e.g. ``http://127.0.0.1:8000``.
+        credentials: ``{role: {"email": ..., "password": ...}}``.
+        timeout: Per-request timeout in seconds.
+        max_inflight: Requests still in flight beyond this are not sent;
+            they are counted as ``dropped`` (the schedule is never delayed).
+        transport: Optional httpx transport (tests use ``httpx.ASGITransport``).
+        events_path: When set, append one JSON line per request.
+        seed: Seed for message/ticket placeholder selection.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        credentials: Optional[Dict[str, Dict[str, str]]] = None,
+        *,
+        timeout: float = 10.0,
+        max_inflight: int = 1000,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        events_path: Optional[Path] = None,
+        seed: int = 1234,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.sessions = _Sessions(credentials or {})
+        self.timeout = timeout
+        self.max_inflight = max_inflight
+        self.transport = transport
+        self.events_path = Path(events_path) if events_path else None
+        self.rng = random.Random(seed)
+        self.messages = [m["message"] for m in synthetic_messages(200, seed=seed)]
+        self.ticket_ids: Deque[int] = deque(maxlen=TICKET_POOL_SIZE)
+        self.stats: Dict[str, _StepStats] = {}
+        self.total = _StepStats()
+        self.dropped = 0
+        self.skipped = 0
+        self._inflight = 0
+        self._events: List[Dict] = []
+
+    # -- placeholders -----------------------------------------------------
+
+    def _context(self, role: Optional[str]) -> Dict:
+        ctx = {"message": self.rng.choice(self.messages)}
+        if self.ticket_ids:
+            ctx["ticket_id"] = self.rng.choice(self.ticket_ids)
+        if role and role in self.sessions.credentials:
+            ctx["email"] = self.sessions.credentials[role].get("email", "")
+            ctx["password"] = self.sessions.credentials[role].get("password", "")
+        return ctx
+
+    # -- auth ---------------------------------------------------------------
+
+    async def login_all(self, client: httpx.AsyncClient) -> Dict[str, bool]:
+        """Log every configured role in once before the timed run starts."""
+        outcome = {}
+        for role, creds in self.sessions.credentials.items():
+            try:
+                resp = await client.post("/auth/login", json=creds)
+                ok = resp.status_code == 200
+                if ok:
+                    self.sessions.store(role, resp.json())
+                else:
+                    logger.warning("Login for role %r failed with HTTP %s", role, resp.status_code)
+            except httpx.HTTPError as exc:
+                ok = False
+                logger.warning("Login for role %r failed: %s", role, exc)
+            outcome[role] = ok
+        return outcome
+
+    # -- one request ------------------------------------------------------
+
+    async def _send(self, client: httpx.AsyncClient, step: Step) -> Optional[httpx.Response]:
+        role = step.auth
+        if step.kind == STEP_LOGIN:
+            body = self.sessions.credentials.get(role)
+            if not body:
+                return None
+            resp = await client.post(step.path, json=body)
+            if resp.status_code == 200:
+                self.sessions.store(role, resp.json())
+            return resp
+
+        if step.kind == STEP_REFRESH:
+            async with self.sessions.lock(role):
+                token = self.sessions.refresh.get(role)
+                if not token:
+                    return None
+                resp = await client.post(step.path, json={"refresh_token": token})
+                if resp.status_code == 200:
+                    self.sessions.store(role, resp.json())
+                return resp
+
+        try:
+            ctx = self._context(role)
+            path = _render(step.path, ctx)
+            body = _render(step.json, ctx) if step.json is not None else None
+        except KeyError:
+            return None  # e.g. {ticket_id} before any ticket was created
+
+        resp = await client.request(
+            step.method, path, json=body, headers=self.sessions.headers(role)
+        )
+        if step.method == "POST" and resp.status_code == 201 and path.rstrip("/") == "/tickets":
+            try:
+                self.ticket_ids.append(int(resp.json()["id"]))
+            except (ValueError, KeyError, TypeError):
+                pass
+        return resp
+
+    async def _fire(self, client: httpx.AsyncClient, planned: PlannedRequest, start: float) -> None:
+        step = planned.step
+        intended = start + planned.offset_s
+        stats = self.stats.setdefault(step.name, _StepStats())
+        sent = time.perf_counter()
+        status = None
+        error = None
+        try:
+            resp = await self._send(client, step)
+            if resp is None:
+                self.skipped += 1
+                return
+            status = resp.status_code
+        except httpx.HTTPError as exc:
+            error = type(exc).__name__
+        finally:
+            self._inflight -= 1
+
+        done = time.perf_counter()
+        latency_us = int((done - intended) * 1e6)
+        service_us = int((done - sent) * 1e6)
+        for bucket in (stats, self.total):
+            bucket.count += 1
+            bucket.latency.record(max(0, latency_us))
+            bucket.service.record(max(0, service_us))
+            if error:
+                bucket.errors += 1
+                bucket.exceptions[error] = bucket.exceptions.get(error, 0) + 1
+            else:
+                bucket.status_codes[str(status)] = bucket.status_codes.get(str(status), 0) + 1
+                if status in step.expect:
+                    bucket.ok += 1
+                else:
+                    bucket.errors += 1
+
+        if self.events_path is not None:
+            self._events.append({
+                "offset_s": round(planned.offset_s, 6),
+                "name": step.name,
+                "kind": step.kind,
+                "method": step.method,
+                "path": step.path,
+                "auth": step.auth,
+                "json": step.json,
+                "status": status,
+                "error": error,
+                "latency_us": latency_us,
+            })
+
+    # -- whole run ----------------------------------------------------------
+
+    async def run(self, planned: List[PlannedRequest]) -> Dict:
+        """Log in, fire every planned request on schedule, and return results."""
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=limits,
+            transport=self.transport,
+        ) as client:
+            logins = await self.login_all(client)
+
+            loop_start = time.perf_counter()
+            tasks = []
+            for item in planned:
+                delay = loop_start + item.offset_s - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self._inflight >= self.max_inflight:
+                    self.dropped += 1
+                    continue
+                self._inflight += 1
+                tasks.append(asyncio.create_task(self._fire(client, item, loop_start)))
+            if tasks:
+                await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - loop_start
+
+        if self.events_path is not None:
+            self.events_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.events_path, "w", encoding="utf-8") as fh:
+                for event in sorted(self._events, key=lambda e: e["offset_s"]):
+                    fh.write(json.dumps(event, sort_keys=True) + "\n")
+
+        scheduled_span = planned[-1].offset_s if planned else 0.0
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "base_url": self.base_url,
+            "logins": logins,
+            "planned": len(planned),
+            "sent": self.total.count,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "elapsed_s": round(elapsed, 3),
+            "target_rate": round(len(planned) / scheduled_span, 2) if scheduled_span > 0 else None,
+            "achieved_rate": round(self.total.count / elapsed, 2) if elapsed > 0 else None,
+            "total": self.total.to_dict(),
+            "steps": {name: s.to_dict() for name, s in sorted(self.stats.items())},
+        }
+
+
+def run_load(planned: List[PlannedRequest], base_url: str, **kwargs) -> Dict:
+    """Synchronous wrapper around :meth:`LoadRunner.run`."""
+    return asyncio.run(LoadRunner(base_url, **kwargs).run(planned))
+
+
+def _format_summary(results: Dict) -> str:
+    lines = [
+        f"planned {results['planned']}  sent {results['sent']}  dropped {results['dropped']}  "
+        f"skipped {results['skipped']}  achieved {results['achieved_rate']} req/s",
+        f"{'step':<24} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    rows = list(results["steps"].items()) + [("TOTAL", results["total"])]
+    for name, s in rows:
+        pct = s["latency_us"]["percentiles"]
+        lines.append(
+            f"{name:<24} {s['count']:>7} {s['errors']:>7} {pct['p50'] / 1000:>9.1f} "
+            f"{pct['p99'] / 1000:>9.1f} {s['latency_us']['max'] / 1000:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    credentials = {}
+    if args.replay:
+        planned = load_replay(args.replay, rate=args.rate, speed=args.speed)
+        if args.credentials:
+            credentials = json.loads(Path(args.credentials).read_text(encoding="utf-8"))
+    else:
+        scenario = load_scenario(args.scenario)
+        credentials = scenario.credentials
+        planned = plan_requests(
+            scenario, rate=args.rate, duration=args.duration, arrival=args.arrival, seed=args.seed
+        )
+
+    results = run_load(
+        planned,
+        args.url,
+        credentials=credentials,
+        timeout=args.timeout,
+        max_inflight=args.max_inflight,
+        events_path=args.events,
+        seed=args.seed,
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(_format_summary(results))
+    logger.info("Wrote results to %s", args.output)
+    return 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the SRS API.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--scenario",
+        type=Path,
+        default=project_root / "benchmarks" / "scenarios" / "mixed.json",
+        help="Scenario JSON file (default: benchmarks/scenarios/mixed.json)",
+    )
+    source.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        help="JSONL request log to replay instead of a scenario",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument("--rate", type=float, default=None, help="Arrival rate in requests/second")
+    parser.add_argument("--duration", type=float, default=None, help="Run length in seconds")
+    parser.add_argument(
+        "--arrival",
+        choices=[ARRIVAL_CONSTANT, ARRIVAL_POISSON],
+        default=ARRIVAL_CONSTANT,
+        help="Inter-arrival distribution (default: constant)",
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument(
+        "--credentials",
+        type=Path,
+        default=None,
+        help="JSON {role: {email, password}} used with --replay",
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout (s)")
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=1000,
+        help="Drop (and count) scheduled requests beyond this many in flight",
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=project_root / "benchmarks" / "results" / "loadgen.json",
+        help="Path for the JSON results",
+    )
+    parser.add_argument(
+        "--events",
+        type=Path,
+        default=None,
+        help="Also write one JSON line per request (replayable with --replay)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+benchmarks/login_throughput.py
+
+Purpose:
+--------
+Login throughput under concurrency, per password-hasher executor
+(app/core/password_hasher.py).
+
+For each profile a uvicorn server is started in a subprocess on a fresh
+SQLite file seeded with ``--users`` accounts. Client threads then call
+POST /auth/login back to back (closed loop) while one probe thread polls
+GET /health, so the report shows both how many logins per second the
+server sustains and whether the bcrypt work stalls unrelated endpoints:
+
+- ``thread``: PASSWORD_HASH_EXECUTOR=thread with as many threads as the
+  request threadpool (40) and an unbounded queue -- bcrypt competing with
+  request handling for the CPU, the way it ran before the hasher pool
+- ``process``: PASSWORD_HASH_EXECUTOR=process (one worker per core unless
+  ``--workers`` is given) with the default PASSWORD_HASH_QUEUE_SIZE
+
+Logins rejected with 503 (hasher saturated) are counted separately from
+errors; a bounded pool trades them for a flat latency tail.
+
+Usage:
+------
+    python -m benchmarks.login_throughput
+    python -m benchmarks.login_throughput --concurrency 64 --duration 10
+    python -m benchmarks.login_throughput --profiles process --workers 2 \\
+        --output benchmarks/results/login_throughput.json
+
+DO NOT:
+-------
+- Point this at a database you care about: each profile run creates and
+  deletes its own SQLite file
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+# Add project root to path so the benchmark can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.db_concurrency import _OpStats  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("thread", "process")
+PASSWORD = "Benchmark-Passw0rd!"
+# AnyIO's default threadpool size, i.e. how many inline bcrypt calls could
+# run at once before the hasher pool existed.
+REQUEST_THREADPOOL_SIZE = 40
+
+
+def profile_env(profile: str, workers: int = 0, queue_size: Optional[int] = None) -> Dict[str, str]:
+    """Settings overrides for ``profile`` (see module docstring)."""
+    if profile == "thread":
+        env = {
+            "PASSWORD_HASH_EXECUTOR": "thread",
+            "PASSWORD_HASH_WORKERS": str(workers or REQUEST_THREADPOOL_SIZE),
+            "PASSWORD_HASH_QUEUE_SIZE": str(queue_size if queue_size is not None else 1_000_000),
+        }
+    elif profile == "process":
+        env = {"PASSWORD_HASH_EXECUTOR": "process", "PASSWORD_HASH_WORKERS": str(workers)}
+        if queue_size is not None:
+            env["PASSWORD_HASH_QUEUE_SIZE"] = str(queue_size)
+    else:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+    return env
+
+
+def _seed(url: str, users: int) -> List[str]:
+    """Create the schema and ``users`` accounts sharing one password hash."""
+    from sqlalchemy import create_engine, insert
+
+    from app.core.security import hash_password
+    from app.db.session import Base
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401 -- register tables
+    from app.models.user import User
+
+    emails = [f"login-bench-{i}@example.com" for i in range(users)]
+    engine = create_engine(url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        hashed = hash_password(PASSWORD)
+        with engine.begin() as conn:
+            conn.execute(insert(User), [{"email": e, "hashed_password": hashed, "role": "user"} for e in emails])
+    finally:
+        engine.dispose()
+    return emails
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(database_url: str, env_overrides: Dict[str, str]):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(env_overrides)
+    env.update({
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": env.get("SECRET_KEY", "benchmark-secret-key"),
+        "DEBUG": "false",
+        "REDIS_URL": "",
+        "AUTH_RATE_LIMIT_LOGIN": "1000000/minute",
+        "RATE_LIMIT_PER_MINUTE": "1000000",
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=str(project_root),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with status {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            proc.terminate()
+            raise RuntimeError("server failed to start")
+        time.sleep(0.1)
+
+
+def _stop_server(proc) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _login_worker(base_url: str, emails: List[str], offset: int, stats: _OpStats, rejected: List[int],
+                  stop: threading.Event, start: threading.Barrier) -> None:
+    with httpx.Client(base_url=base_url, timeout=60) as http:
+        start.wait()
+        i = offset
+        while not stop.is_set():
+            body = {"email": emails[i % len(emails)], "password": PASSWORD}
+            i += 1
+            t0 = time.perf_counter_ns()
+            try:
+                response = http.post("/auth/login", json=body)
+            except httpx.HTTPError as exc:
+                stats.errors[type(exc).__name__] = stats.errors.get(type(exc).__name__, 0) + 1
+                continue
+            if response.status_code == 503:
+                rejected[0] += 1
+                continue
+            if response.status_code != 200:
+                key = f"HTTP {response.status_code}"
+                stats.errors[key] = stats.errors.get(key, 0) + 1
+                continue
+            stats.latency.record((time.perf_counter_ns() - t0) // 1000)
+            stats.ok += 1
+
+
+def _probe_worker(base_url: str, stats: _OpStats, stop: threading.Event, start: threading.Barrier,
+                  interval_s: float) -> None:
+    with httpx.Client(base_url=base_url, timeout=60) as http:
+        start.wait()
+        while not stop.is_set():
+            t0 = time.perf_counter_ns()
+            try:
+                response = http.get("/health")
+                response.raise_for_status()
+            except httpx.HTTPError as exc:
+                stats.errors[type(exc).__name__] = stats.errors.get(type(exc).__name__, 0) + 1
+            else:
+                stats.latency.record((time.perf_counter_ns() - t0) // 1000)
+                stats.ok += 1
+            time.sleep(interval_s)
+
+
+def run_profile(
+    profile: str,
+    *,
+    concurrency: int,
+    duration: float,
+    users: int = 50,
+    workers: int = 0,
+    queue_size: Optional[int] = None,
+    probe_interval_s: float = 0.05,
+    workdir: Optional[str] = None,
+) -> Dict:
+    """
+    Run the login workload against a fresh server for one profile.
+
+    Returns:
+        Dict with ``login`` / ``health`` summaries, the number of logins
+        ``rejected`` with 503, ``elapsed_s`` and the server ``env`` used.
+    """
+    env_overrides = profile_env(profile, workers, queue_size)
+    fd, path = tempfile.mkstemp(prefix=f"srs-login-{profile}-", suffix=".db", dir=workdir)
+    os.close(fd)
+    database_url = f"sqlite:///{path}"
+    try:
+        emails = _seed(database_url, users)
+        proc, base_url = _start_server(database_url, env_overrides)
+        try:
+            stop = threading.Event()
+            start = threading.Barrier(concurrency + 2)
+            login_stats = [_OpStats() for _ in range(concurrency)]
+            rejected = [[0] for _ in range(concurrency)]
+            health = _OpStats()
+            threads = [
+                threading.Thread(
+                    target=_login_worker,
+                    args=(base_url, emails, i, login_stats[i], rejected[i], stop, start),
+                    daemon=True,
+                )
+                for i in range(concurrency)
+            ] + [threading.Thread(target=_probe_worker, args=(base_url, health, stop, start, probe_interval_s),
+                                  daemon=True)]
+            for t in threads:
+                t.start()
+            start.wait()
+            t0 = time.perf_counter()
+            time.sleep(duration)
+            stop.set()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - t0
+        finally:
+            _stop_server(proc)
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    logins = _OpStats()
+    for s in login_stats:
+        logins.merge(s)
+    return {
+        "env": env_overrides,
+        "elapsed_s": round(elapsed, 3),
+        "login": logins.summary(elapsed),
+        "rejected": sum(r[0] for r in rejected),
+        "health": health.summary(elapsed),
+    }
+
+
+def run(profiles: List[str], **kwargs) -> Dict:
+    """Run each profile and add process/thread login throughput when both ran."""
+    results = {p: run_profile(p, **kwargs) for p in profiles}
+    report = {"config": kwargs, "profiles": results}
+    if "thread" in results and "process" in results:
+        base = results["thread"]["login"]["ops_per_sec"]
+        report["speedup"] = round(results["process"]["login"]["ops_per_sec"] / base, 2) if base else None
+    return report
+
+
+def _format(report: Dict) -> str:
+    lines = [
+        f"{'profile':<8} {'logins/s':>9} {'p50_us':>9} {'p99_us':>10} {'503s':>6} {'errors':>7}"
+        f" {'health_p50':>11} {'health_p99':>11}"
+    ]
+    for name, result in report["profiles"].items():
+        login, health = result["login"], result["health"]
+        lp, hp = login["latency_us"]["percentiles"], health["latency_us"]["percentiles"]
+        lines.append(
+            f"{name:<8} {login['ops_per_sec']:>9.1f} {lp['p50']:>9} {lp['p99']:>10} {result['rejected']:>6}"
+            f" {sum(login['errors'].values()):>7} {hp['p50']:>11} {hp['p99']:>11}"
+        )
+    if "speedup" in report:
+        lines.append(f"process/thread login throughput: {report['speedup']}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # app.core.config requires these to seed the database; each server gets
+    # its own DATABASE_URL.
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["DEBUG"] = "false"
+
+    report = run(
+        args.profiles,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        users=args.users,
+        workers=args.workers,
+        queue_size=args.queue_size,
+    )
+    print(_format(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        logger.info("Wrote report to %s", args.output)
+    return 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Login throughput per password-hasher executor.")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES),
+                        help="Profiles to run (default: thread process)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent login clients (default: 32)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile (default: 5)")
+    parser.add_argument("--users", type=int, default=50, help="Accounts seeded and logged into (default: 50)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="PASSWORD_HASH_WORKERS for the server (default: profile default)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="PASSWORD_HASH_QUEUE_SIZE for the server (default: profile default)")
+    parser.add_argument("--output", type=Path, default=None, help="Optional path for the JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.exit(main())
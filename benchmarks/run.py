@@ -0,0 +1,174 @@
+"""
+benchmarks/run.py
+
+Purpose:
+--------
+Command-line entry point for the benchmark suite.
+
+Runs the registered cases, writes a stable JSON report, and optionally
+compares it against a stored baseline. Exits with status 1 when any case
+is slower than the baseline by more than ``--threshold``, so the command
+can be used directly as a CI gate.
+
+Usage:
+------
+    python -m benchmarks.run                                  # run everything
+    python -m benchmarks.run --filter similarity --quick      # subset, fewer repeats
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path so the runner can be invoked as a script too
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.harness import (  # noqa: E402
+    DEFAULT_THRESHOLD,
+    STATUS_OK,
+    build_report,
+    compare_to_baseline,
+    has_regressions,
+    load_report,
+    measure,
+    save_report,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = project_root / "benchmarks" / "results" / "latest.json"
+
+
+def run_cases(pattern=None, *, repeat: int = 7, min_time_s: float = 0.05) -> dict:
+    """
+    Run every case matching ``pattern`` and return ``{case_name: stats}``.
+
+    Application modules are imported lazily by each case, after the
+    benchmark environment has been configured.
+    """
+    from benchmarks.suite import select_cases
+
+    results = {}
+    for case in select_cases(pattern):
+        with case.factory() as func:
+            stats = measure(func, repeat=repeat, min_time_s=min_time_s, items=case.items)
+        stats["group"] = case.group
+        results[case.name] = stats
+        logger.info(
+            "%-45s median %10.2fus  p95 %10.2fus  %12.1f ops/s",
+            case.name, stats["median_us"], stats["p95_us"], stats["ops_per_sec"],
+        )
+    return results
+
+
+def _format_comparison(rows) -> str:
+    lines = [f"{'case':<45} {'baseline_us':>12} {'current_us':>12} {'ratio':>7}  status"]
+    for row in rows:
+        baseline = f"{row['baseline']:.2f}" if row["baseline"] is not None else "-"
+        current = f"{row['current']:.2f}" if row["current"] is not None else "-"
+        ratio = f"{row['ratio']:.3f}" if row["ratio"] is not None else "-"
+        marker = "" if row["status"] == STATUS_OK else row["status"].upper()
+        lines.append(f"{row['name']:<45} {baseline:>12} {current:>12} {ratio:>7}  {marker}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+
+    from benchmarks.suite import cleanup_environment, configure_environment
+
+    configure_environment()
+    try:
+        if args.quick:
+            results = run_cases(args.filter, repeat=3, min_time_s=0.01)
+        else:
+            results = run_cases(args.filter, repeat=args.repeat)
+    finally:
+        cleanup_environment()
+
+    if not results:
+        logger.error("No benchmark cases matched filter %r", args.filter)
+        return 2
+
+    report = build_report(results)
+    save_report(report, args.output)
+    logger.info("Wrote %d results to %s", len(results), args.output)
+
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+        logger.info("Saved baseline to %s", args.save_baseline)
+
+    if args.baseline:
+        baseline = load_report(args.baseline)["results"]
+        rows = compare_to_baseline(results, baseline, threshold=args.threshold)
+        if args.filter:
+            rows = [r for r in rows if args.filter in r["name"]]
+        print(_format_comparison(rows))
+        if has_regressions(rows):
+            logger.error("Performance regression beyond %.0f%% threshold", args.threshold * 100)
+            return 1
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the SRS benchmark suite.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT,
+        help=f"Path for the JSON report (default: {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline report to compare against; exit 1 on regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed relative slowdown of the median (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        default=None,
+        help="Also write this run's report to the given baseline path",
+    )
+    parser.add_argument(
+        "--filter",
+        default=None,
+        help="Only run cases whose name contains this substring",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=7,
+        help="Timed samples per case (default: 7)",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Fewer, shorter samples -- for smoke-testing, not for baselines",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    # Per-call INFO lines from the services would dominate the output.
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sys.exit(main())
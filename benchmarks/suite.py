@@ -0,0 +1,367 @@
+"""
+benchmarks/suite.py
+
+Purpose:
+--------
+Registry of benchmark cases for the request hot paths and workers.
+
+Each case is a context manager that performs its (untimed) setup and
+yields a zero-argument callable; the harness times only that callable.
+Teardown runs after the ``yield``.
+
+Covered:
+--------
+- classifier: ``classify_intent`` (rule-based path)
+- similarity: ``find_similar_ticket`` at several corpus sizes
+- response: ``generate_response`` and ``_sanitize_similar_solution``
+- text: ``tokenize`` and ``compute_idf``
+- pipeline: full ``resolve_message`` against a seeded SQLite database
+- workers: ``collect_metrics``, ``analyze_feedback``, ``build_embeddings``
+- llm: ``classify_intent_ai``, LLM sentiment, LLM response generation and
+  ``resolve_message`` served by the local fake OpenAI server
+  (benchmarks/fake_openai.py, zero injected latency -- measures our
+  client-side overhead, not model latency)
+
+Environment:
+------------
+:func:`configure_environment` must run before any ``app`` import. It
+points the app at a throwaway SQLite file and blanks ``OPENAI_API_KEY``
+and ``REDIS_URL`` so every case is deterministic and network-free.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+from benchmarks.synthetic import (
+    RESPONSES,
+    STATUS_WEIGHTS,
+    STATUSES,
+    synthetic_feedback_records,
+    synthetic_messages,
+    synthetic_resolved_tickets,
+)
+
+SIMILARITY_CORPUS_SIZES = (10, 100, 1000)
+SEEDED_TICKETS = 1000
+WORKER_BATCH = 1000
+
+_SAMPLE_MESSAGE = "I was charged twice this month and need a refund for the duplicate payment"
+
+
+@dataclass(frozen=True)
+class Case:
+    """A registered benchmark case."""
+
+    name: str
+    group: str
+    factory: Callable[[], ContextManager[Callable[[], object]]]
+    items: int = 1
+
+
+CASES: Dict[str, Case] = {}
+
+
+def register(name: str, group: str, items: int = 1):
+    """Decorator: register a generator function as a benchmark case."""
+
+    def decorator(func):
+        if name in CASES:
+            raise ValueError(f"Duplicate benchmark case: {name}")
+        CASES[name] = Case(name=name, group=group, factory=contextmanager(func), items=items)
+        return func
+
+    return decorator
+
+
+def select_cases(pattern: Optional[str] = None) -> List[Case]:
+    """Return registered cases (sorted by name) whose name contains ``pattern``."""
+    return [CASES[n] for n in sorted(CASES) if not pattern or pattern in n]
+
+
+# ---------------------------------------------------------------------------
+# Environment
+# ---------------------------------------------------------------------------
+
+_bench_db_path: Optional[str] = None
+
+
+def configure_environment() -> str:
+    """
+    Prepare process environment for benchmarking; returns the database URL.
+
+    ``BENCH_DATABASE_URL`` may point the pipeline/worker cases at another
+    database; by default a temporary SQLite file is used so the developer's
+    own database is never touched.
+    """
+    global _bench_db_path
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        if _bench_db_path is None:
+            fd, _bench_db_path = tempfile.mkstemp(prefix="srs-bench-", suffix=".db")
+            os.close(fd)
+        url = f"sqlite:///{_bench_db_path}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["REDIS_URL"] = ""
+    os.environ["DEBUG"] = "false"
+    return url
+
+
+def cleanup_environment() -> None:
+    """Remove the temporary benchmark database, if one was created."""
+    global _bench_db_path
+    if _bench_db_path and os.path.exists(_bench_db_path):
+        try:
+            from app.db.session import engine
+            engine.dispose()
+        except Exception:
+            pass
+        os.unlink(_bench_db_path)
+    _bench_db_path = None
+
+
+_seeded = False
+
+
+def _seed_database() -> None:
+    """Create tables and insert ``SEEDED_TICKETS`` tickets plus feedback (once)."""
+    global _seeded
+    if _seeded:
+        return
+
+    import random
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import delete, insert
+
+    from app.db.session import SessionLocal, init_db
+    from app.models.feedback import Feedback
+    from app.models.ticket import Ticket
+
+    init_db()
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    messages = synthetic_messages(SEEDED_TICKETS, seed=42)
+
+    ticket_rows = []
+    for m in messages:
+        status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+        resolved = status in ("auto_resolved", "closed")
+        ticket_rows.append({
+            "id": m["id"],
+            "message": m["message"],
+            "intent": m["intent"],
+            "confidence": round(rng.uniform(0.4, 0.99), 2),
+            "status": status,
+            "is_archived": False,
+            "response": RESPONSES[m["intent"]] if resolved else None,
+            "response_source": "template" if resolved else None,
+            "created_at": now - timedelta(minutes=m["id"]),
+        })
+
+    feedback_rows = []
+    for row in ticket_rows:
+        if row["status"] in ("auto_resolved", "closed") and rng.random() < 0.6:
+            rating = rng.randint(1, 5)
+            feedback_rows.append({
+                "ticket_id": row["id"],
+                "rating": rating,
+                "resolved": rating >= 3,
+                "created_at": row["created_at"],
+            })
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(Feedback))
+        db.execute(delete(Ticket))
+        db.execute(insert(Ticket), ticket_rows)
+        if feedback_rows:
+            db.execute(insert(Feedback), feedback_rows)
+        db.commit()
+    finally:
+        db.close()
+    _seeded = True
+
+
+# ---------------------------------------------------------------------------
+# Classifier
+# ---------------------------------------------------------------------------
+
+@register("classifier.classify_intent", group="classifier")
+def _bench_classify_intent() -> Iterator[Callable[[], object]]:
+    from app.services.classifier import classify_intent
+
+    yield lambda: classify_intent(_SAMPLE_MESSAGE)
+
+
+# ---------------------------------------------------------------------------
+# Similarity search
+# ---------------------------------------------------------------------------
+
+def _register_similarity_case(size: int) -> None:
+    @register(f"similarity.find_similar_ticket[{size}]", group="similarity", items=size)
+    def _bench() -> Iterator[Callable[[], object]]:
+        from app.services.similarity_search import find_similar_ticket
+
+        corpus = synthetic_resolved_tickets(size)
+        yield lambda: find_similar_ticket(_SAMPLE_MESSAGE, corpus)
+
+
+for _size in SIMILARITY_CORPUS_SIZES:
+    _register_similarity_case(_size)
+
+
+# ---------------------------------------------------------------------------
+# Response generation
+# ---------------------------------------------------------------------------
+
+@register("response.generate_response", group="response")
+def _bench_generate_response() -> Iterator[Callable[[], object]]:
+    from app.services.response_generator import generate_response
+
+    yield lambda: generate_response("payment_issue", _SAMPLE_MESSAGE, sub_intent="refund")
+
+
+@register("response.sanitize_similar_solution", group="response")
+def _bench_sanitize() -> Iterator[Callable[[], object]]:
+    from app.services.response_generator import _sanitize_similar_solution
+
+    solution = (
+        "Hi John, thanks for reaching out! Your ticket #48213 was resolved. "
+        "Contact me at john.doe@example.com or +1 (555) 010-2233. "
+    ) * 4
+    yield lambda: _sanitize_similar_solution(solution)
+
+
+# ---------------------------------------------------------------------------
+# Text processing
+# ---------------------------------------------------------------------------
+
+@register("text.tokenize", group="text")
+def _bench_tokenize() -> Iterator[Callable[[], object]]:
+    from app.utils.text_processing import tokenize
+
+    yield lambda: tokenize(_SAMPLE_MESSAGE)
+
+
+@register("text.compute_idf[1000]", group="text", items=1000)
+def _bench_compute_idf() -> Iterator[Callable[[], object]]:
+    from app.utils.text_processing import compute_idf
+
+    corpus = [m["message"] for m in synthetic_messages(1000)]
+    yield lambda: compute_idf(corpus)
+
+
+# ---------------------------------------------------------------------------
+# Full pipeline
+# ---------------------------------------------------------------------------
+
+@register("pipeline.resolve_message", group="pipeline")
+def _bench_resolve_message() -> Iterator[Callable[[], object]]:
+    from app.db.session import SessionLocal
+    from app.services.ticket_service import resolve_message
+
+    _seed_database()
+    db = SessionLocal()
+    try:
+        yield lambda: resolve_message(_SAMPLE_MESSAGE, db, log_ref="benchmark")
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# LLM paths (against the local fake OpenAI server)
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _fake_llm() -> Iterator[None]:
+    """Point the app's OpenAI calls at an in-process fake server."""
+    from app.core.config import settings
+    from benchmarks.fake_openai import serve_in_thread
+
+    overrides = {"AI_PROVIDER": "openai", "OPENAI_API_KEY": "fake"}
+    with serve_in_thread() as base_url:
+        overrides["OPENAI_BASE_URL"] = base_url
+        saved = {k: getattr(settings, k) for k in overrides}
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        try:
+            yield
+        finally:
+            for key, value in saved.items():
+                setattr(settings, key, value)
+
+
+@register("llm.classify_intent_ai", group="llm")
+def _bench_llm_classify() -> Iterator[Callable[[], object]]:
+    from app.services.classifier import classify_intent_ai
+
+    with _fake_llm():
+        yield lambda: classify_intent_ai(_SAMPLE_MESSAGE)
+
+
+@register("llm.sentiment", group="llm")
+def _bench_llm_sentiment() -> Iterator[Callable[[], object]]:
+    from app.services.ai_service import _call_openai_sentiment
+
+    with _fake_llm():
+        yield lambda: _call_openai_sentiment(_SAMPLE_MESSAGE)
+
+
+@register("llm.generate_response", group="llm")
+def _bench_llm_generate() -> Iterator[Callable[[], object]]:
+    from app.services.response_generator import _call_openai
+
+    with _fake_llm():
+        yield lambda: _call_openai("payment_issue", "refund", _SAMPLE_MESSAGE)
+
+
+@register("llm.resolve_message", group="llm")
+def _bench_llm_resolve_message() -> Iterator[Callable[[], object]]:
+    from app.db.session import SessionLocal
+    from app.services.ticket_service import resolve_message
+
+    _seed_database()
+    db = SessionLocal()
+    try:
+        with _fake_llm():
+            yield lambda: resolve_message(_SAMPLE_MESSAGE, db, log_ref="benchmark")
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+@register("workers.collect_metrics", group="workers", items=SEEDED_TICKETS)
+def _bench_collect_metrics() -> Iterator[Callable[[], object]]:
+    from app.db.session import SessionLocal
+    from workers.metrics_collector import collect_metrics
+
+    _seed_database()
+    db = SessionLocal()
+    try:
+        yield lambda: collect_metrics(db)
+    finally:
+        db.close()
+
+
+@register(f"workers.analyze_feedback[{WORKER_BATCH}]", group="workers", items=WORKER_BATCH)
+def _bench_analyze_feedback() -> Iterator[Callable[[], object]]:
+    from workers.feedback_analyzer import analyze_feedback
+
+    records = synthetic_feedback_records(WORKER_BATCH)
+    yield lambda: analyze_feedback(records)
+
+
+@register(f"workers.build_embeddings[{WORKER_BATCH}]", group="workers", items=WORKER_BATCH)
+def _bench_build_embeddings() -> Iterator[Callable[[], object]]:
+    from workers.embedding_builder import build_embeddings
+
+    tickets = synthetic_resolved_tickets(WORKER_BATCH)
+    yield lambda: build_embeddings(tickets)
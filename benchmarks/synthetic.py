@@ -0,0 +1,100 @@
+"""
+benchmarks/synthetic.py
+
+Purpose:
+--------
+Deterministic synthetic ticket/feedback data for benchmarks.
+
+Every generator takes an explicit ``seed`` so two runs of the suite
+operate on byte-identical inputs and timings stay comparable.
+
+DO NOT:
+-------
+- Touch the database (callers decide how rows are persisted)
+"""
+
+import random
+from typing import Dict, List
+
+# (intent, phrase) pairs written in the style of eval_classifier.EVAL_SET.
+SEED_PHRASES = [
+    ("login_issue", "I can't log into my account, it keeps saying wrong password"),
+    ("login_issue", "Forgot my password and the reset email never arrived"),
+    ("login_issue", "My account got locked after too many attempts"),
+    ("payment_issue", "I was charged twice for the same subscription"),
+    ("payment_issue", "My card was declined but funds were still taken"),
+    ("payment_issue", "Need a copy of my invoice from last month"),
+    ("account_issue", "Please delete my account and all my data"),
+    ("account_issue", "Need to update my email address on file"),
+    ("technical_issue", "The app keeps crashing every time I open it"),
+    ("technical_issue", "The dashboard is extremely slow to load lately"),
+    ("technical_issue", "Getting a weird error message on checkout"),
+    ("feature_request", "Could you add a dark mode option please"),
+    ("feature_request", "It would be great to implement bulk export"),
+    ("general_query", "How do I use the export feature, any guide?"),
+    ("general_query", "How much does the pro plan cost"),
+]
+
+FILLER_WORDS = [
+    "today", "again", "urgent", "please", "since", "yesterday", "mobile",
+    "desktop", "browser", "team", "workspace", "billing", "settings",
+    "profile", "dashboard", "report", "export", "email", "invoice", "plan",
+]
+
+RESPONSES = {
+    "login_issue": "Please reset your password using the 'Forgot password' link and try again.",
+    "payment_issue": "We have reviewed your billing history and issued a correction to your account.",
+    "account_issue": "Your account settings have been updated as requested.",
+    "technical_issue": "Please clear your cache and update to the latest app version.",
+    "feature_request": "Thanks for the suggestion, we've shared it with the product team.",
+    "general_query": "You can find step-by-step instructions in our help center.",
+}
+
+STATUSES = ["open", "auto_resolved", "escalated", "in_progress", "closed"]
+STATUS_WEIGHTS = [10, 45, 25, 5, 15]
+
+
+def synthetic_messages(n: int, seed: int = 1234) -> List[Dict]:
+    """
+    Return ``n`` pseudo-random customer messages with their intended intent.
+
+    Each message is a seed phrase plus a few filler words so that
+    TF-IDF vectors differ between tickets without drifting off-topic.
+    """
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        intent, phrase = SEED_PHRASES[rng.randrange(len(SEED_PHRASES))]
+        filler = " ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(1, 5)))
+        out.append({"id": i + 1, "intent": intent, "message": f"{phrase} {filler}"})
+    return out
+
+
+def synthetic_resolved_tickets(n: int, seed: int = 1234) -> List[Dict]:
+    """Return ``n`` resolved-ticket dicts shaped like ``resolve_message`` builds them."""
+    tickets = synthetic_messages(n, seed)
+    for t in tickets:
+        t["response"] = RESPONSES[t["intent"]]
+        t["status"] = "auto_resolved"
+    return tickets
+
+
+def synthetic_feedback_records(n: int, seed: int = 1234) -> List[Dict]:
+    """Return ``n`` records shaped like ``fetch_feedback_with_tickets`` output."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        intent, _ = SEED_PHRASES[rng.randrange(len(SEED_PHRASES))]
+        rating = rng.choices([1, 2, 3, 4, 5], weights=[5, 8, 15, 32, 40])[0]
+        resolved = rating >= 3 if rng.random() > 0.1 else rating < 3
+        records.append({
+            "feedback_id": i + 1,
+            "ticket_id": i + 1,
+            "rating": rating,
+            "resolved": resolved,
+            "created_at": None,
+            "intent": intent,
+            "ticket_status": rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0],
+            "quality_score": round(rng.random(), 3),
+        })
+    return records
@@ -0,0 +1,96 @@
+"""
+Tests for app/db/engine.py
+
+Covers:
+- PostgreSQL profile: QueuePool sized from settings, pre-ping and recycle
+- SQLite file profile: WAL, synchronous=NORMAL, busy_timeout, cache/mmap pragmas
+- SQLite in-memory: pragmas applied without WAL
+- Async (aiosqlite) engines get the same pragmas
+- overrides win over profile defaults
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.engine import (
+    create_async_db_engine,
+    create_db_engine,
+    engine_options,
+    is_sqlite_memory,
+    sqlite_pragmas,
+)
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_postgres_profile_uses_configured_pool():
+    engine = create_db_engine("postgresql://user:pw@localhost:5432/srs")
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == settings.DATABASE_POOL_SIZE
+        assert engine.pool._max_overflow == settings.DATABASE_MAX_OVERFLOW
+        assert engine.pool._timeout == settings.DATABASE_POOL_TIMEOUT
+        assert engine.pool._recycle == settings.DATABASE_POOL_RECYCLE
+        assert engine.pool._pre_ping is True
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_options_have_no_pool_sizing():
+    options = engine_options("sqlite:///./x.db")
+    assert "pool_size" not in options
+    assert options["connect_args"]["check_same_thread"] is False
+
+
+def test_sqlite_file_profile_applies_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(engine, "cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_memory_skips_wal():
+    assert is_sqlite_memory("sqlite://")
+    assert is_sqlite_memory("sqlite:///:memory:")
+    assert not is_sqlite_memory("sqlite:///./support.db")
+    assert "journal_mode" not in sqlite_pragmas("sqlite://")
+
+    engine = create_db_engine("sqlite://")
+    try:
+        assert _pragma(engine, "journal_mode") == "memory"
+        assert _pragma(engine, "synchronous") == 1
+    finally:
+        engine.dispose()
+
+
+def test_async_sqlite_engine_applies_pragmas(tmp_path):
+    engine = create_async_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def run():
+        try:
+            async with engine.connect() as conn:
+                mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            return mode, timeout
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == ("wal", settings.SQLITE_BUSY_TIMEOUT_MS)
+
+
+def test_overrides_win_over_profile():
+    engine = create_db_engine("postgresql://user:pw@localhost/srs", pool_size=1, pool_pre_ping=False)
+    try:
+        assert engine.pool.size() == 1
+        assert engine.pool._pre_ping is False
+    finally:
+        engine.dispose()
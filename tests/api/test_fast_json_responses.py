@@ -0,0 +1,103 @@
+"""
+Tests for FAST_JSON_RESPONSES (app/core/json_response.py)
+
+Covers:
+- GET /admin/tickets and GET /tickets/ return byte-identical JSON with
+  and without the fast path (offset pages, cursor pages, status filter,
+  NULL columns, a regular user's scoped list)
+- The list endpoints select only the schema's columns
+- FastJSONResponse encodes datetimes like Pydantic (UTC as "Z")
+"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import BaseModel
+
+from app.api.admin import ADMIN_TICKET_COLUMNS
+from app.api.tickets import TICKET_LIST_COLUMNS
+from app.core.config import settings
+from app.core.json_response import FastJSONResponse
+from app.models.ticket import Ticket
+from app.schemas.admin import AdminTicketItem
+from app.schemas.ticket import TicketResponse
+from tests.conftest import client
+
+
+@pytest.fixture()
+def tickets(db, regular_user):
+    rows = []
+    for i in range(7):
+        ticket = Ticket(
+            message=f"fast json {i} é☃ \"quoted\"",
+            status=("open", "escalated", "auto_resolved")[i % 3],
+            intent="payment" if i % 2 else None,
+            confidence=0.1 * i if i % 2 else None,
+            sentiment_confidence=1 / 3,
+            quality_score=0.25 if i % 3 == 0 else None,
+            response="answer" if i % 2 else None,
+            user_id=regular_user.id if i < 4 else None,
+            created_at=datetime(2026, 10, 1, 12, 0, i, 1000 * i, tzinfo=timezone.utc),
+        )
+        db.add(ticket)
+        rows.append(ticket)
+    db.commit()
+    return rows
+
+
+def _both(monkeypatch, path, token):
+    bodies = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        response = client.get(path, headers={"Authorization": token})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        bodies.append(response.content)
+    return bodies
+
+
+@pytest.mark.parametrize("query", ["limit=100", "limit=3&page=2", "status=escalated", "limit=2&include_total=true"])
+def test_admin_tickets_identical(monkeypatch, tickets, admin_token, query):
+    slow, fast = _both(monkeypatch, f"/admin/tickets?{query}", admin_token)
+
+    assert fast == slow
+    assert json.loads(fast)["tickets"]
+
+
+@pytest.mark.parametrize("query", ["limit=100", "limit=3&offset=3", "status=open", "limit=2&include_total=false"])
+def test_ticket_list_identical(monkeypatch, tickets, admin_token, query):
+    slow, fast = _both(monkeypatch, f"/tickets/?{query}", admin_token)
+
+    assert fast == slow
+    assert json.loads(fast)["tickets"]
+
+
+def test_cursor_pages_identical(monkeypatch, tickets, admin_token):
+    for path in ("/admin/tickets", "/tickets/"):
+        slow, fast = _both(monkeypatch, f"{path}?limit=3", admin_token)
+        body = json.loads(fast)
+        cursor = body["pagination"]["next_cursor"] if path == "/admin/tickets" else body["next_cursor"]
+        assert fast == slow and cursor
+
+        slow, fast = _both(monkeypatch, f"{path}?limit=3&cursor={cursor}", admin_token)
+        assert fast == slow
+
+
+def test_user_scope_identical(monkeypatch, tickets, user_token):
+    slow, fast = _both(monkeypatch, "/tickets/", user_token)
+
+    assert fast == slow
+    assert len(json.loads(fast)["tickets"]) == 4
+
+
+def test_selects_only_schema_columns():
+    assert [c.key for c in ADMIN_TICKET_COLUMNS] == list(AdminTicketItem.model_fields)
+    assert [c.key for c in TICKET_LIST_COLUMNS] == list(TicketResponse.model_fields)
+
+
+def test_datetimes_encoded_like_pydantic():
+    class Item(BaseModel):
+        at: datetime
+
+    for value in (datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc), datetime(2026, 10, 1, 12, 0, 0, 5)):
+        assert FastJSONResponse({"at": value}).body == Item(at=value).model_dump_json().encode()
@@ -4,10 +4,11 @@ import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.main import app
 from app.models.ticket import Ticket
 from app.models.feedback import Feedback
+from tests.conftest import make_async_db_override
 
 
 @pytest.fixture(scope="function")
@@ -73,11 +74,13 @@ def client(temp_db):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(engine)
     try:
         yield TestClient(app)
     finally:
         # Clean up override and database after test
         app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
         Base.metadata.drop_all(bind=engine)
         engine.dispose()
 
@@ -0,0 +1,170 @@
+"""
+Tests for conditional GETs and compression (app/core/http_cache.py,
+GZipMiddleware in app/main.py)
+
+Covers:
+- GET /tickets/{id}: ETag / Cache-Control / Vary, 304 on a matching
+  If-None-Match, new ETag after an update, no 304 for a caller who may
+  not see the ticket
+- GET /tickets/ and GET /admin/tickets: 304 while unchanged (both JSON
+  paths); inserts, updates, deletes and different scopes or query strings
+  change the ETag; cursor pages without a total carry none
+- GET /admin/metrics: ETag over the snapshot, max-age from its TTL
+- etag_matches: lists, weak tags, "*"
+- Responses above GZIP_MINIMUM_SIZE are gzip-compressed, small ones not
+"""
+import pytest
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.http_cache import etag_matches
+from app.models.ticket import Ticket
+from tests.conftest import AuthHelper, DatabaseHelper, client
+
+
+def _get(path, token, etag=None, **headers):
+    headers["Authorization"] = token
+    if etag:
+        headers["If-None-Match"] = etag
+    return client.get(path, headers=headers)
+
+
+def _bump(db, ticket_id, **values):
+    db.execute(update(Ticket).where(Ticket.id == ticket_id).values(**values))
+    db.commit()
+
+
+class TestTicketDetail:
+    def test_validators_and_304(self, db, admin_token):
+        ticket = DatabaseHelper.create_ticket(db, "etag me")
+
+        first = _get(f"/tickets/{ticket.id}", admin_token)
+        again = _get(f"/tickets/{ticket.id}", admin_token, first.headers["ETag"])
+
+        assert first.status_code == 200
+        assert first.headers["ETag"].startswith('W/"')
+        assert first.headers["Cache-Control"] == "private, no-cache"
+        assert first.headers["Vary"] == "Authorization"
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["ETag"] == first.headers["ETag"]
+
+    def test_update_changes_etag(self, db, admin_token):
+        ticket = DatabaseHelper.create_ticket(db, "etag me")
+        etag = _get(f"/tickets/{ticket.id}", admin_token).headers["ETag"]
+
+        _bump(db, ticket.id, status="closed")
+        response = _get(f"/tickets/{ticket.id}", admin_token, etag)
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "closed"
+        assert response.headers["ETag"] != etag
+
+    def test_no_304_for_other_users(self, db, admin_token, user_token):
+        ticket = DatabaseHelper.create_ticket(db, "not yours")
+        etag = _get(f"/tickets/{ticket.id}", admin_token).headers["ETag"]
+
+        assert _get(f"/tickets/{ticket.id}", user_token, etag).status_code == 404
+
+
+@pytest.mark.parametrize("fast", [False, True])
+@pytest.mark.parametrize("path", ["/tickets/?limit=5", "/admin/tickets?limit=5"])
+class TestLists:
+    def test_304_until_changed(self, db, admin_token, monkeypatch, path, fast):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        tickets = [DatabaseHelper.create_ticket(db, f"list {i}") for i in range(3)]
+        etag = _get(path, admin_token).headers["ETag"]
+
+        assert _get(path, admin_token, etag).status_code == 304
+
+        _bump(db, tickets[0].id, response="answered")
+        changed = _get(path, admin_token, etag)
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        etag = changed.headers["ETag"]
+
+        DatabaseHelper.create_ticket(db, "new one")
+        changed = _get(path, admin_token, etag)
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        etag = changed.headers["ETag"]
+
+        db.delete(db.get(Ticket, tickets[1].id))
+        db.commit()
+        assert _get(path, admin_token, etag).status_code == 200
+
+    def test_etag_depends_on_query(self, db, admin_token, path, fast):
+        DatabaseHelper.create_ticket(db, "only one")
+
+        first = _get(path, admin_token).headers["ETag"]
+
+        assert _get(path + "&status=closed", admin_token).headers["ETag"] != first
+        assert _get(path + "&status=closed", admin_token, first).status_code == 200
+
+    def test_cursor_pages_without_total_have_no_etag(self, db, admin_token, path, fast):
+        for i in range(3):
+            DatabaseHelper.create_ticket(db, f"cursor {i}")
+        body = _get(path.replace("5", "1"), admin_token).json()
+        cursor = body["pagination"]["next_cursor"] if "pagination" in body else body["next_cursor"]
+
+        response = _get(f"{path}&cursor={cursor}", admin_token)
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+
+def test_ticket_list_etag_is_per_user(db, user_token, regular_user):
+    DatabaseHelper.create_ticket(db, "mine", user_id=regular_user.id)
+    other = DatabaseHelper.create_user(db, email="other-etag@example.com")
+    other_token = AuthHelper.create_user_token(str(other.id))
+
+    etag = _get("/tickets/", user_token).headers["ETag"]
+    response = _get("/tickets/", other_token, etag)
+
+    assert response.status_code == 200
+    assert response.json()["tickets"] == []
+
+
+def test_admin_metrics_etag(db, admin_token):
+    first = _get("/admin/metrics", admin_token)
+    again = _get("/admin/metrics", admin_token, first.headers["ETag"])
+
+    assert first.headers["Cache-Control"] == f"private, max-age={int(settings.ADMIN_METRICS_CACHE_TTL_S)}"
+    assert again.status_code == 304
+    assert "Age" in again.headers
+
+    DatabaseHelper.create_ticket(db, "moves the numbers")
+    fresh = _get("/admin/metrics?max_staleness=0", admin_token, first.headers["ETag"])
+    assert fresh.status_code == 200
+
+
+class _Request:
+    def __init__(self, if_none_match=None):
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('W/"x", W/"abc"', True),
+    ('W/"abcd"', False),
+    ("*", True),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(_Request(header), 'W/"abc"') is matches
+
+
+class TestCompression:
+    def test_large_list_gzipped(self, db, admin_token):
+        for i in range(20):
+            DatabaseHelper.create_ticket(db, f"a reasonably long ticket message number {i} " * 3)
+
+        response = _get("/admin/tickets?limit=20", admin_token, **{"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()["tickets"]) == 20
+
+    def test_small_response_not_compressed(self):
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
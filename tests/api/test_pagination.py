@@ -0,0 +1,145 @@
+"""
+Tests for keyset (cursor) pagination on the ticket list endpoints.
+
+Covers:
+- app/utils/pagination.py: cursor round-trip, malformed cursors, wants_total
+- GET /tickets/, GET /admin/tickets, GET /agent/my-assignments:
+  - walking every page with next_cursor returns each ticket exactly once,
+    newest first, including rows that share a created_at
+  - cursor pages skip COUNT(*) unless include_total=true
+  - offset mode keeps its total and also returns next_cursor
+  - a malformed cursor is a 400, not a 500
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.exceptions import AppValidationError
+from app.models.ticket import Ticket
+from app.utils.pagination import decode_cursor, encode_cursor, wants_total
+from tests.conftest import AuthHelper, client
+
+
+@pytest.fixture
+def tickets(db, agent_user):
+    """23 tickets assigned to agent_user; pairs share a created_at to exercise the id tie-breaker."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        Ticket(
+            message=f"ticket {i}",
+            status="escalated",
+            assigned_agent_id=agent_user.id,
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(23)
+    ]
+    db.add_all(rows)
+    db.commit()
+    # Newest first, ties broken by id descending
+    return [t.id for t in sorted(rows, key=lambda t: (t.created_at, t.id), reverse=True)]
+
+
+def _walk(url: str, headers: dict, items_key, cursor_key) -> list[int]:
+    seen, cursor = [], None
+    for _ in range(50):
+        sep = "&" if "?" in url else "?"
+        response = client.get(url + (f"{sep}cursor={cursor}" if cursor else ""), headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        seen += [t["id"] for t in items_key(body)]
+        cursor = cursor_key(body)
+        if cursor is None:
+            return seen
+    raise AssertionError("pagination did not terminate")
+
+
+class TestCursorHelpers:
+    def test_round_trip(self):
+        created_at = datetime(2026, 3, 4, 5, 6, 7, 890123)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "W10", encode_cursor(datetime.now(), 1)[:-3]])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(AppValidationError):
+            decode_cursor(cursor)
+
+    def test_wants_total(self):
+        assert wants_total(None, None) is True
+        assert wants_total("c", None) is False
+        assert wants_total("c", True) is True
+        assert wants_total(None, False) is False
+
+
+class TestTicketsCursor:
+    def test_walk_all_pages(self, tickets, agent_token):
+        seen = _walk(
+            "/tickets/?limit=5",
+            {"Authorization": agent_token},
+            lambda b: b["tickets"],
+            lambda b: b["next_cursor"],
+        )
+        assert seen == tickets
+
+    def test_cursor_page_skips_total_unless_requested(self, tickets, agent_token):
+        headers = {"Authorization": agent_token}
+        first = client.get("/tickets/?limit=5", headers=headers).json()
+        assert first["total"] == 23
+
+        cursor = first["next_cursor"]
+        assert client.get(f"/tickets/?limit=5&cursor={cursor}", headers=headers).json()["total"] is None
+        counted = client.get(f"/tickets/?limit=5&cursor={cursor}&include_total=true", headers=headers).json()
+        assert counted["total"] == 23
+
+    def test_offset_page_still_works(self, tickets, agent_token):
+        body = client.get("/tickets/?limit=5&offset=20", headers={"Authorization": agent_token}).json()
+        assert [t["id"] for t in body["tickets"]] == tickets[20:]
+        assert body["total"] == 23
+        assert body["next_cursor"] is None
+
+    def test_malformed_cursor_is_400(self, agent_token):
+        response = client.get("/tickets/?cursor=garbage", headers={"Authorization": agent_token})
+        assert response.status_code == 400
+
+
+class TestAdminTicketsCursor:
+    def test_walk_all_pages(self, tickets, admin_token):
+        seen = _walk(
+            "/admin/tickets?limit=4",
+            {"Authorization": admin_token},
+            lambda b: b["tickets"],
+            lambda b: b["pagination"]["next_cursor"],
+        )
+        assert seen == tickets
+
+    def test_cursor_pagination_meta(self, tickets, admin_token):
+        headers = {"Authorization": admin_token}
+        first = client.get("/admin/tickets?limit=10", headers=headers).json()["pagination"]
+        assert first["page"] == 1
+        assert first["total"] == 23
+        assert first["total_pages"] == 3
+        assert first["has_next"] is True
+        assert first["has_prev"] is False
+
+        second = client.get(
+            f"/admin/tickets?limit=10&cursor={first['next_cursor']}", headers=headers
+        ).json()["pagination"]
+        assert second["page"] is None
+        assert second["total"] is None
+        assert second["has_next"] is True
+        assert second["has_prev"] is True
+
+    def test_malformed_cursor_is_400(self, admin_token):
+        response = client.get("/admin/tickets?cursor=garbage", headers={"Authorization": admin_token})
+        assert response.status_code == 400
+
+
+class TestMyAssignmentsCursor:
+    def test_walk_all_pages(self, tickets, agent_user):
+        token = AuthHelper.create_agent_token(str(agent_user.id))
+        seen = _walk(
+            "/agent/my-assignments?limit=6&status=escalated",
+            {"Authorization": token},
+            lambda b: b["tickets"],
+            lambda b: b["next_cursor"],
+        )
+        assert seen == tickets
@@ -0,0 +1,135 @@
+"""
+Tests for read-replica routing (app/db/replica.py, get_read_db in app/db/session.py)
+
+Covers:
+- Without DATABASE_READ_URL, get_read_db serves the primary
+- With a replica (second SQLite file), read endpoints are served from it
+- Read-your-writes: after a successful write, that caller's reads go to the
+  primary for the staleness window; other callers stay on the replica
+- POST /resolve does not count as a write
+- A user's first page read from the replica is not stored in ticket_cache
+- ReadYourWritesTracker expiry, disabled window and size bound
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.session as session_mod
+from app.core.config import settings
+from app.db.replica import ReadYourWritesTracker
+from app.db.session import Base
+from app.main import create_app
+from app.models.ticket import Ticket
+from app.services import ticket_cache
+from tests.conftest import AuthHelper, DatabaseHelper
+
+REPLICA_MESSAGE = "only present on the replica"
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """Point the read path at a separate SQLite file seeded with one ticket."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as db:
+        db.add(Ticket(message=REPLICA_MESSAGE, status="escalated"))
+        db.commit()
+
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", str(engine.url))
+    monkeypatch.setattr(session_mod, "ReadSessionLocal", factory)
+    # Async read engine is built lazily from DATABASE_READ_URL; start fresh.
+    monkeypatch.setattr(session_mod, "_async_read_engine", None)
+    monkeypatch.setattr(session_mod, "_async_read_session_factory", None)
+    session_mod.recent_writes.clear()
+    yield TestClient(create_app())
+    session_mod.recent_writes.clear()
+    engine.dispose()
+
+
+def _messages(response):
+    assert response.status_code == 200
+    return [t["message"] for t in response.json()["tickets"]]
+
+
+def test_without_replica_reads_hit_primary(db):
+    agent = DatabaseHelper.create_user(db, email="primary-agent@example.com", role="agent")
+    DatabaseHelper.create_ticket(db, message="primary ticket")
+    client = TestClient(create_app())
+
+    messages = _messages(client.get(
+        "/tickets/", headers={"Authorization": AuthHelper.create_agent_token(agent.id)}
+    ))
+    assert messages == ["primary ticket"]
+
+
+def test_read_endpoints_use_replica(replica, db):
+    agent = DatabaseHelper.create_user(db, email="replica-agent@example.com", role="agent")
+    headers = {"Authorization": AuthHelper.create_agent_token(agent.id)}
+
+    assert _messages(replica.get("/tickets/", headers=headers)) == [REPLICA_MESSAGE]
+
+
+def test_caller_reads_own_write_from_primary(replica, db):
+    agent = DatabaseHelper.create_user(db, email="ryw-agent@example.com", role="agent")
+    other = DatabaseHelper.create_user(db, email="ryw-other@example.com", role="agent")
+    writer_headers = {"Authorization": AuthHelper.create_agent_token(agent.id)}
+    other_headers = {"Authorization": AuthHelper.create_agent_token(other.id)}
+
+    created = replica.post("/tickets/", json={"message": "just written"}, headers=writer_headers)
+    assert created.status_code == 201
+
+    # The writer is pinned to the primary and sees its ticket immediately...
+    assert "just written" in _messages(replica.get("/tickets/", headers=writer_headers))
+    # ...while everyone else keeps reading the (lagging) replica.
+    assert _messages(replica.get("/tickets/", headers=other_headers)) == [REPLICA_MESSAGE]
+
+
+def test_resolve_is_not_a_write(replica):
+    assert replica.post("/resolve", json={"message": "How do I reset my password?"}).status_code == 200
+    assert len(session_mod.recent_writes._expires) == 0
+
+
+def test_replica_pages_are_not_cached(replica, db):
+    user = DatabaseHelper.create_user(db, email="replica-user@example.com")
+    headers = {"Authorization": AuthHelper.create_user_token(str(user.id))}
+
+    assert replica.get("/tickets/", headers=headers).status_code == 200
+
+    key = ticket_cache.user_list_key(user.id, None, 50, True)
+    assert ticket_cache.get_cached(key, ticket_cache.user_stamp(user.id))[0] is None
+
+
+def test_failed_write_does_not_pin(replica, db):
+    agent = DatabaseHelper.create_user(db, email="failed-agent@example.com", role="agent")
+    headers = {"Authorization": AuthHelper.create_agent_token(agent.id)}
+
+    response = replica.post("/agent/tickets/999999/close", headers=headers)
+    assert response.status_code == 404
+    assert len(session_mod.recent_writes._expires) == 0
+
+
+class TestReadYourWritesTracker:
+    def test_window_expires(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("app.db.replica.time.monotonic", lambda: now[0])
+        tracker = ReadYourWritesTracker(window_s=5)
+
+        tracker.mark_write("k")
+        assert tracker.requires_primary("k")
+        now[0] += 5.1
+        assert not tracker.requires_primary("k")
+        assert not tracker.requires_primary("unknown")
+
+    def test_zero_window_disables_pinning(self):
+        tracker = ReadYourWritesTracker(window_s=0)
+        tracker.mark_write("k")
+        assert not tracker.requires_primary("k")
+
+    def test_bounded(self):
+        tracker = ReadYourWritesTracker(window_s=60, max_entries=3)
+        for key in "abcd":
+            tracker.mark_write(key)
+        assert not tracker.requires_primary("a")
+        assert all(tracker.requires_primary(k) for k in "bcd")
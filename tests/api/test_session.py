@@ -6,10 +6,16 @@ Covers:
 - get_db closes session after use
 - init_db creates tables (if available)
 - Base and SessionLocal
+- to_async_url driver mapping and get_async_db yielding an AsyncSession
+- resolve_message_async loads the similarity corpus via the AsyncSession
 """
+import asyncio
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy import text
 from sqlalchemy import exc as sqlalchemy_exc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import app.db.session as _session_mod
@@ -371,3 +377,53 @@ class TestDatabaseSchemaValidation:
         expected_tickets_columns = ['id', 'message', 'intent', 'confidence', 'status', 'created_at']
         for col in expected_tickets_columns:
             assert col in tickets_columns, f"Column '{col}' missing from tickets table"
+
+
+class TestAsyncSession:
+    """Tests for the async engine used by the hot endpoints."""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("sqlite:////tmp/x.db", "sqlite+aiosqlite:////tmp/x.db"),
+        ("postgresql://u:p@db:5432/app", "postgresql+asyncpg://u:p@db:5432/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ])
+    def test_to_async_url(self, url, expected):
+        assert _session_mod.to_async_url(url) == expected
+
+    def test_to_async_url_rejects_unsupported_backend(self):
+        with pytest.raises(ValueError):
+            _session_mod.to_async_url("mysql://u:p@db/app")
+
+    def test_get_async_db_yields_async_session(self):
+        async def run():
+            gen = _session_mod.get_async_db()
+            db = await gen.__anext__()
+            try:
+                assert isinstance(db, AsyncSession)
+                assert (await db.execute(text("SELECT 1"))).scalar() == 1
+            finally:
+                await gen.aclose()
+
+        asyncio.run(run())
+
+    def test_resolve_message_async_uses_prefetched_corpus(self):
+        """The sync corpus query must not run; the pipeline gets the async result."""
+        from app.services import ticket_service
+
+        async def run():
+            async with _session_mod.get_async_session_factory()() as db:
+                return await ticket_service.resolve_message_async(
+                    "I forgot my password", db, log_ref="test"
+                )
+
+        with patch("app.services.ticket_service.get_resolved_tickets") as sync_query, \
+             patch("app.services.ticket_service.get_resolved_tickets_async", return_value=[]) as async_query, \
+             patch("app.services.ticket_service.find_similar_ticket", return_value=None) as search:
+            result = asyncio.run(run())
+
+        sync_query.assert_not_called()
+        async_query.assert_called_once()
+        search.assert_called_once()
+        assert result["decision"] in ("AUTO_RESOLVE", "ESCALATE")
@@ -6,11 +6,13 @@ Tests for app/api/tickets.py endpoints.
 Covers:
 - POST /tickets: ticket creation
 - GET /tickets: list tickets (with status filtering)
-- GET /tickets/{id}: get single ticket
+- GET /tickets/{id}: get single ticket (including read-through to cold storage)
 - Error handling and validation
 - Database integration
 """
 
+from datetime import datetime
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -254,6 +256,37 @@ class TestGetTicket(BaseTestClass):
         for field in required_fields:
             assert field in data
 
+    def test_get_offloaded_ticket(self, db, monkeypatch, tmp_path):
+        """Tickets moved to cold storage are still served, with the same ownership rule."""
+        from app.core.config import settings
+        from app.services.cold_storage import clear_cold_storage_cache, make_record, write_segment
+
+        owner = DatabaseHelper.create_user(db, email="owner@example.com", role="user")
+        other = DatabaseHelper.create_user(db, email="other@example.com", role="user")
+        row = {
+            "id": 424242,
+            "message": "Old offloaded ticket",
+            "status": "closed",
+            "intent": "billing",
+            "user_id": owner.id,
+            "is_archived": True,
+            "created_at": datetime(2023, 5, 1, 12, 0),
+        }
+        write_segment(tmp_path, [make_record(row, {"rating": 4})])
+        monkeypatch.setattr(settings, "COLD_STORAGE_DIR", str(tmp_path))
+        clear_cold_storage_cache()
+
+        response = client.get("/tickets/424242", headers={"Authorization": AuthHelper.create_user_token(str(owner.id))})
+        assert response.status_code == 200
+        assert response.json()["message"] == "Old offloaded ticket"
+        assert response.json()["status"] == "closed"
+
+        response = client.get("/tickets/424242", headers={"Authorization": AuthHelper.create_user_token(str(other.id))})
+        assert response.status_code == 404
+
+        response = client.get("/tickets/424243", headers={"Authorization": AuthHelper.create_agent_token("1")})
+        assert response.status_code == 404
+
 
 class TestTicketAPIIntegration(BaseTestClass):
     """Integration tests for ticket API workflows."""
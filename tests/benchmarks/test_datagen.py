@@ -0,0 +1,112 @@
+"""
+Tests for benchmarks/datagen.py
+
+Covers:
+- run_datagen: row counts, referential integrity, role mix, status/intent
+  distributions and message vocabulary on a small SQLite run
+- Appending a second run continues ids instead of colliding
+- --loadtest-accounts creates loginable accounts once
+- Row generators are deterministic for a given seed
+- _csv_value: COPY encoding of NULL, booleans and datetimes
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.security import verify_password
+from app.services.classifier import ALLOWED_INTENTS
+from benchmarks.datagen import (
+    LOADTEST_PASSWORD,
+    DataGenConfig,
+    _csv_value,
+    _parse_args,
+    generate_tickets,
+    run_datagen,
+)
+
+
+@pytest.fixture()
+def scale_db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'scale.db'}"
+    yield url, create_engine(url)
+
+
+def _scalar(engine, sql):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).scalar()
+
+
+def test_small_run_is_consistent(scale_db):
+    url, engine = scale_db
+    cfg = DataGenConfig(users=200, tickets=3000, batch_size=500, days=60)
+    summary = run_datagen(cfg, url)
+
+    assert summary["rows"]["users"] == 200 + cfg.agent_count + cfg.admins
+    assert summary["rows"]["tickets"] == 3000
+    assert _scalar(engine, "SELECT COUNT(*) FROM tickets") == 3000
+    assert _scalar(engine, "SELECT COUNT(*) FROM feedback") == summary["rows"]["feedback"] > 0
+    assert _scalar(engine, "SELECT COUNT(*) FROM refresh_tokens") == 300
+
+    # Referential integrity
+    assert _scalar(engine, "SELECT COUNT(*) FROM feedback f LEFT JOIN tickets t ON t.id = f.ticket_id "
+                           "WHERE t.id IS NULL") == 0
+    assert _scalar(engine, "SELECT COUNT(*) FROM tickets t JOIN users u ON u.id = t.assigned_agent_id "
+                           "WHERE u.role != 'agent'") == 0
+    assert _scalar(engine, "SELECT COUNT(*) FROM tickets t JOIN users u ON u.id = t.user_id "
+                           "WHERE u.role != 'user'") == 0
+    # Feedback only on resolved tickets, one per ticket
+    assert _scalar(engine, "SELECT COUNT(*) FROM feedback f JOIN tickets t ON t.id = f.ticket_id "
+                           "WHERE t.status NOT IN ('auto_resolved', 'closed')") == 0
+
+    # Distributions look like real traffic
+    resolved = _scalar(engine, "SELECT COUNT(*) FROM tickets WHERE status IN ('auto_resolved', 'closed')")
+    assert resolved > 1500
+    with engine.connect() as conn:
+        intents = {row[0] for row in conn.execute(text("SELECT DISTINCT intent FROM tickets"))}
+    assert intents <= set(ALLOWED_INTENTS)
+    assert len(intents) == 6
+    assert _scalar(engine, "SELECT COUNT(*) FROM tickets WHERE status = 'auto_resolved' "
+                           "AND response IS NULL") == 0
+
+
+def test_second_run_appends(scale_db):
+    url, engine = scale_db
+    cfg = DataGenConfig(users=20, tickets=100, batch_size=40)
+    run_datagen(cfg, url)
+    run_datagen(cfg, url)
+    assert _scalar(engine, "SELECT COUNT(*) FROM tickets") == 200
+    assert _scalar(engine, "SELECT COUNT(DISTINCT email) FROM users") == _scalar(engine, "SELECT COUNT(*) FROM users")
+
+
+def test_loadtest_accounts(scale_db):
+    url, engine = scale_db
+    cfg = DataGenConfig(users=0, admins=0, tickets=0, loadtest_accounts=True)
+    assert run_datagen(cfg, url)["rows"]["loadtest_accounts"] == 3
+    assert run_datagen(cfg, url)["rows"]["loadtest_accounts"] == 0
+    hashed = _scalar(engine, "SELECT hashed_password FROM users WHERE email = 'loadtest-agent@example.com'")
+    assert verify_password(LOADTEST_PASSWORD, hashed)
+
+
+def test_generators_are_deterministic():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    cfg = DataGenConfig(tickets=50)
+    first = list(generate_tickets(cfg, 1, range(10, 20), range(5, 7), now))
+    second = list(generate_tickets(cfg, 1, range(10, 20), range(5, 7), now))
+    assert first == second
+    assert all(t["created_at"] <= now.replace(tzinfo=None) for t, _ in first)
+
+
+def test_csv_value_encoding():
+    assert _csv_value(None) == ""
+    assert _csv_value(True) == "t"
+    assert _csv_value(False) == "f"
+    assert _csv_value(datetime(2026, 1, 2, 3, 4, 5)) == "2026-01-02T03:04:05"
+    assert _csv_value(3) == 3
+
+
+def test_parse_args_defaults():
+    args = _parse_args([])
+    assert args.tickets == 100_000
+    assert args.database_url is None
+    assert args.loadtest_accounts is False
@@ -0,0 +1,30 @@
+"""
+Tests for benchmarks/db_concurrency.py
+
+Covers:
+- run(): both profiles complete a short mixed workload, report throughput
+  and latency, and the tuned profile runs in WAL mode
+- build_engine rejects unknown profiles
+"""
+import pytest
+
+from benchmarks.db_concurrency import build_engine, run
+
+
+def test_short_run_reports_both_profiles(tmp_path):
+    report = run(["baseline", "tuned"], readers=2, writers=1, duration=0.3, rows=200, seed=1,
+                 workdir=str(tmp_path))
+
+    assert set(report["profiles"]) == {"baseline", "tuned"}
+    assert report["profiles"]["baseline"]["journal_mode"] == "delete"
+    assert report["profiles"]["tuned"]["journal_mode"] == "wal"
+    for result in report["profiles"].values():
+        assert result["read"]["ok"] > 0
+        assert result["write"]["ok"] > 0
+        assert result["read"]["latency_us"]["count"] == result["read"]["ok"]
+    assert set(report["speedup"]) == {"read", "write"}
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        build_engine("turbo", "sqlite://")
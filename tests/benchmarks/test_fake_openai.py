@@ -0,0 +1,174 @@
+"""
+Tests for benchmarks/fake_openai.py
+
+Covers:
+- Wire compatibility with the real ``openai`` SDK: plain, JSON-mode and
+  streaming chat completions
+- Deterministic canned answers for the app's intent, sentiment and
+  response-generation prompts
+- Injected 500s, random 429s with Retry-After, and the max_rps cap
+- LatencySpec parsing and sampling
+- End to end: classify_intent_ai / sentiment / generate_response served
+  by the fake server through OPENAI_BASE_URL
+"""
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from openai import InternalServerError, OpenAI, RateLimitError
+
+from app.core.config import settings
+from benchmarks.fake_openai import (
+    FakeOpenAIConfig,
+    LatencySpec,
+    canned_completion,
+    create_app,
+    serve_in_thread,
+)
+
+
+def _client(config=None, max_retries=0):
+    app = create_app(config)
+    http_client = TestClient(app)
+    client = OpenAI(api_key="fake", base_url="http://testserver/v1",
+                    http_client=http_client, max_retries=max_retries)
+    return client, app
+
+
+def _intent_messages(text):
+    return [
+        {"role": "system", "content": "You classify customer support tickets into exactly one of these intents: ..."},
+        {"role": "user", "content": f"Customer message:\n{text}"},
+    ]
+
+
+class TestWireFormat:
+    def test_json_mode_completion(self):
+        client, app = _client()
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_intent_messages("I was charged twice for my subscription"),
+            response_format={"type": "json_object"},
+        )
+        payload = json.loads(resp.choices[0].message.content)
+        assert payload["intent"] == "payment_issue"
+        assert 0.0 <= payload["confidence"] <= 1.0
+        assert resp.usage.total_tokens > 0
+        assert app.state.stats.snapshot()["completed"] == 1
+
+    def test_streaming_completion(self):
+        client, _ = _client()
+        messages = [
+            {"role": "system", "content": "You are a helpful SaaS customer support agent."},
+            {"role": "user", "content": "Intent: login_issue\nCustomer message: I forgot my password"},
+        ]
+        stream = client.chat.completions.create(model="gpt-4o-mini", messages=messages, stream=True)
+        parts, finish = [], None
+        for event in stream:
+            choice = event.choices[0]
+            parts.append(choice.delta.content or "")
+            finish = choice.finish_reason or finish
+        streamed = "".join(parts)
+        assert finish == "stop"
+        assert streamed == canned_completion(messages)
+
+    def test_models_endpoint(self):
+        client, _ = _client()
+        assert [m.id for m in client.models.list()] == ["gpt-4o-mini"]
+
+
+class TestCannedAnswers:
+    def test_answers_are_deterministic(self):
+        messages = _intent_messages("The app keeps crashing")
+        assert canned_completion(messages) == canned_completion(messages)
+        assert json.loads(canned_completion(messages))["intent"] == "technical_issue"
+
+    def test_sentiment_prompt(self):
+        messages = [
+            {"role": "system", "content": "Classify the sentiment of a customer support message"},
+            {"role": "user", "content": "Customer message:\nThis is terrible and I am angry"},
+        ]
+        assert json.loads(canned_completion(messages))["sentiment"] == "negative"
+
+    def test_response_override(self):
+        messages = [
+            {"role": "system", "content": "You are a helpful SaaS customer support agent."},
+            {"role": "user", "content": "Intent: payment_issue\nCustomer message: refund"},
+        ]
+        assert canned_completion(messages, {"payment_issue": "canned"}) == "canned"
+
+
+class TestFaultInjection:
+    def test_server_errors(self):
+        client, app = _client(FakeOpenAIConfig(error_rate=1.0))
+        with pytest.raises(InternalServerError):
+            client.chat.completions.create(model="m", messages=_intent_messages("hi"))
+        assert app.state.stats.snapshot()["errors"] == 1
+
+    def test_rate_limit_has_retry_after(self):
+        client, _ = _client(FakeOpenAIConfig(rate_limit_rate=1.0, retry_after_s=2))
+        with pytest.raises(RateLimitError) as exc:
+            client.chat.completions.create(model="m", messages=_intent_messages("hi"))
+        assert exc.value.response.headers["retry-after"] == "2"
+
+    def test_max_rps_cap(self):
+        client, app = _client(FakeOpenAIConfig(max_rps=2))
+        outcomes = []
+        for _ in range(4):
+            try:
+                client.chat.completions.create(model="m", messages=_intent_messages("hi"))
+                outcomes.append("ok")
+            except RateLimitError:
+                outcomes.append("429")
+        assert outcomes[:2] == ["ok", "ok"]
+        assert "429" in outcomes[2:]
+
+    def test_invalid_body(self):
+        app = create_app()
+        resp = TestClient(app).post("/v1/chat/completions", json={"model": "m"})
+        assert resp.status_code == 400
+
+
+class TestLatencySpec:
+    @pytest.mark.parametrize("spec,kind", [
+        ("fixed:0.2", "fixed"), ("uniform:0.1:0.3", "uniform"),
+        ("normal:0.2:0.05", "normal"), ("lognormal:0.25:0.5", "lognormal"),
+    ])
+    def test_parse(self, spec, kind):
+        parsed = LatencySpec.parse(spec)
+        assert parsed.kind == kind
+        rng = random.Random(1)
+        assert all(parsed.sample(rng) >= 0 for _ in range(100))
+
+    def test_uniform_bounds(self):
+        rng = random.Random(1)
+        spec = LatencySpec.parse("uniform:0.1:0.3")
+        assert all(0.1 <= spec.sample(rng) <= 0.3 for _ in range(100))
+
+    @pytest.mark.parametrize("spec", ["gamma:1", "uniform:0.1", "fixed:x"])
+    def test_parse_errors(self, spec):
+        with pytest.raises(ValueError):
+            LatencySpec.parse(spec)
+
+
+def test_app_llm_paths_use_fake_server(monkeypatch):
+    """The app's own LLM call sites work end to end against the fake server."""
+    from app.services.ai_service import _call_openai_sentiment
+    from app.services.classifier import classify_intent_ai
+    from app.services.response_generator import _call_openai
+
+    with serve_in_thread() as base_url:
+        monkeypatch.setattr(settings, "AI_PROVIDER", "openai")
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "fake")
+        monkeypatch.setattr(settings, "OPENAI_BASE_URL", base_url)
+
+        result = classify_intent_ai("I was charged twice and need a refund")
+        assert result["source"] == "llm"
+        assert result["intent"] == "payment_issue"
+
+        sentiment = _call_openai_sentiment("I hate this, it's awful")
+        assert sentiment["sentiment"] == "negative"
+
+        reply = _call_openai("login_issue", None, "I forgot my password")
+        assert reply
@@ -0,0 +1,144 @@
+"""
+Tests for benchmarks/harness.py and the case registry in benchmarks/suite.py
+
+Covers:
+- measure: statistics shape, fixed inner-loop count, items throughput
+- compare_to_baseline: ok / regression / improvement / new / missing rows,
+  threshold validation
+- save_report / load_report: stable round-trip, schema version check
+- suite registry: expected hot-path cases are registered and runnable
+- run._parse_args: CLI defaults and overrides
+"""
+import json
+
+import pytest
+
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD,
+    SCHEMA_VERSION,
+    build_report,
+    compare_to_baseline,
+    has_regressions,
+    load_report,
+    measure,
+    save_report,
+)
+from benchmarks.run import _parse_args
+from benchmarks.suite import CASES, SIMILARITY_CORPUS_SIZES, select_cases
+
+
+class TestMeasure:
+    def test_returns_expected_keys(self):
+        stats = measure(lambda: sum(range(10)), repeat=3, min_time_s=0.001)
+        for key in ("median_us", "p95_us", "min_us", "mean_us", "stdev_us",
+                    "ops_per_sec", "items_per_sec", "number", "repeat", "items"):
+            assert key in stats
+        assert stats["repeat"] == 3
+        assert stats["min_us"] <= stats["median_us"] <= stats["p95_us"]
+
+    def test_fixed_number_is_respected(self):
+        calls = []
+        stats = measure(lambda: calls.append(1), repeat=2, warmup=1, number=5)
+        assert stats["number"] == 5
+        assert len(calls) == 1 + 2 * 5
+
+    def test_items_scale_throughput(self):
+        stats = measure(lambda: None, repeat=2, number=100, items=10)
+        assert stats["items_per_sec"] == pytest.approx(stats["ops_per_sec"] * 10, rel=0.01)
+
+    def test_rejects_zero_repeat(self):
+        with pytest.raises(ValueError):
+            measure(lambda: None, repeat=0)
+
+
+class TestCompareToBaseline:
+    baseline = {
+        "a": {"median_us": 100.0},
+        "b": {"median_us": 100.0},
+        "c": {"median_us": 100.0},
+        "gone": {"median_us": 5.0},
+    }
+
+    def test_classifies_rows(self):
+        current = {
+            "a": {"median_us": 110.0},   # within 15%
+            "b": {"median_us": 130.0},   # slower than 15%
+            "c": {"median_us": 50.0},    # much faster
+            "fresh": {"median_us": 1.0},
+        }
+        rows = {r["name"]: r for r in compare_to_baseline(current, self.baseline, threshold=0.15)}
+        assert rows["a"]["status"] == "ok"
+        assert rows["b"]["status"] == "regression"
+        assert rows["b"]["ratio"] == pytest.approx(1.3)
+        assert rows["c"]["status"] == "improvement"
+        assert rows["fresh"]["status"] == "new"
+        assert rows["gone"]["status"] == "missing"
+
+    def test_has_regressions(self):
+        slow = {"a": {"median_us": 200.0}}
+        assert has_regressions(compare_to_baseline(slow, self.baseline))
+        fast = {"a": {"median_us": 100.0}}
+        assert not has_regressions(compare_to_baseline(fast, self.baseline))
+
+    def test_threshold_is_configurable(self):
+        current = {"a": {"median_us": 130.0}}
+        assert has_regressions(compare_to_baseline(current, self.baseline, threshold=0.15))
+        assert not has_regressions(compare_to_baseline(current, self.baseline, threshold=0.5))
+
+    def test_negative_threshold_rejected(self):
+        with pytest.raises(ValueError):
+            compare_to_baseline({}, {}, threshold=-0.1)
+
+
+class TestReportIO:
+    def test_round_trip_is_stable(self, tmp_path):
+        report = build_report({"z": {"median_us": 1.0}, "a": {"median_us": 2.0}})
+        path = tmp_path / "out.json"
+        save_report(report, path)
+        loaded = load_report(path)
+        assert loaded["schema_version"] == SCHEMA_VERSION
+        assert loaded["results"] == report["results"]
+        text = path.read_text()
+        assert text.index('"a"') < text.index('"z"')
+
+    def test_unknown_schema_version_rejected(self, tmp_path):
+        path = tmp_path / "old.json"
+        path.write_text(json.dumps({"schema_version": 999, "results": {}}))
+        with pytest.raises(ValueError):
+            load_report(path)
+
+
+class TestSuiteRegistry:
+    def test_hot_paths_registered(self):
+        names = set(CASES)
+        assert "classifier.classify_intent" in names
+        assert "pipeline.resolve_message" in names
+        assert "response.generate_response" in names
+        assert "response.sanitize_similar_solution" in names
+        assert "text.tokenize" in names
+        for size in SIMILARITY_CORPUS_SIZES:
+            assert f"similarity.find_similar_ticket[{size}]" in names
+        assert any(n.startswith("workers.") for n in names)
+
+    def test_select_cases_filters_by_substring(self):
+        selected = select_cases("similarity")
+        assert len(selected) == len(SIMILARITY_CORPUS_SIZES)
+        assert all("similarity" in c.name for c in selected)
+
+    def test_pure_case_runs(self):
+        with CASES["text.tokenize"].factory() as func:
+            assert func()
+
+
+class TestParseArgs:
+    def test_defaults(self):
+        args = _parse_args([])
+        assert args.threshold == DEFAULT_THRESHOLD
+        assert args.baseline is None
+        assert args.quick is False
+
+    def test_overrides(self):
+        args = _parse_args(["--threshold", "0.3", "--filter", "text", "--quick"])
+        assert args.threshold == 0.3
+        assert args.filter == "text"
+        assert args.quick is True
@@ -0,0 +1,53 @@
+"""
+Tests for benchmarks/import_time.py
+
+Covers:
+- parse_importtime / total_us / package_self_us / loaded on a sample
+  ``-X importtime`` report
+- run(): import app.main does not load openai or resend; a package
+  imported at startup fails the check
+"""
+import pytest
+
+from benchmarks.import_time import loaded, package_self_us, parse_importtime, run, total_us
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       397 |     262133 |           openai
+import time:      2000 |       2000 |     sqlalchemy.sql
+import time:      7372 |       9372 |   sqlalchemy
+import time:     22790 |     294295 | app.main
+"""
+
+
+def test_parse_sample_report():
+    records = parse_importtime(SAMPLE)
+
+    assert [r.name for r in records] == ["_io", "openai", "sqlalchemy.sql", "sqlalchemy", "app.main"]
+    assert (records[1].self_us, records[1].cumulative_us, records[1].depth) == (397, 262133, 5)
+    assert records[-1].depth == 0
+    assert total_us(records, "app.main") == 294295
+    assert package_self_us(records) == {"app": 22790, "sqlalchemy": 9372, "openai": 397, "_io": 120}
+    assert loaded(records, ["openai", "resend", "sql"]) == ["openai"]
+    with pytest.raises(ValueError):
+        total_us(records, "app.missing")
+
+
+def test_app_main_defers_optional_packages():
+    # No wall-clock budget here: one sample is too host-dependent for CI.
+    # The budget gate is ``python -m benchmarks.import_time``.
+    report = run(runs=1, top=5, budget_ms=None)
+
+    assert report["forbidden_loaded"] == []
+    assert report["import_ms"]["median"] > 0
+    assert "app" in report["packages_ms"]
+    assert len(report["slowest_modules"]) == 5
+
+
+def test_package_loaded_at_startup_fails():
+    # app.core.config imports pydantic_settings at module level
+    report = run("app.core.config", runs=1, forbid=["pydantic_settings"], budget_ms=None)
+
+    assert report["forbidden_loaded"] == ["pydantic_settings"]
+    assert report["ok"] is False
@@ -0,0 +1,29 @@
+"""
+Tests for benchmarks/list_serialization.py
+
+Covers:
+- run(): both profiles serve 100-item pages of both list endpoints against
+  a real server, with identical JSON
+- profile_env rejects unknown profiles
+"""
+import pytest
+
+from benchmarks.list_serialization import ENDPOINTS, profile_env, run
+
+
+def test_short_run_reports_both_profiles(tmp_path):
+    report = run(["pydantic", "orjson"], concurrency=2, duration=1.0, tickets=200, workdir=str(tmp_path))
+
+    assert report["identical"] is True
+    assert report["profiles"]["orjson"]["env"] == {"FAST_JSON_RESPONSES": "true"}
+    for result in report["profiles"].values():
+        for endpoint in ENDPOINTS:
+            assert result[endpoint]["ok"] > 0
+            assert result[endpoint]["errors"] == {}
+    assert set(report["p50_speedup"]) == set(ENDPOINTS)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        profile_env("msgspec")
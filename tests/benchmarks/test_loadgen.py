@@ -0,0 +1,245 @@
+"""
+Tests for benchmarks/histogram.py and benchmarks/loadgen.py
+
+Covers:
+- LatencyHistogram: percentiles within bucket precision, merge, round-trip
+- load_scenario / plan_requests: validation, constant and Poisson schedules,
+  deterministic weighted step selection
+- load_replay: timed and rate-paced replay of JSONL logs
+- LoadRunner: open-loop run against the ASGI app (public resolve, ticket
+  creation with {ticket_id} follow-ups), latency measured from the intended
+  start time, events log replayable, max_inflight drops
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks.histogram import LatencyHistogram
+from benchmarks.loadgen import (
+    ARRIVAL_POISSON,
+    LoadRunner,
+    PlannedRequest,
+    Scenario,
+    Step,
+    _parse_args,
+    load_replay,
+    load_scenario,
+    plan_requests,
+)
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+
+class TestLatencyHistogram:
+    def test_percentiles_within_precision(self):
+        hist = LatencyHistogram()
+        for v in range(1, 100_001):
+            hist.record(v)
+        assert hist.total_count == 100_000
+        assert hist.min == 1 and hist.max == 100_000
+        for pct, expected in ((50, 50_000), (99, 99_000), (99.9, 99_900)):
+            assert hist.percentile(pct) == pytest.approx(expected, rel=0.002)
+        assert hist.percentile(100) == 100_000
+
+    def test_small_values_are_exact(self):
+        hist = LatencyHistogram()
+        for v in (3, 1, 2):
+            hist.record(v)
+        assert hist.percentile(50) == 2
+        assert hist.mean == 2.0
+
+    def test_merge_and_round_trip(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(100, count=3)
+        b.record(5_000_000)
+        a.merge(b)
+        assert a.total_count == 4
+        assert a.max == 5_000_000
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(a.to_dict())))
+        assert restored.total_count == 4
+        assert restored.percentile(50) == a.percentile(50)
+        assert restored.max == a.max
+
+    def test_rejects_negative(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram().record(-1)
+
+    def test_empty_summary(self):
+        summary = LatencyHistogram().summary()
+        assert summary["count"] == 0
+        assert summary["percentiles"]["p99"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Scenarios and schedules
+# ---------------------------------------------------------------------------
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return path
+
+
+class TestScenario:
+    def test_bundled_scenarios_load(self):
+        from benchmarks.loadgen import project_root
+        for path in sorted((project_root / "benchmarks" / "scenarios").glob("*.json")):
+            scenario = load_scenario(path)
+            assert scenario.steps
+
+    def test_missing_credentials_rejected(self, tmp_path):
+        path = _write(tmp_path, "s.json", {
+            "steps": [{"name": "q", "path": "/agent/my-assignments", "auth": "agent"}],
+        })
+        with pytest.raises(ValueError):
+            load_scenario(path)
+
+    def test_refresh_step_needs_role(self, tmp_path):
+        path = _write(tmp_path, "s.json", {"steps": [{"kind": "refresh"}]})
+        with pytest.raises(ValueError):
+            load_scenario(path)
+
+    def test_constant_schedule(self):
+        scenario = Scenario(name="s", steps=[Step(name="a"), Step(name="b")])
+        planned = plan_requests(scenario, rate=10, duration=2)
+        assert len(planned) == 20
+        assert planned[1].offset_s == pytest.approx(0.1)
+        assert {p.step.name for p in planned} == {"a", "b"}
+
+    def test_poisson_schedule_is_seeded(self):
+        scenario = Scenario(name="s", steps=[Step(name="a")])
+        first = plan_requests(scenario, rate=50, duration=2, arrival=ARRIVAL_POISSON, seed=7)
+        second = plan_requests(scenario, rate=50, duration=2, arrival=ARRIVAL_POISSON, seed=7)
+        assert [p.offset_s for p in first] == [p.offset_s for p in second]
+        assert all(0 <= p.offset_s < 2 for p in first)
+        assert 50 < len(first) < 150
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            plan_requests(Scenario(name="s", steps=[Step(name="a")]), rate=0)
+
+
+class TestReplay:
+    def test_timed_replay_respects_offsets_and_speed(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(
+            json.dumps({"offset_s": 2.0, "method": "GET", "path": "/health"}) + "\n\n"
+            + json.dumps({"offset_s": 1.0, "method": "POST", "path": "/resolve",
+                          "json": {"message": "hi"}}) + "\n"
+            + json.dumps({"request_id": "not-a-request"}) + "\n"
+        )
+        planned = load_replay(path, speed=2.0)
+        assert [p.offset_s for p in planned] == [0.5, 1.0]
+        assert planned[0].step.method == "POST"
+
+    def test_untimed_replay_needs_rate(self, tmp_path):
+        path = tmp_path / "log.jsonl"
+        path.write_text(json.dumps({"path": "/health"}) + "\n" + json.dumps({"path": "/"}) + "\n")
+        with pytest.raises(ValueError):
+            load_replay(path)
+        planned = load_replay(path, rate=4)
+        assert [p.offset_s for p in planned] == [0.0, 0.25]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _run(planned, **kwargs):
+    runner = LoadRunner("http://testserver", transport=httpx.ASGITransport(app=app), **kwargs)
+    return asyncio.run(runner.run(planned))
+
+
+class TestLoadRunner:
+    def test_open_loop_run_against_app(self, tmp_path):
+        create = Step(name="create", method="POST", path="/tickets/",
+                      json={"message": "{message}"}, expect=(201,))
+        fetch = Step(name="fetch", method="GET", path="/tickets/{ticket_id}", expect=(401,))
+        health = Step(name="health", path="/health")
+        planned = [
+            PlannedRequest(0.00, fetch),   # no ticket yet -> skipped
+            PlannedRequest(0.00, create),
+            PlannedRequest(0.01, health),
+            PlannedRequest(0.30, fetch),
+        ]
+        events = tmp_path / "events.jsonl"
+        results = _run(planned, events_path=events)
+
+        assert results["planned"] == 4
+        assert results["skipped"] == 1
+        assert results["sent"] == 3
+        assert results["steps"]["create"]["ok"] == 1
+        assert results["steps"]["health"]["status_codes"] == {"200": 1}
+        # Anonymous GET /tickets/{id} is a 401, which this step expects.
+        assert results["steps"]["fetch"]["ok"] == 1
+        assert results["total"]["latency_us"]["count"] == 3
+
+        replayed = load_replay(events)
+        assert [p.step.name for p in replayed] == ["create", "health", "fetch"]
+
+    def test_latency_includes_schedule_lag(self):
+        """A stalled event loop shows up as latency, not as lower offered load."""
+
+        import time
+
+        def handler(request):
+            time.sleep(0.05)  # blocks the loop, delaying later sends
+            return httpx.Response(200, json={})
+
+        runner = LoadRunner("http://testserver", transport=httpx.MockTransport(handler))
+        step = Step(name="s")
+        planned = [PlannedRequest(i * 0.001, step) for i in range(5)]
+        results = asyncio.run(runner.run(planned))
+        latency = results["total"]["latency_us"]
+        service = results["total"]["service_time_us"]
+        assert results["sent"] == 5
+        assert latency["max"] >= 5 * 45_000
+        assert latency["max"] > service["max"]
+
+    def test_max_inflight_drops(self):
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200)
+
+        runner = LoadRunner("http://testserver", transport=httpx.MockTransport(handler), max_inflight=1)
+        planned = [PlannedRequest(0.0, Step(name="s")) for _ in range(3)]
+        results = asyncio.run(runner.run(planned))
+        assert results["sent"] == 1
+        assert results["dropped"] == 2
+
+    def test_login_and_refresh_rotate_tokens(self):
+        tokens = iter(range(100))
+
+        def handler(request):
+            body = json.loads(request.content or b"{}")
+            if request.url.path == "/auth/login":
+                assert body["email"] == "u@example.com"
+            elif request.url.path == "/auth/refresh":
+                assert body["refresh_token"].startswith("r")
+            n = next(tokens)
+            return httpx.Response(200, json={"access_token": f"a{n}", "refresh_token": f"r{n}"})
+
+        runner = LoadRunner(
+            "http://testserver",
+            credentials={"user": {"email": "u@example.com", "password": "pw"}},
+            transport=httpx.MockTransport(handler),
+        )
+        planned = [PlannedRequest(0.0, Step(name="refresh", kind="refresh", method="POST",
+                                            path="/auth/refresh", auth="user")) for _ in range(3)]
+        results = asyncio.run(runner.run(planned))
+        assert results["logins"] == {"user": True}
+        assert results["steps"]["refresh"]["ok"] == 3
+        assert runner.sessions.refresh["user"] == "r3"
+
+
+def test_parse_args_defaults():
+    args = _parse_args([])
+    assert args.scenario.name == "mixed.json"
+    assert args.replay is None
+    assert args.arrival == "constant"
@@ -0,0 +1,30 @@
+"""
+Tests for benchmarks/login_throughput.py
+
+Covers:
+- run(): both executor profiles serve logins against a real server and
+  report throughput, 503 rejections and /health latency
+- profile_env rejects unknown profiles
+"""
+import pytest
+
+from benchmarks.login_throughput import profile_env, run
+
+
+def test_short_run_reports_both_profiles(tmp_path):
+    report = run(["thread", "process"], concurrency=2, duration=1.5, users=2, workers=1, workdir=str(tmp_path))
+
+    assert set(report["profiles"]) == {"thread", "process"}
+    assert report["profiles"]["process"]["env"]["PASSWORD_HASH_EXECUTOR"] == "process"
+    for result in report["profiles"].values():
+        assert result["login"]["ok"] > 0
+        assert result["login"]["errors"] == {}
+        assert result["login"]["latency_us"]["count"] == result["login"]["ok"]
+        assert result["health"]["ok"] > 0
+    assert "speedup" in report
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        profile_env("inline")
@@ -90,6 +90,49 @@ class DatabaseHelper:
         return ticket
 
 
+def make_async_db_override(sync_engine):
+    """
+    Build a ``get_async_db`` override that talks to the same database file
+    as ``sync_engine``.
+
+    Fixtures that point ``get_db`` at their own temporary database must do
+    the same for ``get_async_db``, otherwise the async endpoints (POST
+    /tickets/, GET /tickets/{id}, /resolve, agent actions) would read and
+    write the shared conftest database instead. NullPool keeps no
+    connection open between requests (TestClient runs each request on its
+    own event loop) and leaves nothing to dispose.
+
+    The engine is connected once up front: SQLAlchemy guards its
+    first-connect initialisation with an asyncio.Lock, and tests that fire
+    requests from several threads would otherwise race for it from
+    different event loops.
+    """
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.db.session import to_async_url
+
+    async_engine = create_async_engine(
+        to_async_url(sync_engine.url.render_as_string(hide_password=False)),
+        poolclass=NullPool,
+    )
+
+    async def _warm_up():
+        async with async_engine.connect():
+            pass
+
+    asyncio.run(_warm_up())
+    factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as session:
+            yield session
+
+    return override_get_async_db
+
+
 class AuthHelper:
     """Helper class for authentication in tests."""
     
@@ -143,6 +186,42 @@ def reset_limiter():
     limiter.reset()
 
 
+@pytest.fixture(autouse=True)
+def reset_admin_metrics_cache():
+    """Drop the cached /admin/metrics snapshot between tests."""
+    from app.services.admin_metrics import clear_admin_metrics_cache
+    clear_admin_metrics_cache()
+    yield
+    clear_admin_metrics_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """Drop cached principals between tests (cleanup_tables bypasses the Session)."""
+    from app.services.principal_cache import clear_principal_cache
+    clear_principal_cache()
+    yield
+    clear_principal_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_ticket_cache():
+    """Drop cached tickets between tests (cleanup_tables bypasses the Session)."""
+    from app.services.ticket_cache import clear_ticket_cache
+    clear_ticket_cache()
+    yield
+    clear_ticket_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_token_claims_cache():
+    """Forget cached token verifications between tests."""
+    from app.core.token_claims import clear_token_claims_cache
+    clear_token_claims_cache()
+    yield
+    clear_token_claims_cache()
+
+
 @pytest.fixture
 def agent_user(db):
     """Create an agent user for testing."""
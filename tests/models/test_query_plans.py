@@ -0,0 +1,304 @@
+"""
+Query-plan regression tests for the ticket/feedback indexes.
+
+Covers:
+- Every hot list/metrics query is served from the index declared for it
+  in the models' __table_args__ (see alembic revision a7b8c9d0e1f2)
+- None of them degrades to a full table scan
+- Ordered list queries (offset and keyset pages) read created_at from the
+  index instead of sorting
+- The incremental metrics collector's watermark scans use the
+  updated_at / created_at indexes (alembic revision c9d0e1f2a3b4)
+- The cleanup worker finds expired refresh tokens through the partial
+  active-token index (alembic revision d0e1f2a3b4c5)
+- The email outbox worker finds due rows through its (status,
+  next_attempt_at) index, and revision e1f2a3b4c5d6 creates the table
+  the model declares
+- The alembic migrations create the same indexes as the models
+
+The plans come from SQLite's EXPLAIN QUERY PLAN on a seeded database with
+ANALYZE statistics, so the planner sees a realistic row distribution.
+"""
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, insert, inspect, select, text, tuple_
+from sqlalchemy.dialects import sqlite
+
+from app.constants import TicketStatus
+from app.db.session import Base
+from app.models.email_outbox import EmailOutbox
+from app.models.feedback import Feedback
+from app.models.refresh_token import RefreshToken
+from app.models.ticket import Ticket
+from app.models.user import User
+from app.services.similarity_search import _resolved_tickets_query
+
+VERSIONS = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+MIGRATION = VERSIONS / "a7b8c9d0e1f2_add_query_indexes.py"
+INCREMENTAL_MIGRATION = VERSIONS / "c9d0e1f2a3b4_add_incremental_metrics_state.py"
+REFRESH_TOKEN_MIGRATION = VERSIONS / "d0e1f2a3b4c5_add_active_refresh_token_index.py"
+EMAIL_OUTBOX_MIGRATION = VERSIONS / "e1f2a3b4c5d6_add_email_outbox.py"
+
+STATUSES = [s.value for s in TicketStatus]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(bind=eng)
+    now = datetime.now(timezone.utc)
+    with eng.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "role": "user" if i % 5 else "agent"}
+            for i in range(1, 51)
+        ])
+        conn.execute(insert(Ticket), [
+            {
+                "message": f"ticket {i}",
+                "intent": ("login_issue", "payment", "refund")[i % 3],
+                "status": STATUSES[i % len(STATUSES)],
+                "is_archived": False,
+                "response": "answer" if i % 2 else None,
+                "quality_score": (i % 10) / 10 if i % 4 == 0 else None,
+                "user_id": 1 + i % 50,
+                "assigned_agent_id": 5 * (1 + i % 10) if i % 3 == 0 else None,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now - timedelta(minutes=i),
+            }
+            for i in range(1, 5001)
+        ])
+        conn.execute(insert(Feedback), [
+            {"ticket_id": i, "rating": 1 + i % 5, "resolved": bool(i % 2), "created_at": now - timedelta(minutes=i)}
+            for i in range(1, 2001)
+        ])
+        # Mostly rotated (revoked) tokens, as between two cleanup runs
+        conn.execute(insert(RefreshToken), [
+            {
+                "user_id": 1 + i % 50,
+                "token_hash": f"{i:064x}",
+                "expires_at": now + timedelta(days=30 - i % 60),
+                "revoked": i % 10 != 0,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(1, 5001)
+        ])
+        conn.execute(text("ANALYZE"))
+    yield eng
+    eng.dispose()
+
+
+def _plan(engine, stmt) -> list[str]:
+    compiled = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    """Plan steps that read a whole table (``SCAN t`` without an index)."""
+    return [step for step in plan if step.startswith("SCAN ") and "USING" not in step]
+
+
+# Each entry: (id, statement, index name(s) acceptable in the plan, ordered by the index)
+HOT_QUERIES = [
+    (
+        "list_tickets_all",
+        select(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(20),
+        "ix_tickets_created_at",
+        True,
+    ),
+    (
+        "list_tickets_by_status",
+        select(Ticket)
+        .where(Ticket.status == TicketStatus.ESCALATED.value)
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+        .limit(20),
+        "ix_tickets_status_created_at",
+        True,
+    ),
+    (
+        "list_tickets_by_user",
+        select(Ticket)
+        .where(Ticket.user_id == 7)
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+        .limit(20),
+        "ix_tickets_user_id_created_at",
+        True,
+    ),
+    (
+        "list_tickets_by_status_keyset",
+        select(Ticket)
+        .where(
+            Ticket.status == TicketStatus.ESCALATED.value,
+            tuple_(Ticket.created_at, Ticket.id) < (datetime(2026, 1, 1), 1000),
+        )
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+        .limit(20),
+        "ix_tickets_status_created_at",
+        True,
+    ),
+    (
+        "list_tickets_by_user_and_status",
+        select(Ticket)
+        .where(Ticket.status == TicketStatus.OPEN.value, Ticket.user_id == 7)
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+        .limit(20),
+        "ix_tickets_",
+        False,
+    ),
+    (
+        "my_assignments",
+        select(Ticket)
+        .where(Ticket.assigned_agent_id == 5, Ticket.status == TicketStatus.IN_PROGRESS.value)
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+        .limit(20),
+        "ix_tickets_assigned_agent_status",
+        True,
+    ),
+    (
+        "unassigned_escalated_count",
+        select(func.count()).select_from(Ticket).where(
+            Ticket.status == TicketStatus.ESCALATED.value,
+            Ticket.assigned_agent_id.is_(None),
+        ),
+        "ix_tickets_",
+        False,
+    ),
+    (
+        "low_quality_count",
+        select(func.count()).select_from(Ticket).where(
+            Ticket.quality_score.isnot(None),
+            Ticket.quality_score < 0.5,
+        ),
+        "ix_tickets_quality_score",
+        False,
+    ),
+    (
+        "resolved_corpus",
+        _resolved_tickets_query(),
+        # SQLite's planner may prefer the status index, which also yields
+        # created_at order; PostgreSQL picks the smaller partial index.
+        ("ix_tickets_resolved_corpus", "ix_tickets_status_created_at"),
+        True,
+    ),
+    (
+        "resolved_feedback_count",
+        select(func.count()).select_from(Feedback).where(Feedback.resolved.is_(True)),
+        "ix_feedback_resolved",
+        False,
+    ),
+    (
+        "metrics_watermark_tickets",
+        select(Ticket.id).where(Ticket.updated_at >= datetime.now(timezone.utc) - timedelta(minutes=10)),
+        "ix_tickets_updated_at",
+        False,
+    ),
+    (
+        "metrics_watermark_feedback",
+        select(Feedback.ticket_id).where(Feedback.created_at >= datetime.now(timezone.utc) - timedelta(minutes=10)),
+        "ix_feedback_created_at",
+        False,
+    ),
+    (
+        "cleanup_expired_refresh_tokens",
+        select(RefreshToken.id)
+        .where(RefreshToken.revoked == False, RefreshToken.expires_at < datetime.now(timezone.utc))  # noqa: E712
+        .order_by(RefreshToken.expires_at)
+        .limit(1000),
+        "ix_refresh_tokens_active_expires_at",
+        True,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "stmt, index, ordered",
+    [pytest.param(stmt, index, ordered, id=name) for name, stmt, index, ordered in HOT_QUERIES],
+)
+def test_hot_query_uses_index(engine, stmt, index, ordered):
+    plan = _plan(engine, stmt)
+    assert not _full_scans(plan), f"full table scan: {plan}"
+    names = (index,) if isinstance(index, str) else index
+    assert any(name in step for name in names for step in plan), f"expected {index}: {plan}"
+    if ordered:
+        assert not any("TEMP B-TREE FOR ORDER BY" in step for step in plan), f"sorts in memory: {plan}"
+
+
+def test_full_scan_detector_flags_unindexed_query(engine):
+    """Sanity check: a filter on an unindexed column is reported as a scan."""
+    plan = _plan(engine, select(Ticket).where(Ticket.message == "ticket 1"))
+    assert _full_scans(plan)
+
+
+def _load_migration(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def test_migration_creates_model_indexes():
+    """The migrations and the models' __table_args__ declare the same indexes."""
+    migration = _load_migration(MIGRATION)
+    incremental = _load_migration(INCREMENTAL_MIGRATION)
+
+    assert migration.down_revision == "f6a7b8c9d0e1"
+    migration_names = {name for name, _ in migration._TICKET_INDEXES}
+    migration_names |= {"ix_tickets_resolved_corpus", "ix_feedback_resolved"}
+    migration_names |= {name for name, _table, _columns in incremental._INDEXES}
+
+    model_names = {
+        ix.name
+        for table in (Ticket.__table__, Feedback.__table__)
+        for ix in table.indexes
+        if ix.name.startswith(("ix_tickets_", "ix_feedback_")) and not ix.name.endswith("_id")
+    }
+    assert migration_names == model_names
+    for name, columns in migration._TICKET_INDEXES:
+        model_index = next(ix for ix in Ticket.__table__.indexes if ix.name == name)
+        assert [c.name for c in model_index.columns] == columns
+
+
+def test_refresh_token_migration_matches_model():
+    migration = _load_migration(REFRESH_TOKEN_MIGRATION)
+    assert migration.down_revision == "c9d0e1f2a3b4"
+
+    index = next(ix for ix in RefreshToken.__table__.indexes if ix.name == "ix_refresh_tokens_active_expires_at")
+    assert [c.name for c in index.columns] == ["expires_at"]
+    assert str(index.dialect_options["sqlite"]["where"]) == "revoked = 0"
+
+
+def test_email_outbox_due_rows_use_index(engine):
+    stmt = (
+        select(EmailOutbox)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= datetime.now(timezone.utc))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(50)
+    )
+
+    plan = _plan(engine, stmt)
+
+    assert any("ix_email_outbox_status_next_attempt_at" in step for step in plan), plan
+    assert not _full_scans(plan)
+
+
+def test_email_outbox_migration_matches_model():
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    migration = _load_migration(EMAIL_OUTBOX_MIGRATION)
+    assert migration.down_revision == "d0e1f2a3b4c5"
+
+    eng = create_engine("sqlite://")
+    with eng.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+        migration.upgrade()
+    inspector = inspect(eng)
+
+    columns = {c["name"]: c["nullable"] for c in inspector.get_columns("email_outbox")}
+    assert columns == {c.name: c.nullable for c in EmailOutbox.__table__.columns if not c.primary_key} | {"id": False}
+    assert {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("email_outbox")} == {
+        ix.name: [c.name for c in ix.columns] for ix in EmailOutbox.__table__.indexes
+    }
+    eng.dispose()
@@ -0,0 +1,226 @@
+"""
+Tests for app/services/admin_metrics.py and the cached GET /admin/metrics.
+
+Covers:
+- compute_admin_metrics matches the per-metric queries it replaced
+- compute_admin_metrics issues exactly two SQL statements
+- get_admin_metrics: served from the local cache within the TTL,
+  recomputed after it, max_staleness=0 forces fresh numbers
+- Redis: snapshots published by another process are served, and fresh
+  computations are written back; Redis errors fall back to recomputing
+- GET /admin/metrics: Age header and ?max_staleness=0
+"""
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.constants import TicketStatus
+from app.core.config import settings
+from app.db.session import Base
+from app.models.feedback import Feedback
+from app.models.ticket import Ticket
+from app.services import admin_metrics
+from app.services.admin_metrics import compute_admin_metrics, get_admin_metrics
+from tests.conftest import client
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture()
+def seeded(session):
+    rows = [
+        ("auto_resolved", "login_issue", 0.9, None),
+        ("auto_resolved", "login_issue", 0.3, None),
+        ("auto_resolved", "payment", None, None),
+        ("escalated", "payment", 0.2, None),
+        ("escalated", "refund", None, 7),
+        ("escalated", None, 0.4, None),
+        ("open", "general", None, None),
+        ("in_progress", "refund", 0.8, 7),
+        ("closed", "", 0.1, 7),
+    ]
+    tickets = [
+        Ticket(message=f"t{i}", status=s, intent=intent, quality_score=q, assigned_agent_id=agent)
+        for i, (s, intent, q, agent) in enumerate(rows)
+    ]
+    session.add_all(tickets)
+    session.commit()
+    session.add_all([
+        Feedback(ticket_id=tickets[0].id, rating=5, resolved=True),
+        Feedback(ticket_id=tickets[1].id, rating=2, resolved=False),
+        Feedback(ticket_id=tickets[3].id, rating=4, resolved=True),
+    ])
+    session.commit()
+    return session
+
+
+def _reference_metrics(db):
+    """The previous multi-query implementation of /admin/metrics."""
+    total = db.query(Ticket).count()
+    status_counts = dict(db.query(Ticket.status, func.count(Ticket.id)).group_by(Ticket.status).all())
+    auto_resolved = status_counts.get("auto_resolved", 0)
+    escalated = status_counts.get("escalated", 0)
+    unassigned = db.query(Ticket).filter(
+        Ticket.status == "escalated", Ticket.assigned_agent_id.is_(None)
+    ).count()
+    total_feedback = db.query(Feedback).count()
+    resolved = db.query(Feedback).filter(Feedback.resolved.is_(True)).count()
+    avg = db.query(func.avg(Feedback.rating)).scalar()
+    low = db.query(Ticket).filter(Ticket.quality_score.isnot(None), Ticket.quality_score < 0.5).count()
+    by_intent = (
+        db.query(Ticket.intent, func.avg(Ticket.quality_score))
+        .filter(Ticket.quality_score.isnot(None))
+        .group_by(Ticket.intent)
+        .all()
+    )
+    return {
+        "total": total,
+        "by_status": status_counts,
+        "auto_resolve_rate": round(auto_resolved / total * 100, 2),
+        "escalation_rate": round(escalated / total * 100, 2),
+        "unassigned_escalated": unassigned,
+        "feedback_total": total_feedback,
+        "resolved_count": resolved,
+        "average_rating": round(float(avg), 2),
+        "low_quality_count": low,
+        "by_intent": {i: round(float(s), 2) for i, s in by_intent if i},
+    }
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+class _BrokenRedis:
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+
+class TestComputeAdminMetrics:
+    def test_matches_previous_queries(self, seeded):
+        expected = _reference_metrics(seeded)
+        metrics = compute_admin_metrics(seeded)
+
+        assert metrics["tickets"]["total"] == expected["total"]
+        assert metrics["tickets"]["by_status"] == expected["by_status"]
+        assert metrics["tickets"]["auto_resolve_rate"] == expected["auto_resolve_rate"]
+        assert metrics["tickets"]["escalation_rate"] == expected["escalation_rate"]
+        assert metrics["tickets"]["unassigned_escalated"] == expected["unassigned_escalated"] == 2
+        assert metrics["feedback"]["total"] == expected["feedback_total"]
+        assert metrics["feedback"]["resolved_count"] == expected["resolved_count"]
+        assert metrics["feedback"]["average_rating"] == expected["average_rating"]
+        assert metrics["quality"]["low_quality_count"] == expected["low_quality_count"] == 4
+        assert metrics["quality"]["by_intent"] == expected["by_intent"]
+
+    def test_empty_database(self, session):
+        metrics = compute_admin_metrics(session)
+        assert metrics["tickets"]["total"] == 0
+        assert metrics["tickets"]["by_status"] == {}
+        assert metrics["feedback"] == {"total": 0, "average_rating": 0.0, "resolution_rate": 0, "resolved_count": 0}
+        assert metrics["quality"] == {"low_quality_count": 0, "by_intent": {}}
+
+    def test_two_statements(self, seeded):
+        statements = []
+        engine = seeded.get_bind()
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            compute_admin_metrics(seeded)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 2
+
+
+class TestGetAdminMetrics:
+    def test_cached_within_ttl(self, seeded):
+        first, age = get_admin_metrics(seeded)
+        assert age == 0.0
+        seeded.add(Ticket(message="new", status=TicketStatus.OPEN.value))
+        seeded.commit()
+
+        cached, _ = get_admin_metrics(seeded)
+        assert cached["tickets"]["total"] == first["tickets"]["total"]
+
+        fresh, age = get_admin_metrics(seeded, max_staleness=0)
+        assert age == 0.0
+        assert fresh["tickets"]["total"] == first["tickets"]["total"] + 1
+
+    def test_recomputed_after_ttl(self, seeded, monkeypatch):
+        clock = [1_000.0]
+        monkeypatch.setattr(admin_metrics.time, "time", lambda: clock[0])
+        first, _ = get_admin_metrics(seeded)
+        seeded.add(Ticket(message="new", status=TicketStatus.OPEN.value))
+        seeded.commit()
+
+        clock[0] += settings.ADMIN_METRICS_CACHE_TTL_S - 1
+        _, age = get_admin_metrics(seeded)
+        assert age == pytest.approx(settings.ADMIN_METRICS_CACHE_TTL_S - 1)
+
+        clock[0] += 2
+        later, age = get_admin_metrics(seeded)
+        assert age == 0.0
+        assert later["tickets"]["total"] == first["tickets"]["total"] + 1
+
+    def test_serves_snapshot_published_to_redis(self, session, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(admin_metrics, "_get_cache_client", lambda: fake)
+        snapshot = {"tickets": {"total": 1234}}
+        fake.set(admin_metrics.REDIS_KEY, json.dumps({"computed_at": admin_metrics.time.time(), "metrics": snapshot}))
+
+        metrics, _ = get_admin_metrics(session)
+        assert metrics == snapshot
+
+    def test_fresh_computation_written_to_redis(self, seeded, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(admin_metrics, "_get_cache_client", lambda: fake)
+
+        metrics, _ = get_admin_metrics(seeded)
+        stored = json.loads(fake.get(admin_metrics.REDIS_KEY))
+        assert stored["metrics"] == metrics
+
+    def test_redis_errors_fall_back_to_database(self, seeded, monkeypatch):
+        monkeypatch.setattr(admin_metrics, "_get_cache_client", lambda: _BrokenRedis())
+        metrics, _ = get_admin_metrics(seeded)
+        assert metrics["tickets"]["total"] == 9
+
+
+class TestMetricsEndpoint:
+    def test_age_header_and_max_staleness(self, db, admin_token):
+        headers = {"Authorization": admin_token}
+        first = client.get("/admin/metrics", headers=headers)
+        assert first.status_code == 200
+        assert first.headers["Age"] == "0"
+        total = first.json()["tickets"]["total"]
+
+        db.add(Ticket(message="new", status=TicketStatus.OPEN.value))
+        db.commit()
+        assert client.get("/admin/metrics", headers=headers).json()["tickets"]["total"] == total
+        fresh = client.get("/admin/metrics?max_staleness=0", headers=headers).json()
+        assert fresh["tickets"]["total"] == total + 1
+
+    def test_negative_max_staleness_rejected(self, admin_token):
+        response = client.get("/admin/metrics?max_staleness=-1", headers={"Authorization": admin_token})
+        assert response.status_code == 400
@@ -22,9 +22,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.models.ticket import Ticket
 from app.models.user import User
+from tests.conftest import make_async_db_override
 
 
 @pytest.fixture(scope="function")
@@ -54,6 +55,7 @@ def client_with_temp_db(tmp_path):
     db = TestingSessionLocal()
 
     original_override = app.dependency_overrides.get(get_db)
+    original_async_override = app.dependency_overrides.get(get_async_db)
 
     def override_get_db():
         """
@@ -71,6 +73,7 @@ def client_with_temp_db(tmp_path):
             request_db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(engine)
     client = TestClient(app)
 
     try:
@@ -81,6 +84,10 @@ def client_with_temp_db(tmp_path):
             app.dependency_overrides[get_db] = original_override
         else:
             app.dependency_overrides.pop(get_db, None)
+        if original_async_override is not None:
+            app.dependency_overrides[get_async_db] = original_async_override
+        else:
+            app.dependency_overrides.pop(get_async_db, None)
         engine.dispose()
 
 
@@ -2,11 +2,12 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.main import app
 from app.models.ticket import Ticket
 import os
 import tempfile
+from tests.conftest import make_async_db_override
 
 @pytest.fixture(scope="session")
 def temp_db_file():
@@ -41,10 +42,12 @@ def override_get_db(db_engine):
 @pytest.fixture(scope="function")
 def client(db_engine):
     app.dependency_overrides[get_db] = override_get_db(db_engine)
+    app.dependency_overrides[get_async_db] = make_async_db_override(db_engine[0])
     try:
         yield TestClient(app)
     finally:
         app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
 
 
 @pytest.fixture(scope="function")
@@ -20,13 +20,13 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
 from app.main import app
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.models.ticket import Ticket
 from app.services.classifier import classify_intent
 from app.services.similarity_search import find_similar_ticket
 from app.services.decision_engine import decide_resolution
 from app.services.response_generator import generate_response
-from tests.conftest import AuthHelper
+from tests.conftest import AuthHelper, make_async_db_override
 
 # Test database setup - use temporary database for parallel safety
 import tempfile
@@ -84,6 +84,7 @@ def client(integration_engine):
             db.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(integration_engine)
     try:
         yield TestClient(app)
     finally:
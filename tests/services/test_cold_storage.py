@@ -0,0 +1,131 @@
+"""
+Tests for app/services/cold_storage.py
+
+Covers:
+- make_record: datetimes serialized, feedback nested or null
+- write_segment / read_manifest: gzip JSONL segment plus manifest entry
+  (id range, counts, sha256), manifest appended across segments
+- find_offloaded_ticket: lookup by id across segments, misses outside and
+  inside a segment's range, newest copy wins, manifest reloaded after a
+  new segment, missing segment file skipped, no directory configured
+"""
+import gzip
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.services.cold_storage import (
+    MANIFEST_NAME,
+    clear_cold_storage_cache,
+    find_offloaded_ticket,
+    make_record,
+    read_manifest,
+    write_segment,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_cold_storage_cache()
+    yield
+    clear_cold_storage_cache()
+
+
+def _record(ticket_id, message="archived", feedback=None):
+    ticket = {
+        "id": ticket_id,
+        "message": message,
+        "status": "closed",
+        "is_archived": True,
+        "created_at": datetime(2024, 1, 2, 3, 4, 5),
+    }
+    return make_record(ticket, feedback)
+
+
+def test_make_record_serializes_datetimes_and_feedback():
+    record = _record(1, feedback={"id": 9, "ticket_id": 1, "rating": 4, "created_at": datetime(2024, 1, 3)})
+
+    assert record["created_at"] == "2024-01-02T03:04:05"
+    assert record["feedback"] == {"id": 9, "ticket_id": 1, "rating": 4, "created_at": "2024-01-03T00:00:00"}
+    assert _record(2)["feedback"] is None
+    json.dumps(record)
+
+
+def test_write_segment_writes_gzip_jsonl_and_manifest(tmp_path):
+    records = [_record(3), _record(5, feedback={"rating": 5})]
+
+    entry = write_segment(tmp_path, records)
+
+    path = tmp_path / entry["file"]
+    data = path.read_bytes()
+    lines = gzip.decompress(data).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == records
+    assert (entry["min_id"], entry["max_id"]) == (3, 5)
+    assert (entry["tickets"], entry["feedback"]) == (2, 1)
+    assert entry["bytes"] == len(data)
+    assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+    assert read_manifest(tmp_path) == [entry]
+
+
+def test_manifest_appends_segments(tmp_path):
+    first = write_segment(tmp_path, [_record(1)])
+    second = write_segment(tmp_path, [_record(2)])
+
+    assert read_manifest(tmp_path) == [first, second]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([MANIFEST_NAME, first["file"], second["file"]])
+
+
+def test_write_segment_rejects_empty_batch(tmp_path):
+    with pytest.raises(ValueError):
+        write_segment(tmp_path, [])
+
+
+def test_read_manifest_empty_directory(tmp_path):
+    assert read_manifest(tmp_path) == []
+
+
+def test_find_offloaded_ticket(tmp_path):
+    write_segment(tmp_path, [_record(1, "one"), _record(4, "four")])
+    write_segment(tmp_path, [_record(10, "ten")])
+
+    assert find_offloaded_ticket(4, tmp_path)["message"] == "four"
+    assert find_offloaded_ticket(10, tmp_path)["message"] == "ten"
+    assert find_offloaded_ticket(2, tmp_path) is None  # inside a range, not offloaded
+    assert find_offloaded_ticket(11, tmp_path) is None
+    assert find_offloaded_ticket(0, tmp_path) is None
+
+
+def test_newest_copy_wins(tmp_path):
+    write_segment(tmp_path, [_record(7, "old copy")])
+    write_segment(tmp_path, [_record(6), _record(7, "new copy")])
+
+    assert find_offloaded_ticket(7, tmp_path)["message"] == "new copy"
+
+
+def test_sees_segments_written_after_first_lookup(tmp_path):
+    write_segment(tmp_path, [_record(1)])
+    assert find_offloaded_ticket(20, tmp_path) is None
+
+    write_segment(tmp_path, [_record(20)])
+
+    assert find_offloaded_ticket(20, tmp_path)["id"] == 20
+
+
+def test_missing_segment_is_skipped(tmp_path):
+    entry = write_segment(tmp_path, [_record(1)])
+    (tmp_path / entry["file"]).unlink()
+
+    assert find_offloaded_ticket(1, tmp_path) is None
+
+
+def test_uses_configured_directory(tmp_path, monkeypatch):
+    write_segment(tmp_path, [_record(1)])
+
+    monkeypatch.setattr(settings, "COLD_STORAGE_DIR", None)
+    assert find_offloaded_ticket(1) is None
+
+    monkeypatch.setattr(settings, "COLD_STORAGE_DIR", str(tmp_path))
+    assert find_offloaded_ticket(1)["id"] == 1
@@ -20,14 +20,14 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.models.ticket import Ticket
 from tests.services.test_ai_mocks import (
     MockAIService, 
     TestScenarios, 
     create_mock_ai_service
 )
-from tests.conftest import AuthHelper
+from tests.conftest import AuthHelper, make_async_db_override
 
 # Test database setup - use temporary database for parallel safety
 import tempfile
@@ -85,6 +85,7 @@ def client(comprehensive_engine):
             db.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(comprehensive_engine)
     try:
         yield TestClient(app)
     finally:
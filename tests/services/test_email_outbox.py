@@ -0,0 +1,205 @@
+"""
+Tests for app/services/email_outbox.py
+
+Covers:
+- enqueue_otp_email: queued only when the caller commits; the OTP is
+  encrypted at rest
+- deliver_due: batches of batch_size, one sender call per batch; payload
+  cleared after sending; exponential backoff on failure, failed after
+  EMAIL_OUTBOX_MAX_ATTEMPTS or a permanent error; expired emails dropped;
+  unreadable payloads failed
+- DevLogSender: fails permanently outside development
+- POST /auth/forgot-password queues the OTP email without sending it; the
+  worker's delivery carries an OTP that resets the password
+
+Emails go to _MemorySink, a local stand-in for the provider.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.email_outbox import EXPIRED, FAILED, PENDING, SENT, EmailOutbox
+from app.services import email_outbox
+from app.services.email_outbox import (
+    DevLogSender,
+    EmailDeliveryError,
+    deliver_due,
+    enqueue_otp_email,
+    retry_delay,
+)
+from tests.conftest import DatabaseHelper, client
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class _MemorySink:
+    """Records every batch; raises the queued errors first, one per call."""
+
+    def __init__(self, *errors):
+        self.batches = []
+        self.errors = list(errors)
+
+    def send(self, messages):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.batches.append(list(messages))
+
+    @property
+    def messages(self):
+        return [m for batch in self.batches for m in batch]
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox(db):
+    db.execute(EmailOutbox.__table__.delete())
+    db.commit()
+    yield
+    db.rollback()
+    db.execute(EmailOutbox.__table__.delete())
+    db.commit()
+
+
+def _queue(db, n=1, expires_in=timedelta(minutes=10)):
+    rows = [enqueue_otp_email(db, f"user{i}@example.com", f"{i:06d}", NOW + expires_in) for i in range(n)]
+    for row in rows:
+        row.next_attempt_at = NOW
+    db.commit()
+    return rows
+
+
+def _rows(db):
+    db.expire_all()
+    return db.execute(select(EmailOutbox).order_by(EmailOutbox.id)).scalars().all()
+
+
+class TestEnqueue:
+    def test_queued_with_the_callers_transaction(self, db):
+        enqueue_otp_email(db, "a@example.com", "123456", NOW)
+        db.rollback()
+        assert _rows(db) == []
+
+        enqueue_otp_email(db, "a@example.com", "123456", NOW)
+        db.commit()
+        [row] = _rows(db)
+        assert (row.kind, row.recipient, row.status, row.attempts) == ("otp", "a@example.com", PENDING, 0)
+
+    def test_otp_encrypted_at_rest(self, db):
+        [row] = _queue(db)
+
+        assert "000000" not in row.payload
+        assert email_outbox._decrypt(row.payload) == {"otp": "000000"}
+
+
+class TestDeliverDue:
+    def test_sends_in_batches(self, db):
+        _queue(db, 5)
+        sink = _MemorySink()
+
+        summaries = [deliver_due(db, sink, batch_size=2, now=NOW) for _ in range(4)]
+
+        assert [len(b) for b in sink.batches] == [2, 2, 1]
+        assert [s["sent"] for s in summaries] == [2, 2, 1, 0]
+        assert summaries[-1]["claimed"] == 0
+        assert sorted(m.to for m in sink.messages) == [f"user{i}@example.com" for i in range(5)]
+        assert "<strong>000000</strong>" in sink.messages[0].html
+        assert all(r.status == SENT and r.payload is None and r.sent_at is not None for r in _rows(db))
+
+    def test_failed_send_retried_with_backoff(self, db):
+        _queue(db)
+        sink = _MemorySink(ConnectionError("provider down"), ConnectionError("provider down"))
+
+        assert deliver_due(db, sink, now=NOW)["retried"] == 1
+        [row] = _rows(db)
+        assert (row.status, row.attempts, row.last_error) == (PENDING, 1, "provider down")
+        first_retry = NOW + retry_delay(1)
+        assert row.next_attempt_at.replace(tzinfo=timezone.utc) == first_retry
+
+        assert deliver_due(db, sink, now=first_retry - timedelta(seconds=1))["claimed"] == 0
+        deliver_due(db, sink, now=first_retry)
+        assert _rows(db)[0].attempts == 2
+
+        deliver_due(db, sink, now=first_retry + retry_delay(2))
+        [row] = _rows(db)
+        assert row.status == SENT and len(sink.messages) == 1
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        delays = [retry_delay(n).total_seconds() for n in range(1, 10)]
+
+        assert delays[:3] == [settings.EMAIL_OUTBOX_RETRY_BASE_S * f for f in (1, 2, 4)]
+        assert max(delays) == settings.EMAIL_OUTBOX_RETRY_MAX_S
+
+    def test_gives_up_after_max_attempts(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+        _queue(db)
+        sink = _MemorySink(*[TimeoutError("slow")] * 3)
+
+        deliver_due(db, sink, now=NOW)
+        summary = deliver_due(db, sink, now=NOW + retry_delay(1))
+
+        assert summary["failed"] == 1
+        [row] = _rows(db)
+        assert (row.status, row.attempts, row.payload) == (FAILED, 2, None)
+
+    def test_permanent_error_not_retried(self, db):
+        _queue(db, 2)
+        sink = _MemorySink(EmailDeliveryError("rejected", permanent=True))
+
+        assert deliver_due(db, sink, now=NOW)["failed"] == 2
+        assert {(r.status, r.attempts) for r in _rows(db)} == {(FAILED, 1)}
+
+    def test_expired_email_dropped(self, db):
+        _queue(db, 1, expires_in=timedelta(seconds=-1))
+        sink = _MemorySink()
+
+        assert deliver_due(db, sink, now=NOW)["expired"] == 1
+        assert sink.batches == []
+        [row] = _rows(db)
+        assert (row.status, row.payload) == (EXPIRED, None)
+
+    def test_unreadable_payload_failed(self, db):
+        [row] = _queue(db)
+        row.payload = "not-a-fernet-token"
+        db.commit()
+
+        summary = deliver_due(db, _MemorySink(), now=NOW)
+
+        assert (summary["failed"], summary["sent"]) == (1, 0)
+        assert _rows(db)[0].status == FAILED
+
+
+def test_dev_log_sender_fails_outside_development(monkeypatch):
+    monkeypatch.setattr(settings, "ENV", "production")
+    message = email_outbox.render("otp", "a@example.com", {"otp": "123456"})
+
+    with pytest.raises(EmailDeliveryError) as excinfo:
+        DevLogSender().send([message])
+
+    assert excinfo.value.permanent
+
+
+def test_forgot_password_queues_instead_of_sending(db, monkeypatch):
+    def _no_network(*args, **kwargs):
+        raise AssertionError("the request must not call the email provider")
+
+    import resend
+
+    monkeypatch.setattr(resend.Batch, "send", _no_network)
+    monkeypatch.setattr(resend.Emails, "send", _no_network)
+    DatabaseHelper.create_user(db, email="outbox@example.com")
+
+    response = client.post("/auth/forgot-password", json={"email": "outbox@example.com"})
+
+    assert response.status_code == 200
+    [row] = _rows(db)
+    assert (row.recipient, row.status) == ("outbox@example.com", PENDING)
+
+    sink = _MemorySink()
+    deliver_due(db, sink)
+    [message] = sink.messages
+    response = client.post(
+        "/auth/reset-password",
+        json={"email": "outbox@example.com", "otp": message.context["otp"], "new_password": "NewPassw0rd!"},
+    )
+    assert response.status_code == 200
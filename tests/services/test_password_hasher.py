@@ -0,0 +1,116 @@
+"""
+Tests for app/core/password_hasher.py
+
+Covers:
+- hash_password_async / verify_password_async round-trip through the
+  process pool
+- PasswordHasher: rejects work beyond workers + queue_size with
+  ServiceUnavailableError and accepts it again once jobs finish; a dead
+  worker process yields a 503 and the pool is rebuilt
+- API: login, register and password resets answer 503 with Retry-After
+  while the hasher is saturated
+"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.core import password_hasher
+from app.core.exceptions import ServiceUnavailableError
+from app.core.password_hasher import PasswordHasher, hash_password_async, verify_password_async
+from app.core.security import hash_password
+from tests.conftest import DatabaseHelper, client
+
+
+@pytest.fixture()
+def saturated(monkeypatch):
+    """Install a one-worker, no-queue hasher whose only worker is blocked."""
+    hasher = PasswordHasher("thread", 1, 0)
+    release = threading.Event()
+    hasher.submit(release.wait)
+    monkeypatch.setattr(password_hasher, "_hasher", hasher)
+    yield hasher
+    release.set()
+    hasher.shutdown()
+
+
+def test_round_trip_through_process_pool():
+    async def round_trip():
+        hashed = await hash_password_async("Sup3rSecret!")
+        return hashed, await verify_password_async("Sup3rSecret!", hashed), await verify_password_async("nope", hashed)
+
+    hashed, ok, wrong = asyncio.run(round_trip())
+
+    assert hashed.startswith("$2b$")
+    assert (ok, wrong) == (True, False)
+    assert password_hasher.get_password_hasher().kind == "process"
+
+
+class TestPasswordHasher:
+    def test_rejects_when_full_and_recovers(self):
+        hasher = PasswordHasher("thread", 1, 1)
+        release = threading.Event()
+        try:
+            running = hasher.submit(release.wait)
+            queued = hasher.submit(lambda: "queued")
+            with pytest.raises(ServiceUnavailableError) as excinfo:
+                hasher.submit(lambda: "rejected")
+            assert excinfo.value.status_code == 503
+            assert excinfo.value.details == {"retry_after": password_hasher.RETRY_AFTER_S}
+
+            release.set()
+            running.result(timeout=5)
+            assert queued.result(timeout=5) == "queued"
+            assert hasher.submit(lambda: "accepted").result(timeout=5) == "accepted"
+            assert hasher.pending == 0
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    def test_defaults_to_one_worker_per_core(self):
+        hasher = PasswordHasher("thread", 0, 4)
+
+        assert hasher.workers == (os.cpu_count() or 1)
+        assert hasher.max_pending == hasher.workers + 4
+
+    def test_dead_worker_process_is_replaced(self):
+        hasher = PasswordHasher("process", 1, 0)
+        try:
+            with pytest.raises(ServiceUnavailableError):
+                asyncio.run(hasher.run(os._exit, 1))
+
+            assert asyncio.run(hasher.run(hash_password, "after")).startswith("$2b$")
+            assert hasher.pending == 0
+        finally:
+            hasher.shutdown()
+
+
+class TestSaturatedEndpoints:
+    def _assert_busy(self, response):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(password_hasher.RETRY_AFTER_S)
+        assert response.json()["error"]["code"] == "SERVICE_UNAVAILABLE"
+
+    def test_login(self, db, saturated):
+        DatabaseHelper.create_user(db, email="busy-login@example.com")
+
+        response = client.post("/auth/login", json={"email": "busy-login@example.com", "password": "Passw0rd!"})
+
+        self._assert_busy(response)
+
+    def test_register(self, db, saturated):
+        response = client.post("/auth/register", json={"email": "busy-register@example.com", "password": "Passw0rd!"})
+
+        self._assert_busy(response)
+
+    def test_admin_reset_password(self, db, admin_token, saturated):
+        target = DatabaseHelper.create_user(db, email="busy-target@example.com")
+
+        response = client.post(
+            f"/admin/users/{target.id}/reset-password",
+            json={"new_password": "NewPassw0rd!"},
+            headers={"Authorization": admin_token},
+        )
+
+        self._assert_busy(response)
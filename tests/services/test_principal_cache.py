@@ -0,0 +1,303 @@
+"""
+Tests for app/services/principal_cache.py and its use in get_current_user.
+
+Covers:
+- get_principal / store_principal: hit within the TTL, miss after it,
+  disabled with a TTL of 0, LRU eviction, pruning of local stamps
+- A store racing an invalidation is discarded (version stamp)
+- Session events: ORM updates and deletes, and bulk UPDATEs, invalidate on
+  commit; rolled-back changes do not
+- Redis tier: entries shared between processes, invalidation bumps the
+  shared stamp (which expires), Redis errors fall back to the database
+- GET /auth/me and the async agent dependency: the users SELECT runs once
+  per TTL; role changes / password resets take effect immediately; the
+  async dependency hands out a plain Principal, never a half-loaded User
+"""
+import json
+
+import pytest
+from sqlalchemy import event, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.user import User
+from app.services import principal_cache
+from app.services.principal_cache import (
+    _LocalCache,
+    get_principal,
+    invalidate_principals,
+    store_principal,
+)
+from tests.conftest import AuthHelper, DatabaseHelper, client
+
+FIELDS = {"id": 7, "email": "p@example.com", "role": "agent", "is_active": True}
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def mget(self, *keys):
+        return [self.store.get(k) for k in keys]
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis, self._calls = redis, []
+
+    def __getattr__(self, name):
+        return lambda *args: self._calls.append((name, args))
+
+    def execute(self):
+        for name, args in self._calls:
+            getattr(self._redis, name)(*args)
+
+
+class _BrokenRedis:
+    def mget(self, *keys):
+        raise ConnectionError("redis down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+
+def _user_selects(bind=engine):
+    statements = []
+
+    def listener(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM USERS" in statement.upper():
+            statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(bind, "before_cursor_execute", listener)
+
+
+class TestLookup:
+    def test_hit_within_ttl_and_miss_after(self, monkeypatch):
+        clock = [1_000.0]
+        monkeypatch.setattr(principal_cache.time, "time", lambda: clock[0])
+
+        cached, version = get_principal(7)
+        assert cached is None
+        store_principal(7, version, FIELDS)
+        assert get_principal(7)[0] == FIELDS
+
+        clock[0] += settings.PRINCIPAL_CACHE_TTL_S + 1
+        assert get_principal(7)[0] is None
+
+    def test_disabled_with_zero_ttl(self, monkeypatch):
+        monkeypatch.setattr(settings, "PRINCIPAL_CACHE_TTL_S", 0)
+        _, version = get_principal(7)
+        store_principal(7, version, FIELDS)
+        assert get_principal(7) == (None, None)
+
+    def test_store_after_invalidation_is_discarded(self):
+        _, version = get_principal(7)
+        invalidate_principals([7])  # committed change while the loader queried
+        store_principal(7, version, FIELDS)
+
+        assert get_principal(7)[0] is None
+
+    def test_lru_eviction(self):
+        cache = _LocalCache(max_entries=2)
+        for user_id in (1, 2):
+            cache.put(user_id, 0, {"id": user_id}, 0.0, check_version=True)
+        cache.get(1, 0, float("inf"))  # 1 is now most recently used
+        cache.put(3, 0, {"id": 3}, 0.0, check_version=True)
+
+        assert cache.get(2, 0, float("inf")) is None
+        assert cache.get(1, 0, float("inf")) == {"id": 1}
+        assert cache.get(3, 0, float("inf")) == {"id": 3}
+
+    def test_stamps_without_entries_are_pruned(self):
+        cache = _LocalCache(max_entries=2)
+        cache.put(1, cache.version(1), {"id": 1}, 0.0, check_version=True)
+        version = cache.version(2)  # a loader for user 2 reads its stamp
+        cache.invalidate(range(2, 12))
+
+        assert len(cache._versions) <= 2 * 2
+        assert cache.get(1, cache.version(1), float("inf")) == {"id": 1}
+        cache.put(2, version, {"id": 2}, 0.0, check_version=True)
+        assert cache.get(2, cache.version(2), float("inf")) is None
+
+
+class TestInvalidationEvents:
+    @pytest.fixture()
+    def cached_user(self, db):
+        user = DatabaseHelper.create_user(db, email="cached@example.com", role="agent")
+        _, version = get_principal(user.id)
+        store_principal(user.id, version, principal_cache.principal_fields(user))
+        assert get_principal(user.id)[0] is not None
+        return user
+
+    def test_orm_update_invalidates_on_commit(self, db, cached_user):
+        cached_user.role = "admin"
+        db.flush()
+        assert get_principal(cached_user.id)[0] is not None  # not committed yet
+
+        db.commit()
+        assert get_principal(cached_user.id)[0] is None
+
+    def test_rollback_keeps_entry(self, db, cached_user):
+        cached_user.is_active = False
+        db.flush()
+        db.rollback()
+
+        assert get_principal(cached_user.id)[0] is not None
+
+    def test_bulk_update_invalidates(self, db, cached_user):
+        db.execute(update(User).where(User.email == "cached@example.com").values(is_active=False))
+        db.commit()
+
+        assert get_principal(cached_user.id)[0] is None
+
+    def test_delete_invalidates(self, db, cached_user):
+        db.delete(cached_user)
+        db.commit()
+
+        assert get_principal(cached_user.id)[0] is None
+
+    def test_unrelated_user_stays_cached(self, db, cached_user):
+        other = DatabaseHelper.create_user(db, email="other@example.com")
+        other.role = "agent"
+        db.commit()
+
+        assert get_principal(cached_user.id)[0] is not None
+
+
+class TestRedisTier:
+    def test_entry_shared_between_processes(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(principal_cache, "_redis", lambda: fake)
+        _, version = get_principal(7)
+        store_principal(7, version, FIELDS)
+
+        principal_cache.clear_principal_cache()  # another process: empty local tier
+        assert get_principal(7)[0] == FIELDS
+
+    def test_invalidation_reaches_other_processes(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(principal_cache, "_redis", lambda: fake)
+        _, version = get_principal(7)
+        store_principal(7, version, FIELDS)
+
+        # Another process commits a change: only the shared stamp moves.
+        fake.incr(principal_cache.REDIS_VERSION_PREFIX + "7")
+        assert get_principal(7) == (None, 1)
+
+    def test_stale_redis_entry_ignored(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(principal_cache, "_redis", lambda: fake)
+        fake.set(principal_cache.REDIS_VERSION_PREFIX + "7", "2")
+        fake.set(
+            principal_cache.REDIS_ENTRY_PREFIX + "7",
+            json.dumps({"version": 1, "cached_at": principal_cache.time.time(), "fields": FIELDS}),
+        )
+
+        assert get_principal(7) == (None, 2)
+
+    def test_invalidate_bumps_shared_stamp(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(principal_cache, "_redis", lambda: fake)
+        _, version = get_principal(7)
+        store_principal(7, version, FIELDS)
+
+        invalidate_principals([7])
+
+        assert fake.store[principal_cache.REDIS_VERSION_PREFIX + "7"] == "1"
+        assert fake.ttls[principal_cache.REDIS_VERSION_PREFIX + "7"] >= settings.PRINCIPAL_CACHE_TTL_S
+        assert principal_cache.REDIS_ENTRY_PREFIX + "7" not in fake.store
+
+    def test_redis_errors_fall_back_to_database(self, db, monkeypatch):
+        monkeypatch.setattr(principal_cache, "_redis", lambda: _BrokenRedis())
+        user = DatabaseHelper.create_user(db, email="broken@example.com")
+
+        response = client.get("/auth/me", headers={"Authorization": AuthHelper.create_user_token(str(user.id))})
+        assert response.status_code == 200
+        assert response.json()["email"] == "broken@example.com"
+
+
+class TestCurrentUser:
+    def test_users_select_runs_once(self, db):
+        user = DatabaseHelper.create_user(db, email="me@example.com")
+        headers = {"Authorization": AuthHelper.create_user_token(str(user.id))}
+
+        selects, stop = _user_selects()
+        try:
+            responses = [client.get("/auth/me", headers=headers) for _ in range(3)]
+        finally:
+            stop()
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert responses[-1].json() == {"id": user.id, "email": "me@example.com", "role": "user"}
+        assert len(selects) == 1
+
+    def test_async_dependency_uses_cache(self, db, agent_token):
+        from app.db.session import get_async_engine
+
+        selects, stop = _user_selects(get_async_engine().sync_engine)
+        try:
+            responses = [
+                client.post("/agent/tickets/99999/accept", headers={"Authorization": agent_token}) for _ in range(3)
+            ]
+        finally:
+            stop()
+
+        assert [r.status_code for r in responses] == [404, 404, 404]
+        assert len(selects) == 1
+
+    def test_async_dependency_returns_plain_principal(self):
+        import asyncio
+
+        from app.api.auth import get_current_user_async
+
+        _, version = get_principal(7)
+        store_principal(7, version, FIELDS)
+
+        # Cache hit: the session is never touched, and nothing is left to lazy-load.
+        principal = asyncio.run(get_current_user_async("token", {"sub": "7"}, None))
+
+        assert principal == principal_cache.Principal(**FIELDS)
+        with pytest.raises(AttributeError):
+            principal.full_name
+
+    def test_role_change_takes_effect_immediately(self, db, admin_user, admin_token):
+        headers = {"Authorization": admin_token}
+        assert client.get("/admin/agents", headers=headers).status_code == 200
+
+        with SessionLocal() as other:
+            other.get(User, admin_user.id).role = "agent"
+            other.commit()
+
+        assert client.get("/admin/agents", headers=headers).status_code == 403
+
+    def test_admin_password_reset_invalidates_target(self, db, admin_token):
+        target = DatabaseHelper.create_user(db, email="target@example.com")
+        client.get("/auth/me", headers={"Authorization": AuthHelper.create_user_token(str(target.id))})
+        assert get_principal(target.id)[0] is not None
+
+        response = client.post(
+            f"/admin/users/{target.id}/reset-password",
+            json={"new_password": "NewPassw0rd!"},
+            headers={"Authorization": admin_token},
+        )
+
+        assert response.status_code == 200
+        assert get_principal(target.id)[0] is None
@@ -0,0 +1,231 @@
+"""
+Tests for app/core/rate_limit_storage.py
+
+Covers:
+- Without Redis: moving-window limits are enforced in process
+- With Redis: one limit shared by several processes (storage instances),
+  one script call per hit, window slides with the Redis clock
+- Local leases: spent without Redis while clearly under the limit, never
+  for small limits or near the limit, expire after LEASE_TTL_S and are
+  dropped once spent or expired
+- Redis errors: per-process fallback, Redis retried after REDIS_RETRY_S
+- reset() clears the shared keys
+- The app limiter uses this storage (login limit counted in Redis)
+
+The fake Redis below implements the two Lua scripts in Python; it checks
+the storage's use of them, not the Lua itself.
+"""
+import pytest
+from limits import parse
+
+from app.core import rate_limit_storage
+from app.core.config import settings
+from app.core.limiter import limiter
+from app.core.rate_limit_storage import (
+    ACQUIRE_SCRIPT,
+    LEASE_TTL_S,
+    REDIS_KEY_PREFIX,
+    REDIS_RETRY_S,
+    WINDOW_SCRIPT,
+    RedisSlidingWindowStorage,
+)
+from tests.conftest import client
+
+
+class _FakeRedis:
+    """Sorted sets + counters, with the storage's scripts emulated in Python."""
+
+    def __init__(self):
+        self.now_ms = 1_000_000
+        self.zsets = {}
+        self.counters = {}
+        self.calls = 0
+
+    def register_script(self, source):
+        handler = {ACQUIRE_SCRIPT: self._acquire, WINDOW_SCRIPT: self._window}[source]
+
+        def call(keys, args):
+            self.calls += 1
+            return handler(keys, args)
+
+        return call
+
+    def _trim(self, key, window_ms):
+        entries = [e for e in self.zsets.get(key, []) if e > self.now_ms - window_ms]
+        self.zsets[key] = entries
+        return entries
+
+    def _acquire(self, keys, args):
+        limit, window, amount, extra, ceiling = (int(a) for a in args)
+        entries = self._trim(keys[0], window)
+        if len(entries) + amount > limit:
+            return [0, len(entries), min(entries, default=self.now_ms)]
+        if len(entries) + amount + extra > ceiling:
+            extra = 0
+        grant = amount + extra
+        self.counters[keys[1]] = self.counters.get(keys[1], 0) + grant
+        entries.extend([self.now_ms] * grant)
+        return [grant, len(entries), self.now_ms]
+
+    def _window(self, keys, args):
+        entries = self._trim(keys[0], int(args[0]))
+        return [len(entries), min(entries, default=self.now_ms)]
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [k for k in (*self.zsets, *self.counters) if k.startswith(prefix)]
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += (self.zsets.pop(key, None) is not None) + (self.counters.pop(key, None) is not None)
+        return removed
+
+    def ping(self):
+        return True
+
+
+class _BrokenRedis:
+    def register_script(self, source):
+        def call(keys, args):
+            raise ConnectionError("redis down")
+
+        return call
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(rate_limit_storage, "_redis", lambda: fake)
+    return fake
+
+
+def _hits(storage, limit, n, key="k"):
+    return [storage.acquire_entry(key, limit, 60) for _ in range(n)]
+
+
+def test_local_limits_without_redis():
+    storage = RedisSlidingWindowStorage()
+
+    assert _hits(storage, 3, 4) == [True, True, True, False]
+    assert storage.get_moving_window("k", 3, 60)[1] == 3
+
+
+class TestRedisWindow:
+    def test_limit_shared_between_processes(self, fake_redis):
+        a, b = RedisSlidingWindowStorage(), RedisSlidingWindowStorage()
+
+        results = [(a if i % 2 else b).acquire_entry("k", 10, 60) for i in range(11)]
+
+        assert results == [True] * 10 + [False]
+        assert b.get_moving_window("k", 10, 60)[1] == 10
+
+    def test_one_script_call_per_hit_for_small_limits(self, fake_redis):
+        storage = RedisSlidingWindowStorage()
+
+        _hits(storage, 10, 5)
+
+        assert fake_redis.calls == 5
+
+    def test_window_slides(self, fake_redis):
+        storage = RedisSlidingWindowStorage()
+        assert _hits(storage, 2, 3) == [True, True, False]
+
+        fake_redis.now_ms += 30_000
+        assert storage.acquire_entry("k", 2, 60) is False
+        fake_redis.now_ms += 30_001
+        assert storage.acquire_entry("k", 2, 60) is True
+
+
+class TestLocalLease:
+    def test_lease_spent_without_redis(self, fake_redis):
+        storage = RedisSlidingWindowStorage()  # limit 100 -> 5 extra per round trip
+
+        assert _hits(storage, 100, 12) == [True] * 12
+        assert fake_redis.calls == 2
+        # Leased entries are already counted in the shared window.
+        assert len(fake_redis.zsets[REDIS_KEY_PREFIX + "{k}"]) == 12
+
+    def test_no_lease_near_the_limit(self, fake_redis):
+        other, storage = RedisSlidingWindowStorage(), RedisSlidingWindowStorage()
+        _hits(other, 100, 50)  # another process filled half the window
+        fake_redis.calls = 0
+
+        assert _hits(storage, 100, 3) == [True] * 3
+        assert fake_redis.calls == 3
+
+    def test_lease_expires(self, fake_redis, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(rate_limit_storage.time, "monotonic", lambda: clock[0])
+        storage = RedisSlidingWindowStorage()
+        storage.acquire_entry("k", 100, 60)
+
+        clock[0] += LEASE_TTL_S + 0.1
+        storage.acquire_entry("k", 100, 60)
+
+        assert fake_redis.calls == 2
+
+    def test_spent_and_expired_leases_are_dropped(self, fake_redis, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(rate_limit_storage.time, "monotonic", lambda: clock[0])
+        storage = RedisSlidingWindowStorage()
+
+        _hits(storage, 100, 6, key="spent")  # 1 + the 5 leased entries
+        storage.acquire_entry("idle", 100, 60)
+        assert set(storage._leases) == {"idle"}
+
+        clock[0] += LEASE_TTL_S + 0.1
+        storage.acquire_entry("other", 100, 60)  # sweeps "idle", never seen again
+        assert set(storage._leases) == {"other"}
+
+    def test_limit_never_exceeded(self, fake_redis):
+        storages = [RedisSlidingWindowStorage() for _ in range(4)]
+
+        granted = sum(s.acquire_entry("k", 100, 60) for _ in range(60) for s in storages)
+
+        assert granted == 100
+
+
+class TestRedisFailure:
+    def test_falls_back_to_local_limits(self, monkeypatch):
+        monkeypatch.setattr(rate_limit_storage, "_redis", lambda: _BrokenRedis())
+        monkeypatch.setattr(rate_limit_storage, "_reset_redis", lambda: None)
+        storage = RedisSlidingWindowStorage()
+
+        assert _hits(storage, 2, 3) == [True, True, False]
+
+    def test_redis_retried_after_backoff(self, fake_redis, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(rate_limit_storage.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(rate_limit_storage, "_reset_redis", lambda: None)
+        storage = RedisSlidingWindowStorage()
+        storage._scripts = (fake_redis, {"acquire": _BrokenRedis().register_script(ACQUIRE_SCRIPT)})
+
+        assert storage.acquire_entry("k", 10, 60) is True  # counted locally
+        assert storage.acquire_entry("k", 10, 60) is True
+        assert fake_redis.calls == 0
+
+        clock[0] += REDIS_RETRY_S
+        assert storage.acquire_entry("k", 10, 60) is True
+        assert fake_redis.calls == 1
+
+
+def test_reset_clears_shared_keys(fake_redis):
+    storage = RedisSlidingWindowStorage()
+    _hits(storage, 10, 3)
+
+    storage.reset()
+
+    assert fake_redis.zsets == {} and fake_redis.counters == {}
+    assert _hits(storage, 10, 1) == [True]
+
+
+def test_login_limit_counted_in_redis(db, fake_redis):
+    limit = parse(settings.AUTH_RATE_LIMIT_LOGIN)
+    body = {"email": "nobody@example.com", "password": "Passw0rd!"}
+
+    statuses = [client.post("/auth/login", json=body).status_code for _ in range(limit.amount + 1)]
+
+    assert statuses == [401] * limit.amount + [429]
+    assert isinstance(limiter._storage, RedisSlidingWindowStorage)
+    assert fake_redis.calls == limit.amount + 1
@@ -17,8 +17,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.services.ai_service import SentimentAnalysisService, _call_openai_sentiment
+from tests.conftest import make_async_db_override
 
 
 # -----------------------------------------------------------------------
@@ -67,6 +68,7 @@ def client(integration_engine):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(integration_engine)
     try:
         yield TestClient(app)
     finally:
@@ -0,0 +1,311 @@
+"""
+Tests for app/services/ticket_cache.py and its use in GET /tickets/{id} and
+GET /tickets/.
+
+Covers:
+- get_cached / store_cached: hit within the TTL, miss after it, disabled
+  with a TTL of 0; a store racing an invalidation is discarded
+- Session events: automation, agent assign/accept/close, admin assign,
+  feedback, ORM and bulk updates invalidate the ticket and its owner's
+  lists on commit; new tickets invalidate the owner's lists; rolled-back
+  changes invalidate nothing
+- In-process stamps are pruned once they outnumber the entries, without
+  letting a racing store through
+- Redis tier: entries shared between processes, invalidation bumps the
+  shared stamps, which expire
+- GET /tickets/{id}: hits skip the tickets SELECT but still enforce
+  ownership and answer If-None-Match with 304
+- GET /tickets/: a user's first page is served from cache, identical to
+  the uncached page (default and FAST_JSON_RESPONSES paths); later pages
+  and agents' lists are not cached
+"""
+import pytest
+from sqlalchemy import event, update
+
+from app.core.config import settings
+from app.db.session import engine, get_async_engine
+from app.models.ticket import Ticket
+from app.services import ticket_cache
+from app.services.ticket_cache import (
+    get_cached,
+    invalidate,
+    store_cached,
+    ticket_key,
+    ticket_stamp,
+    user_list_key,
+    user_stamp,
+)
+from tests.conftest import AuthHelper, DatabaseHelper, client
+from tests.services.test_principal_cache import _FakeRedis
+
+VALUE = {"ticket": {"id": 7}, "updated_at": "2026-10-19T12:00:00"}
+
+
+def _ticket_selects(bind):
+    statements = []
+
+    def listener(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM TICKETS" in statement.upper():
+            statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(bind, "before_cursor_execute", listener)
+
+
+def _is_cached(ticket_id):
+    return get_cached(ticket_key(ticket_id), ticket_stamp(ticket_id))[0] is not None
+
+
+def _list_cached(user_id, limit=50):
+    return get_cached(user_list_key(user_id, None, limit, True), user_stamp(user_id))[0] is not None
+
+
+@pytest.fixture()
+def owner(db):
+    user = DatabaseHelper.create_user(db, email="owner@example.com")
+    return user, {"Authorization": AuthHelper.create_user_token(str(user.id))}
+
+
+@pytest.fixture()
+def cached_ticket(db, owner):
+    """An escalated ticket whose GET response and owner's first page are cached."""
+    user, headers = owner
+    ticket = DatabaseHelper.create_ticket(db, message="Cached ticket", user_id=user.id)
+    ticket.status = "escalated"
+    db.commit()
+    assert client.get(f"/tickets/{ticket.id}", headers=headers).status_code == 200
+    assert client.get("/tickets/", headers=headers).status_code == 200
+    assert _is_cached(ticket.id) and _list_cached(user.id)
+    return ticket
+
+
+class TestLookup:
+    def test_hit_within_ttl_and_miss_after(self, monkeypatch):
+        clock = [1_000.0]
+        monkeypatch.setattr(ticket_cache.time, "time", lambda: clock[0])
+
+        cached, version = get_cached(ticket_key(7), ticket_stamp(7))
+        assert cached is None
+        store_cached(ticket_key(7), ticket_stamp(7), version, VALUE)
+        assert get_cached(ticket_key(7), ticket_stamp(7))[0] == VALUE
+
+        clock[0] += settings.TICKET_CACHE_TTL_S + 1
+        assert get_cached(ticket_key(7), ticket_stamp(7))[0] is None
+
+    def test_disabled_with_zero_ttl(self, monkeypatch):
+        monkeypatch.setattr(settings, "TICKET_CACHE_TTL_S", 0)
+        _, version = get_cached(ticket_key(7), ticket_stamp(7))
+        store_cached(ticket_key(7), ticket_stamp(7), version, VALUE)
+        assert get_cached(ticket_key(7), ticket_stamp(7)) == (None, None)
+
+    def test_store_after_invalidation_is_discarded(self):
+        key, stamp = user_list_key(3, None, 50, True), user_stamp(3)
+        _, version = get_cached(key, stamp)
+        invalidate([stamp])  # committed write while the loader queried
+        store_cached(key, stamp, version, VALUE)
+
+        assert get_cached(key, stamp)[0] is None
+
+
+class TestLocalStamps:
+    def test_stamps_without_entries_are_pruned(self):
+        local = ticket_cache._LocalCache(max_entries=2)
+        local.put("kept", "kept", local.version("kept"), VALUE, 0.0, check_version=True)
+        local.invalidate([ticket_stamp(i) for i in range(10)])
+
+        assert len(local._versions) <= 2 * 2
+        assert local.get("kept", local.version("kept"), float("inf")) == VALUE
+
+    def test_store_racing_a_pruned_stamp_is_discarded(self):
+        local = ticket_cache._LocalCache(max_entries=2)
+        version = local.version(ticket_stamp(1))  # loader reads the stamp
+        local.invalidate([ticket_stamp(i) for i in range(10)])  # bump, then prune
+
+        local.put("k", ticket_stamp(1), version, VALUE, 0.0, check_version=True)
+        assert local.get("k", local.version(ticket_stamp(1)), float("inf")) is None
+
+
+class TestInvalidationEvents:
+    def test_orm_update_invalidates_on_commit(self, db, cached_ticket):
+        cached_ticket.response = "On it"
+        db.flush()
+        assert _is_cached(cached_ticket.id)  # not committed yet
+
+        db.commit()
+        assert not _is_cached(cached_ticket.id)
+        assert not _list_cached(cached_ticket.user_id)
+
+    def test_rollback_keeps_entries(self, db, cached_ticket):
+        cached_ticket.status = "closed"
+        db.flush()
+        db.rollback()
+
+        assert _is_cached(cached_ticket.id) and _list_cached(cached_ticket.user_id)
+
+    def test_bulk_update_invalidates(self, db, cached_ticket):
+        db.execute(update(Ticket).where(Ticket.message == "Cached ticket").values(status="closed"))
+        db.commit()
+
+        assert not _is_cached(cached_ticket.id)
+        assert not _list_cached(cached_ticket.user_id)
+
+    def test_new_ticket_invalidates_owners_lists_only(self, db, cached_ticket):
+        DatabaseHelper.create_ticket(db, message="Another one", user_id=cached_ticket.user_id)
+
+        assert not _list_cached(cached_ticket.user_id)
+        assert _is_cached(cached_ticket.id)
+
+    def test_other_users_ticket_leaves_entries(self, db, cached_ticket):
+        other = DatabaseHelper.create_user(db, email="other@example.com")
+        DatabaseHelper.create_ticket(db, message="Not yours", user_id=other.id)
+
+        assert _is_cached(cached_ticket.id) and _list_cached(cached_ticket.user_id)
+
+    def test_automation_invalidates(self, db, cached_ticket, monkeypatch):
+        from app.services import ticket_service
+
+        monkeypatch.setattr(ticket_service, "resolve_message", lambda *args, **kwargs: {
+            "intent": "refund", "sub_intent": None, "confidence": 0.9, "sentiment": "neutral",
+            "sentiment_confidence": 0.9, "decision": "AUTO_RESOLVE", "response": "Refunded",
+            "response_source": "ai",
+        })
+        ticket_service.run_ticket_automation(cached_ticket, db)
+
+        assert not _is_cached(cached_ticket.id)
+
+    def test_admin_assign_invalidates(self, db, cached_ticket, admin_token):
+        agent = DatabaseHelper.create_user(db, email="assignee@example.com", role="agent")
+
+        response = client.post(
+            f"/admin/tickets/{cached_ticket.id}/assign",
+            json={"agent_id": agent.id},
+            headers={"Authorization": admin_token},
+        )
+
+        assert response.status_code == 200
+        assert not _is_cached(cached_ticket.id)
+
+    def test_agent_assign_and_accept_invalidate(self, db, cached_ticket, owner, agent_user, agent_token):
+        _user, headers = owner
+        agent_headers = {"Authorization": agent_token}
+        assert client.post(f"/agent/tickets/{cached_ticket.id}/assign", headers=agent_headers).status_code == 200
+        assert client.get(f"/tickets/{cached_ticket.id}", headers=headers).json()["assigned_agent_id"] == agent_user.id
+
+        assert client.post(f"/agent/tickets/{cached_ticket.id}/accept", headers=agent_headers).status_code == 200
+        assert client.get(f"/tickets/{cached_ticket.id}", headers=headers).json()["status"] == "in_progress"
+
+    def test_agent_close_invalidates(self, db, cached_ticket, owner, agent_token):
+        _user, headers = owner
+        agent_headers = {"Authorization": agent_token}
+
+        assert client.post(f"/agent/tickets/{cached_ticket.id}/close", headers=agent_headers).status_code == 200
+        assert client.get(f"/tickets/{cached_ticket.id}", headers=headers).json()["status"] == "closed"
+        assert client.get("/tickets/", headers=headers).json()["tickets"][0]["status"] == "closed"
+
+    def test_feedback_invalidates(self, db, cached_ticket, owner):
+        _user, headers = owner
+        cached_ticket.status = "auto_resolved"
+        db.commit()
+        etag = client.get(f"/tickets/{cached_ticket.id}", headers=headers).headers["ETag"]
+        assert _is_cached(cached_ticket.id)
+
+        response = client.post(f"/tickets/{cached_ticket.id}/feedback", json={"rating": 5, "resolved": True})
+
+        assert response.status_code == 201
+        assert not _is_cached(cached_ticket.id)
+        # quality_score moved updated_at: the next poll gets a new ETag
+        assert client.get(f"/tickets/{cached_ticket.id}", headers=headers).headers["ETag"] != etag
+
+
+class TestRedisTier:
+    def test_entry_shared_between_processes(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(ticket_cache, "_redis", lambda: fake)
+        _, version = get_cached(ticket_key(7), ticket_stamp(7))
+        store_cached(ticket_key(7), ticket_stamp(7), version, VALUE)
+
+        ticket_cache.clear_ticket_cache()  # another process: empty local tier
+        assert get_cached(ticket_key(7), ticket_stamp(7))[0] == VALUE
+
+    def test_invalidation_reaches_other_processes(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(ticket_cache, "_redis", lambda: fake)
+        key, stamp = user_list_key(3, "open", 20, False), user_stamp(3)
+        _, version = get_cached(key, stamp)
+        store_cached(key, stamp, version, VALUE)
+
+        invalidate([stamp, ticket_stamp(7)])
+
+        assert fake.store[ticket_cache.REDIS_VERSION_PREFIX + stamp] == "1"
+        assert get_cached(key, stamp) == (None, 1)
+
+    def test_version_stamps_expire(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(ticket_cache, "_redis", lambda: fake)
+
+        invalidate([ticket_stamp(7)])
+
+        assert fake.ttls[ticket_cache.REDIS_VERSION_PREFIX + ticket_stamp(7)] >= settings.TICKET_CACHE_TTL_S
+
+
+class TestGetTicket:
+    def test_hits_skip_the_tickets_select(self, db, cached_ticket, owner):
+        _user, headers = owner
+        selects, stop = _ticket_selects(get_async_engine().sync_engine)
+        try:
+            responses = [client.get(f"/tickets/{cached_ticket.id}", headers=headers) for _ in range(3)]
+        finally:
+            stop()
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert responses[0].json()["message"] == "Cached ticket"
+        assert len(selects) == 0
+
+    def test_hit_still_enforces_ownership(self, db, cached_ticket):
+        stranger = DatabaseHelper.create_user(db, email="stranger@example.com")
+        headers = {"Authorization": AuthHelper.create_user_token(str(stranger.id)), "If-None-Match": "*"}
+
+        assert client.get(f"/tickets/{cached_ticket.id}", headers=headers).status_code == 404
+
+    def test_hit_and_miss_share_the_etag(self, db, cached_ticket, owner):
+        _user, headers = owner
+        hit = client.get(f"/tickets/{cached_ticket.id}", headers=headers)
+        ticket_cache.clear_ticket_cache()
+        miss = client.get(f"/tickets/{cached_ticket.id}", headers=headers)
+
+        assert hit.headers["ETag"] == miss.headers["ETag"]
+        assert hit.json() == miss.json()
+        revalidated = client.get(f"/tickets/{cached_ticket.id}", headers={**headers, "If-None-Match": hit.headers["ETag"]})
+        assert revalidated.status_code == 304
+
+
+class TestListTickets:
+    @pytest.mark.parametrize("fast_json", [False, True])
+    def test_first_page_served_from_cache(self, db, cached_ticket, owner, monkeypatch, fast_json):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast_json)
+        _user, headers = owner
+        ticket_cache.clear_ticket_cache()
+        miss = client.get("/tickets/", headers=headers)
+
+        selects, stop = _ticket_selects(engine)
+        try:
+            hit = client.get("/tickets/", headers=headers)
+        finally:
+            stop()
+
+        assert len(selects) == 0
+        assert hit.content == miss.content
+        assert hit.headers["ETag"] == miss.headers["ETag"]
+        assert client.get("/tickets/", headers={**headers, "If-None-Match": hit.headers["ETag"]}).status_code == 304
+
+    def test_later_pages_not_cached(self, db, cached_ticket, owner):
+        _user, headers = owner
+        client.get("/tickets/", params={"offset": 1}, headers=headers)
+
+        assert len(ticket_cache._local_cache._entries) == 2  # the fixture's entries only
+
+    def test_agents_lists_not_cached(self, db, cached_ticket, agent_token):
+        ticket_cache.clear_ticket_cache()
+        client.get("/tickets/", headers={"Authorization": agent_token})
+
+        assert len(ticket_cache._local_cache._entries) == 0
@@ -14,10 +14,11 @@ import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.db.session import get_db, Base
+from app.db.session import get_async_db, get_db, Base
 from app.main import app
 from app.models.ticket import Ticket
 from app.models.user import User
+from tests.conftest import make_async_db_override
 
 
 @pytest.fixture(scope="function")
@@ -48,6 +49,7 @@ def client_with_temp_db(temp_db):
     
     # Save the original override before setting our own
     original_override = app.dependency_overrides.get(get_db)
+    original_async_override = app.dependency_overrides.get(get_async_db)
     
     def override_get_db():
         # Create a new session per request
@@ -58,6 +60,7 @@ def client_with_temp_db(temp_db):
             request_db.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = make_async_db_override(engine)
     client = TestClient(app)
     try:
         yield client, db  # Yield both client and db session for test use
@@ -67,6 +70,10 @@ def client_with_temp_db(temp_db):
             app.dependency_overrides[get_db] = original_override
         else:
             app.dependency_overrides.pop(get_db, None)
+        if original_async_override is not None:
+            app.dependency_overrides[get_async_db] = original_async_override
+        else:
+            app.dependency_overrides.pop(get_async_db, None)
         db.close()
         # Dispose the engine to ensure SQLite connections are fully closed
         engine.dispose()
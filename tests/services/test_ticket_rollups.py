@@ -0,0 +1,227 @@
+"""
+Tests for app/db/rollups.py and the rollup-backed admin metrics.
+
+Covers:
+- ticket_rollups_hourly tracks ORM inserts, status/assignment updates,
+  feedback inserts, bulk session UPDATE/DELETE and ticket deletes
+- Rolled-back transactions leave the rollups untouched
+- reconcile_rollups repairs drift (dry_run only reports it)
+- compute_admin_metrics_from_rollups matches compute_admin_metrics
+- ticket_timeseries hourly and daily buckets
+- GET /admin/metrics/timeseries: 404 while METRICS_ROLLUPS_ENABLED is off
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.rollups import compute_rollups, reconcile_rollups
+from app.db.session import Base
+from app.models.feedback import Feedback
+from app.models.ticket import Ticket
+from app.models.ticket_rollup import COUNTER_COLUMNS, TicketRollupHourly
+from app.services.admin_metrics import (
+    compute_admin_metrics,
+    compute_admin_metrics_from_rollups,
+    ticket_timeseries,
+)
+from tests.conftest import client
+
+T0 = datetime(2026, 3, 1, 10, 15)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    from app.models import feedback, refresh_token, ticket, ticket_rollup, user  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _stored(db) -> dict:
+    """Non-empty rollup rows as {key: counters}."""
+    rows = db.execute(select(TicketRollupHourly)).scalars().all()
+    return {
+        (r.bucket_start, r.intent, r.status, r.response_source): [getattr(r, c) for c in COUNTER_COLUMNS]
+        for r in rows
+        if r.ticket_count
+    }
+
+
+def assert_in_sync(db):
+    expected = compute_rollups(db.connection())
+    stored = _stored(db)
+    assert stored.keys() == expected.keys()
+    for key, vector in expected.items():
+        assert stored[key] == pytest.approx(vector), key
+
+
+def _ticket(i, **kwargs):
+    kwargs.setdefault("status", "open")
+    kwargs.setdefault("created_at", T0 + timedelta(minutes=20 * i))
+    return Ticket(message=f"t{i}", **kwargs)
+
+
+@pytest.fixture()
+def seeded(session):
+    tickets = [
+        _ticket(0, status="auto_resolved", intent="login_issue", confidence=0.9, quality_score=0.8, response_source="rag"),
+        _ticket(1, status="auto_resolved", intent="login_issue", confidence=0.7, quality_score=0.3, response_source="rag"),
+        _ticket(2, status="escalated", intent="payment", confidence=0.2),
+        _ticket(3, status="escalated", intent=None, assigned_agent_id=7),
+        _ticket(4, status="open", intent="refund", confidence=0.5),
+        _ticket(5, status="closed", intent="", quality_score=0.1, created_at=T0 + timedelta(days=1)),
+    ]
+    session.add_all(tickets)
+    session.commit()
+    session.add_all([
+        Feedback(ticket_id=tickets[0].id, rating=5, resolved=True),
+        Feedback(ticket_id=tickets[1].id, rating=2, resolved=False),
+        Feedback(ticket_id=tickets[2].id, rating=4, resolved=True),
+    ])
+    session.commit()
+    return session
+
+
+class TestMaintenance:
+    def test_inserts(self, seeded):
+        assert_in_sync(seeded)
+        assert sum(v[0] for v in _stored(seeded).values()) == 6
+
+    def test_status_and_assignment_update(self, seeded):
+        ticket = seeded.query(Ticket).filter_by(intent="payment").one()
+        ticket.status = "in_progress"
+        ticket.assigned_agent_id = 3
+        seeded.commit()
+        assert_in_sync(seeded)
+
+    def test_feedback_insert_and_update(self, seeded):
+        ticket = seeded.query(Ticket).filter_by(intent="refund").one()
+        seeded.add(Feedback(ticket_id=ticket.id, rating=3, resolved=False))
+        seeded.commit()
+        assert_in_sync(seeded)
+
+        feedback = seeded.query(Feedback).filter_by(ticket_id=ticket.id).one()
+        feedback.resolved = True
+        seeded.commit()
+        assert_in_sync(seeded)
+
+    def test_bulk_update_and_delete(self, seeded):
+        seeded.execute(update(Ticket).where(Ticket.status == "escalated").values(status="closed"))
+        seeded.commit()
+        assert_in_sync(seeded)
+
+        seeded.execute(delete(Feedback).where(Feedback.rating < 3))
+        seeded.commit()
+        assert_in_sync(seeded)
+
+    def test_ticket_delete(self, seeded):
+        seeded.query(Feedback).delete()
+        seeded.delete(seeded.query(Ticket).filter_by(intent="refund").one())
+        seeded.commit()
+        assert_in_sync(seeded)
+
+    def test_rollback_leaves_rollups_unchanged(self, seeded):
+        before = _stored(seeded)
+        seeded.add(_ticket(9))
+        seeded.query(Ticket).filter_by(intent="payment").one().status = "closed"
+        seeded.flush()
+        seeded.rollback()
+
+        seeded.add(_ticket(10))
+        seeded.commit()
+        after = _stored(seeded)
+        assert sum(v[0] for v in after.values()) == sum(v[0] for v in before.values()) + 1
+        assert_in_sync(seeded)
+
+
+class TestReconcile:
+    def test_repairs_drift(self, seeded):
+        seeded.execute(update(TicketRollupHourly).values(ticket_count=TicketRollupHourly.ticket_count + 5))
+        seeded.execute(delete(TicketRollupHourly).where(TicketRollupHourly.status == "closed"))
+        seeded.commit()
+
+        report = reconcile_rollups(seeded, dry_run=True)
+        seeded.rollback()
+        assert report["inserted"] == 1
+        assert report["updated"] >= 1
+        assert _stored(seeded) != compute_rollups(seeded.connection())
+
+        stats = reconcile_rollups(seeded)
+        seeded.commit()
+        assert stats == report
+        assert_in_sync(seeded)
+        assert reconcile_rollups(seeded)["updated"] == 0
+
+    def test_backfills_rows_written_outside_the_session(self, session):
+        session.connection().execute(Ticket.__table__.insert(), [
+            {"message": "raw", "status": "open", "is_archived": False, "created_at": T0},
+        ])
+        session.commit()
+        assert _stored(session) == {}
+
+        stats = reconcile_rollups(session, since=T0 - timedelta(hours=1))
+        session.commit()
+        assert stats["inserted"] == 1
+        assert_in_sync(session)
+
+
+class TestRollupReads:
+    def test_metrics_match_base_tables(self, seeded):
+        assert compute_admin_metrics_from_rollups(seeded) == compute_admin_metrics(seeded)
+
+    def test_hourly_timeseries(self, seeded):
+        points = ticket_timeseries(seeded, since=T0)
+        assert [p["bucket_start"] for p in points] == [
+            "2026-03-01T10:00:00", "2026-03-01T11:00:00", "2026-03-02T10:00:00",
+        ]
+        first = points[0]
+        assert first["tickets"] == 3
+        assert first["by_status"] == {"auto_resolved": 2, "escalated": 1}
+        assert first["feedback"] == 3
+        assert first["resolved_feedback"] == 2
+        assert first["average_rating"] == pytest.approx(3.67)
+        assert first["average_confidence"] == pytest.approx(0.6)
+        assert points[2]["average_confidence"] is None
+
+    def test_daily_timeseries(self, seeded):
+        points = ticket_timeseries(seeded, since=T0, interval="day")
+        assert [(p["bucket_start"], p["tickets"]) for p in points] == [
+            ("2026-03-01T00:00:00", 5), ("2026-03-02T00:00:00", 1),
+        ]
+
+    def test_since_filters_buckets(self, seeded):
+        points = ticket_timeseries(seeded, since=T0 + timedelta(hours=2))
+        assert [p["tickets"] for p in points] == [1]
+
+
+class TestTimeseriesEndpoint:
+    def test_disabled_by_default(self, admin_token):
+        resp = client.get("/admin/metrics/timeseries", headers={"Authorization": admin_token})
+        assert resp.status_code == 404
+
+    def test_returns_points_when_enabled(self, admin_token, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ROLLUPS_ENABLED", True)
+        headers = {"Authorization": admin_token}
+        client.post("/tickets/", json={"message": "My password reset link is broken"}, headers=headers)
+
+        resp = client.get("/admin/metrics/timeseries?hours=24&interval=day", headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["interval"] == "day"
+        assert sum(p["tickets"] for p in body["points"]) >= 1
+
+    def test_rejects_unknown_interval(self, admin_token, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ROLLUPS_ENABLED", True)
+        resp = client.get(
+            "/admin/metrics/timeseries?interval=week",
+            headers={"Authorization": admin_token},
+        )
+        assert resp.status_code == 400
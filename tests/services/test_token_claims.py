@@ -0,0 +1,133 @@
+"""
+Tests for app/core/token_claims.py
+
+Covers:
+- verified_claims: verified once per token, served from cache until
+  ``exp``, failures not cached, callers get their own copy, SECRET_KEY
+  rotation invalidates entries, LRU bound
+- get_token_claims: one decode per request across dependencies, claims on
+  request.state, None for missing or invalid tokens
+- API: repeated requests with the same token skip re-verification
+"""
+from datetime import timedelta
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from jose import JWTError
+
+from app.core import token_claims
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.token_claims import _ClaimsCache, get_token_claims, verified_claims
+from tests.conftest import client
+
+
+@pytest.fixture()
+def decodes(monkeypatch):
+    """Count calls to the real decode_token."""
+    calls = []
+    real = token_claims.decode_token
+
+    def counting(token):
+        calls.append(token)
+        return real(token)
+
+    monkeypatch.setattr(token_claims, "decode_token", counting)
+    return calls
+
+
+class TestVerifiedClaims:
+    def test_decoded_once(self, decodes):
+        token = create_access_token({"sub": "5", "role": "agent"})
+
+        first = verified_claims(token)
+        second = verified_claims(token)
+
+        assert first == second
+        assert (first["sub"], first["role"]) == ("5", "agent")
+        assert len(decodes) == 1
+
+    def test_not_served_after_exp(self, decodes, monkeypatch):
+        token = create_access_token({"sub": "5"}, expires_delta=timedelta(minutes=1))
+        exp = verified_claims(token)["exp"]
+
+        def expired(_token):
+            # What jose would say once the wall clock has passed exp.
+            raise JWTError("Signature has expired")
+
+        monkeypatch.setattr(token_claims.time, "time", lambda: exp + 1)
+        monkeypatch.setattr(token_claims, "decode_token", expired)
+        with pytest.raises(JWTError):
+            verified_claims(token)
+        assert len(token_claims._cache) == 0
+
+    def test_invalid_token_not_cached(self, decodes):
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                verified_claims("not.a.jwt")
+        assert len(decodes) == 2
+
+    def test_returns_a_copy(self):
+        token = create_access_token({"sub": "5"})
+        verified_claims(token)["sub"] = "999"
+
+        assert verified_claims(token)["sub"] == "5"
+
+    def test_secret_rotation_invalidates(self, monkeypatch):
+        token = create_access_token({"sub": "5"})
+        verified_claims(token)
+
+        monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret")
+        with pytest.raises(JWTError):
+            verified_claims(token)
+
+    def test_lru_bound(self):
+        cache = _ClaimsCache(max_entries=2)
+        for key in (b"a", b"b", b"c"):
+            cache.put(key, float("inf"), {"k": key})
+
+        assert len(cache) == 2
+        assert cache.get(b"a") is None
+        assert cache.get(b"c") == {"k": b"c"}
+
+
+class TestGetTokenClaims:
+    @pytest.fixture()
+    def app_client(self):
+        app = FastAPI()
+
+        def first(claims=Depends(get_token_claims)):
+            return claims
+
+        def second(request: Request, claims=Depends(get_token_claims)):
+            return claims, request.state.token_claims
+
+        @app.get("/probe")
+        def probe(a=Depends(first), b=Depends(second)):
+            claims, on_state = b
+            return {"same": a == claims == on_state, "sub": claims["sub"] if claims else None}
+
+        return TestClient(app)
+
+    def test_decoded_once_per_request(self, app_client, decodes):
+        token = create_access_token({"sub": "9"})
+
+        response = app_client.get("/probe", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.json() == {"same": True, "sub": "9"}
+        assert len(decodes) == 1
+
+    def test_missing_or_invalid_token(self, app_client):
+        assert app_client.get("/probe").json() == {"same": True, "sub": None}
+        bad = app_client.get("/probe", headers={"Authorization": "Bearer garbage"})
+        assert bad.json() == {"same": True, "sub": None}
+
+
+def test_repeated_requests_skip_verification(db, agent_token, decodes):
+    headers = {"Authorization": agent_token}
+    for _ in range(3):
+        assert client.get("/tickets/99999", headers=headers).status_code == 404
+    assert client.get("/agent/my-assignments", headers=headers).status_code == 200
+
+    assert len(decodes) == 1
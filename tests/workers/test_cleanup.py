@@ -6,24 +6,47 @@ Covers:
   dry-run mode, cutoff date boundary
 - remove_orphaned_feedback: detecting and removing orphaned feedback records,
   dry-run mode, no-op when no orphans exist
+- Batching: one UPDATE/DELETE + commit per batch, sleep between batches,
+  checkpoint cleared on completion, resume after an interrupted run,
+  restart ignoring the checkpoint
+- purge_refresh_tokens: revoked and expired tokens deleted in batches,
+  live tokens kept, dry-run mode
+- clear_expired_reset_otps: expired OTP state cleared, pending OTPs and
+  updated_at untouched
+- offload_archived_tickets: archived old tickets and their feedback written
+  to cold storage and deleted in batches, recent/unarchived tickets kept,
+  dry-run mode
 - run_cleanup: integration through the full cleanup pipeline
 - _parse_args: CLI argument defaults and overrides
 """
+import json
 import os
 import tempfile
 from datetime import datetime, timedelta, timezone
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 from app.db.session import Base
 from app.models.feedback import Feedback
+from app.models.refresh_token import RefreshToken
 from app.models.ticket import Ticket
+from app.models.user import User
+from app.models.worker_checkpoint import WorkerCheckpoint
+from app.services.cold_storage import clear_cold_storage_cache, find_offloaded_ticket, read_manifest
 from workers.cleanup import (
+    ARCHIVE_CHECKPOINT,
     ARCHIVABLE_STATUSES,
+    OFFLOAD_CHECKPOINT,
+    ORPHAN_CHECKPOINT,
+    REVOKED_TOKEN_CHECKPOINT,
     _parse_args,
     archive_old_tickets,
+    clear_expired_reset_otps,
+    offload_archived_tickets,
+    purge_refresh_tokens,
     remove_orphaned_feedback,
     run_cleanup,
 )
@@ -54,7 +77,7 @@ def db_session(temp_db_path):
     Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     # Import models so they register with Base
-    from app.models import feedback, ticket, user  # noqa: F401
+    from app.models import feedback, refresh_token, ticket, user  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
     db = Session()
@@ -242,6 +265,279 @@ class TestRemoveOrphanedFeedback:
         assert count == 0
 
 
+# ---------------------------------------------------------------------------
+# Batching, checkpoints and resume
+# ---------------------------------------------------------------------------
+
+def _count_statements(db, prefix):
+    statements = []
+    listener = lambda *args: statements.append(args[2]) if args[2].lstrip().upper().startswith(prefix) else None  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    return statements, lambda: event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class TestBatching:
+
+    @pytest.fixture()
+    def cutoff(self):
+        return datetime.now(timezone.utc) - timedelta(days=90)
+
+    def test_archives_in_batches(self, db_session, cutoff):
+        for _ in range(5):
+            _make_ticket(db_session, status="closed", age_days=100)
+        _make_ticket(db_session, status="open", age_days=100)
+
+        updates, stop = _count_statements(db_session, "UPDATE TICKETS")
+        try:
+            count = archive_old_tickets(db_session, cutoff, batch_size=2)
+        finally:
+            stop()
+
+        assert count == 5
+        assert len(updates) == 3
+        assert db_session.query(Ticket).filter_by(is_archived=True).count() == 5
+        assert db_session.get(WorkerCheckpoint, ARCHIVE_CHECKPOINT) is None
+
+    def test_sleeps_between_batches_only(self, db_session, cutoff, monkeypatch):
+        import workers.cleanup as wc
+        sleeps = []
+        monkeypatch.setattr(wc.time, "sleep", sleeps.append)
+        for _ in range(4):
+            _make_ticket(db_session, status="closed", age_days=100)
+
+        archive_old_tickets(db_session, cutoff, batch_size=2, sleep_s=0.25)
+
+        # Two full batches, then an empty probe: no sleep after the last write.
+        assert sleeps == [0.25, 0.25]
+
+    def test_resumes_after_interruption(self, db_session, cutoff, monkeypatch):
+        import workers.cleanup as wc
+        tickets = [_make_ticket(db_session, status="auto_resolved", age_days=100) for _ in range(5)]
+
+        def interrupt(_seconds):
+            raise _Interrupted()
+
+        monkeypatch.setattr(wc.time, "sleep", interrupt)
+        with pytest.raises(_Interrupted):
+            archive_old_tickets(db_session, cutoff, batch_size=2, sleep_s=1)
+        db_session.rollback()
+
+        checkpoint = db_session.get(WorkerCheckpoint, ARCHIVE_CHECKPOINT)
+        assert checkpoint is not None
+        assert json.loads(checkpoint.state)["last_id"] == tickets[1].id
+        assert db_session.query(Ticket).filter_by(is_archived=True).count() == 2
+
+        monkeypatch.setattr(wc.time, "sleep", lambda _s: None)
+        count = archive_old_tickets(db_session, cutoff, batch_size=2, sleep_s=1)
+
+        assert count == 3
+        assert db_session.query(Ticket).filter_by(is_archived=True).count() == 5
+        assert db_session.get(WorkerCheckpoint, ARCHIVE_CHECKPOINT) is None
+
+    def test_resume_skips_checkpointed_ids(self, db_session, cutoff):
+        first = _make_ticket(db_session, status="closed", age_days=100)
+        second = _make_ticket(db_session, status="closed", age_days=100)
+        db_session.add(WorkerCheckpoint(name=ARCHIVE_CHECKPOINT, state=json.dumps({"last_id": first.id})))
+        db_session.commit()
+
+        assert archive_old_tickets(db_session, cutoff) == 1
+        db_session.refresh(first)
+        db_session.refresh(second)
+        assert (first.is_archived, second.is_archived) == (False, True)
+
+    def test_restart_ignores_checkpoint(self, db_session, cutoff):
+        first = _make_ticket(db_session, status="closed", age_days=100)
+        _make_ticket(db_session, status="closed", age_days=100)
+        db_session.add(WorkerCheckpoint(name=ARCHIVE_CHECKPOINT, state=json.dumps({"last_id": first.id})))
+        db_session.commit()
+
+        assert archive_old_tickets(db_session, cutoff, resume=False) == 2
+
+    def test_dry_run_leaves_checkpoint_alone(self, db_session, cutoff):
+        _make_ticket(db_session, status="closed", age_days=100)
+        db_session.add(WorkerCheckpoint(name=ARCHIVE_CHECKPOINT, state=json.dumps({"last_id": 0})))
+        db_session.commit()
+
+        assert archive_old_tickets(db_session, cutoff, dry_run=True) == 1
+        assert db_session.get(WorkerCheckpoint, ARCHIVE_CHECKPOINT) is not None
+
+    def test_removes_orphans_in_batches(self, db_session):
+        ticket = _make_ticket(db_session, status="auto_resolved")
+        _make_feedback(db_session, ticket_id=ticket.id)
+        for ticket_id in range(9000, 9005):
+            db_session.execute(text(
+                "INSERT INTO feedback (ticket_id, rating, resolved, created_at) "
+                f"VALUES ({ticket_id}, 3, 0, CURRENT_TIMESTAMP)"
+            ))
+        db_session.commit()
+
+        deletes, stop = _count_statements(db_session, "DELETE FROM FEEDBACK")
+        try:
+            count = remove_orphaned_feedback(db_session, batch_size=2)
+        finally:
+            stop()
+
+        assert count == 5
+        assert len(deletes) == 3
+        assert db_session.query(Feedback).count() == 1
+        assert db_session.get(WorkerCheckpoint, ORPHAN_CHECKPOINT) is None
+
+
+# ---------------------------------------------------------------------------
+# purge_refresh_tokens / clear_expired_reset_otps
+# ---------------------------------------------------------------------------
+
+class TestAuthStatePurge:
+
+    @pytest.fixture()
+    def now(self):
+        return datetime.now(timezone.utc)
+
+    @pytest.fixture()
+    def user(self, db_session):
+        user = User(email="purge@example.com", hashed_password="x")
+        db_session.add(user)
+        db_session.commit()
+        return user
+
+    def _token(self, db, user, revoked=False, expires_in_days=30):
+        token = RefreshToken(
+            user_id=user.id,
+            token_hash=os.urandom(32).hex(),
+            revoked=revoked,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=expires_in_days),
+        )
+        db.add(token)
+        db.commit()
+        return token.id
+
+    def test_purges_revoked_and_expired_tokens(self, db_session, user, now):
+        live = self._token(db_session, user)
+        self._token(db_session, user, revoked=True)
+        self._token(db_session, user, revoked=True, expires_in_days=-5)
+        self._token(db_session, user, expires_in_days=-1)
+
+        assert purge_refresh_tokens(db_session, now) == 3
+        assert [t.id for t in db_session.query(RefreshToken)] == [live]
+        assert db_session.get(WorkerCheckpoint, REVOKED_TOKEN_CHECKPOINT) is None
+
+    def test_purges_in_batches(self, db_session, user, now):
+        for _ in range(3):
+            self._token(db_session, user, revoked=True)
+        for _ in range(3):
+            self._token(db_session, user, expires_in_days=-1)
+
+        deletes, stop = _count_statements(db_session, "DELETE FROM REFRESH_TOKENS")
+        try:
+            count = purge_refresh_tokens(db_session, now, batch_size=2)
+        finally:
+            stop()
+
+        assert count == 6
+        assert len(deletes) == 4
+        assert db_session.query(RefreshToken).count() == 0
+
+    def test_token_dry_run_does_not_delete(self, db_session, user, now):
+        self._token(db_session, user, revoked=True)
+        self._token(db_session, user, expires_in_days=-1)
+        self._token(db_session, user)
+
+        assert purge_refresh_tokens(db_session, now, dry_run=True) == 2
+        assert db_session.query(RefreshToken).count() == 3
+
+    def test_clears_expired_otps_only(self, db_session, now):
+        stamp = datetime(2026, 1, 1)
+        expired = User(email="expired@example.com", hashed_password="x", reset_otp="a" * 64,
+                       reset_otp_expires_at=now - timedelta(minutes=1), reset_otp_attempts=2, updated_at=stamp)
+        pending = User(email="pending@example.com", hashed_password="x", reset_otp="b" * 64,
+                       reset_otp_expires_at=now + timedelta(minutes=10), reset_otp_attempts=1)
+        idle = User(email="idle@example.com", hashed_password="x")
+        db_session.add_all([expired, pending, idle])
+        db_session.commit()
+
+        assert clear_expired_reset_otps(db_session, now, dry_run=True) == 1
+        assert clear_expired_reset_otps(db_session, now) == 1
+
+        db_session.expire_all()
+        assert (expired.reset_otp, expired.reset_otp_expires_at, expired.reset_otp_attempts) == (None, None, 0)
+        assert expired.updated_at.replace(tzinfo=None) == stamp
+        assert pending.reset_otp == "b" * 64
+        assert pending.reset_otp_attempts == 1
+
+
+# ---------------------------------------------------------------------------
+# offload_archived_tickets
+# ---------------------------------------------------------------------------
+
+class TestOffloadArchivedTickets:
+
+    @pytest.fixture()
+    def cutoff(self):
+        return datetime.now(timezone.utc) - timedelta(days=365)
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_cold_storage_cache()
+        yield
+        clear_cold_storage_cache()
+
+    def _archived(self, db, age_days=400):
+        ticket = _make_ticket(db, status="closed", age_days=age_days)
+        ticket.is_archived = True
+        db.commit()
+        return ticket
+
+    def test_moves_tickets_and_feedback(self, db_session, cutoff, tmp_path):
+        old = self._archived(db_session)
+        _make_feedback(db_session, ticket_id=old.id, rating=2, resolved=False)
+        bare = self._archived(db_session)
+        old_id, bare_id = old.id, bare.id
+
+        count = offload_archived_tickets(db_session, tmp_path, cutoff)
+
+        assert count == 2
+        assert db_session.query(Ticket).count() == 0
+        assert db_session.query(Feedback).count() == 0
+        record = find_offloaded_ticket(old_id, tmp_path)
+        assert record["message"] == "Test ticket"
+        assert (record["feedback"]["rating"], record["feedback"]["resolved"]) == (2, False)
+        assert find_offloaded_ticket(bare_id, tmp_path)["feedback"] is None
+        assert db_session.get(WorkerCheckpoint, OFFLOAD_CHECKPOINT) is None
+
+    def test_keeps_recent_and_unarchived_tickets(self, db_session, cutoff, tmp_path):
+        recent = self._archived(db_session, age_days=100)
+        live = _make_ticket(db_session, status="closed", age_days=400)
+
+        assert offload_archived_tickets(db_session, tmp_path, cutoff) == 0
+        assert {t.id for t in db_session.query(Ticket)} == {recent.id, live.id}
+        assert read_manifest(tmp_path) == []
+
+    def test_one_segment_per_batch(self, db_session, cutoff, tmp_path):
+        for _ in range(5):
+            self._archived(db_session)
+
+        deletes, stop = _count_statements(db_session, "DELETE FROM TICKETS")
+        try:
+            count = offload_archived_tickets(db_session, tmp_path, cutoff, batch_size=2)
+        finally:
+            stop()
+
+        assert count == 5
+        assert len(deletes) == 3
+        assert [entry["tickets"] for entry in read_manifest(tmp_path)] == [2, 2, 1]
+
+    def test_dry_run_writes_nothing(self, db_session, cutoff, tmp_path):
+        self._archived(db_session)
+
+        assert offload_archived_tickets(db_session, tmp_path, cutoff, dry_run=True) == 1
+        assert db_session.query(Ticket).count() == 1
+        assert list(tmp_path.iterdir()) == []
+
+
 # ---------------------------------------------------------------------------
 # run_cleanup integration
 # ---------------------------------------------------------------------------
@@ -254,7 +550,7 @@ class TestRunCleanup:
         url = f"sqlite:///{temp_db_path}"
         engine = create_engine(url, connect_args={"check_same_thread": False})
         Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        from app.models import feedback, ticket, user  # noqa: F401
+        from app.models import feedback, refresh_token, ticket, user  # noqa: F401
         Base.metadata.create_all(bind=engine)
         yield engine, Session
         Base.metadata.drop_all(bind=engine)
@@ -272,6 +568,8 @@ class TestRunCleanup:
         assert isinstance(result, dict)
         assert "archived_tickets" in result
         assert "removed_feedback" in result
+        assert "purged_refresh_tokens" in result
+        assert "cleared_reset_otps" in result
 
     def test_empty_db_returns_zeros(self, monkeypatch, isolated_session_factory):
         """On an empty database both counters should be zero."""
@@ -284,6 +582,32 @@ class TestRunCleanup:
 
         assert result["archived_tickets"] == 0
         assert result["removed_feedback"] == 0
+        assert result["purged_refresh_tokens"] == 0
+        assert result["cleared_reset_otps"] == 0
+        assert "offloaded_tickets" not in result
+
+    def test_offload_requires_cold_storage_dir(self, monkeypatch):
+        monkeypatch.setattr(settings, "COLD_STORAGE_DIR", None)
+
+        with pytest.raises(ValueError):
+            run_cleanup(offload=True)
+
+    def test_offload_reports_count(self, monkeypatch, isolated_session_factory, tmp_path):
+        _engine, TestSession = isolated_session_factory
+        import workers.cleanup as wc
+        monkeypatch.setattr(wc, "SessionLocal", TestSession)
+        monkeypatch.setattr(wc, "init_db", lambda: None)
+        monkeypatch.setattr(settings, "COLD_STORAGE_DIR", str(tmp_path))
+        db = TestSession()
+        db.add(Ticket(message="old", status="closed", is_archived=True,
+                      created_at=datetime.now(timezone.utc) - timedelta(days=400)))
+        db.commit()
+        db.close()
+
+        result = run_cleanup(days=90, offload=True)
+
+        assert result["offloaded_tickets"] == 1
+        assert len(read_manifest(tmp_path)) == 1
 
 
 # ---------------------------------------------------------------------------
@@ -308,6 +632,25 @@ class TestParseArgs:
         args = _parse_args(["--dry-run"])
         assert args.dry_run is True
 
+    def test_batch_defaults(self):
+        args = _parse_args([])
+        assert args.batch_size == 1000
+        assert args.sleep == 0.0
+        assert args.restart is False
+
+    def test_batch_flags(self):
+        args = _parse_args(["--batch-size", "250", "--sleep", "0.5", "--restart"])
+        assert (args.batch_size, args.sleep, args.restart) == (250, 0.5, True)
+
+    def test_offload_flags(self):
+        assert (_parse_args([]).offload, _parse_args([]).offload_days) == (False, 365)
+        args = _parse_args(["--offload", "--offload-days", "730"])
+        assert (args.offload, args.offload_days) == (True, 730)
+
+    def test_batch_size_must_be_positive(self):
+        with pytest.raises(SystemExit):
+            _parse_args(["--batch-size", "0"])
+
     def test_combined_flags(self):
         """Both flags can be combined."""
         args = _parse_args(["--days", "7", "--dry-run"])
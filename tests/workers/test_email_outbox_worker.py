@@ -0,0 +1,85 @@
+"""
+Tests for workers/email_outbox.py
+
+Covers:
+- run_email_outbox --once: drains every due email batch by batch, leaves
+  failed sends queued for their retry and returns
+- _parse_args: CLI argument defaults and overrides
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import workers.email_outbox as wo
+from app.db.session import Base
+from app.models.email_outbox import PENDING, SENT, EmailOutbox
+from app.services.email_outbox import enqueue_otp_email
+from workers.email_outbox import _parse_args, run_email_outbox
+
+
+class _MemorySink:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def send(self, messages):
+        if self.fail:
+            raise ConnectionError("provider down")
+        self.batches.append([m.to for m in messages])
+
+
+@pytest.fixture()
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    from app.models import email_outbox  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(wo, "SessionLocal", Session)
+    monkeypatch.setattr(wo, "init_db", lambda: None)
+    yield Session
+    engine.dispose()
+
+
+def _queue(Session, n):
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+    with Session() as db:
+        for i in range(n):
+            enqueue_otp_email(db, f"user{i}@example.com", "123456", expires_at)
+        db.commit()
+
+
+def _statuses(Session):
+    with Session() as db:
+        return db.execute(select(EmailOutbox.status)).scalars().all()
+
+
+def test_once_drains_all_due_batches(session_factory):
+    _queue(session_factory, 5)
+    sink = _MemorySink()
+
+    totals = run_email_outbox(once=True, batch_size=2, sender=sink)
+
+    assert [len(b) for b in sink.batches] == [2, 2, 1]
+    assert totals["sent"] == 5
+    assert _statuses(session_factory) == [SENT] * 5
+
+
+def test_once_returns_with_failures_queued_for_retry(session_factory):
+    _queue(session_factory, 3)
+
+    totals = run_email_outbox(once=True, sender=_MemorySink(fail=True))
+
+    assert (totals["claimed"], totals["retried"]) == (3, 3)
+    assert _statuses(session_factory) == [PENDING] * 3
+
+
+def test_parse_args():
+    assert _parse_args([]).once is False
+    assert _parse_args([]).batch_size is None
+
+    args = _parse_args(["--once", "--batch-size", "100", "--poll-interval", "0.5"])
+
+    assert (args.once, args.batch_size, args.poll_interval) == (True, 100, 0.5)
@@ -327,7 +327,7 @@ class TestRunEmbeddingBuilder:
     def test_returns_dict(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.embedding_builder as wb
-        monkeypatch.setattr(wb, "SessionLocal", TestSession)
+        monkeypatch.setattr(wb, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wb, "init_db", lambda: None)
 
         out = tmp_path / "emb.json"
@@ -340,7 +340,7 @@ class TestRunEmbeddingBuilder:
     def test_empty_db_produces_empty_cache(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.embedding_builder as wb
-        monkeypatch.setattr(wb, "SessionLocal", TestSession)
+        monkeypatch.setattr(wb, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wb, "init_db", lambda: None)
 
         out = tmp_path / "emb.json"
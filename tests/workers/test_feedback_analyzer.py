@@ -6,16 +6,21 @@ Covers:
 - analyze_feedback: empty records, aggregation correctness, per-intent/status
   breakdowns, rating distribution, null handling
 - fetch_feedback_with_tickets: joins feedback with ticket data from DB
-- run_feedback_analyzer: end-to-end integration, JSON output
-- _parse_args: CLI defaults and --output override
+- analyze_feedback_sql: parity with analyze_feedback (full table, time
+  window, empty DB), per-response_source breakdown, two SQL statements
+- run_feedback_analyzer: end-to-end integration, JSON output, SQL and
+  reference paths agree
+- _parse_args: CLI defaults, --output override, --days / --by-response-source / --reference
 """
 import json
 import os
+import random
 import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import Base
@@ -25,8 +30,10 @@ from workers.feedback_analyzer import (
     _parse_args,
     _safe_avg,
     analyze_feedback,
+    analyze_feedback_sql,
     fetch_feedback_with_tickets,
     run_feedback_analyzer,
+    summarize_by,
 )
 
 
@@ -289,6 +296,85 @@ class TestFetchFeedbackWithTickets:
         assert results[0]["resolved"] is False
 
 
+# ---------------------------------------------------------------------------
+# analyze_feedback_sql
+# ---------------------------------------------------------------------------
+
+T0 = datetime(2026, 5, 1, 12, 0)
+
+
+@pytest.fixture()
+def varied_feedback(db_session):
+    """Feedback spread over intents (incl. None / ""), statuses, sources and 10 days."""
+    rng = random.Random(7)
+    intents = ["login_issue", "payment", "refund", None, ""]
+    statuses = ["auto_resolved", "closed", "escalated", "in_progress"]
+    sources = ["similarity", "openai", "template", "agent", None]
+    tickets = [
+        Ticket(
+            message=f"m{i}",
+            intent=rng.choice(intents),
+            status=rng.choice(statuses),
+            response_source=rng.choice(sources),
+            quality_score=round(rng.random(), 3) if rng.random() < 0.7 else None,
+        )
+        for i in range(120)
+    ]
+    db_session.add_all(tickets)
+    db_session.commit()
+    db_session.add_all([
+        Feedback(
+            ticket_id=t.id,
+            rating=rng.randint(1, 5),
+            resolved=rng.random() < 0.6,
+            created_at=T0 - timedelta(hours=2 * i),
+        )
+        for i, t in enumerate(tickets)
+        if i % 5
+    ])
+    db_session.commit()
+    return db_session
+
+
+class TestAnalyzeFeedbackSql:
+
+    def test_matches_reference(self, varied_feedback):
+        expected = analyze_feedback(fetch_feedback_with_tickets(varied_feedback))
+        assert analyze_feedback_sql(varied_feedback) == expected
+        assert "unknown" in expected["by_intent"]
+
+    def test_matches_reference_in_window(self, varied_feedback):
+        since, until = T0 - timedelta(days=3), T0 - timedelta(days=1)
+        expected = analyze_feedback(fetch_feedback_with_tickets(varied_feedback, since=since, until=until))
+        result = analyze_feedback_sql(varied_feedback, since=since, until=until)
+        assert result == expected
+        assert 0 < result["total_feedback"] < 96
+
+    def test_empty_matches_reference(self, db_session):
+        assert analyze_feedback_sql(db_session) == analyze_feedback([])
+
+    def test_by_response_source(self, varied_feedback):
+        records = fetch_feedback_with_tickets(varied_feedback)
+        by_source = analyze_feedback_sql(varied_feedback, by_response_source=True)["by_response_source"]
+
+        assert sum(v["count"] for v in by_source.values()) == len(records)
+        template = [r for r in records if r["response_source"] == "template"]
+        assert by_source["template"]["count"] == len(template)
+        assert by_source["template"]["average_rating"] == _safe_avg([r["rating"] for r in template])
+        assert by_source == summarize_by(records, "response_source")
+
+    def test_two_statements(self, varied_feedback):
+        statements = []
+        engine = varied_feedback.get_bind()
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            analyze_feedback_sql(varied_feedback, by_response_source=True)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 2
+
+
 # ---------------------------------------------------------------------------
 # run_feedback_analyzer integration
 # ---------------------------------------------------------------------------
@@ -310,7 +396,7 @@ class TestRunFeedbackAnalyzer:
     def test_returns_dict(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.feedback_analyzer as wfa
-        monkeypatch.setattr(wfa, "SessionLocal", TestSession)
+        monkeypatch.setattr(wfa, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wfa, "init_db", lambda: None)
 
         out = tmp_path / "fa.json"
@@ -323,7 +409,7 @@ class TestRunFeedbackAnalyzer:
     def test_output_file_is_valid_json(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.feedback_analyzer as wfa
-        monkeypatch.setattr(wfa, "SessionLocal", TestSession)
+        monkeypatch.setattr(wfa, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wfa, "init_db", lambda: None)
 
         out = tmp_path / "fa.json"
@@ -335,7 +421,7 @@ class TestRunFeedbackAnalyzer:
     def test_empty_db_returns_zeros(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.feedback_analyzer as wfa
-        monkeypatch.setattr(wfa, "SessionLocal", TestSession)
+        monkeypatch.setattr(wfa, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wfa, "init_db", lambda: None)
 
         result = run_feedback_analyzer(output_path=tmp_path / "fa.json")
@@ -343,6 +429,27 @@ class TestRunFeedbackAnalyzer:
         assert result["total_feedback"] == 0
         assert result["average_rating"] == 0.0
 
+    def test_sql_and_reference_paths_agree(self, monkeypatch, tmp_path, isolated_session_factory):
+        _engine, TestSession = isolated_session_factory
+        import workers.feedback_analyzer as wfa
+        monkeypatch.setattr(wfa, "ReadSessionLocal", TestSession)
+        monkeypatch.setattr(wfa, "init_db", lambda: None)
+        seed = TestSession()
+        for intent, source, rating in (("payment", "openai", 5), ("payment", "template", 2), (None, None, 3)):
+            ticket = Ticket(message="m", intent=intent, status="auto_resolved", response_source=source)
+            seed.add(ticket)
+            seed.commit()
+            _make_feedback(seed, ticket.id, rating=rating)
+        seed.close()
+
+        kwargs = {"days": 1, "by_response_source": True}
+        sql = run_feedback_analyzer(output_path=tmp_path / "sql.json", **kwargs)
+        reference = run_feedback_analyzer(output_path=tmp_path / "ref.json", reference=True, **kwargs)
+
+        assert sql == reference
+        assert sql["total_feedback"] == 3
+        assert set(sql["by_response_source"]) == {"openai", "template", "unknown"}
+
 
 # ---------------------------------------------------------------------------
 # CLI arg parsing
@@ -359,6 +466,12 @@ class TestParseArgs:
         args = _parse_args(["--output", custom])
         assert str(args.output) == custom
 
+    def test_analysis_options(self):
+        args = _parse_args([])
+        assert (args.days, args.by_response_source, args.reference) == (None, False, False)
+        args = _parse_args(["--days", "7", "--by-response-source", "--reference"])
+        assert (args.days, args.by_response_source, args.reference) == (7, True, True)
+
 
 def test_analyze_feedback_includes_quality_score_in_output():
     """Test that analyze_feedback includes quality score in output."""
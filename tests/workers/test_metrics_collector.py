@@ -4,8 +4,13 @@ Tests for workers/metrics_collector.py
 Covers:
 - collect_metrics: empty DB returns zeros, counts tickets by status and intent,
   auto_resolve_rate / escalation_rate calculation, feedback averages
-- run_metrics_collector: end-to-end, JSON output with correct keys
-- _parse_args: CLI defaults and --output override
+- run_metrics_collector: end-to-end, JSON output with correct keys,
+  pre-populates the /admin/metrics cache unless prime_cache=False
+- collect_metrics_incremental: first run rebuilds, later runs fold in only
+  changed tickets/feedback and match a full collect_metrics; per-interval
+  delta; idempotent re-reads inside the watermark overlap; --rebuild
+- _parse_args: CLI defaults, --output override, --no-prime-cache,
+  --incremental / --rebuild
 """
 import json
 import os
@@ -14,7 +19,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 
 from app.db.session import Base
@@ -23,6 +28,7 @@ from app.models.ticket import Ticket
 from workers.metrics_collector import (
     _parse_args,
     collect_metrics,
+    collect_metrics_incremental,
     run_metrics_collector,
 )
 
@@ -260,7 +266,7 @@ class TestRunMetricsCollector:
     def test_returns_dict(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.metrics_collector as wmc
-        monkeypatch.setattr(wmc, "SessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wmc, "init_db", lambda: None)
 
         out = tmp_path / "metrics.json"
@@ -273,7 +279,7 @@ class TestRunMetricsCollector:
     def test_output_file_is_valid_json(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.metrics_collector as wmc
-        monkeypatch.setattr(wmc, "SessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wmc, "init_db", lambda: None)
 
         out = tmp_path / "metrics.json"
@@ -287,7 +293,7 @@ class TestRunMetricsCollector:
     def test_empty_db_zero_totals(self, monkeypatch, tmp_path, isolated_session_factory):
         _engine, TestSession = isolated_session_factory
         import workers.metrics_collector as wmc
-        monkeypatch.setattr(wmc, "SessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "ReadSessionLocal", TestSession)
         monkeypatch.setattr(wmc, "init_db", lambda: None)
 
         result = run_metrics_collector(output_path=tmp_path / "metrics.json")
@@ -295,6 +301,156 @@ class TestRunMetricsCollector:
         assert result["tickets"]["total"] == 0
         assert result["feedback"]["total"] == 0
 
+    def test_primes_admin_metrics_cache(self, monkeypatch, tmp_path, isolated_session_factory):
+        from app.services import admin_metrics
+
+        _engine, TestSession = isolated_session_factory
+        import workers.metrics_collector as wmc
+        monkeypatch.setattr(wmc, "ReadSessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "init_db", lambda: None)
+        seed = TestSession()
+        _add_ticket(seed, status="escalated")
+        seed.close()
+
+        run_metrics_collector(output_path=tmp_path / "metrics.json")
+
+        cached = admin_metrics._local_cache.get()
+        assert cached is not None
+        assert cached[1]["tickets"]["escalated"] == 1
+
+    def test_prime_cache_can_be_disabled(self, monkeypatch, tmp_path, isolated_session_factory):
+        from app.services import admin_metrics
+
+        _engine, TestSession = isolated_session_factory
+        import workers.metrics_collector as wmc
+        monkeypatch.setattr(wmc, "ReadSessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "init_db", lambda: None)
+
+        run_metrics_collector(output_path=tmp_path / "metrics.json", prime_cache=False)
+
+        assert admin_metrics._local_cache.get() is None
+
+
+# ---------------------------------------------------------------------------
+# Incremental mode
+# ---------------------------------------------------------------------------
+
+def _comparable(metrics):
+    return {k: v for k, v in metrics.items() if k not in ("collected_at", "watermark", "delta")}
+
+
+class TestCollectMetricsIncremental:
+
+    def _run(self, db):
+        metrics = collect_metrics_incremental(db)
+        db.commit()
+        return metrics
+
+    def test_first_run_rebuilds(self, db_session):
+        t = _add_ticket(db_session, status="auto_resolved", intent="login_issue")
+        _add_feedback(db_session, t.id, rating=5)
+        _add_ticket(db_session, status="escalated", intent=None)
+
+        result = self._run(db_session)
+
+        assert _comparable(result) == _comparable(collect_metrics(db_session))
+        assert result["delta"]["mode"] == "rebuild"
+        assert result["delta"]["since"] is None
+        assert result["delta"]["tickets"]["total"] == 2
+        assert result["delta"]["feedback"] == {"total": 1, "rating_sum": 5, "resolved": 1}
+
+    def test_folds_in_changes(self, db_session):
+        escalated = _add_ticket(db_session, status="escalated", intent="payment")
+        resolved = _add_ticket(db_session, status="auto_resolved", intent="login_issue")
+        self._run(db_session)
+
+        escalated.status = "in_progress"
+        db_session.commit()
+        _add_feedback(db_session, resolved.id, rating=2, resolved=False)
+        _add_ticket(db_session, status="open", intent="refund")
+
+        result = self._run(db_session)
+
+        assert _comparable(result) == _comparable(collect_metrics(db_session))
+        delta = result["delta"]
+        assert delta["mode"] == "incremental"
+        assert delta["tickets_processed"] == 3
+        assert delta["tickets"]["total"] == 1
+        assert delta["tickets"]["by_status"] == {"escalated": -1, "in_progress": 1, "open": 1}
+        assert delta["tickets"]["by_intent"] == {"refund": 1}
+        assert delta["feedback"] == {"total": 1, "rating_sum": 2, "resolved": 0}
+
+    def test_bulk_update_is_picked_up(self, db_session):
+        _add_ticket(db_session, status="escalated")
+        _add_ticket(db_session, status="auto_resolved")
+        self._run(db_session)
+
+        db_session.execute(
+            update(Ticket).where(Ticket.status.in_(["escalated", "auto_resolved"])).values(status="closed")
+        )
+        db_session.commit()
+
+        result = self._run(db_session)
+        assert result["tickets"]["by_status"] == {"closed": 2}
+        assert _comparable(result) == _comparable(collect_metrics(db_session))
+
+    def test_rerun_without_changes_is_a_no_op(self, db_session):
+        _add_ticket(db_session, status="escalated", intent="payment")
+        first = self._run(db_session)
+
+        # The ticket is still inside the watermark overlap, so it is
+        # re-read, but nothing is counted twice.
+        second = self._run(db_session)
+
+        assert _comparable(second) == _comparable(first)
+        assert second["delta"]["tickets_processed"] == 0
+        assert second["delta"]["tickets"] == {"total": 0, "by_status": {}, "by_intent": {}}
+
+    def test_rebuild_resets_drift(self, db_session):
+        from app.models.worker_checkpoint import WorkerCheckpoint
+
+        _add_ticket(db_session, status="open")
+        self._run(db_session)
+        checkpoint = db_session.get(WorkerCheckpoint, "metrics_collector")
+        checkpoint.state = json.dumps({
+            "tickets": {"total": 99, "by_status": {"open": 99}, "by_intent": {}},
+            "feedback": {"total": 0, "rating_sum": 0, "resolved": 0},
+        })
+        db_session.commit()
+
+        result = collect_metrics_incremental(db_session, rebuild=True)
+        db_session.commit()
+
+        assert result["tickets"]["total"] == 1
+        assert result["delta"]["mode"] == "rebuild"
+        assert result["delta"]["tickets"]["total"] == -98
+
+
+class TestRunMetricsCollectorIncremental:
+
+    def test_writes_cumulative_snapshot_and_delta(self, monkeypatch, tmp_path, temp_db_path):
+        engine = create_engine(f"sqlite:///{temp_db_path}", connect_args={"check_same_thread": False})
+        TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        Base.metadata.create_all(bind=engine)
+        import workers.metrics_collector as wmc
+        monkeypatch.setattr(wmc, "SessionLocal", TestSession)
+        monkeypatch.setattr(wmc, "init_db", lambda: None)
+
+        seed = TestSession()
+        _add_ticket(seed, status="escalated")
+        out = tmp_path / "metrics.json"
+        run_metrics_collector(output_path=out, prime_cache=False, incremental=True)
+        _add_ticket(seed, status="open")
+        seed.close()
+
+        result = run_metrics_collector(output_path=out, prime_cache=False, incremental=True)
+        loaded = json.loads(out.read_text())
+
+        assert loaded["tickets"]["total"] == result["tickets"]["total"] == 2
+        assert loaded["delta"]["tickets"]["by_status"] == {"open": 1}
+        assert loaded["delta"]["since"] is not None
+        engine.dispose()
+
 
 # ---------------------------------------------------------------------------
 # CLI arg parsing
@@ -310,3 +466,15 @@ class TestParseArgs:
         custom = str(tmp_path / "custom.json")
         args = _parse_args(["--output", custom])
         assert str(args.output) == custom
+
+    def test_prime_cache_flag(self):
+        assert _parse_args([]).prime_cache is True
+        assert _parse_args(["--no-prime-cache"]).prime_cache is False
+
+    def test_incremental_flags(self):
+        args = _parse_args([])
+        assert args.incremental is False
+        assert args.rebuild is False
+        args = _parse_args(["--incremental", "--rebuild"])
+        assert args.incremental is True
+        assert args.rebuild is True
@@ -12,6 +12,8 @@ Perform routine maintenance and cleanup tasks.
 This worker handles:
 - Archiving old tickets
 - Removing stale or temporary data
+- Purging used-up refresh tokens and expired password-reset OTPs
+- Offloading long-archived tickets to cold storage (--offload)
 - Database housekeeping
 
 Why this is a worker:
@@ -26,6 +28,35 @@ Responsibilities:
 - Clean or archive data safely
 - Maintain database performance
 
+Batching:
+---------
+Every task works in primary-key order, ``--batch-size`` rows per UPDATE /
+DELETE, with a commit after each batch and an optional ``--sleep`` pause
+between batches, so no statement holds row locks (or grows the WAL) for
+long and ticket writes keep flowing while cleanup runs. After every batch
+the last processed id is saved in worker_checkpoints in the same
+transaction. An interrupted run resumes from there on the next start
+(``--restart`` ignores it); a finished task clears its checkpoint.
+(Expired refresh tokens are drained in expiry order instead and need no
+checkpoint.)
+
+Auth state:
+-----------
+Every login and every /auth/refresh rotation inserts a refresh_tokens row,
+and revocation only flags it. Each run deletes revoked tokens and tokens
+past expires_at (neither can ever be accepted again), and clears
+reset_otp* on users whose OTP has expired. The counts are reported in the
+run summary as ``purged_refresh_tokens`` / ``cleared_reset_otps``.
+
+Cold storage:
+-------------
+With --offload, archived tickets older than --offload-days (and their
+feedback) are written batch by batch to COLD_STORAGE_DIR as gzipped JSONL
+segments listed in a manifest (app/services/cold_storage.py), then
+deleted from the hot tables in the same batch's transaction. GET
+/tickets/{id} reads them back from there. Offloaded tickets no longer
+count towards database-backed metrics and the similarity corpus.
+
 DO NOT:
 -------
 - Delete active tickets
@@ -35,30 +66,167 @@ DO NOT:
 Usage:
 ------
     python workers/cleanup.py [--days 90] [--dry-run]
+    python workers/cleanup.py --batch-size 500 --sleep 0.2    # business hours
+    python workers/cleanup.py --offload [--offload-days 365]  # needs COLD_STORAGE_DIR
 """
 
 import argparse
+import json
 import logging
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable
 
 # Add project root to path so worker can be run directly
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import delete, exists, func, select, update
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.session import SessionLocal, init_db
+from app.models.feedback import Feedback
+from app.models.refresh_token import RefreshToken
 from app.models.ticket import Ticket
+from app.models.user import User
+from app.models.worker_checkpoint import WorkerCheckpoint
+from app.services.cold_storage import make_record, write_segment
 
 logger = logging.getLogger(__name__)
 
 # Ticket statuses that are safe to archive
 ARCHIVABLE_STATUSES = {"closed", "auto_resolved", "escalated"}
 
+# Rows per UPDATE / DELETE statement (one commit each).
+DEFAULT_BATCH_SIZE = 1000
+
+ARCHIVE_CHECKPOINT = "cleanup.archive_tickets"
+ORPHAN_CHECKPOINT = "cleanup.orphaned_feedback"
+OFFLOAD_CHECKPOINT = "cleanup.offload_tickets"
+REVOKED_TOKEN_CHECKPOINT = "cleanup.revoked_refresh_tokens"
+RESET_OTP_CHECKPOINT = "cleanup.reset_otps"
+
+# Archived tickets older than this are offloaded with --offload.
+DEFAULT_OFFLOAD_DAYS = 365
+
+
+# ---------------------------------------------------------------------------
+# Batch driver
+# ---------------------------------------------------------------------------
+
+def _load_checkpoint(db: Session, name: str, resume: bool) -> int:
+    """Return the last id processed by an interrupted run (0 when starting fresh)."""
+    checkpoint = db.get(WorkerCheckpoint, name)
+    if checkpoint is None or not checkpoint.state:
+        return 0
+    if not resume:
+        db.delete(checkpoint)
+        db.commit()
+        return 0
+    last_id = json.loads(checkpoint.state).get("last_id", 0)
+    logger.info("Resuming %s after id %d.", name, last_id)
+    return last_id
+
+
+def _save_checkpoint(db: Session, name: str, last_id: int) -> None:
+    checkpoint = db.get(WorkerCheckpoint, name) or WorkerCheckpoint(name=name)
+    checkpoint.state = json.dumps({"last_id": last_id})
+    db.add(checkpoint)
+
 
-def archive_old_tickets(db: Session, cutoff_date: datetime, dry_run: bool = False) -> int:
+def _clear_checkpoint(db: Session, name: str) -> None:
+    db.execute(delete(WorkerCheckpoint).where(WorkerCheckpoint.name == name))
+    db.commit()
+
+
+def _run_batches(
+    db: Session,
+    name: str,
+    next_ids: Callable[[int], list],
+    apply: Callable[[list], int],
+    max_id: int,
+    batch_size: int,
+    sleep_s: float,
+    resume: bool,
+    label: str,
+) -> int:
+    """
+    Process rows in primary-key order, *batch_size* at a time.
+
+    ``next_ids(after_id)`` returns the next batch of ids; ``apply(ids)``
+    writes them and returns the affected row count. Each batch is committed
+    together with the checkpoint.
+    """
+    first_id = last_id = _load_checkpoint(db, name, resume)
+    done = 0
+    while True:
+        ids = next_ids(last_id)
+        if not ids:
+            break
+        done += apply(ids)
+        last_id = ids[-1]
+        _save_checkpoint(db, name, last_id)
+        db.commit()
+
+        span = max(max_id - first_id, 1)
+        logger.info(
+            "%s: %d row(s) so far, through id %d (~%.0f%%).",
+            label, done, last_id, min(100.0, (last_id - first_id) * 100 / span),
+        )
+        if len(ids) < batch_size:
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+
+    _clear_checkpoint(db, name)
+    return done
+
+
+def _drain_batches(
+    db: Session,
+    next_ids: Callable[[], list],
+    apply: Callable[[list], int],
+    batch_size: int,
+    sleep_s: float,
+    label: str,
+) -> int:
+    """
+    Like :func:`_run_batches` for deletes whose selection shrinks as they go.
+
+    ``next_ids()`` returns up to *batch_size* rows still to delete (in
+    whatever order its index yields them); no checkpoint is needed because
+    a restarted run simply finds what is left.
+    """
+    done = 0
+    while True:
+        ids = next_ids()
+        if not ids:
+            break
+        done += apply(ids)
+        db.commit()
+        logger.info("%s: %d row(s) so far.", label, done)
+        if len(ids) < batch_size:
+            break
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+    return done
+
+
+# ---------------------------------------------------------------------------
+# Tasks
+# ---------------------------------------------------------------------------
+
+def archive_old_tickets(
+    db: Session,
+    cutoff_date: datetime,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+) -> int:
     """
     Mark old resolved/closed tickets as archived via the ``is_archived`` flag.
 
@@ -72,34 +240,58 @@ def archive_old_tickets(db: Session, cutoff_date: datetime, dry_run: bool = Fals
         db: Active SQLAlchemy session.
         cutoff_date: Tickets created before this timestamp are eligible.
         dry_run: When *True* log what would happen without writing to the DB.
+        batch_size: Tickets per UPDATE (one commit each).
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue after the id checkpointed by an interrupted run.
 
     Returns:
         Number of tickets archived (or that would be archived in dry-run mode).
     """
-    base_query = db.query(Ticket).filter(
+    eligible = (
         Ticket.status.in_(ARCHIVABLE_STATUSES),
         Ticket.is_archived.is_(False),  # skip already-archived tickets (idempotency)
         Ticket.created_at < cutoff_date,
     )
 
-    count = base_query.count()
-    if count == 0:
-        logger.info("No old tickets found to archive.")
-        return 0
-
-    logger.info("Found %d ticket(s) eligible for archiving (before %s).", count, cutoff_date.date())
-
     if dry_run:
-        logger.info("[DRY-RUN] Would archive %d ticket(s).", count)
+        count = db.scalar(select(func.count()).select_from(Ticket).where(*eligible))
+        logger.info("[DRY-RUN] Would archive %d ticket(s) (before %s).", count, cutoff_date.date())
         return count
 
-    base_query.update({Ticket.is_archived: True}, synchronize_session=False)
-    db.commit()
-    logger.info("Archived %d ticket(s).", count)
-    return count
+    max_id = db.scalar(select(func.max(Ticket.id))) or 0  # progress estimate only
+
+    def next_ids(after_id: int) -> list:
+        return list(db.scalars(
+            select(Ticket.id)
+            .where(Ticket.id > after_id, *eligible)
+            .order_by(Ticket.id)
+            .limit(batch_size)
+        ))
+
+    def apply(ids: list) -> int:
+        result = db.execute(
+            update(Ticket).where(Ticket.id.in_(ids), *eligible).values(is_archived=True),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    archived = _run_batches(
+        db, ARCHIVE_CHECKPOINT, next_ids, apply, max_id, batch_size, sleep_s, resume, "Archiving tickets",
+    )
+    if archived:
+        logger.info("Archived %d ticket(s) (before %s).", archived, cutoff_date.date())
+    else:
+        logger.info("No old tickets found to archive.")
+    return archived
 
 
-def remove_orphaned_feedback(db: Session, dry_run: bool = False) -> int:
+def remove_orphaned_feedback(
+    db: Session,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+) -> int:
     """
     Remove feedback records whose parent ticket no longer exists.
 
@@ -109,67 +301,328 @@ def remove_orphaned_feedback(db: Session, dry_run: bool = False) -> int:
     Args:
         db: Active SQLAlchemy session.
         dry_run: When *True* log what would happen without writing to the DB.
+        batch_size: Feedback rows per DELETE (one commit each).
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue after the id checkpointed by an interrupted run.
 
     Returns:
         Number of orphaned feedback records removed.
     """
-    from sqlalchemy import exists
-    from app.models.feedback import Feedback
-
     # Use NOT EXISTS for set-based efficiency (avoids large IN-list)
-    orphan_query = db.query(Feedback).filter(
-        ~exists().where(Ticket.id == Feedback.ticket_id)
-    )
+    orphaned = ~exists().where(Ticket.id == Feedback.ticket_id)
 
-    count = orphan_query.count()
-    if count == 0:
+    if dry_run:
+        count = db.scalar(select(func.count()).select_from(Feedback).where(orphaned))
+        logger.info("[DRY-RUN] Would delete %d orphaned feedback record(s).", count)
+        return count
+
+    max_id = db.scalar(select(func.max(Feedback.id))) or 0  # progress estimate only
+
+    def next_ids(after_id: int) -> list:
+        return list(db.scalars(
+            select(Feedback.id)
+            .where(Feedback.id > after_id, orphaned)
+            .order_by(Feedback.id)
+            .limit(batch_size)
+        ))
+
+    def apply(ids: list) -> int:
+        result = db.execute(
+            delete(Feedback).where(Feedback.id.in_(ids), orphaned),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    removed = _run_batches(
+        db, ORPHAN_CHECKPOINT, next_ids, apply, max_id, batch_size, sleep_s, resume, "Removing orphaned feedback",
+    )
+    if removed:
+        logger.info("Removed %d orphaned feedback record(s).", removed)
+    else:
         logger.info("No orphaned feedback records found.")
-        return 0
+    return removed
+
+
+def purge_refresh_tokens(
+    db: Session,
+    now: datetime,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+) -> int:
+    """
+    Delete refresh tokens that can never be accepted again.
 
-    logger.info("Found %d orphaned feedback record(s).", count)
+    Revoked tokens (rotated or logged out) are deleted in primary-key order
+    with a checkpoint; unrevoked tokens past ``expires_at`` are drained
+    oldest first through the partial ``ix_refresh_tokens_active_expires_at``
+    index. A rejected token gets the same 401 whether its row exists or
+    not, so deleting them changes no API behaviour.
+
+    Args:
+        db: Active SQLAlchemy session.
+        now: Tokens that expired before this are purged.
+        dry_run: When *True* only count what would be deleted.
+        batch_size: Tokens per DELETE (one commit each).
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue after the id checkpointed by an interrupted run.
+
+    Returns:
+        Number of refresh tokens deleted (or that would be in dry-run mode).
+    """
+    revoked = RefreshToken.revoked == True  # noqa: E712 - must render "= 1/true" like the index predicate
+    expired = (RefreshToken.revoked == False, RefreshToken.expires_at < now)  # noqa: E712
 
     if dry_run:
-        logger.info("[DRY-RUN] Would delete %d orphaned feedback record(s).", count)
+        count = db.scalar(
+            select(func.count()).select_from(RefreshToken).where(revoked | (RefreshToken.expires_at < now))
+        )
+        logger.info("[DRY-RUN] Would delete %d revoked/expired refresh token(s).", count)
         return count
 
-    orphan_query.delete(synchronize_session=False)
-    db.commit()
-    logger.info("Removed %d orphaned feedback record(s).", count)
-    return count
+    max_id = db.scalar(select(func.max(RefreshToken.id))) or 0  # progress estimate only
+    sync = {"synchronize_session": False}
+
+    def next_revoked(after_id: int) -> list:
+        return list(db.scalars(
+            select(RefreshToken.id)
+            .where(RefreshToken.id > after_id, revoked)
+            .order_by(RefreshToken.id)
+            .limit(batch_size)
+        ))
+
+    def delete_revoked(ids: list) -> int:
+        return db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids), revoked), execution_options=sync).rowcount
+
+    def next_expired() -> list:
+        return list(db.scalars(
+            select(RefreshToken.id).where(*expired).order_by(RefreshToken.expires_at).limit(batch_size)
+        ))
+
+    def delete_expired(ids: list) -> int:
+        return db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids), *expired), execution_options=sync).rowcount
+
+    purged = _run_batches(
+        db, REVOKED_TOKEN_CHECKPOINT, next_revoked, delete_revoked, max_id, batch_size, sleep_s, resume,
+        "Purging revoked refresh tokens",
+    )
+    purged += _drain_batches(db, next_expired, delete_expired, batch_size, sleep_s, "Purging expired refresh tokens")
+    if purged:
+        logger.info("Purged %d revoked/expired refresh token(s).", purged)
+    else:
+        logger.info("No revoked or expired refresh tokens to purge.")
+    return purged
+
+
+def clear_expired_reset_otps(
+    db: Session,
+    now: datetime,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+) -> int:
+    """
+    Clear the password-reset OTP fields of users whose OTP has expired.
+
+    POST /auth/verify-otp already clears them when an expired OTP is
+    presented; this handles the OTPs nobody came back for. ``updated_at``
+    is left alone, since the account itself did not change.
+
+    Args:
+        db: Active SQLAlchemy session.
+        now: OTPs that expired before this are cleared.
+        dry_run: When *True* only count what would be cleared.
+        batch_size: Users per UPDATE (one commit each).
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue after the id checkpointed by an interrupted run.
+
+    Returns:
+        Number of users whose OTP state was cleared (or would be in dry-run mode).
+    """
+    expired = User.reset_otp_expires_at < now
+
+    if dry_run:
+        count = db.scalar(select(func.count()).select_from(User).where(expired))
+        logger.info("[DRY-RUN] Would clear %d expired reset OTP(s).", count)
+        return count
+
+    max_id = db.scalar(select(func.max(User.id))) or 0  # progress estimate only
+
+    def next_ids(after_id: int) -> list:
+        return list(db.scalars(
+            select(User.id).where(User.id > after_id, expired).order_by(User.id).limit(batch_size)
+        ))
+
+    def apply(ids: list) -> int:
+        result = db.execute(
+            update(User)
+            .where(User.id.in_(ids), expired)
+            .values(
+                reset_otp=None,
+                reset_otp_expires_at=None,
+                reset_otp_attempts=0,
+                updated_at=User.updated_at,  # suppress onupdate
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    cleared = _run_batches(
+        db, RESET_OTP_CHECKPOINT, next_ids, apply, max_id, batch_size, sleep_s, resume, "Clearing expired reset OTPs",
+    )
+    if cleared:
+        logger.info("Cleared %d expired reset OTP(s).", cleared)
+    else:
+        logger.info("No expired reset OTPs to clear.")
+    return cleared
+
+
+def offload_archived_tickets(
+    db: Session,
+    directory: Path,
+    cutoff_date: datetime,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+) -> int:
+    """
+    Move archived tickets created before *cutoff_date*, with their
+    feedback, from the database to cold storage.
+
+    Each batch is written as one segment (and recorded in the manifest)
+    before its rows are deleted, and the delete is committed together with
+    the checkpoint.
+
+    Args:
+        db: Active SQLAlchemy session.
+        directory: Cold-storage directory (COLD_STORAGE_DIR).
+        cutoff_date: Archived tickets created before this are offloaded.
+        dry_run: When *True* only count what would be offloaded.
+        batch_size: Tickets per segment / DELETE (one commit each).
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue after the id checkpointed by an interrupted run.
 
+    Returns:
+        Number of tickets offloaded (or that would be in dry-run mode).
+    """
+    eligible = (Ticket.is_archived.is_(True), Ticket.created_at < cutoff_date)
 
-def run_cleanup(days: int = 90, dry_run: bool = False) -> dict:
+    if dry_run:
+        count = db.scalar(select(func.count()).select_from(Ticket).where(*eligible))
+        logger.info("[DRY-RUN] Would offload %d archived ticket(s) to %s.", count, directory)
+        return count
+
+    tickets, feedback = Ticket.__table__, Feedback.__table__
+    max_id = db.scalar(select(func.max(Ticket.id))) or 0  # progress estimate only
+
+    def next_ids(after_id: int) -> list:
+        return list(db.scalars(
+            select(Ticket.id)
+            .where(Ticket.id > after_id, *eligible)
+            .order_by(Ticket.id)
+            .limit(batch_size)
+        ))
+
+    def apply(ids: list) -> int:
+        ticket_rows = db.execute(select(tickets).where(tickets.c.id.in_(ids)).order_by(tickets.c.id)).mappings().all()
+        feedback_rows = {
+            row["ticket_id"]: row
+            for row in db.execute(select(feedback).where(feedback.c.ticket_id.in_(ids))).mappings()
+        }
+        write_segment(directory, [make_record(dict(row), feedback_rows.get(row["id"])) for row in ticket_rows])
+
+        sync = {"synchronize_session": False}
+        db.execute(delete(Feedback).where(Feedback.ticket_id.in_(ids)), execution_options=sync)
+        return db.execute(delete(Ticket).where(Ticket.id.in_(ids)), execution_options=sync).rowcount
+
+    offloaded = _run_batches(
+        db, OFFLOAD_CHECKPOINT, next_ids, apply, max_id, batch_size, sleep_s, resume, "Offloading tickets",
+    )
+    if offloaded:
+        logger.info("Offloaded %d archived ticket(s) to %s.", offloaded, directory)
+    else:
+        logger.info("No archived tickets to offload.")
+    return offloaded
+
+
+def run_cleanup(
+    days: int = 90,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sleep_s: float = 0.0,
+    resume: bool = True,
+    offload: bool = False,
+    offload_days: int = DEFAULT_OFFLOAD_DAYS,
+) -> dict:
     """
     Execute all cleanup tasks.
 
     Args:
         days: Tickets older than this many days (and not open) are archived.
         dry_run: When *True* no database writes are performed.
+        batch_size: Rows per UPDATE / DELETE batch.
+        sleep_s: Pause between batches, in seconds.
+        resume: Continue interrupted tasks from their checkpoints.
+        offload: Also move archived tickets older than *offload_days* to
+            COLD_STORAGE_DIR.
+        offload_days: Age threshold for *offload*.
 
     Returns:
-        Summary dict with keys ``archived_tickets`` and ``removed_feedback``.
+        Summary dict with keys ``archived_tickets``, ``removed_feedback``,
+        ``purged_refresh_tokens`` and ``cleared_reset_otps`` (plus
+        ``offloaded_tickets`` when *offload*).
+
+    Raises:
+        ValueError: *offload* requested without COLD_STORAGE_DIR.
     """
+    if offload and not settings.COLD_STORAGE_DIR:
+        raise ValueError("--offload needs COLD_STORAGE_DIR to be set")
+
     init_db()
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    now = datetime.now(timezone.utc)
+    cutoff_date = now - timedelta(days=days)
 
     logger.info(
-        "Starting cleanup (dry_run=%s, cutoff=%s, days=%d).",
+        "Starting cleanup (dry_run=%s, cutoff=%s, days=%d, batch_size=%d, sleep=%.2fs).",
         dry_run,
         cutoff_date.date(),
         days,
+        batch_size,
+        sleep_s,
     )
 
+    options = {"batch_size": batch_size, "sleep_s": sleep_s, "resume": resume}
     db: Session = SessionLocal()
     try:
-        archived = archive_old_tickets(db, cutoff_date, dry_run=dry_run)
-        removed_feedback = remove_orphaned_feedback(db, dry_run=dry_run)
+        archived = archive_old_tickets(db, cutoff_date, dry_run=dry_run, **options)
+        removed_feedback = remove_orphaned_feedback(db, dry_run=dry_run, **options)
+        purged_tokens = purge_refresh_tokens(db, now, dry_run=dry_run, **options)
+        cleared_otps = clear_expired_reset_otps(db, now, dry_run=dry_run, **options)
+        if offload:
+            offloaded = offload_archived_tickets(
+                db,
+                Path(settings.COLD_STORAGE_DIR),
+                now - timedelta(days=offload_days),
+                dry_run=dry_run,
+                **options,
+            )
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
     summary = {
         "archived_tickets": archived,
         "removed_feedback": removed_feedback,
+        "purged_refresh_tokens": purged_tokens,
+        "cleared_reset_otps": cleared_otps,
     }
+    if offload:
+        summary["offloaded_tickets"] = offloaded
     logger.info("Cleanup complete: %s", summary)
     return summary
 
@@ -178,9 +631,16 @@ def run_cleanup(days: int = 90, dry_run: bool = False) -> dict:
 # CLI entry point
 # ---------------------------------------------------------------------------
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
 def _parse_args(argv=None):
     parser = argparse.ArgumentParser(
-        description="Cleanup worker — archive old tickets and remove orphaned records.",
+        description="Cleanup worker — archive old tickets and remove orphaned and expired records.",
     )
     parser.add_argument(
         "--days",
@@ -193,6 +653,34 @@ def _parse_args(argv=None):
         action="store_true",
         help="Show what would be done without making any changes.",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per UPDATE/DELETE batch, committed separately (default: {DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--sleep",
+        type=float,
+        default=0.0,
+        help="Seconds to pause between batches (default: 0).",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore checkpoints left by an interrupted run and start from the first row.",
+    )
+    parser.add_argument(
+        "--offload",
+        action="store_true",
+        help="Move archived tickets to cold storage (COLD_STORAGE_DIR) and delete them from the database.",
+    )
+    parser.add_argument(
+        "--offload-days",
+        type=int,
+        default=DEFAULT_OFFLOAD_DAYS,
+        help=f"Offload archived tickets older than this many days (default: {DEFAULT_OFFLOAD_DAYS}).",
+    )
     return parser.parse_args(argv)
 
 
@@ -202,4 +690,12 @@ if __name__ == "__main__":
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
     args = _parse_args()
-    run_cleanup(days=args.days, dry_run=args.dry_run)
+    run_cleanup(
+        days=args.days,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        sleep_s=args.sleep,
+        resume=not args.restart,
+        offload=args.offload,
+        offload_days=args.offload_days,
+    )
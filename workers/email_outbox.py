@@ -0,0 +1,142 @@
+"""
+workers/email_outbox.py
+
+Owner:
+------
+Om (Backend / System)
+
+Purpose:
+--------
+Deliver the emails queued in the email_outbox table (password-reset OTPs
+from POST /auth/forgot-password).
+
+Why this is a worker:
+---------------------
+- The email provider's latency and outages stay out of the request path
+- Due emails are sent in batches (one Resend API call per batch) and
+  failed sends are retried with backoff instead of being lost
+
+Responsibilities:
+-----------------
+- Poll for due emails and send them (app/services/email_outbox.py:deliver_due)
+- Keep running; drain the backlog batch by batch, then sleep for the
+  poll interval
+
+Several instances may run side by side on PostgreSQL (rows are claimed
+with SKIP LOCKED); run a single one on SQLite.
+
+DO NOT:
+-------
+- Render or encrypt emails here (app/services/email_outbox.py does)
+- Run inside API requests
+
+Usage:
+------
+    python workers/email_outbox.py                    # run forever
+    python workers/email_outbox.py --once             # drain what is due, then exit
+    python workers/email_outbox.py --batch-size 100 --poll-interval 0.5
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so worker can be run directly
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.db.session import SessionLocal, init_db
+from app.services.email_outbox import EmailSender, deliver_due, get_email_sender
+
+logger = logging.getLogger(__name__)
+
+
+def run_email_outbox(
+    once: bool = False,
+    batch_size: int | None = None,
+    poll_interval: float | None = None,
+    sender: EmailSender | None = None,
+) -> dict:
+    """
+    Deliver due emails, batch after batch.
+
+    Args:
+        once: Return once nothing is due instead of polling forever.
+        batch_size: Emails per provider call (default EMAIL_OUTBOX_BATCH_SIZE).
+        poll_interval: Seconds to sleep when nothing is due
+            (default EMAIL_OUTBOX_POLL_INTERVAL_S).
+        sender: Where emails go; the configured provider by default.
+
+    Returns:
+        Totals of the counts returned by deliver_due().
+    """
+    init_db()
+    sender = sender or get_email_sender()
+    poll_interval = settings.EMAIL_OUTBOX_POLL_INTERVAL_S if poll_interval is None else poll_interval
+    totals = {"claimed": 0, "sent": 0, "retried": 0, "failed": 0, "expired": 0}
+
+    while True:
+        db = SessionLocal()  # writes: always the primary
+        try:
+            summary = deliver_due(db, sender, batch_size=batch_size)
+        except Exception:
+            db.rollback()
+            if once:
+                raise
+            logger.exception("Email outbox pass failed; retrying in %.1fs", poll_interval)
+            summary = None
+        finally:
+            db.close()
+
+        if summary is not None:
+            for key, value in summary.items():
+                totals[key] += value
+            if summary["claimed"]:
+                logger.info("Email outbox batch: %s", summary)
+                continue
+            if once:
+                break
+        time.sleep(poll_interval)
+
+    logger.info("Email outbox drained: %s", totals)
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Email outbox — send queued emails with batching and retries.",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Send everything that is due, then exit.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Emails per provider call (default: {settings.EMAIL_OUTBOX_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=None,
+        help=f"Seconds to wait when nothing is due (default: {settings.EMAIL_OUTBOX_POLL_INTERVAL_S}).",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    args = _parse_args()
+    run_email_outbox(once=args.once, batch_size=args.batch_size, poll_interval=args.poll_interval)
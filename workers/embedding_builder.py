@@ -48,7 +48,7 @@ from typing import Dict, List
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.db.session import SessionLocal, init_db
+from app.db.session import ReadSessionLocal, init_db
 from app.models.ticket import Ticket
 
 logger = logging.getLogger(__name__)
@@ -146,7 +146,7 @@ def run_embedding_builder(output_path: Path = DEFAULT_OUTPUT) -> Dict:
         The embedding data dict (same structure as :func:`build_embeddings`).
     """
     init_db()
-    db = SessionLocal()
+    db = ReadSessionLocal()  # read-only scan: replica when configured
     try:
         logger.info("Fetching resolved tickets from the database…")
         tickets = fetch_resolved_tickets(db)
@@ -26,6 +26,12 @@ Responsibilities:
 - Aggregate ratings and resolution flags
 - Compute performance metrics
 
+The runner aggregates in SQL (:func:`analyze_feedback_sql`: one GROUP BY
+over intent / status / response_source and one over rating), so only
+summary rows leave the database. :func:`analyze_feedback` over
+:func:`fetch_feedback_with_tickets` is the in-Python reference
+implementation; both return the same dict (see the parity tests).
+
 DO NOT:
 -------
 - Modify ticket status
@@ -35,6 +41,8 @@ DO NOT:
 Usage:
 ------
     python workers/feedback_analyzer.py [--output feedback_analysis.json]
+    python workers/feedback_analyzer.py --days 7 --by-response-source
+    python workers/feedback_analyzer.py --reference   # in-Python aggregation
 """
 
 import argparse
@@ -42,14 +50,18 @@ import json
 import logging
 import sys
 from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
 
 # Add project root to path so worker can be run directly
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.db.session import SessionLocal, init_db
+from sqlalchemy import case, func, select
+
+from app.db.session import ReadSessionLocal, init_db
 from app.models.feedback import Feedback
 from app.models.ticket import Ticket
 
@@ -62,19 +74,36 @@ DEFAULT_OUTPUT = project_root / "feedback_analysis.json"
 # Data fetching
 # ---------------------------------------------------------------------------
 
-def fetch_feedback_with_tickets(db) -> List[Dict]:
+def _in_window(query, since: Optional[datetime], until: Optional[datetime]):
+    if since is not None:
+        query = query.where(Feedback.created_at >= since)
+    if until is not None:
+        query = query.where(Feedback.created_at < until)
+    return query
+
+
+def fetch_feedback_with_tickets(
+    db,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[Dict]:
     """
     Return all feedback records joined with their parent ticket's intent.
 
+    Args:
+        db: Active SQLAlchemy session.
+        since / until: Optional window on feedback ``created_at`` (``[since, until)``).
+
     Returns:
         List of dicts containing feedback fields and the ticket's ``intent``.
     """
-    rows = (
-        db.query(Feedback, Ticket)
-        .join(Ticket, Feedback.ticket_id == Ticket.id)
-        .order_by(Feedback.id)
-        .all()
-    )
+    rows = db.execute(
+        _in_window(
+            select(Feedback, Ticket).join(Ticket, Feedback.ticket_id == Ticket.id),
+            since,
+            until,
+        ).order_by(Feedback.id)
+    ).all()
     return [
         {
             "feedback_id": fb.id,
@@ -85,6 +114,7 @@ def fetch_feedback_with_tickets(db) -> List[Dict]:
             "intent": ticket.intent,
             "ticket_status": ticket.status,
             "quality_score": ticket.quality_score,
+            "response_source": ticket.response_source,
         }
         for fb, ticket in rows
     ]
@@ -99,6 +129,32 @@ def _safe_avg(values: List[float]) -> float:
     return round(sum(values) / len(values), 3) if values else 0.0
 
 
+def summarize_by(records: List[Dict], key: str) -> Dict[str, Dict]:
+    """
+    Count, average rating and resolution rate of *records* grouped by *key*.
+
+    Records whose *key* is missing or empty are grouped under ``"unknown"``.
+    """
+    groups: Dict[str, Dict] = defaultdict(lambda: {"ratings": [], "resolved": []})
+    for rec in records:
+        group_key = rec.get(key) or "unknown"
+        if rec["rating"] is not None:
+            groups[group_key]["ratings"].append(rec["rating"])
+        if rec["resolved"] is not None:
+            groups[group_key]["resolved"].append(rec["resolved"])
+
+    return {
+        group: {
+            "count": len(vals["ratings"]),
+            "average_rating": _safe_avg(vals["ratings"]),
+            "resolution_rate": round(sum(vals["resolved"]) / len(vals["resolved"]), 3)
+            if vals["resolved"]
+            else 0.0,
+        }
+        for group, vals in groups.items()
+    }
+
+
 def analyze_feedback(records: List[Dict]) -> Dict:
     """
     Aggregate feedback records into actionable metrics.
@@ -119,14 +175,7 @@ def analyze_feedback(records: List[Dict]) -> Dict:
         Dict containing all computed metrics.
     """
     if not records:
-        return {
-            "total_feedback": 0,
-            "average_rating": 0.0,
-            "resolution_rate": 0.0,
-            "by_intent": {},
-            "by_ticket_status": {},
-            "rating_distribution": {},
-        }
+        return _empty_analysis()
 
     total = len(records)
     all_ratings = [r["rating"] for r in records if r["rating"] is not None]
@@ -156,24 +205,7 @@ def analyze_feedback(records: List[Dict]) -> Dict:
     }
 
     # Per-ticket-status aggregation
-    by_status: Dict[str, Dict] = defaultdict(lambda: {"ratings": [], "resolved": []})
-    for rec in records:
-        status_key = rec.get("ticket_status") or "unknown"
-        if rec["rating"] is not None:
-            by_status[status_key]["ratings"].append(rec["rating"])
-        if rec["resolved"] is not None:
-            by_status[status_key]["resolved"].append(rec["resolved"])
-
-    status_summary = {
-        status: {
-            "count": len(vals["ratings"]),
-            "average_rating": _safe_avg(vals["ratings"]),
-            "resolution_rate": round(sum(vals["resolved"]) / len(vals["resolved"]), 3)
-            if vals["resolved"]
-            else 0.0,
-        }
-        for status, vals in by_status.items()
-    }
+    status_summary = summarize_by(records, "ticket_status")
 
     # Rating distribution.
     # Keys are explicitly converted to strings so the JSON representation
@@ -197,30 +229,164 @@ def analyze_feedback(records: List[Dict]) -> Dict:
     }
 
 
+def _empty_analysis() -> Dict:
+    return {
+        "total_feedback": 0,
+        "average_rating": 0.0,
+        "resolution_rate": 0.0,
+        "by_intent": {},
+        "by_ticket_status": {},
+        "rating_distribution": {},
+    }
+
+
+def _group_key(column):
+    """SQL twin of ``value or "unknown"``."""
+    return func.coalesce(func.nullif(column, ""), "unknown")
+
+
+def _ratio(numerator: float, denominator: int) -> float:
+    return round(numerator / denominator, 3) if denominator else 0.0
+
+
+def analyze_feedback_sql(
+    db,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    by_response_source: bool = False,
+) -> Dict:
+    """
+    Same result as ``analyze_feedback(fetch_feedback_with_tickets(db))``,
+    aggregated in the database.
+
+    One query groups feedback joined with tickets by (intent, status,
+    response_source) and returns count / rating sum / resolved count /
+    quality-score sum and count per group; a second builds the rating
+    histogram. Python only folds those few summary rows together.
+
+    Args:
+        db: Active SQLAlchemy session.
+        since / until: Optional window on feedback ``created_at`` (``[since, until)``).
+        by_response_source: Add a ``by_response_source`` breakdown (same
+            fields as ``by_ticket_status``).
+
+    Returns:
+        Dict with the keys documented on :func:`analyze_feedback`.
+    """
+    intent_key = _group_key(Ticket.intent)
+    status_key = _group_key(Ticket.status)
+    source_key = _group_key(Ticket.response_source)
+    joined = lambda query: _in_window(query.join(Ticket, Feedback.ticket_id == Ticket.id), since, until)  # noqa: E731
+
+    group_rows = db.execute(
+        joined(
+            select(
+                intent_key,
+                status_key,
+                source_key,
+                func.count(),
+                func.sum(Feedback.rating),
+                func.count(Feedback.resolved),
+                func.sum(case((Feedback.resolved.is_(True), 1), else_=0)),
+                func.sum(Ticket.quality_score),
+                func.count(Ticket.quality_score),
+            ).select_from(Feedback)
+        ).group_by(intent_key, status_key, source_key)
+    ).all()
+
+    if not group_rows:
+        analysis = _empty_analysis()
+        if by_response_source:
+            analysis["by_response_source"] = {}
+        return analysis
+
+    def fold(index: Optional[int]) -> Dict[str, List[float]]:
+        acc: Dict[str, List[float]] = defaultdict(lambda: [0, 0, 0, 0, 0.0, 0])
+        for row in group_rows:
+            bucket = acc["*" if index is None else row[index]]
+            for i, value in enumerate(row[3:]):
+                bucket[i] += value or 0
+        return acc
+
+    def summary(vals: List[float], with_quality: bool) -> Dict:
+        count, rating_sum, resolved_count, resolved_true, quality_sum, quality_count = vals
+        result = {
+            "count": count,
+            "average_rating": _ratio(rating_sum, count),
+            "resolution_rate": _ratio(resolved_true, resolved_count),
+        }
+        if with_quality:
+            result["average_quality_score"] = _ratio(quality_sum, quality_count)
+        return result
+
+    overall = fold(None)["*"]
+    rating_distribution = {
+        str(rating): count
+        for rating, count in db.execute(
+            joined(select(Feedback.rating, func.count()).select_from(Feedback))
+            .where(Feedback.rating.isnot(None))
+            .group_by(Feedback.rating)
+        )
+    }
+
+    analysis = {
+        "total_feedback": overall[0],
+        "average_rating": _ratio(overall[1], overall[0]),
+        "resolution_rate": _ratio(overall[3], overall[2]),
+        "by_intent": {key: summary(vals, True) for key, vals in fold(0).items()},
+        "by_ticket_status": {key: summary(vals, False) for key, vals in fold(1).items()},
+        "rating_distribution": rating_distribution,
+        "average_quality_score": _ratio(overall[4], overall[5]),
+    }
+    if by_response_source:
+        analysis["by_response_source"] = {key: summary(vals, False) for key, vals in fold(2).items()}
+    return analysis
+
+
 # ---------------------------------------------------------------------------
 # Runner
 # ---------------------------------------------------------------------------
 
-def run_feedback_analyzer(output_path: Path = DEFAULT_OUTPUT) -> Dict:
+def run_feedback_analyzer(
+    output_path: Path = DEFAULT_OUTPUT,
+    days: Optional[int] = None,
+    by_response_source: bool = False,
+    reference: bool = False,
+) -> Dict:
     """
-    Fetch feedback records, compute metrics, and save the analysis.
+    Compute feedback metrics and save the analysis.
 
     Args:
         output_path: Destination file for the JSON analysis report.
+        days: Only feedback submitted in the last *days* days (all when None).
+        by_response_source: Add the per-response_source breakdown.
+        reference: Fetch every record and aggregate in Python
+            (:func:`analyze_feedback`) instead of in SQL.
 
     Returns:
-        The analysis dict produced by :func:`analyze_feedback`.
+        The analysis dict produced by :func:`analyze_feedback_sql`
+        (or :func:`analyze_feedback` when *reference*).
     """
+    # created_at is stored as naive UTC
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).replace(tzinfo=None) if days is not None else None
+
     init_db()
-    db = SessionLocal()
+    db = ReadSessionLocal()  # read-only scan: replica when configured
     try:
-        logger.info("Fetching feedback records…")
-        records = fetch_feedback_with_tickets(db)
-        logger.info("Found %d feedback record(s).", len(records))
+        if reference:
+            logger.info("Fetching feedback records…")
+            records = fetch_feedback_with_tickets(db, since=since)
+            logger.info("Found %d feedback record(s).", len(records))
+        else:
+            logger.info("Aggregating feedback in the database…")
+            analysis = analyze_feedback_sql(db, since=since, by_response_source=by_response_source)
     finally:
         db.close()
 
-    analysis = analyze_feedback(records)
+    if reference:
+        analysis = analyze_feedback(records)
+        if by_response_source:
+            analysis["by_response_source"] = summarize_by(records, "response_source")
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as fh:
@@ -250,6 +416,22 @@ def _parse_args(argv=None):
         default=DEFAULT_OUTPUT,
         help="Path to write the JSON analysis report (default: feedback_analysis.json).",
     )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="Only analyze feedback submitted in the last DAYS days (default: all).",
+    )
+    parser.add_argument(
+        "--by-response-source",
+        action="store_true",
+        help="Add a per-response_source breakdown.",
+    )
+    parser.add_argument(
+        "--reference",
+        action="store_true",
+        help="Aggregate in Python over every record instead of in SQL (slow; for cross-checking).",
+    )
     return parser.parse_args(argv)
 
 
@@ -259,4 +441,9 @@ if __name__ == "__main__":
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
     args = _parse_args()
-    run_feedback_analyzer(output_path=args.output)
+    run_feedback_analyzer(
+        output_path=args.output,
+        days=args.days,
+        by_response_source=args.by_response_source,
+        reference=args.reference,
+    )
@@ -25,6 +25,23 @@ Responsibilities:
 - Query ticket and feedback tables
 - Compute aggregate statistics
 - Store results for admin dashboards
+- Pre-populate the /admin/metrics cache (app/services/admin_metrics.py), so
+  with REDIS_URL set the dashboard is served without touching the database
+
+Incremental mode (--incremental):
+---------------------------------
+A full run scans both tables. In incremental mode the worker keeps its
+running aggregates and a watermark in the "metrics_collector" row of
+worker_checkpoints, and the values it counted per ticket in
+metrics_ticket_state. Each run reads only the tickets updated, and the
+feedback created, since the watermark. It subtracts each ticket's old
+contribution and adds the new one, then writes the cumulative snapshot
+plus a ``delta`` section for the interval. The work is proportional to
+what changed, so it can run every minute against a large database.
+
+The first incremental run, or --rebuild, recounts everything once. Deletes
+carry no updated_at (orphaned-feedback cleanup, tickets offloaded by
+cleanup --offload); only a rebuild takes them out of the totals.
 
 DO NOT:
 -------
@@ -34,36 +51,97 @@ DO NOT:
 
 Usage:
 ------
-    python workers/metrics_collector.py [--output metrics_<YYYYMMDD_HHMMSS>.json]
+    python workers/metrics_collector.py [--output metrics_<YYYYMMDD_HHMMSS>.json] [--no-prime-cache]
+    python workers/metrics_collector.py --incremental --output metrics.json [--rebuild]
 """
 
 import argparse
 import json
 import logging
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
 # Add project root to path so worker can be run directly
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy import func
+from sqlalchemy import case, delete, func, insert, select, union
 
-from app.db.session import SessionLocal, init_db
+from app.db.session import ReadSessionLocal, SessionLocal, init_db
+from app.services.admin_metrics import refresh_admin_metrics
 from app.models.feedback import Feedback
+from app.models.metrics_ticket_state import MetricsTicketState
 from app.models.ticket import Ticket
+from app.models.worker_checkpoint import WorkerCheckpoint
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_OUTPUT = project_root / "metrics.json"
 
+CHECKPOINT_NAME = "metrics_collector"
+
+# A transaction that commits after a run took its watermark can carry an
+# updated_at from before it. Every run re-reads this much history to pick
+# those rows up; re-reading is harmless because deltas are taken against
+# metrics_ticket_state.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Tickets handled per SELECT / state rewrite in incremental mode.
+BATCH_SIZE = 500
+
 
 # ---------------------------------------------------------------------------
 # Metric computation
 # ---------------------------------------------------------------------------
 
+def _empty_totals() -> Dict:
+    return {
+        "tickets": {"total": 0, "by_status": {}, "by_intent": {}},
+        "feedback": {"total": 0, "rating_sum": 0, "resolved": 0},
+    }
+
+
+def _snapshot(totals: Dict) -> Dict:
+    """Build the published metrics dict from raw counters."""
+    tickets_by_status = totals["tickets"]["by_status"]
+    total_tickets = totals["tickets"]["total"]
+
+    # Resolved / escalated ticket counts.
+    # "Decided" = all tickets that have left the open state.
+    # Using total - open ensures archived tickets (is_archived=True) are
+    # counted correctly since archiving preserves the original status.
+    open_count = tickets_by_status.get("open", 0)
+    decided = total_tickets - open_count  # tickets that left open state
+
+    auto_resolved = tickets_by_status.get("auto_resolved", 0)
+    escalated = tickets_by_status.get("escalated", 0)
+
+    auto_resolve_rate = round(auto_resolved / decided, 3) if decided else 0.0
+    escalation_rate = round(escalated / decided, 3) if decided else 0.0
+
+    total_feedback = totals["feedback"]["total"]
+    average_rating = round(totals["feedback"]["rating_sum"] / total_feedback, 3) if total_feedback else 0.0
+    resolution_rate = round(totals["feedback"]["resolved"] / total_feedback, 3) if total_feedback else 0.0
+
+    return {
+        "collected_at": datetime.now(timezone.utc).isoformat(),
+        "tickets": {
+            "total": total_tickets,
+            "by_status": dict(tickets_by_status),
+            "by_intent": dict(totals["tickets"]["by_intent"]),
+        },
+        "feedback": {
+            "total": total_feedback,
+            "average_rating": average_rating,
+            "resolution_rate": resolution_rate,
+        },
+        "auto_resolve_rate": auto_resolve_rate,
+        "escalation_rate": escalation_rate,
+    }
+
+
 def collect_metrics(db) -> Dict:
     """
     Query the database and return a snapshot of system-wide metrics.
@@ -82,10 +160,12 @@ def collect_metrics(db) -> Dict:
     Returns:
         Dict with all computed metrics.
     """
+    totals = _empty_totals()
+
     # ------------------------------------------------------------------
     # Ticket metrics
     # ------------------------------------------------------------------
-    total_tickets: int = db.query(func.count(Ticket.id)).scalar() or 0
+    totals["tickets"]["total"] = db.query(func.count(Ticket.id)).scalar() or 0
 
     # Count per status using a single query
     status_rows = (
@@ -93,7 +173,7 @@ def collect_metrics(db) -> Dict:
         .group_by(Ticket.status)
         .all()
     )
-    tickets_by_status = {status: count for status, count in status_rows}
+    totals["tickets"]["by_status"] = {status: count for status, count in status_rows}
 
     # Count per intent
     intent_rows = (
@@ -102,73 +182,234 @@ def collect_metrics(db) -> Dict:
         .group_by(Ticket.intent)
         .all()
     )
-    tickets_by_intent = {intent: count for intent, count in intent_rows}
-
-    # Resolved / escalated ticket counts.
-    # "Decided" = all tickets that have left the open state.
-    # Using total - open ensures archived tickets (is_archived=True) are
-    # counted correctly since archiving preserves the original status.
-    open_count = tickets_by_status.get("open", 0)
-    decided = total_tickets - open_count  # tickets that left open state
-
-    auto_resolved = tickets_by_status.get("auto_resolved", 0)
-    escalated = tickets_by_status.get("escalated", 0)
-
-    auto_resolve_rate = round(auto_resolved / decided, 3) if decided else 0.0
-    escalation_rate = round(escalated / decided, 3) if decided else 0.0
+    totals["tickets"]["by_intent"] = {intent: count for intent, count in intent_rows}
 
     # ------------------------------------------------------------------
     # Feedback metrics
     # ------------------------------------------------------------------
-    total_feedback: int = db.query(func.count(Feedback.id)).scalar() or 0
+    total_feedback, rating_sum, resolved_count = db.query(
+        func.count(Feedback.id),
+        func.coalesce(func.sum(Feedback.rating), 0),
+        func.coalesce(func.sum(case((Feedback.resolved.is_(True), 1), else_=0)), 0),
+    ).one()
+    totals["feedback"] = {"total": total_feedback or 0, "rating_sum": rating_sum, "resolved": resolved_count}
 
-    avg_rating_row = db.query(func.avg(Feedback.rating)).scalar()
-    average_rating = round(float(avg_rating_row), 3) if avg_rating_row is not None else 0.0
+    return _snapshot(totals)
 
-    resolved_count: int = (
-        db.query(func.count(Feedback.id)).filter(Feedback.resolved.is_(True)).scalar() or 0
-    )
-    resolution_rate = round(resolved_count / total_feedback, 3) if total_feedback else 0.0
 
-    # ------------------------------------------------------------------
-    # Assemble result
-    # ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+# Incremental mode
+# ---------------------------------------------------------------------------
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _apply(totals: Dict, row, sign: int) -> None:
+    """Add (sign=+1) or remove (sign=-1) one ticket's contribution."""
+    status, intent, rating, resolved = row
+    tickets = totals["tickets"]
+    tickets["total"] += sign
+    tickets["by_status"][status] = tickets["by_status"].get(status, 0) + sign
+    if intent is not None:
+        tickets["by_intent"][intent] = tickets["by_intent"].get(intent, 0) + sign
+    if rating is not None:
+        feedback = totals["feedback"]
+        feedback["total"] += sign
+        feedback["rating_sum"] += sign * rating
+        if resolved:
+            feedback["resolved"] += sign
+
+
+def _prune(totals: Dict) -> Dict:
+    for key in ("by_status", "by_intent"):
+        totals["tickets"][key] = {k: v for k, v in totals["tickets"][key].items() if v}
+    return totals
+
+
+def _diff(before: Dict, after: Dict) -> Dict:
+    """Counter-wise ``after - before`` (zero entries dropped)."""
+    def sub(a: Dict, b: Dict) -> Dict:
+        return {k: b.get(k, 0) - a.get(k, 0) for k in a.keys() | b.keys() if b.get(k, 0) != a.get(k, 0)}
+
     return {
-        "collected_at": datetime.now(timezone.utc).isoformat(),
         "tickets": {
-            "total": total_tickets,
-            "by_status": tickets_by_status,
-            "by_intent": tickets_by_intent,
-        },
-        "feedback": {
-            "total": total_feedback,
-            "average_rating": average_rating,
-            "resolution_rate": resolution_rate,
+            "total": after["tickets"]["total"] - before["tickets"]["total"],
+            "by_status": sub(before["tickets"]["by_status"], after["tickets"]["by_status"]),
+            "by_intent": sub(before["tickets"]["by_intent"], after["tickets"]["by_intent"]),
         },
-        "auto_resolve_rate": auto_resolve_rate,
-        "escalation_rate": escalation_rate,
+        "feedback": {k: after["feedback"][k] - before["feedback"][k] for k in after["feedback"]},
     }
 
 
+def _current_rows():
+    return (
+        select(Ticket.id, Ticket.status, Ticket.intent, Feedback.rating, Feedback.resolved)
+        .outerjoin(Feedback, Feedback.ticket_id == Ticket.id)
+    )
+
+
+def _rebuild(db) -> Tuple[Dict, int]:
+    """Recount everything into metrics_ticket_state and return the totals."""
+    db.execute(delete(MetricsTicketState))
+    db.execute(
+        insert(MetricsTicketState).from_select(
+            ["ticket_id", "status", "intent", "rating", "resolved"], _current_rows()
+        )
+    )
+
+    s = MetricsTicketState
+    totals = _empty_totals()
+    for status, intent, count, feedback, rating_sum, resolved in db.execute(
+        select(
+            s.status,
+            s.intent,
+            func.count(),
+            func.count(s.rating),
+            func.coalesce(func.sum(s.rating), 0),
+            func.coalesce(func.sum(case((s.resolved.is_(True), 1), else_=0)), 0),
+        ).group_by(s.status, s.intent)
+    ):
+        totals["tickets"]["total"] += count
+        totals["tickets"]["by_status"][status] = totals["tickets"]["by_status"].get(status, 0) + count
+        if intent is not None:
+            totals["tickets"]["by_intent"][intent] = totals["tickets"]["by_intent"].get(intent, 0) + count
+        totals["feedback"]["total"] += feedback
+        totals["feedback"]["rating_sum"] += rating_sum
+        totals["feedback"]["resolved"] += resolved
+    return totals, totals["tickets"]["total"]
+
+
+def _apply_changes(db, totals: Dict, since: datetime) -> int:
+    """Fold tickets changed since *since* into *totals*; returns how many changed."""
+    changed_ids = sorted(db.execute(union(
+        select(Ticket.id).where(Ticket.updated_at >= since),
+        select(Feedback.ticket_id).where(Feedback.created_at >= since),
+    )).scalars())
+
+    changed = 0
+    for start in range(0, len(changed_ids), BATCH_SIZE):
+        chunk = changed_ids[start:start + BATCH_SIZE]
+        current = {row[0]: tuple(row[1:]) for row in db.execute(_current_rows().where(Ticket.id.in_(chunk)))}
+        counted = {
+            row.ticket_id: (row.status, row.intent, row.rating, row.resolved)
+            for row in db.execute(select(MetricsTicketState).where(MetricsTicketState.ticket_id.in_(chunk))).scalars()
+        }
+
+        rewrite = []
+        for ticket_id in chunk:
+            old, new = counted.get(ticket_id), current.get(ticket_id)
+            if old == new:
+                continue
+            changed += 1
+            if old is not None:
+                _apply(totals, old, -1)
+            if new is not None:
+                _apply(totals, new, +1)
+            rewrite.append(ticket_id)
+
+        if rewrite:
+            db.execute(delete(MetricsTicketState).where(MetricsTicketState.ticket_id.in_(rewrite)))
+            rows = [
+                dict(zip(("ticket_id", "status", "intent", "rating", "resolved"), (ticket_id, *current[ticket_id])))
+                for ticket_id in rewrite
+                if ticket_id in current
+            ]
+            if rows:
+                db.execute(insert(MetricsTicketState), rows)
+    return changed
+
+
+def collect_metrics_incremental(db, rebuild: bool = False) -> Dict:
+    """
+    Update the running aggregates with what changed since the last run.
+
+    Reads and writes the "metrics_collector" worker checkpoint and
+    metrics_ticket_state; the caller commits.
+
+    Returns:
+        The cumulative snapshot (same keys as :func:`collect_metrics`) plus
+        ``watermark`` and a ``delta`` dict: the interval bounds, how many
+        tickets changed, and the change in every counter.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    checkpoint = db.get(WorkerCheckpoint, CHECKPOINT_NAME)
+    if checkpoint is None:
+        checkpoint = WorkerCheckpoint(name=CHECKPOINT_NAME)
+        db.add(checkpoint)
+
+    previous = json.loads(checkpoint.state) if checkpoint.state else None
+    since = checkpoint.watermark
+
+    if previous is None or since is None or rebuild:
+        logger.info("Rebuilding incremental metrics state from scratch.")
+        totals, processed = _rebuild(db)
+        mode = "rebuild"
+    else:
+        totals = json.loads(checkpoint.state)
+        processed = _apply_changes(db, totals, _naive_utc(since) - WATERMARK_OVERLAP)
+        mode = "incremental"
+    _prune(totals)
+
+    checkpoint.watermark = now
+    checkpoint.state = json.dumps(totals)
+
+    metrics = _snapshot(totals)
+    metrics["watermark"] = now.isoformat()
+    metrics["delta"] = {
+        "mode": mode,
+        "since": since.isoformat() if since else None,
+        "until": now.isoformat(),
+        "tickets_processed": processed,
+        **_diff(previous or _empty_totals(), totals),
+    }
+    return metrics
+
+
 # ---------------------------------------------------------------------------
 # Runner
 # ---------------------------------------------------------------------------
 
-def run_metrics_collector(output_path: Path = DEFAULT_OUTPUT) -> Dict:
+def run_metrics_collector(
+    output_path: Path = DEFAULT_OUTPUT,
+    prime_cache: bool = True,
+    incremental: bool = False,
+    rebuild: bool = False,
+) -> Dict:
     """
     Collect system metrics and persist them to *output_path*.
 
     Args:
         output_path: Destination file for the JSON metrics snapshot.
+        prime_cache: Also recompute and publish the /admin/metrics snapshot.
+        incremental: Fold in only what changed since the last incremental
+            run (see module docstring); the snapshot gains a ``delta`` key.
+        rebuild: With *incremental*, recount everything first.
 
     Returns:
-        The metrics dict produced by :func:`collect_metrics`.
+        The metrics dict produced by :func:`collect_metrics` or
+        :func:`collect_metrics_incremental`.
     """
     init_db()
-    db = SessionLocal()
+    if incremental:
+        db = SessionLocal()  # writes the checkpoint: always the primary
+    else:
+        db = ReadSessionLocal()  # read-only scan: replica when configured
     try:
-        logger.info("Collecting system metrics…")
-        metrics = collect_metrics(db)
+        logger.info("Collecting system metrics%s…", " (incremental)" if incremental else "")
+        if incremental:
+            metrics = collect_metrics_incremental(db, rebuild=rebuild)
+            db.commit()
+        else:
+            metrics = collect_metrics(db)
+        if prime_cache:
+            refresh_admin_metrics(db)
+            logger.info("Admin metrics cache refreshed.")
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -205,6 +446,22 @@ def _parse_args(argv=None):
         default=_default_cli_output,
         help="Path to write the JSON metrics snapshot (default: metrics_<timestamp>.json).",
     )
+    parser.add_argument(
+        "--no-prime-cache",
+        dest="prime_cache",
+        action="store_false",
+        help="Do not refresh the cached /admin/metrics snapshot.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Process only tickets/feedback changed since the last incremental run.",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="With --incremental: recount everything and reset the watermark.",
+    )
     return parser.parse_args(argv)
 
 
@@ -214,4 +471,9 @@ if __name__ == "__main__":
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
     args = _parse_args()
-    run_metrics_collector(output_path=args.output)
+    run_metrics_collector(
+        output_path=args.output,
+        prime_cache=args.prime_cache,
+        incremental=args.incremental,
+        rebuild=args.rebuild,
+    )
@@ -0,0 +1,126 @@
+"""
+workers/rollup_reconciler.py
+
+Owner:
+------
+Om (Backend / System)
+
+Purpose:
+--------
+Recompute ticket_rollups_hourly from the tickets and feedback tables and
+fix any rows that drifted.
+
+The rollups are maintained incrementally on every ticket/feedback write
+(app/db/rollups.py). Writes that bypass the ORM Session (bulk seeding,
+manual SQL) and float rounding in the running sums are not captured; this
+job is the safety net, and the way to backfill history after the
+ticket_rollups_hourly migration.
+
+Why this is a worker:
+---------------------
+- A full recompute scans every ticket — fine on a schedule, not per request
+- Can run during low-traffic periods
+
+Responsibilities:
+-----------------
+- Recompute rollups for a window (default: the last 48 hours) or everything
+- Insert missing rows, rewrite drifted rows, delete rows with no tickets
+
+DO NOT:
+-------
+- Serve metrics (see app/services/admin_metrics.py)
+- Run inside API requests
+
+Usage:
+------
+    python workers/rollup_reconciler.py                 # last 48 hours
+    python workers/rollup_reconciler.py --hours 168
+    python workers/rollup_reconciler.py --all           # full backfill
+    python workers/rollup_reconciler.py --all --dry-run
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path so worker can be run directly
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.rollups import reconcile_rollups
+from app.db.session import SessionLocal, init_db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOURS = 48
+
+
+def run_rollup_reconciler(hours: int | None = DEFAULT_HOURS, dry_run: bool = False) -> dict:
+    """
+    Reconcile the rollups for the last *hours* hours (all history if None).
+
+    Args:
+        hours: Window to recompute, by ticket creation time; None for all.
+        dry_run: When *True* report drift without writing.
+
+    Returns:
+        Summary dict with ``checked`` / ``inserted`` / ``updated`` / ``deleted`` counts.
+    """
+    init_db()
+    since = datetime.now(timezone.utc) - timedelta(hours=hours) if hours is not None else None
+    logger.info("Reconciling ticket rollups (since=%s, dry_run=%s).", since or "beginning", dry_run)
+
+    db = SessionLocal()  # writes: always the primary
+    try:
+        summary = reconcile_rollups(db, since=since, dry_run=dry_run)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info("Rollup reconciliation complete: %s", summary)
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rollup reconciler — recompute ticket_rollups_hourly from tickets/feedback.",
+    )
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument(
+        "--hours",
+        type=int,
+        default=DEFAULT_HOURS,
+        help=f"Recompute buckets for tickets created in the last HOURS hours (default: {DEFAULT_HOURS}).",
+    )
+    window.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every bucket (backfill).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report drift without making any changes.",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    args = _parse_args()
+    run_rollup_reconciler(hours=None if args.all else args.hours, dry_run=args.dry_run)